@@ -151,34 +151,8 @@ class MainnetTraderDiscovery:
     async def _get_program_accounts(self, program_id: str) -> List[Dict[str, Any]]:
         """Get accounts owned by a program"""
         try:
-            solana_url = self.settings.solana_rpc_url
-            
-            payload = {
-                "jsonrpc": "2.0",
-                "id": 1,
-                "method": "getProgramAccounts",
-                "params": [
-                    program_id,
-                    {
-                        "encoding": "jsonParsed",
-                        "filters": [],
-                        "dataSlice": {"offset": 0, "length": 0}  # Only get account info
-                    }
-                ]
-            }
-            
-            response = await self.http_client.post(
-                solana_url,
-                json=payload,
-                headers={"Content-Type": "application/json"}
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                if "result" in data:
-                    return [{"owner": acc["account"]["owner"]} for acc in data["result"][:50]]
-            
-            return []
+            accounts = await self.rpc_client.get_program_accounts(program_id, limit=50)
+            return [{"owner": acc["account"]["owner"]} for acc in accounts]
             
         except Exception as e:
             logger.debug(f"Error getting program accounts: {e}")
@@ -238,30 +212,7 @@ class MainnetTraderDiscovery:
     async def _get_recent_signatures(self, wallet_address: str, limit: int = 100) -> List[str]:
         """Get recent transaction signatures for a wallet"""
         try:
-            solana_url = self.settings.solana_rpc_url
-            
-            payload = {
-                "jsonrpc": "2.0",
-                "id": 1,
-                "method": "getSignaturesForAddress",
-                "params": [
-                    wallet_address,
-                    {"limit": limit}
-                ]
-            }
-            
-            response = await self.http_client.post(
-                solana_url,
-                json=payload,
-                headers={"Content-Type": "application/json"}
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                if "result" in data and data["result"]:
-                    return [tx["signature"] for tx in data["result"]]
-            
-            return []
+            return await self.rpc_client.get_signatures_for_address(wallet_address, limit=limit)
             
         except Exception as e:
             logger.debug(f"Error getting signatures for {wallet_address}: {e}")
@@ -270,30 +221,7 @@ class MainnetTraderDiscovery:
     async def _get_transaction_details(self, signature: str) -> Optional[Dict[str, Any]]:
         """Get detailed transaction information"""
         try:
-            solana_url = self.settings.solana_rpc_url
-            
-            payload = {
-                "jsonrpc": "2.0",
-                "id": 1,
-                "method": "getTransaction",
-                "params": [
-                    signature,
-                    {"encoding": "jsonParsed"}
-                ]
-            }
-            
-            response = await self.http_client.post(
-                solana_url,
-                json=payload,
-                headers={"Content-Type": "application/json"}
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                if "result" in data and data["result"]:
-                    return data["result"]
-            
-            return None
+            return await self.rpc_client.get_transaction(signature)
             
         except Exception as e:
             logger.debug(f"Error getting transaction details for {signature}: {e}")
@@ -368,8 +296,8 @@ class MainnetTraderDiscovery:
     
     async def close(self):
         """Clean up resources"""
-        if self.http_client:
-            await self.http_client.aclose()
+        # The shared RPC client outlives this service; nothing else to release
+        pass
 
 
 # Global trader discovery service
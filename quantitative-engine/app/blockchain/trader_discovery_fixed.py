@@ -4,12 +4,16 @@ Fixed mainnet trader discovery service that actually finds Raydium traders
 
 import asyncio
 import httpx
+import json
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timezone
 import logging
 from dataclasses import dataclass
 from collections import Counter
 
+from ..core.rate_limiter import get_rpc_rate_limiter, provider_for_url
+from ..core.transaction_cache import get_transaction_cache, is_finalized, transaction_key
+
 logger = logging.getLogger(__name__)
 
 
@@ -36,6 +40,9 @@ class FixedMainnetTraderDiscovery:
         self.solana_rpc = f"https://mainnet.helius-rpc.com/?api-key={self.helius_api_key}"
         self.raydium_program = "675kPX9MHTjS2zt1qfr1NYHuzeLXfQM9H24wFSUt1Mp8"
         self.http_client = None
+        self.rate_limiter = get_rpc_rate_limiter()
+        self.provider = provider_for_url(self.solana_rpc)
+        self.transaction_cache = get_transaction_cache()
         
     async def initialize(self):
         """Initialize the trader discovery service"""
@@ -95,6 +102,7 @@ class FixedMainnetTraderDiscovery:
         """
         try:
             # Get recent transactions to Raydium program
+            await self.rate_limiter.acquire(self.provider, "getSignaturesForAddress")
             response = await self.http_client.post(
                 self.solana_rpc,
                 json={
@@ -131,53 +139,30 @@ class FixedMainnetTraderDiscovery:
                 try:
                     signature = sig_info["signature"]
                     
-                    # Get transaction details
-                    tx_response = await self.http_client.post(
-                        self.solana_rpc,
-                        json={
-                            "jsonrpc": "2.0",
-                            "id": 1,
-                            "method": "getTransaction",
-                            "params": [
-                                signature,
-                                {
-                                    "encoding": "json",
-                                    "commitment": "confirmed",
-                                    "maxSupportedTransactionVersion": 0
-                                }
-                            ]
-                        }
-                    )
+                    # Get transaction details (history seen before is read from the local cache)
+                    result = await self._get_transaction(signature)
                     
-                    if tx_response.status_code == 200:
-                        tx_data = tx_response.json()
-                        
-                        if "result" in tx_data and tx_data["result"]:
-                            result = tx_data["result"]
+                    if result:
+                        # Extract the fee payer (trader)
+                        if "transaction" in result and "message" in result["transaction"]:
+                            message = result["transaction"]["message"]
                             
-                            # Extract the fee payer (trader)
-                            if "transaction" in result and "message" in result["transaction"]:
-                                message = result["transaction"]["message"]
-                                
-                                # Get account keys
-                                account_keys = []
-                                if "accountKeys" in message:
-                                    account_keys = message["accountKeys"]
-                                elif "accounts" in message:
-                                    account_keys = message["accounts"]
+                            # Get account keys
+                            account_keys = []
+                            if "accountKeys" in message:
+                                account_keys = message["accountKeys"]
+                            elif "accounts" in message:
+                                account_keys = message["accounts"]
+                            
+                            if account_keys and len(account_keys) > 0:
+                                # First account is typically the fee payer/trader
+                                trader = account_keys[0]
                                 
-                                if account_keys and len(account_keys) > 0:
-                                    # First account is typically the fee payer/trader
-                                    trader = account_keys[0]
-                                    
-                                    # Skip system programs and invalid addresses
-                                    if (not trader.endswith("11111111111111111111111111111111") and 
-                                        len(trader) == 44):  # Valid base58 address
-                                        trader_activity[trader] += 1
-                    
-                    # Rate limiting
-                    await asyncio.sleep(0.01)
-                    
+                                # Skip system programs and invalid addresses
+                                if (not trader.endswith("11111111111111111111111111111111") and 
+                                    len(trader) == 44):  # Valid base58 address
+                                    trader_activity[trader] += 1
+                
                 except Exception as e:
                     logger.debug(f"Error processing transaction: {e}")
                     continue
@@ -192,6 +177,44 @@ class FixedMainnetTraderDiscovery:
             logger.error(f"Error finding Raydium traders: {e}")
             return []
     
+    async def _get_transaction(self, signature: str) -> Optional[Dict[str, Any]]:
+        """Get a transaction's "result" object, through the shared transaction cache"""
+        cache_key = transaction_key(signature, "json", 0)
+        if self.transaction_cache:
+            # Cache reads and writes touch disk and a lock file: run them off the event loop
+            cached = await asyncio.to_thread(self.transaction_cache.get, cache_key)
+            if cached is not None:
+                return cached
+        
+        await self.rate_limiter.acquire(self.provider, "getTransaction")
+        tx_response = await self.http_client.post(
+            self.solana_rpc,
+            json={
+                "jsonrpc": "2.0",
+                "id": 1,
+                "method": "getTransaction",
+                "params": [
+                    signature,
+                    {
+                        "encoding": "json",
+                        "commitment": "confirmed",
+                        "maxSupportedTransactionVersion": 0
+                    }
+                ]
+            }
+        )
+        
+        if tx_response.status_code != 200:
+            return None
+        
+        result = tx_response.json().get("result")
+        if self.transaction_cache and result and is_finalized(result.get("blockTime"), "confirmed"):
+            try:
+                await asyncio.to_thread(self.transaction_cache.put, cache_key, json.dumps(result, separators=(",", ":")))
+            except OSError as e:
+                logger.warning(f"Failed to write transaction cache: {e}")
+        return result
+    
     async def cleanup(self):
         """Clean up resources"""
         if self.http_client:
@@ -4,17 +4,22 @@ Calculates key financial metrics using high-precision decimal arithmetic
 """
 
 import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timezone, timedelta
 from decimal import Decimal, getcontext, ROUND_HALF_UP
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Union, Any
 from dataclasses import dataclass
 from enum import Enum
 import statistics
 
-from ..schemas.ingestion import RaydiumSwap, TokenBalance
+from ..schemas.ingestion import SwapData, TokenAmount, TokenBalance
 from ..core.config import get_settings
 from ..core.logging import get_calculation_logger
-from .price_feed import get_price_feed, PricePoint
+from .price_feed import get_price_feed, PricePoint, price_cache_key
+from .vectorized import NUMPY_AVAILABLE, TradeColumns, compute_core_metrics
+from .rolling import RollingStateStore, RollingCoreMetrics, to_unix_us
 
 # Set high precision for all decimal calculations
 getcontext().prec = 28
@@ -22,6 +27,13 @@ getcontext().prec = 28
 settings = get_settings()
 logger = get_calculation_logger()
 
+SOL_MINT = 'So11111111111111111111111111111111111111112'
+
+
+def as_decimal(value: Any) -> Decimal:
+    """Decimal value of an amount, without a string round trip when it already is one"""
+    return value if isinstance(value, Decimal) else Decimal(str(value))
+
 
 class TradeType(Enum):
     """Trade type classification"""
@@ -30,14 +42,48 @@ class TradeType(Enum):
     SWAP = "swap"
 
 
+class MetricsEngine(Enum):
+    """Arithmetic backend used for core metrics calculation"""
+    DECIMAL = "decimal"        # High-precision Decimal path (audit output)
+    VECTORIZED = "vectorized"  # NumPy float64/int64 columnar path (ranking runs)
+    INCREMENTAL = "incremental"  # Persisted per-wallet rolling state updated from new trades only
+
+
+# Maximum allowed difference between VECTORIZED and DECIMAL results per quantized field.
+# float64 sums keep ~15 significant digits, so after quantization the two engines agree
+# exactly unless a value sits within float error of a rounding boundary, in which case
+# they may differ by one quantum. Trade counts must always match exactly.
+VECTORIZED_TOLERANCE: Dict[str, Decimal] = {
+    'net_roi_percent': Decimal('0.01'),
+    'maximum_drawdown_percent': Decimal('0.01'),
+    'sharpe_ratio': Decimal('0.001'),
+    'win_loss_ratio': Decimal('0'),
+    'total_volume_usd': Decimal('0.01'),
+    'total_fees_usd': Decimal('0.01'),
+    'total_profit_usd': Decimal('0.01'),
+    'average_trade_size_usd': Decimal('0.01'),
+    'largest_win_usd': Decimal('0.01'),
+    'largest_loss_usd': Decimal('0.01'),
+    'average_holding_period_hours': Decimal('0.1'),
+}
+
+
+class TradeValues(NamedTuple):
+    """The TradeRecord fields the core metrics read, shipped to process-pool workers"""
+    timestamp: datetime
+    token_in_usd: Decimal
+    fee_usd: Decimal
+    net_profit_usd: Decimal
+
+
 @dataclass
 class TradeRecord:
     """High-precision trade record with USD valuations"""
     timestamp: datetime
     signature: str
     trade_type: TradeType
-    token_in: TokenBalance
-    token_out: TokenBalance
+    token_in: Union[TokenBalance, TokenAmount]
+    token_out: Union[TokenBalance, TokenAmount]
     token_in_usd: Decimal
     token_out_usd: Decimal
     net_usd_change: Decimal  # token_out_usd - token_in_usd (excluding fees)
@@ -53,6 +99,55 @@ class TradeRecord:
                 setattr(self, field_name, Decimal(str(value)))
 
 
+class TradeValuationCache:
+    """
+    Per-run cache of trade USD valuations keyed by swap signature
+    
+    Shared by eligibility checks, metrics and portfolio summaries within one scoring run
+    so each swap is priced exactly once. Failed valuations are cached as None and are
+    not retried within the run. Streaming callers evict entries they no longer need.
+    """
+    
+    # Price lookups needed to value one swap from scratch (token_in, token_out, SOL fee)
+    LOOKUPS_PER_SWAP = 3
+    
+    def __init__(self):
+        self._records: Dict[str, Optional[TradeRecord]] = {}
+        self.swaps_valued = 0
+        self.valuations_reused = 0
+    
+    def __contains__(self, signature: str) -> bool:
+        return signature in self._records
+    
+    def __getitem__(self, signature: str) -> Optional[TradeRecord]:
+        return self._records[signature]
+    
+    def __len__(self) -> int:
+        return len(self._records)
+    
+    def update(self, signatures: List[str], records: List[Optional[TradeRecord]]):
+        """Store the valuations of freshly priced swaps"""
+        self._records.update(zip(signatures, records))
+        self.swaps_valued += len(signatures)
+    
+    def evict(self, signatures: Iterable[str]):
+        """Drop the valuations of swaps the run no longer needs"""
+        for signature in signatures:
+            self._records.pop(signature, None)
+    
+    def record_reuse(self, count: int):
+        """Count swaps served from the cache instead of being priced again"""
+        self.valuations_reused += count
+    
+    def get_statistics(self) -> Dict[str, int]:
+        """Get valuation reuse statistics for the run"""
+        return {
+            "swaps_valued": self.swaps_valued,
+            "valuations_reused": self.valuations_reused,
+            "lookups_saved": self.valuations_reused * self.LOOKUPS_PER_SWAP
+        }
+
+
 @dataclass
 class PerformanceMetrics:
     """Comprehensive performance metrics over rolling period"""
@@ -91,6 +186,35 @@ class PerformanceMetrics:
                 setattr(self, field_name, Decimal(str(value)))
 
 
+def find_tolerance_violations(
+    reference: PerformanceMetrics,
+    candidate: PerformanceMetrics
+) -> Dict[str, Tuple[Any, Any]]:
+    """
+    Compare vectorized metrics against the Decimal reference using VECTORIZED_TOLERANCE
+    
+    Args:
+        reference: Metrics calculated with MetricsEngine.DECIMAL
+        candidate: Metrics calculated with MetricsEngine.VECTORIZED
+        
+    Returns:
+        Dict mapping field name to (reference, candidate) for every field out of tolerance
+    """
+    violations = {}
+    
+    for field_name in ('total_trades', 'winning_trades', 'losing_trades'):
+        if getattr(reference, field_name) != getattr(candidate, field_name):
+            violations[field_name] = (getattr(reference, field_name), getattr(candidate, field_name))
+    
+    for field_name, tolerance in VECTORIZED_TOLERANCE.items():
+        expected = getattr(reference, field_name)
+        actual = getattr(candidate, field_name)
+        if abs(expected - actual) > tolerance:
+            violations[field_name] = (expected, actual)
+    
+    return violations
+
+
 class PerformanceCalculator:
     """
     High-precision performance metrics calculator
@@ -100,11 +224,20 @@ class PerformanceCalculator:
     def __init__(self):
         self.price_feed = None
         self.rolling_period_days = settings.metrics_rolling_period_days
+        self.default_engine = MetricsEngine(settings.metrics_engine)
+        self.rolling_store = RollingStateStore(settings.rolling_state_dir)
+        self.process_workers = settings.metrics_process_workers
+        self.process_min_wallets = settings.metrics_process_min_wallets
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._process_pool_failed = False
         
         logger.info(
             "Initialized performance calculator",
             rolling_period_days=self.rolling_period_days,
-            precision_digits=getcontext().prec
+            precision_digits=getcontext().prec,
+            default_engine=self.default_engine.value,
+            numpy_available=NUMPY_AVAILABLE,
+            process_workers=self.process_workers
         )
     
     async def initialize(self):
@@ -114,7 +247,7 @@ class PerformanceCalculator:
     
     async def calculate_trade_usd_values(
         self, 
-        swap: RaydiumSwap
+        swap: SwapData
     ) -> Optional[TradeRecord]:
         """
         Calculate USD values for a trade at execution time
@@ -156,9 +289,107 @@ class PerformanceCalculator:
             )
             return None
         
+        # Get SOL price for fee calculation
+        sol_price = await self.price_feed.get_historical_price(
+            SOL_MINT,
+            swap.block_time,
+            'SOL'
+        )
+        
+        return self._build_trade_record(swap, token_in_price, token_out_price, sol_price)
+    
+    async def calculate_trade_usd_values_batch(
+        self,
+        swaps: List[SwapData],
+        valuation_cache: Optional[TradeValuationCache] = None
+    ) -> List[Optional[TradeRecord]]:
+        """
+        Calculate USD values for many trades with one deduplicated price lookup pass
+        
+        Collects every (mint, timestamp) pair needed by the swaps (token_in, token_out
+        and SOL for the fee), dedupes them by price key, resolves them concurrently
+        through get_multiple_historical_prices and builds all TradeRecords in one pass.
+        
+        Args:
+            swaps: Validated Raydium swap transactions
+            valuation_cache: Per-run cache; swaps already valued in it are not priced again
+            
+        Returns:
+            List aligned with swaps; None where price data was missing
+        """
+        if not swaps:
+            return []
+        
+        if valuation_cache is not None:
+            pending = [swap for swap in swaps if swap.signature not in valuation_cache]
+            if pending:
+                valuation_cache.update(
+                    [swap.signature for swap in pending],
+                    await self.calculate_trade_usd_values_batch(pending)
+                )
+            valuation_cache.record_reuse(len(swaps) - len(pending))
+            return [valuation_cache[swap.signature] for swap in swaps]
+        
+        if not self.price_feed:
+            await self.initialize()
+        
+        # Collect deduplicated price requests
+        price_requests: Dict[str, Tuple[str, datetime, Optional[str]]] = {}
+        for swap in swaps:
+            legs = [
+                (swap.token_in.mint, swap.token_in.symbol),
+                (swap.token_out.mint, swap.token_out.symbol)
+            ]
+            if swap.fee_lamports:
+                legs.append((SOL_MINT, 'SOL'))
+            
+            for mint, symbol in legs:
+                price_requests.setdefault(
+                    price_cache_key(mint, swap.block_time),
+                    (mint, swap.block_time, symbol)
+                )
+        
+        logger.debug(
+            "Resolving batch trade prices",
+            trade_count=len(swaps),
+            unique_price_requests=len(price_requests),
+            serial_lookups_avoided=len(swaps) * 3 - len(price_requests)
+        )
+        
+        prices = await self.price_feed.get_multiple_historical_prices(list(price_requests.values()))
+        
+        # Build trade records in a single pass
+        trade_records: List[Optional[TradeRecord]] = []
+        for swap in swaps:
+            token_in_price = prices.get(price_cache_key(swap.token_in.mint, swap.block_time))
+            token_out_price = prices.get(price_cache_key(swap.token_out.mint, swap.block_time))
+            
+            if not token_in_price or not token_out_price:
+                logger.warning(
+                    "Missing price data for trade",
+                    signature=swap.signature,
+                    token_in_missing=token_in_price is None,
+                    token_out_missing=token_out_price is None
+                )
+                trade_records.append(None)
+                continue
+            
+            sol_price = prices.get(price_cache_key(SOL_MINT, swap.block_time)) if swap.fee_lamports else None
+            trade_records.append(self._build_trade_record(swap, token_in_price, token_out_price, sol_price))
+        
+        return trade_records
+    
+    def _build_trade_record(
+        self,
+        swap: SwapData,
+        token_in_price: PricePoint,
+        token_out_price: PricePoint,
+        sol_price: Optional[PricePoint]
+    ) -> TradeRecord:
+        """Build a TradeRecord from a swap and its resolved execution-time prices"""
         # Calculate USD values with high precision
-        token_in_amount = Decimal(str(swap.token_in.amount))
-        token_out_amount = Decimal(str(swap.token_out.amount))
+        token_in_amount = as_decimal(swap.token_in.amount)
+        token_out_amount = as_decimal(swap.token_out.amount)
         
         token_in_usd = token_in_amount * token_in_price.price_usd
         token_out_usd = token_out_amount * token_out_price.price_usd
@@ -167,14 +398,6 @@ class PerformanceCalculator:
         fee_lamports = Decimal(str(swap.fee_lamports or 0))
         fee_sol = fee_lamports / Decimal('1000000000')  # Convert lamports to SOL
         
-        # Get SOL price for fee calculation
-        sol_mint = settings.supported_tokens.get('SOL', 'So11111111111111111111111111111111111111112')
-        sol_price = await self.price_feed.get_historical_price(
-            sol_mint,
-            swap.block_time,
-            'SOL'
-        )
-        
         fee_usd = fee_sol * (sol_price.price_usd if sol_price else Decimal('0'))
         
         # Determine trade type
@@ -210,7 +433,7 @@ class PerformanceCalculator:
         
         return trade_record
     
-    def _classify_trade_type(self, swap: RaydiumSwap) -> TradeType:
+    def _classify_trade_type(self, swap: SwapData) -> TradeType:
         """Classify trade type based on token symbols"""
         # Simple classification logic - can be enhanced
         if swap.token_in.symbol in ['USDC', 'USDT']:
@@ -223,8 +446,10 @@ class PerformanceCalculator:
     async def calculate_performance_metrics(
         self,
         wallet_address: str,
-        trades: List[RaydiumSwap],
-        end_date: Optional[datetime] = None
+        trades: List[SwapData],
+        end_date: Optional[datetime] = None,
+        engine: Optional[MetricsEngine] = None,
+        valuation_cache: Optional[TradeValuationCache] = None
     ) -> Optional[PerformanceMetrics]:
         """
         Calculate comprehensive performance metrics over rolling 90-day period
@@ -233,6 +458,8 @@ class PerformanceCalculator:
             wallet_address: Wallet address being analyzed
             trades: List of Raydium swaps for the wallet
             end_date: End date for calculation period (defaults to now)
+            engine: Metrics backend (defaults to settings.metrics_engine)
+            valuation_cache: Per-run trade valuation cache shared with other stages
             
         Returns:
             PerformanceMetrics with the five required metrics
@@ -270,24 +497,37 @@ class PerformanceCalculator:
             period_end=end_date.isoformat()
         )
         
-        # Convert swaps to trade records with USD values
-        trade_records = []
-        for swap in period_trades:
-            trade_record = await self.calculate_trade_usd_values(swap)
-            if trade_record:
-                trade_records.append(trade_record)
-        
-        if not trade_records:
-            logger.error("Failed to calculate USD values for any trades", wallet=wallet_address)
-            return None
-        
-        # Calculate the five required metrics
-        metrics = await self._calculate_core_metrics(trade_records, start_date, end_date)
+        engine = self._resolve_engine(engine)
+        if engine == MetricsEngine.INCREMENTAL:
+            metrics = await self._calculate_metrics_incremental(
+                wallet_address, period_trades, start_date, end_date, valuation_cache
+            )
+            if not metrics:
+                logger.error("Failed to calculate USD values for any trades", wallet=wallet_address)
+                return None
+        else:
+            # Convert swaps to trade records with USD values (one batched price pass)
+            trade_records = [
+                trade_record
+                for trade_record in await self.calculate_trade_usd_values_batch(period_trades, valuation_cache)
+                if trade_record
+            ]
+            
+            if not trade_records:
+                logger.error("Failed to calculate USD values for any trades", wallet=wallet_address)
+                return None
+            
+            # Calculate the five required metrics
+            if engine == MetricsEngine.VECTORIZED:
+                metrics = self._calculate_core_metrics_vectorized(trade_records, start_date, end_date)
+            else:
+                metrics = await self._calculate_core_metrics(trade_records, start_date, end_date)
         
         logger.info(
             "Completed performance metrics calculation",
             wallet=wallet_address,
-            processed_trades=len(trade_records),
+            processed_trades=metrics.total_trades,
+            engine=engine.value,
             net_roi_percent=str(metrics.net_roi_percent),
             sharpe_ratio=str(metrics.sharpe_ratio),
             max_drawdown_percent=str(metrics.maximum_drawdown_percent)
@@ -366,6 +606,189 @@ class PerformanceCalculator:
             average_holding_period_hours=average_holding_period_hours.quantize(Decimal('0.1'), rounding=ROUND_HALF_UP)
         )
     
+    def _resolve_engine(self, engine: Optional[MetricsEngine]) -> MetricsEngine:
+        """Pick the metrics engine for a call, falling back to Decimal without NumPy"""
+        engine = engine or self.default_engine
+        
+        if engine == MetricsEngine.VECTORIZED and not NUMPY_AVAILABLE:
+            logger.warning("NumPy not available, falling back to Decimal metrics engine")
+            return MetricsEngine.DECIMAL
+        
+        return engine
+    
+    def _calculate_core_metrics_vectorized(
+        self,
+        trades: List[TradeRecord],
+        start_date: datetime,
+        end_date: datetime
+    ) -> PerformanceMetrics:
+        """
+        Calculate the five core metrics with the columnar float64 kernel
+        
+        Results agree with _calculate_core_metrics within VECTORIZED_TOLERANCE.
+        """
+        core = compute_core_metrics(TradeColumns.from_trade_records(trades))
+        
+        def to_decimal(value: float, places: str) -> Decimal:
+            return Decimal(str(value)).quantize(Decimal(places), rounding=ROUND_HALF_UP)
+        
+        # Counts are exact, so the ratio is computed in Decimal like the reference path
+        win_loss_ratio = (
+            Decimal(core.winning_trades) / Decimal(core.losing_trades)
+            if core.losing_trades else Decimal('99999')
+        )
+        
+        return PerformanceMetrics(
+            period_start=start_date,
+            period_end=end_date,
+            total_trades=core.total_trades,
+            net_roi_percent=to_decimal(core.net_roi_percent, '0.01'),
+            maximum_drawdown_percent=to_decimal(core.maximum_drawdown_percent, '0.01'),
+            sharpe_ratio=to_decimal(core.sharpe_ratio, '0.001'),
+            win_loss_ratio=win_loss_ratio.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP),
+            total_volume_usd=to_decimal(core.total_volume_usd, '0.01'),
+            total_fees_usd=to_decimal(core.total_fees_usd, '0.01'),
+            total_profit_usd=to_decimal(core.total_profit_usd, '0.01'),
+            winning_trades=core.winning_trades,
+            losing_trades=core.losing_trades,
+            average_trade_size_usd=to_decimal(core.average_trade_size_usd, '0.01'),
+            largest_win_usd=to_decimal(core.largest_win_usd, '0.01'),
+            largest_loss_usd=to_decimal(core.largest_loss_usd, '0.01'),
+            average_holding_period_hours=to_decimal(core.average_holding_period_hours, '0.1')
+        )
+    
+    async def _calculate_metrics_incremental(
+        self,
+        wallet_address: str,
+        period_trades: List[SwapData],
+        start_date: datetime,
+        end_date: datetime,
+        valuation_cache: Optional[TradeValuationCache] = None
+    ) -> Optional[PerformanceMetrics]:
+        """
+        Update a wallet's persisted rolling state and read metrics from it
+        
+        Only swaps not yet applied to the window are valued and added, together with
+        earlier swaps that could not be priced (retried every run until priced or
+        expired); trades older than start_date are expired. Valued trades older than
+        the newest applied one (late backfill, late price) are merged by replaying the
+        stored window; the window is rebuilt from period_trades only when the end date
+        moves backwards. Runs for the same wallet are serialized.
+        
+        Args:
+            wallet_address: Wallet address being analyzed
+            period_trades: Wallet swaps inside [start_date, end_date]
+            start_date: Start of the rolling window
+            end_date: End of the rolling window
+            valuation_cache: Per-run trade valuation cache shared with other stages
+            
+        Returns:
+            PerformanceMetrics for the window, or None if it holds no valued trades
+        """
+        async with self.rolling_store.lock(wallet_address):
+            # Snapshot and journal I/O stays off the event loop
+            state = await asyncio.to_thread(self.rolling_store.get, wallet_address)
+            if not state.can_advance_to(end_date):
+                state = self.rolling_store.reset(wallet_address)
+            
+            expired = state.expire_before(start_date)
+            
+            pending = sorted(
+                (
+                    trade for trade in period_trades
+                    if not state.has_seen(trade.signature) or state.is_unpriced(trade.signature)
+                ),
+                key=lambda trade: trade.block_time
+            )
+            retried = sum(1 for trade in pending if state.is_unpriced(trade.signature))
+            
+            valued = []
+            trade_records = await self.calculate_trade_usd_values_batch(pending, valuation_cache)
+            for swap, trade_record in zip(pending, trade_records):
+                if trade_record:
+                    valued.append(trade_record)
+                else:
+                    state.mark_unpriced(swap.block_time, swap.signature)
+            state.clear_unpriced(trade_record.signature for trade_record in valued)
+            
+            newest_applied = state.newest_timestamp_us
+            if valued and newest_applied is not None and to_unix_us(valued[0].timestamp) < newest_applied:
+                logger.info(
+                    "Trades predate rolling state, replaying window",
+                    wallet=wallet_address,
+                    inserted_trades=len(valued),
+                    window_trades=len(state.entries)
+                )
+                state.insert(
+                    (record.timestamp, record.signature, record.token_in_usd, record.fee_usd, record.net_profit_usd)
+                    for record in valued
+                )
+            else:
+                for trade_record in valued:
+                    state.apply(
+                        trade_record.timestamp,
+                        trade_record.signature,
+                        trade_record.token_in_usd,
+                        trade_record.fee_usd,
+                        trade_record.net_profit_usd
+                    )
+            
+            window_moved = state.window_end_us != to_unix_us(end_date)
+            state.window_end_us = to_unix_us(end_date)
+            if state.has_changes or window_moved:
+                await asyncio.to_thread(self.rolling_store.save, state)
+            
+            logger.debug(
+                "Applied incremental window update",
+                wallet=wallet_address,
+                new_trades=len(pending) - retried,
+                retried_unpriced=retried,
+                valued_trades=len(valued),
+                expired_trades=expired,
+                window_trades=len(state.entries)
+            )
+            
+            core = state.core_metrics()
+        
+        if core is None:
+            return None
+        
+        return self._metrics_from_rolling_core(core, start_date, end_date)
+    
+    def _metrics_from_rolling_core(
+        self,
+        core: RollingCoreMetrics,
+        start_date: datetime,
+        end_date: datetime
+    ) -> PerformanceMetrics:
+        """Quantize raw rolling-state metrics like the Decimal reference path"""
+        def quantize(value: Decimal, places: str) -> Decimal:
+            return value.quantize(Decimal(places), rounding=ROUND_HALF_UP)
+        
+        win_loss_ratio = (
+            Decimal(core.winning_trades) / Decimal(core.losing_trades)
+            if core.losing_trades else Decimal('99999')
+        )
+        
+        return PerformanceMetrics(
+            period_start=start_date,
+            period_end=end_date,
+            total_trades=core.total_trades,
+            net_roi_percent=quantize(core.net_roi_percent, '0.01'),
+            maximum_drawdown_percent=quantize(core.maximum_drawdown_percent, '0.01'),
+            sharpe_ratio=quantize(core.sharpe_ratio, '0.001'),
+            win_loss_ratio=quantize(win_loss_ratio, '0.01'),
+            total_volume_usd=quantize(core.total_volume_usd, '0.01'),
+            total_fees_usd=quantize(core.total_fees_usd, '0.01'),
+            total_profit_usd=quantize(core.total_profit_usd, '0.01'),
+            winning_trades=core.winning_trades,
+            losing_trades=core.losing_trades,
+            average_trade_size_usd=quantize(core.average_trade_size_usd, '0.01'),
+            largest_win_usd=quantize(core.largest_win_usd, '0.01'),
+            largest_loss_usd=quantize(core.largest_loss_usd, '0.01'),
+            average_holding_period_hours=quantize(core.average_holding_period_hours, '0.1')
+        )
+    
     def _calculate_maximum_drawdown(self, trades: List[TradeRecord]) -> Decimal:
         """
         Calculate maximum drawdown as peak-to-trough decline
@@ -444,8 +867,10 @@ class PerformanceCalculator:
     
     async def calculate_batch_metrics(
         self,
-        wallet_trades: Dict[str, List[RaydiumSwap]],
-        end_date: Optional[datetime] = None
+        wallet_trades: Dict[str, List[SwapData]],
+        end_date: Optional[datetime] = None,
+        engine: Optional[MetricsEngine] = None,
+        valuation_cache: Optional[TradeValuationCache] = None
     ) -> Dict[str, Optional[PerformanceMetrics]]:
         """
         Calculate performance metrics for multiple wallets efficiently
@@ -453,6 +878,8 @@ class PerformanceCalculator:
         Args:
             wallet_trades: Dict mapping wallet addresses to their trades
             end_date: End date for calculation period
+            engine: Metrics backend (defaults to settings.metrics_engine)
+            valuation_cache: Per-run trade valuation cache shared with other stages
             
         Returns:
             Dict mapping wallet addresses to their performance metrics
@@ -468,11 +895,11 @@ class PerformanceCalculator:
         # Process wallets with controlled concurrency
         semaphore = asyncio.Semaphore(3)  # Max 3 concurrent calculations
         
-        async def calculate_wallet_metrics(wallet_address: str, trades: List[RaydiumSwap]):
+        async def calculate_wallet_metrics(wallet_address: str, trades: List[SwapData]):
             async with semaphore:
                 try:
                     metrics = await self.calculate_performance_metrics(
-                        wallet_address, trades, end_date
+                        wallet_address, trades, end_date, engine, valuation_cache
                     )
                     return wallet_address, metrics
                 except Exception as e:
@@ -484,13 +911,19 @@ class PerformanceCalculator:
                     )
                     return wallet_address, None
         
-        # Execute all calculations
-        tasks = [
-            calculate_wallet_metrics(wallet, trades)
-            for wallet, trades in wallet_trades.items()
-        ]
-        
-        batch_results = await asyncio.gather(*tasks, return_exceptions=True)
+        engine = self._resolve_engine(engine)
+        if self._use_process_pool(engine, len(wallet_trades)):
+            batch_results = await self._calculate_batch_metrics_parallel(
+                wallet_trades, end_date, engine, valuation_cache
+            )
+        else:
+            # Execute all calculations
+            tasks = [
+                calculate_wallet_metrics(wallet, trades)
+                for wallet, trades in wallet_trades.items()
+            ]
+            
+            batch_results = await asyncio.gather(*tasks, return_exceptions=True)
         
         # Process results
         successful_calculations = 0
@@ -513,6 +946,181 @@ class PerformanceCalculator:
         )
         
         return results
+    
+    def _use_process_pool(self, engine: MetricsEngine, wallet_count: int) -> bool:
+        """Shard across processes only when enabled and the batch is large enough to pay off"""
+        return (
+            self.process_workers > 1
+            and not self._process_pool_failed
+            and engine != MetricsEngine.INCREMENTAL  # Rolling state lives in this process
+            and wallet_count >= self.process_min_wallets
+            # Daemonic processes (e.g. pool workers themselves) cannot start children
+            and not multiprocessing.current_process().daemon
+        )
+    
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        """Create the metrics process pool on first use"""
+        if self._process_pool is None:
+            # Spawned workers do not inherit the event loop, locks or open sockets of this process
+            self._process_pool = ProcessPoolExecutor(
+                max_workers=self.process_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+            logger.info("Started metrics process pool", workers=self.process_workers)
+        return self._process_pool
+    
+    async def _calculate_batch_metrics_parallel(
+        self,
+        wallet_trades: Dict[str, List[SwapData]],
+        end_date: Optional[datetime],
+        engine: MetricsEngine,
+        valuation_cache: Optional[TradeValuationCache] = None
+    ) -> List[Tuple[str, Optional[PerformanceMetrics]]]:
+        """
+        Value trades in this process, then compute core metrics on the process pool
+        
+        USD valuation is I/O-bound and stays on the event loop (one deduplicated price
+        pass across all wallets). The CPU-bound metric work is sharded round-robin
+        across workers, which receive only the TradeValues they need.
+        
+        Args:
+            wallet_trades: Dict mapping wallet addresses to their trades
+            end_date: End date for calculation period (defaults to now)
+            engine: Resolved DECIMAL or VECTORIZED engine
+            valuation_cache: Per-run trade valuation cache shared with other stages
+            
+        Returns:
+            List of (wallet_address, metrics) pairs for every wallet
+        """
+        if not end_date:
+            end_date = datetime.now(timezone.utc)
+        start_date = end_date - timedelta(days=self.rolling_period_days)
+        
+        period_trades = {
+            wallet_address: [trade for trade in trades if start_date <= trade.block_time <= end_date]
+            for wallet_address, trades in wallet_trades.items()
+        }
+        trade_records = await self.calculate_trade_usd_values_batch(
+            [trade for trades in period_trades.values() for trade in trades],
+            valuation_cache
+        )
+        
+        # Split the valued records back per wallet
+        wallet_values: List[Tuple[str, List[TradeValues]]] = []
+        offset = 0
+        for wallet_address, trades in period_trades.items():
+            values = [
+                TradeValues(record.timestamp, record.token_in_usd, record.fee_usd, record.net_profit_usd)
+                for record in trade_records[offset:offset + len(trades)]
+                if record
+            ]
+            offset += len(trades)
+            if values:
+                wallet_values.append((wallet_address, values))
+        
+        results: Dict[str, Optional[PerformanceMetrics]] = {wallet: None for wallet in wallet_trades}
+        if not wallet_values:
+            return list(results.items())
+        
+        # Several shards per worker keep cores busy when wallet sizes are uneven
+        shard_count = min(len(wallet_values), self.process_workers * 4)
+        shards = [wallet_values[index::shard_count] for index in range(shard_count)]
+        
+        logger.info(
+            "Dispatching metrics shards to process pool",
+            wallets=len(wallet_values),
+            shards=shard_count,
+            workers=self.process_workers,
+            engine=engine.value
+        )
+        
+        loop = asyncio.get_running_loop()
+        try:
+            pool = self._get_process_pool()
+            shard_results = await asyncio.gather(*[
+                loop.run_in_executor(pool, _calculate_metrics_shard, shard, start_date, end_date, engine.value)
+                for shard in shards
+            ], return_exceptions=True)
+        except (BrokenProcessPool, OSError, RuntimeError, AssertionError) as e:
+            # The pool could not even be started or accept work
+            shard_results = [e] * len(shards)
+        
+        pool_broken = False
+        for shard, shard_result in zip(shards, shard_results):
+            if isinstance(shard_result, Exception):
+                pool_broken = pool_broken or isinstance(
+                    shard_result, (BrokenProcessPool, OSError, RuntimeError, AssertionError)
+                )
+                logger.error(
+                    "Metrics shard failed, calculating in-process",
+                    wallets=len(shard),
+                    error=str(shard_result),
+                    error_type=type(shard_result).__name__
+                )
+                shard_result = await self._calculate_shard_metrics(shard, start_date, end_date, engine)
+            results.update(shard_result)
+        
+        if pool_broken:
+            # Metrics must not depend on the pool: stay in-process for good
+            self._process_pool_failed = True
+            logger.error("Metrics process pool unavailable, calculating in-process")
+            self.shutdown_process_pool()
+        
+        return list(results.items())
+    
+    async def _calculate_shard_metrics(
+        self,
+        shard: List[Tuple[str, List[TradeValues]]],
+        start_date: datetime,
+        end_date: datetime,
+        engine: MetricsEngine
+    ) -> List[Tuple[str, Optional[PerformanceMetrics]]]:
+        """Core metrics for a shard of pre-valued wallets (runs inside a pool worker)"""
+        results = []
+        for wallet_address, trade_values in shard:
+            try:
+                if engine == MetricsEngine.VECTORIZED:
+                    metrics = self._calculate_core_metrics_vectorized(trade_values, start_date, end_date)
+                else:
+                    metrics = await self._calculate_core_metrics(trade_values, start_date, end_date)
+            except Exception as e:
+                logger.error(
+                    "Failed to calculate metrics for wallet",
+                    wallet=wallet_address,
+                    error=str(e),
+                    error_type=type(e).__name__
+                )
+                metrics = None
+            results.append((wallet_address, metrics))
+        return results
+    
+    def shutdown_process_pool(self):
+        """Stop metrics process pool workers"""
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=True, cancel_futures=True)
+            self._process_pool = None
+            logger.info("Stopped metrics process pool")
+
+
+# Calculator reused by every shard a process-pool worker handles
+_worker_calculator: Optional[PerformanceCalculator] = None
+
+
+def _calculate_metrics_shard(
+    shard: List[Tuple[str, List[TradeValues]]],
+    start_date: datetime,
+    end_date: datetime,
+    engine_value: str
+) -> List[Tuple[str, Optional[PerformanceMetrics]]]:
+    """Process-pool entry point for _calculate_batch_metrics_parallel"""
+    global _worker_calculator
+    
+    if _worker_calculator is None:
+        _worker_calculator = PerformanceCalculator()
+    
+    return asyncio.run(
+        _worker_calculator._calculate_shard_metrics(shard, start_date, end_date, MetricsEngine(engine_value))
+    )
 
 
 # Global calculator instance
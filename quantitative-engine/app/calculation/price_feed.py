@@ -14,6 +14,7 @@ import time
 from ..core.config import get_settings, get_supported_token_mints, get_token_mint
 from ..core.logging import get_calculation_logger
 from ..core.retry import retry_with_backoff, RetrySession, RateLimitError, TransientError
+from .price_store import PriceSeriesStore
 
 # Set high precision for all decimal calculations
 getcontext().prec = 28
@@ -21,6 +22,27 @@ getcontext().prec = 28
 settings = get_settings()
 logger = get_calculation_logger()
 
+# Map token symbols to CoinGecko IDs
+COINGECKO_IDS = {
+    'SOL': 'solana',
+    'USDC': 'usd-coin',
+    'USDT': 'tether',
+    'RAY': 'raydium',
+    'BONK': 'bonk',
+    'JUP': 'jupiter-exchange-solana'
+}
+
+
+def price_cache_key(mint: str, timestamp: datetime) -> str:
+    """
+    Key identifying one (mint, minute) price lookup
+    
+    Used for the price cache and as the result key of get_multiple_historical_prices.
+    """
+    # Round timestamp to nearest minute for caching efficiency
+    rounded_timestamp = timestamp.replace(second=0, microsecond=0)
+    return f"{mint}_{rounded_timestamp.isoformat()}"
+
 
 @dataclass
 class PricePoint:
@@ -50,8 +72,18 @@ class HistoricalPriceFeed:
         
         # Price caching to reduce API calls
         self.price_cache: Dict[str, PricePoint] = {}  # key: "mint_timestamp"
+        self.price_cache_times: Dict[str, float] = {}  # key: "mint_timestamp" -> time cached
         self.cache_ttl_seconds = 3600  # 1 hour cache for historical prices
         
+        # Persistent per-mint price series filled by range fetches
+        self.price_store = PriceSeriesStore(
+            settings.price_store_dir,
+            max_gap_seconds=settings.price_store_max_gap_seconds
+        )
+        self.range_window_seconds = settings.price_store_range_days * 86400
+        self._range_locks: Dict[Tuple[str, int], asyncio.Lock] = {}
+        self._range_lock_users: Dict[Tuple[str, int], int] = {}  # Coroutines holding or awaiting each lock
+        
         # Rate limiting
         self.last_request_times: Dict[str, float] = {}  # source -> last_request_time
         self.rate_limits = {
@@ -70,7 +102,8 @@ class HistoricalPriceFeed:
         logger.info(
             "Initialized historical price feed",
             supported_tokens=list(self.supported_tokens.keys()),
-            cache_ttl_hours=self.cache_ttl_seconds / 3600
+            cache_ttl_hours=self.cache_ttl_seconds / 3600,
+            range_window_days=settings.price_store_range_days
         )
     
     async def close(self):
@@ -79,14 +112,14 @@ class HistoricalPriceFeed:
     
     def _get_cache_key(self, mint: str, timestamp: datetime) -> str:
         """Generate cache key for price data"""
-        # Round timestamp to nearest minute for caching efficiency
-        rounded_timestamp = timestamp.replace(second=0, microsecond=0)
-        return f"{mint}_{rounded_timestamp.isoformat()}"
+        return price_cache_key(mint, timestamp)
     
-    def _is_cache_valid(self, price_point: PricePoint) -> bool:
-        """Check if cached price point is still valid"""
-        age_seconds = (datetime.now(timezone.utc) - price_point.timestamp).total_seconds()
-        return age_seconds < self.cache_ttl_seconds
+    def _is_cache_valid(self, cache_key: str) -> bool:
+        """Check if cached price point is still valid (age measured from when it was cached)"""
+        cached_at = self.price_cache_times.get(cache_key)
+        if cached_at is None:
+            return False
+        return time.time() - cached_at < self.cache_ttl_seconds
     
     async def _rate_limit_wait(self, source: str):
         """Implement rate limiting for API sources"""
@@ -118,17 +151,7 @@ class HistoricalPriceFeed:
         """
         await self._rate_limit_wait('coingecko')
         
-        # Map token symbols to CoinGecko IDs
-        coingecko_ids = {
-            'SOL': 'solana',
-            'USDC': 'usd-coin',
-            'USDT': 'tether',
-            'RAY': 'raydium',
-            'BONK': 'bonk',
-            'JUP': 'jupiter-exchange-solana'
-        }
-        
-        coingecko_id = coingecko_ids.get(symbol.upper())
+        coingecko_id = COINGECKO_IDS.get(symbol.upper())
         if not coingecko_id:
             logger.warning(f"No CoinGecko ID mapping for symbol: {symbol}")
             return None
@@ -195,6 +218,205 @@ class HistoricalPriceFeed:
             )
             return None
     
+    @retry_with_backoff(max_attempts=3, base_delay=1.0)
+    async def _fetch_coingecko_range(
+        self,
+        symbol: str,
+        start: datetime,
+        end: datetime
+    ) -> Optional[List[Tuple[int, Decimal]]]:
+        """
+        Fetch a full price series for a time range from CoinGecko
+        
+        One request covers the whole range; CoinGecko returns hourly points
+        for ranges between 1 and 90 days.
+        
+        Args:
+            symbol: Token symbol (e.g., 'SOL')
+            start: Range start
+            end: Range end
+            
+        Returns:
+            List of (unix_seconds, price_usd) pairs, or None if the fetch failed
+        """
+        await self._rate_limit_wait('coingecko')
+        
+        coingecko_id = COINGECKO_IDS.get(symbol.upper())
+        if not coingecko_id:
+            logger.warning(f"No CoinGecko ID mapping for symbol: {symbol}")
+            return None
+        
+        url = f"https://api.coingecko.com/api/v3/coins/{coingecko_id}/market_chart/range"
+        params = {
+            'vs_currency': 'usd',
+            'from': int(start.timestamp()),
+            'to': int(end.timestamp())
+        }
+        
+        # Add API key if available
+        if settings.coingecko_api_key:
+            headers = {'X-CG-Demo-API-Key': settings.coingecko_api_key}
+        else:
+            headers = {}
+        
+        try:
+            logger.debug(
+                "Fetching CoinGecko price range",
+                symbol=symbol,
+                coingecko_id=coingecko_id,
+                start=start.isoformat(),
+                end=end.isoformat()
+            )
+            
+            response = await self.client.get(url, params=params, headers=headers)
+            
+            if response.status_code == 429:
+                raise RateLimitError("CoinGecko rate limit exceeded")
+            elif response.status_code >= 400:
+                raise TransientError(f"CoinGecko API error: {response.status_code}")
+            
+            data = response.json()
+            
+            points = [
+                (int(timestamp_ms) // 1000, Decimal(str(price)))
+                for timestamp_ms, price in data.get('prices', [])
+                if price is not None
+            ]
+            
+            logger.debug(
+                "Retrieved CoinGecko price range",
+                symbol=symbol,
+                points=len(points)
+            )
+            return points
+            
+        except httpx.RequestError as e:
+            raise TransientError(f"CoinGecko request failed: {str(e)}")
+        except (RateLimitError, TransientError):
+            raise
+        except Exception as e:
+            logger.error(
+                "CoinGecko price range fetch error",
+                symbol=symbol,
+                error=str(e),
+                error_type=type(e).__name__
+            )
+            return None
+    
+    def _range_window(self, timestamp: datetime) -> Tuple[int, datetime, datetime]:
+        """
+        Fixed, aligned range window containing a timestamp
+        
+        Windows are aligned to multiples of price_store_range_days so that every
+        lookup in the same window shares one range load. The current window keeps
+        its nominal end; _get_range_price fetches only the part that has passed.
+        
+        Returns:
+            Tuple of (window_index, window_start, window_end)
+        """
+        unix_ts = int(timestamp.timestamp())
+        window_index = unix_ts // self.range_window_seconds
+        window_start = datetime.fromtimestamp(window_index * self.range_window_seconds, tz=timezone.utc)
+        window_end = datetime.fromtimestamp((window_index + 1) * self.range_window_seconds, tz=timezone.utc)
+        return window_index, window_start, window_end
+    
+    async def _get_range_price(
+        self,
+        mint: str,
+        symbol: str,
+        timestamp: datetime
+    ) -> Optional[Decimal]:
+        """
+        Resolve a price from the persistent series store, loading its range window on a miss
+        
+        Concurrent lookups in the same (mint, window) wait on a single range load,
+        whose lock is dropped once nobody waits for it. Only the part of the window not stored yet is fetched, so a miss in the
+        current window loads just the tail since the previous load.
+        
+        Args:
+            mint: Token mint address
+            symbol: Token symbol
+            timestamp: Target timestamp
+            
+        Returns:
+            Interpolated price in USD, or None if the range has no usable data
+        """
+        if not self.price_store.is_loaded(mint):
+            # The first lookup of a mint reads its series file: keep that off the event loop
+            await asyncio.to_thread(self.price_store.load, mint)
+        
+        price = self.price_store.lookup(mint, timestamp)
+        if price is not None:
+            return price
+        
+        if symbol.upper() not in COINGECKO_IDS:
+            return None
+        
+        window_index, window_start, window_end = self._range_window(timestamp)
+        key = (mint, window_index)
+        lock = self._range_locks.setdefault(key, asyncio.Lock())
+        self._range_lock_users[key] = self._range_lock_users.get(key, 0) + 1
+        
+        try:
+            async with lock:
+                return await self._load_range_window(mint, symbol, timestamp, window_start, window_end)
+        finally:
+            # Drop the window's lock once no coroutine holds or waits for it
+            self._range_lock_users[key] -= 1
+            if not self._range_lock_users[key]:
+                del self._range_lock_users[key]
+                del self._range_locks[key]
+    
+    async def _load_range_window(
+        self,
+        mint: str,
+        symbol: str,
+        timestamp: datetime,
+        window_start: datetime,
+        window_end: datetime
+    ) -> Optional[Decimal]:
+        """Load the missing tail of a range window and look the timestamp up (window lock held)"""
+        # Another coroutine may have loaded this window while we waited
+        if self.price_store.is_covered(mint, timestamp):
+            return self.price_store.lookup(mint, timestamp)
+        
+        # Stored ranges always start at the window start, so what is missing is the tail
+        fetch_start = self.price_store.covered_until(mint, window_start) or window_start
+        fetch_end = min(window_end, datetime.now(timezone.utc))
+        if timestamp > fetch_end or fetch_start >= fetch_end:
+            return None
+        
+        try:
+            points = await self.retry_session.execute_with_retry(
+                self._fetch_coingecko_range,
+                symbol,
+                fetch_start,
+                fetch_end
+            )
+        except Exception as e:
+            logger.warning(
+                "CoinGecko price range load failed",
+                symbol=symbol,
+                error=str(e)
+            )
+            return None
+        
+        if points is None:
+            return None
+        
+        # Merging and rewriting the mint's series file grows with the series: run it in a thread
+        await asyncio.to_thread(self.price_store.add_range, mint, fetch_start, fetch_end, points)
+        logger.info(
+            "Loaded price range into store",
+            mint=mint,
+            symbol=symbol,
+            range_start=fetch_start.isoformat(),
+            range_end=fetch_end.isoformat(),
+            points=len(points)
+        )
+        
+        return self.price_store.lookup(mint, timestamp)
+    
     @retry_with_backoff(max_attempts=2, base_delay=0.5)
     async def _fetch_jupiter_current_price(self, mint: str) -> Optional[Decimal]:
         """
@@ -265,7 +487,7 @@ class HistoricalPriceFeed:
         cache_key = self._get_cache_key(mint, timestamp)
         if cache_key in self.price_cache:
             cached_price = self.price_cache[cache_key]
-            if self._is_cache_valid(cached_price):
+            if self._is_cache_valid(cache_key):
                 logger.debug("Price cache hit", mint=mint, timestamp=timestamp.isoformat())
                 return cached_price
         
@@ -303,36 +525,55 @@ class HistoricalPriceFeed:
             logger.debug("Using stablecoin price", symbol=symbol)
         
         else:
-            # Try CoinGecko for historical data (primary source)
-            try:
-                coingecko_price = await self.retry_session.execute_with_retry(
-                    self._fetch_coingecko_price,
-                    symbol,
-                    timestamp
+            # Try the range-loaded series store first (one request per mint per window)
+            range_price = await self._get_range_price(mint, symbol, timestamp)
+            if range_price is not None:
+                price_point = PricePoint(
+                    timestamp=timestamp,
+                    mint=mint,
+                    symbol=symbol,
+                    price_usd=range_price,
+                    source='coingecko_range',
+                    confidence=0.95
                 )
-                
-                if coingecko_price is not None:
-                    price_point = PricePoint(
-                        timestamp=timestamp,
-                        mint=mint,
-                        symbol=symbol,
-                        price_usd=coingecko_price,
-                        source='coingecko',
-                        confidence=0.95
+                logger.debug(
+                    "Resolved historical price from series store",
+                    symbol=symbol,
+                    price_usd=str(range_price),
+                    timestamp=timestamp.isoformat()
+                )
+            
+            # Fall back to CoinGecko point-in-time history
+            if price_point is None:
+                try:
+                    coingecko_price = await self.retry_session.execute_with_retry(
+                        self._fetch_coingecko_price,
+                        symbol,
+                        timestamp
                     )
-                    logger.info(
-                        "Retrieved historical price from CoinGecko",
+                    
+                    if coingecko_price is not None:
+                        price_point = PricePoint(
+                            timestamp=timestamp,
+                            mint=mint,
+                            symbol=symbol,
+                            price_usd=coingecko_price,
+                            source='coingecko',
+                            confidence=0.95
+                        )
+                        logger.info(
+                            "Retrieved historical price from CoinGecko",
+                            symbol=symbol,
+                            price_usd=str(coingecko_price),
+                            timestamp=timestamp.isoformat()
+                        )
+                    
+                except Exception as e:
+                    logger.warning(
+                        "CoinGecko historical price failed",
                         symbol=symbol,
-                        price_usd=str(coingecko_price),
-                        timestamp=timestamp.isoformat()
+                        error=str(e)
                     )
-                
-            except Exception as e:
-                logger.warning(
-                    "CoinGecko historical price failed",
-                    symbol=symbol,
-                    error=str(e)
-                )
             
             # Fallback to Jupiter for recent data (last 24 hours)
             if price_point is None:
@@ -370,6 +611,7 @@ class HistoricalPriceFeed:
         # Cache the result if we got one
         if price_point:
             self.price_cache[cache_key] = price_point
+            self.price_cache_times[cache_key] = time.time()
             
             # Clean old cache entries periodically
             if len(self.price_cache) > 1000:
@@ -452,15 +694,15 @@ class HistoricalPriceFeed:
     
     async def _clean_price_cache(self):
         """Clean expired entries from price cache"""
-        current_time = datetime.now(timezone.utc)
         expired_keys = []
         
-        for cache_key, price_point in self.price_cache.items():
-            if not self._is_cache_valid(price_point):
+        for cache_key in self.price_cache:
+            if not self._is_cache_valid(cache_key):
                 expired_keys.append(cache_key)
         
         for key in expired_keys:
             del self.price_cache[key]
+            self.price_cache_times.pop(key, None)
         
         logger.debug(
             "Cleaned price cache",
@@ -471,8 +713,8 @@ class HistoricalPriceFeed:
     async def get_price_statistics(self) -> Dict[str, any]:
         """Get statistics about price feed usage"""
         valid_cache_entries = sum(
-            1 for price in self.price_cache.values() 
-            if self._is_cache_valid(price)
+            1 for cache_key in self.price_cache
+            if self._is_cache_valid(cache_key)
         )
         
         return {
@@ -481,7 +723,8 @@ class HistoricalPriceFeed:
             "cache_hit_rate": "calculated_per_request",
             "supported_tokens": list(self.supported_tokens.keys()),
             "rate_limits": self.rate_limits,
-            "last_request_times": self.last_request_times
+            "last_request_times": self.last_request_times,
+            "price_store": self.price_store.get_statistics()
         }
 
 
@@ -0,0 +1,315 @@
+"""
+XORJ Quantitative Engine - Historical Price Series Store
+Persistent per-mint price series filled by range fetches and queried by binary search
+"""
+
+import json
+import os
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone
+from decimal import Decimal, getcontext
+from typing import Dict, List, Optional, Tuple
+
+from ..core.logging import get_calculation_logger
+
+# Set high precision for all decimal calculations
+getcontext().prec = 28
+
+logger = get_calculation_logger()
+
+# A lookup outside any bracketing pair may snap to the nearest point within this distance
+DEFAULT_MAX_SNAP_SECONDS = 2 * 3600
+
+# Neighbouring points further apart than this are a hole in the series, not something to interpolate across
+DEFAULT_MAX_GAP_SECONDS = 6 * 3600
+
+
+class MintPriceSeries:
+    """Sorted price points for one mint plus the time ranges that have been fetched"""
+    
+    def __init__(self):
+        self.timestamps: List[int] = []          # Unix seconds, ascending
+        self.prices: List[Decimal] = []          # USD price at the matching timestamp
+        self.coverage: List[Tuple[int, int]] = []  # Merged, sorted [start, end] ranges already fetched
+    
+    def is_covered(self, timestamp: int) -> bool:
+        """Check if a timestamp falls inside a fetched range"""
+        return self.covered_until(timestamp) is not None
+    
+    def covered_until(self, timestamp: int) -> Optional[int]:
+        """End of the fetched range containing a timestamp (None if it is not covered)"""
+        index = bisect_right(self.coverage, (timestamp, float('inf'))) - 1
+        if index >= 0 and self.coverage[index][0] <= timestamp <= self.coverage[index][1]:
+            return self.coverage[index][1]
+        return None
+    
+    def add_points(self, points: List[Tuple[int, Decimal]]):
+        """Merge new points, replacing any existing values at identical timestamps"""
+        merged = dict(zip(self.timestamps, self.prices))
+        merged.update(points)
+        ordered = sorted(merged.items())
+        self.timestamps = [ts for ts, _ in ordered]
+        self.prices = [price for _, price in ordered]
+    
+    def add_coverage(self, start: int, end: int):
+        """Record a fetched range, merging overlapping or adjacent ranges"""
+        ranges = sorted(self.coverage + [(start, end)])
+        merged: List[Tuple[int, int]] = []
+        for range_start, range_end in ranges:
+            if merged and range_start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], range_end))
+            else:
+                merged.append((range_start, range_end))
+        self.coverage = merged
+    
+    def lookup(
+        self,
+        timestamp: int,
+        max_snap_seconds: int,
+        max_gap_seconds: Optional[int] = None
+    ) -> Optional[Decimal]:
+        """
+        Price at timestamp by binary search and linear interpolation
+        
+        Args:
+            timestamp: Target Unix timestamp in seconds
+            max_snap_seconds: Maximum distance to the nearest point when not bracketed
+            max_gap_seconds: Maximum distance between the bracketing points (None = no limit)
+        
+        Returns:
+            Interpolated price, or None if no usable points surround the timestamp
+        """
+        if not self.timestamps:
+            return None
+        
+        index = bisect_left(self.timestamps, timestamp)
+        
+        # Exact hit
+        if index < len(self.timestamps) and self.timestamps[index] == timestamp:
+            return self.prices[index]
+        
+        # Bracketed: interpolate between neighbours
+        if 0 < index < len(self.timestamps):
+            t0, t1 = self.timestamps[index - 1], self.timestamps[index]
+            if max_gap_seconds is not None and t1 - t0 > max_gap_seconds:
+                # Inside a hole in the source data: only a point close to either side is usable
+                if timestamp - t0 <= max_snap_seconds:
+                    return self.prices[index - 1]
+                if t1 - timestamp <= max_snap_seconds:
+                    return self.prices[index]
+                return None
+            p0, p1 = self.prices[index - 1], self.prices[index]
+            weight = Decimal(timestamp - t0) / Decimal(t1 - t0)
+            return p0 + (p1 - p0) * weight
+        
+        # Before the first or after the last point: snap to the edge if close enough
+        edge = 0 if index == 0 else len(self.timestamps) - 1
+        if abs(self.timestamps[edge] - timestamp) <= max_snap_seconds:
+            return self.prices[edge]
+        
+        return None
+    
+    def to_dict(self) -> Dict:
+        """Serialize for on-disk persistence (prices as strings to keep precision)"""
+        return {
+            "points": [[ts, str(price)] for ts, price in zip(self.timestamps, self.prices)],
+            "coverage": [[start, end] for start, end in self.coverage]
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> "MintPriceSeries":
+        """Restore a series persisted with to_dict"""
+        series = cls()
+        series.timestamps = [int(ts) for ts, _ in data.get("points", [])]
+        series.prices = [Decimal(price) for _, price in data.get("points", [])]
+        series.coverage = [(int(start), int(end)) for start, end in data.get("coverage", [])]
+        return series
+
+
+class PriceSeriesStore:
+    """
+    Persistent per-mint historical price store
+    
+    Each mint's series is loaded lazily from `<storage_dir>/<mint>.json` and rewritten
+    atomically after every range load. Historical prices never change once recorded,
+    so stored ranges have no TTL. An empty storage_dir keeps the store in memory only.
+    
+    Lookups hold the store lock only for in-memory work; file reads and writes run
+    outside it, so async callers can run load() and add_range() in a thread while
+    lookups continue on the event loop.
+    """
+    
+    def __init__(
+        self,
+        storage_dir: Optional[str] = None,
+        max_snap_seconds: int = DEFAULT_MAX_SNAP_SECONDS,
+        max_gap_seconds: int = DEFAULT_MAX_GAP_SECONDS
+    ):
+        self.storage_dir = storage_dir or None
+        self.max_snap_seconds = max_snap_seconds
+        self.max_gap_seconds = max_gap_seconds
+        self._series: Dict[str, MintPriceSeries] = {}
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()  # Serializes file writes; never held with I/O under _lock
+        
+        # Usage statistics
+        self.hits = 0
+        self.misses = 0
+        self.range_loads = 0
+        
+        if self.storage_dir:
+            os.makedirs(self.storage_dir, exist_ok=True)
+        
+        logger.info(
+            "Initialized price series store",
+            storage_dir=self.storage_dir or "memory",
+            max_snap_seconds=self.max_snap_seconds,
+            max_gap_seconds=self.max_gap_seconds
+        )
+    
+    def _series_path(self, mint: str) -> str:
+        return os.path.join(self.storage_dir, f"{mint}.json")
+    
+    def is_loaded(self, mint: str) -> bool:
+        """Check if a mint's series is in memory (lookups on it do no file I/O)"""
+        return mint in self._series
+    
+    def load(self, mint: str):
+        """Read a mint's series from disk ahead of its first lookup (blocking)"""
+        if self.is_loaded(mint):
+            return
+        series = self._read_series(mint)
+        with self._lock:
+            self._series.setdefault(mint, series)
+    
+    def _read_series(self, mint: str) -> MintPriceSeries:
+        """Read a mint's persisted series (empty if there is none or it is unreadable)"""
+        if not self.storage_dir or not os.path.exists(self._series_path(mint)):
+            return MintPriceSeries()
+        try:
+            with open(self._series_path(mint), "r") as f:
+                return MintPriceSeries.from_dict(json.load(f))
+        except (OSError, ValueError) as e:
+            logger.warning("Failed to load price series, starting empty", mint=mint, error=str(e))
+            return MintPriceSeries()
+    
+    def _get_series(self, mint: str) -> MintPriceSeries:
+        """Get a mint's series, reading it from disk if load() was not called first"""
+        series = self._series.get(mint)
+        if series is None:
+            series = self._series[mint] = self._read_series(mint)
+        return series
+    
+    def _persist(self, mint: str):
+        """Write a snapshot of a mint's series atomically, outside the store lock"""
+        if not self.storage_dir:
+            return
+        
+        path = self._series_path(mint)
+        tmp_path = f"{path}.tmp"
+        with self._write_lock:
+            # Snapshots are taken in write order, so a later write never loses to an older one
+            with self._lock:
+                data = self._series[mint].to_dict()
+            try:
+                with open(tmp_path, "w") as f:
+                    json.dump(data, f, separators=(",", ":"))
+                os.replace(tmp_path, path)
+            except OSError as e:
+                logger.error("Failed to persist price series", mint=mint, error=str(e))
+    
+    def is_covered(self, mint: str, timestamp: datetime) -> bool:
+        """Check if a range load already covers this mint at this time"""
+        with self._lock:
+            return self._get_series(mint).is_covered(_to_unix(timestamp))
+    
+    def covered_until(self, mint: str, timestamp: datetime) -> Optional[datetime]:
+        """End of the stored range containing this mint at this time (None if not covered)"""
+        with self._lock:
+            end = self._get_series(mint).covered_until(_to_unix(timestamp))
+        return datetime.fromtimestamp(end, tz=timezone.utc) if end is not None else None
+    
+    def lookup(self, mint: str, timestamp: datetime) -> Optional[Decimal]:
+        """
+        Look up a price from stored ranges
+        
+        Args:
+            mint: Token mint address
+            timestamp: Target timestamp
+        
+        Returns:
+            Price in USD, or None if the timestamp is not covered by a stored range
+            or falls in a hole longer than max_gap_seconds
+        """
+        unix_ts = _to_unix(timestamp)
+        with self._lock:
+            series = self._get_series(mint)
+            price = (
+                series.lookup(unix_ts, self.max_snap_seconds, self.max_gap_seconds)
+                if series.is_covered(unix_ts) else None
+            )
+        
+        if price is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return price
+    
+    def add_range(
+        self,
+        mint: str,
+        start: datetime,
+        end: datetime,
+        points: List[Tuple[int, Decimal]]
+    ):
+        """
+        Record the result of a range fetch
+        
+        Rewrites the mint's file, so async callers should run it in a thread
+        (asyncio.to_thread) to keep the event loop free.
+        
+        Args:
+            mint: Token mint address
+            start: Start of the fetched range
+            end: End of the fetched range
+            points: (unix_seconds, price_usd) pairs returned by the source
+        """
+        with self._lock:
+            series = self._get_series(mint)
+            series.add_points(points)
+            series.add_coverage(_to_unix(start), _to_unix(end))
+            self.range_loads += 1
+        self._persist(mint)
+        
+        logger.debug(
+            "Stored price range",
+            mint=mint,
+            start=start.isoformat(),
+            end=end.isoformat(),
+            points=len(points)
+        )
+    
+    def get_statistics(self) -> Dict[str, any]:
+        """Get store usage statistics"""
+        with self._lock:
+            total_points = sum(len(series.timestamps) for series in self._series.values())
+            loaded_mints = len(self._series)
+        
+        lookups = self.hits + self.misses
+        return {
+            "storage_dir": self.storage_dir or "memory",
+            "loaded_mints": loaded_mints,
+            "total_points": total_points,
+            "range_loads": self.range_loads,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": f"{self.hits / lookups:.2%}" if lookups else "0%"
+        }
+
+
+def _to_unix(timestamp: datetime) -> int:
+    """Convert a datetime (naive values are treated as UTC) to Unix seconds"""
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return int(timestamp.timestamp())
@@ -0,0 +1,655 @@
+"""
+XORJ Quantitative Engine - Incremental Rolling-Window Metrics
+Persisted per-wallet running state that applies new trades and expires old ones instead of recomputing the window
+"""
+
+import asyncio
+import json
+import os
+import threading
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from decimal import Decimal, getcontext
+from typing import Deque, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from ..core.logging import get_calculation_logger
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    FCNTL_AVAILABLE = False
+
+# Set high precision for all decimal calculations
+getcontext().prec = 28
+
+logger = get_calculation_logger()
+
+MICROSECONDS_PER_HOUR = Decimal(3_600_000_000)
+
+
+class WindowEntry(NamedTuple):
+    """Compact record of one valued trade inside a wallet's window"""
+    timestamp_us: int        # Execution time, microseconds since epoch
+    signature: str
+    token_in_usd: Decimal
+    fee_usd: Decimal
+    net_profit_usd: Decimal
+    cumulative_usd: Decimal  # Cumulative profit of every trade ever applied, including this one
+
+
+class Extremes(NamedTuple):
+    """Associative summary of a run of consecutive window entries"""
+    cumulative_max: Decimal
+    cumulative_min: Decimal
+    drawdown: Decimal        # Largest earlier-peak-to-later-trough drop within the run
+    profit_max: Decimal
+    profit_min: Decimal
+
+
+def _leaf(entry: WindowEntry) -> Extremes:
+    return Extremes(
+        cumulative_max=entry.cumulative_usd,
+        cumulative_min=entry.cumulative_usd,
+        drawdown=Decimal('0'),
+        profit_max=entry.net_profit_usd,
+        profit_min=entry.net_profit_usd
+    )
+
+
+def _combine(older: Optional[Extremes], newer: Optional[Extremes]) -> Optional[Extremes]:
+    """Summary of two adjacent runs (order matters: drawdowns only run forward in time)"""
+    if older is None:
+        return newer
+    if newer is None:
+        return older
+    return Extremes(
+        cumulative_max=max(older.cumulative_max, newer.cumulative_max),
+        cumulative_min=min(older.cumulative_min, newer.cumulative_min),
+        drawdown=max(older.drawdown, newer.drawdown, older.cumulative_max - newer.cumulative_min),
+        profit_max=max(older.profit_max, newer.profit_max),
+        profit_min=min(older.profit_min, newer.profit_min)
+    )
+
+
+class SlidingExtremes:
+    """
+    Two-stack queue over window entries answering peak/trough/drawdown queries
+
+    Appends and expiries are amortized O(1): new entries go on the back stack with
+    a running summary, and expiries pop from the front stack, which is refilled
+    from the back stack (with suffix summaries) only when it runs empty.
+    """
+
+    def __init__(self):
+        self._front: List[Extremes] = []  # Top is the oldest entry; each item summarizes itself and everything newer in the front stack
+        self._back: List[WindowEntry] = []
+        self._back_summary: Optional[Extremes] = None
+
+    def append(self, entry: WindowEntry):
+        self._back.append(entry)
+        self._back_summary = _combine(self._back_summary, _leaf(entry))
+
+    def pop_oldest(self):
+        if not self._front:
+            summary = None
+            while self._back:
+                summary = _combine(_leaf(self._back.pop()), summary)
+                self._front.append(summary)
+            self._back_summary = None
+        self._front.pop()
+
+    def summary(self) -> Optional[Extremes]:
+        return _combine(self._front[-1] if self._front else None, self._back_summary)
+
+
+class RollingCoreMetrics(NamedTuple):
+    """Raw (unquantized) core metrics read from a wallet's rolling state"""
+    total_trades: int
+    winning_trades: int
+    losing_trades: int
+    total_volume_usd: Decimal
+    total_fees_usd: Decimal
+    total_profit_usd: Decimal
+    net_roi_percent: Decimal
+    maximum_drawdown_percent: Decimal
+    sharpe_ratio: Decimal
+    average_trade_size_usd: Decimal
+    largest_win_usd: Decimal
+    largest_loss_usd: Decimal
+    average_holding_period_hours: Decimal
+
+
+class RollingWindowState:
+    """
+    Running metrics state for one wallet's rolling window
+
+    Holds the window's valued trades in time order together with running totals,
+    win/loss counts and a Welford mean/variance of per-trade profit, so applying
+    or expiring a trade costs O(1) (amortized) regardless of window size.
+
+    Changes since the last save are tracked so the store can persist just those
+    (see RollingStateStore.save); operations that rewrite the window request a
+    full snapshot instead.
+    """
+
+    def __init__(self, wallet_address: str):
+        self.wallet_address = wallet_address
+        self.entries: Deque[WindowEntry] = deque()
+        self.unpriced: Deque[Tuple[int, str]] = deque()  # (timestamp_us, signature) of swaps that could not be valued yet
+        self.window_end_us: Optional[int] = None
+        self.sequence = 0  # Saves so far; orders journal records against the snapshot
+
+        # Running totals
+        self.total_volume_usd = Decimal('0')
+        self.total_fees_usd = Decimal('0')
+        self.cumulative_usd = Decimal('0')   # Profit of every trade ever applied
+        self.expired_profit_usd = Decimal('0')  # Profit of trades that left the window
+        self.winning_trades = 0
+        self.losing_trades = 0
+
+        # Welford running mean / sum of squared deviations of per-trade profit
+        self.profit_mean = Decimal('0')
+        self.profit_m2 = Decimal('0')
+
+        self._signatures = set()
+        self._unpriced_signatures: Set[str] = set()
+        self._extremes = SlidingExtremes()
+
+        # Unsaved changes
+        self.needs_snapshot = True  # Nothing on disk to append to yet
+        self._added: Deque[WindowEntry] = deque()
+        self._expired = 0
+        self._unpriced_added: List[Tuple[int, str]] = []
+        self._unpriced_removed: List[str] = []
+
+    @property
+    def newest_timestamp_us(self) -> Optional[int]:
+        return self.entries[-1].timestamp_us if self.entries else None
+
+    def has_seen(self, signature: str) -> bool:
+        """Check if a swap was already applied (or found unpriceable) in this window"""
+        return signature in self._signatures
+
+    def is_unpriced(self, signature: str) -> bool:
+        """Check if a swap in this window is waiting for a price"""
+        return signature in self._unpriced_signatures
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.needs_snapshot or self._added or self._expired or self._unpriced_added or self._unpriced_removed)
+
+    def can_advance_to(self, end_date: datetime) -> bool:
+        """Windows only slide forward; an earlier end date needs a rebuild"""
+        return self.window_end_us is None or to_unix_us(end_date) >= self.window_end_us
+
+    def apply(self, timestamp: datetime, signature: str, token_in_usd: Decimal, fee_usd: Decimal, net_profit_usd: Decimal):
+        """Add a valued trade at the new end of the window"""
+        self.cumulative_usd += net_profit_usd
+        entry = WindowEntry(to_unix_us(timestamp), signature, token_in_usd, fee_usd, net_profit_usd, self.cumulative_usd)
+        self._add(entry)
+
+    def mark_unpriced(self, timestamp: datetime, signature: str):
+        """Remember a swap that could not be valued; later runs retry it until it is priced or expires"""
+        if signature in self._unpriced_signatures:
+            return
+        item = (to_unix_us(timestamp), signature)
+        self.unpriced.append(item)
+        self._unpriced_signatures.add(signature)
+        self._signatures.add(signature)
+        self._unpriced_added.append(item)
+
+    def clear_unpriced(self, signatures: Iterable[str]):
+        """Forget unpriced swaps (now priced, or expired)"""
+        removed = {signature for signature in signatures if signature in self._unpriced_signatures}
+        if not removed:
+            return
+        self.unpriced = deque(item for item in self.unpriced if item[1] not in removed)
+        self._unpriced_signatures -= removed
+        self._signatures -= removed
+        self._unpriced_removed.extend(removed)
+
+    def insert(self, trades: Iterable[Tuple[datetime, str, Decimal, Decimal, Decimal]]):
+        """
+        Add valued trades that predate the newest applied one (late backfill, late price)
+
+        The window is replayed in time order from the entries already held, so no
+        trade is valued again; this costs O(window) and the next save is a snapshot.
+
+        Args:
+            trades: (timestamp, signature, token_in_usd, fee_usd, net_profit_usd) tuples
+        """
+        merged = sorted(
+            [(entry.timestamp_us, entry.signature, entry.token_in_usd, entry.fee_usd, entry.net_profit_usd)
+             for entry in self.entries] +
+            [(to_unix_us(timestamp), signature, token_in_usd, fee_usd, net_profit_usd)
+             for timestamp, signature, token_in_usd, fee_usd, net_profit_usd in trades],
+            key=lambda item: item[0]
+        )
+
+        self.entries = deque()
+        self._extremes = SlidingExtremes()
+        self._signatures = set(self._unpriced_signatures)
+        self.total_volume_usd = Decimal('0')
+        self.total_fees_usd = Decimal('0')
+        self.cumulative_usd = self.expired_profit_usd
+        self.winning_trades = 0
+        self.losing_trades = 0
+        self.profit_mean = Decimal('0')
+        self.profit_m2 = Decimal('0')
+
+        for timestamp_us, signature, token_in_usd, fee_usd, net_profit_usd in merged:
+            self.cumulative_usd += net_profit_usd
+            self._add(WindowEntry(timestamp_us, signature, token_in_usd, fee_usd, net_profit_usd, self.cumulative_usd))
+
+        self.needs_snapshot = True
+
+    def expire_before(self, start_date: datetime) -> int:
+        """
+        Drop trades that fell out of the window
+
+        Returns:
+            Number of valued trades expired
+        """
+        cutoff_us = to_unix_us(start_date)
+        expired = 0
+
+        while self.entries and self.entries[0].timestamp_us < cutoff_us:
+            entry = self.entries.popleft()
+            self._extremes.pop_oldest()
+            self._signatures.discard(entry.signature)
+            if self._added and self._added[0] is entry:
+                self._added.popleft()  # Never saved, so nothing to expire on disk
+            else:
+                self._expired += 1
+
+            self.total_volume_usd -= entry.token_in_usd
+            self.total_fees_usd -= entry.fee_usd
+            self.expired_profit_usd += entry.net_profit_usd
+            if entry.net_profit_usd > 0:
+                self.winning_trades -= 1
+            elif entry.net_profit_usd < 0:
+                self.losing_trades -= 1
+            self._welford_remove(entry.net_profit_usd)
+            expired += 1
+
+        self.clear_unpriced([signature for timestamp_us, signature in self.unpriced if timestamp_us < cutoff_us])
+
+        return expired
+
+    def core_metrics(self) -> Optional[RollingCoreMetrics]:
+        """
+        Read the core metrics of the current window
+
+        Definitions match PerformanceCalculator._calculate_core_metrics: ROI on traded
+        volume, drawdown relative to the window's final running peak, sample standard
+        deviation of per-trade profit for Sharpe.
+
+        Returns:
+            RollingCoreMetrics, or None if the window holds no valued trades
+        """
+        total_trades = len(self.entries)
+        if total_trades == 0:
+            return None
+
+        total_profit_usd = self.cumulative_usd - self.expired_profit_usd
+        extremes = self._extremes.summary()
+
+        # 1. Net ROI (%) on traded volume
+        net_roi_percent = (
+            total_profit_usd / self.total_volume_usd * 100
+            if self.total_volume_usd > 0 else Decimal('0')
+        )
+
+        # 2. Maximum Drawdown (%) against the window's running peak
+        peak = extremes.cumulative_max - self.expired_profit_usd
+        maximum_drawdown_percent = extremes.drawdown / peak * 100 if peak > 0 else Decimal('0')
+
+        # 3. Sharpe Ratio on per-trade profits (risk-free rate of 0)
+        sharpe_ratio = Decimal('0')
+        if total_trades >= 2:
+            std_dev = (self.profit_m2 / (total_trades - 1)).sqrt()
+            if std_dev > 0:
+                sharpe_ratio = self.profit_mean / std_dev
+
+        # Mean gap between consecutive trades telescopes to (last - first) / (n - 1)
+        if total_trades > 1:
+            span_us = self.entries[-1].timestamp_us - self.entries[0].timestamp_us
+            average_holding_period_hours = Decimal(span_us) / (total_trades - 1) / MICROSECONDS_PER_HOUR
+        else:
+            average_holding_period_hours = Decimal('0')
+
+        return RollingCoreMetrics(
+            total_trades=total_trades,
+            winning_trades=self.winning_trades,
+            losing_trades=self.losing_trades,
+            total_volume_usd=self.total_volume_usd,
+            total_fees_usd=self.total_fees_usd,
+            total_profit_usd=total_profit_usd,
+            net_roi_percent=net_roi_percent,
+            maximum_drawdown_percent=maximum_drawdown_percent,
+            sharpe_ratio=sharpe_ratio,
+            average_trade_size_usd=self.total_volume_usd / total_trades,
+            largest_win_usd=max(extremes.profit_max, Decimal('0')),
+            largest_loss_usd=min(extremes.profit_min, Decimal('0')),
+            average_holding_period_hours=average_holding_period_hours
+        )
+
+    def _add(self, entry: WindowEntry):
+        self.entries.append(entry)
+        self._extremes.append(entry)
+        self._signatures.add(entry.signature)
+        self._added.append(entry)
+
+        self.total_volume_usd += entry.token_in_usd
+        self.total_fees_usd += entry.fee_usd
+        if entry.net_profit_usd > 0:
+            self.winning_trades += 1
+        elif entry.net_profit_usd < 0:
+            self.losing_trades += 1
+        self._welford_add(entry.net_profit_usd)
+
+    def _welford_add(self, value: Decimal):
+        count = len(self.entries)
+        delta = value - self.profit_mean
+        self.profit_mean += delta / count
+        self.profit_m2 += delta * (value - self.profit_mean)
+
+    def _welford_remove(self, value: Decimal):
+        count = len(self.entries)  # Entry already removed
+        if count == 0:
+            self.profit_mean = Decimal('0')
+            self.profit_m2 = Decimal('0')
+            return
+
+        previous_mean = self.profit_mean
+        self.profit_mean = (previous_mean * (count + 1) - value) / count
+        self.profit_m2 = max(self.profit_m2 - (value - previous_mean) * (value - self.profit_mean), Decimal('0'))
+
+    def _totals(self) -> Dict:
+        return {
+            "total_volume_usd": str(self.total_volume_usd),
+            "total_fees_usd": str(self.total_fees_usd),
+            "cumulative_usd": str(self.cumulative_usd),
+            "expired_profit_usd": str(self.expired_profit_usd),
+            "winning_trades": self.winning_trades,
+            "losing_trades": self.losing_trades,
+            "profit_mean": str(self.profit_mean),
+            "profit_m2": str(self.profit_m2)
+        }
+
+    def to_dict(self) -> Dict:
+        """Serialize for on-disk persistence (Decimals as strings to keep precision)"""
+        return {
+            "wallet_address": self.wallet_address,
+            "sequence": self.sequence,
+            "window_end_us": self.window_end_us,
+            "totals": self._totals(),
+            "entries": [_entry_to_list(entry) for entry in self.entries],
+            "unpriced": [list(item) for item in self.unpriced]
+        }
+
+    def changes_to_dict(self) -> Dict:
+        """
+        Journal record of the changes since the last save
+
+        Replayed by apply_journal_record: drop `expired` entries from the front,
+        append `added`, remove then add unpriced swaps, take the new totals.
+        """
+        return {
+            "sequence": self.sequence,
+            "window_end_us": self.window_end_us,
+            "totals": self._totals(),
+            "expired": self._expired,
+            "added": [_entry_to_list(entry) for entry in self._added],
+            "unpriced_removed": list(self._unpriced_removed),
+            "unpriced_added": [list(item) for item in self._unpriced_added]
+        }
+
+    def mark_saved(self):
+        """The current state is on disk"""
+        self.needs_snapshot = False
+        self._added.clear()
+        self._expired = 0
+        self._unpriced_added = []
+        self._unpriced_removed = []
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "RollingWindowState":
+        """Restore a state persisted with to_dict"""
+        state = cls(data["wallet_address"])
+        state.window_end_us = data.get("window_end_us")
+
+        state.sequence = int(data.get("sequence", 0))
+
+        for item in data.get("entries", []):
+            entry = _entry_from_list(item)
+            state.entries.append(entry)
+            state._extremes.append(entry)
+            state._signatures.add(entry.signature)
+
+        for timestamp_us, signature in data.get("unpriced", []):
+            state.unpriced.append((int(timestamp_us), signature))
+            state._unpriced_signatures.add(signature)
+            state._signatures.add(signature)
+
+        totals = data.get("totals", {})
+        state.total_volume_usd = Decimal(totals.get("total_volume_usd", "0"))
+        state.total_fees_usd = Decimal(totals.get("total_fees_usd", "0"))
+        state.cumulative_usd = Decimal(totals.get("cumulative_usd", "0"))
+        state.expired_profit_usd = Decimal(totals.get("expired_profit_usd", "0"))
+        state.winning_trades = int(totals.get("winning_trades", 0))
+        state.losing_trades = int(totals.get("losing_trades", 0))
+        state.profit_mean = Decimal(totals.get("profit_mean", "0"))
+        state.profit_m2 = Decimal(totals.get("profit_m2", "0"))
+        state.needs_snapshot = False
+        return state
+
+
+def apply_journal_record(data: Dict, record: Dict):
+    """Fold one journal record (RollingWindowState.changes_to_dict) into a snapshot dict"""
+    entries = data.setdefault("entries", [])
+    del entries[:record["expired"]]
+    entries.extend(record["added"])
+
+    removed = set(record["unpriced_removed"])
+    data["unpriced"] = [item for item in data.get("unpriced", []) if item[1] not in removed] + record["unpriced_added"]
+
+    data["sequence"] = record["sequence"]
+    data["window_end_us"] = record["window_end_us"]
+    data["totals"] = record["totals"]
+
+
+def _entry_to_list(entry: WindowEntry) -> List:
+    return [entry.timestamp_us, entry.signature, str(entry.token_in_usd), str(entry.fee_usd),
+            str(entry.net_profit_usd), str(entry.cumulative_usd)]
+
+
+def _entry_from_list(item: List) -> WindowEntry:
+    timestamp_us, signature, token_in_usd, fee_usd, net_profit_usd, cumulative_usd = item
+    return WindowEntry(
+        int(timestamp_us), signature, Decimal(token_in_usd), Decimal(fee_usd),
+        Decimal(net_profit_usd), Decimal(cumulative_usd)
+    )
+
+
+class RollingStateStore:
+    """
+    Persistent per-wallet rolling metrics state
+
+    Each wallet has a snapshot `<storage_dir>/<wallet>.json` and a journal
+    `<wallet>.journal.jsonl`. A save appends one journal line holding only what
+    changed in the run (new and expired trades, unpriced swaps, totals), so it costs
+    O(changes) rather than O(window); the snapshot is rewritten atomically when the
+    window was replayed or the journal reaches max_journal_records. Loading reads
+    the snapshot and replays the journal records newer than it. States are kept in
+    memory for later runs. An empty storage_dir keeps the store in memory only.
+
+    Several processes (API, Celery workers) may share storage_dir: reads and writes
+    of a wallet's files hold an exclusive lock on `<wallet>.lock`, a state kept in
+    memory is reloaded when another process saved the wallet since, and a save
+    whose state another process overtook is dropped instead of appending a
+    duplicate journal sequence (the next run reloads and applies what is missing).
+    Callers on an event loop should run get and save in a thread.
+    """
+
+    def __init__(self, storage_dir: Optional[str] = None, max_journal_records: int = 100):
+        self.storage_dir = storage_dir or None
+        self.max_journal_records = max_journal_records
+        self._states: Dict[str, RollingWindowState] = {}
+        self._journal_records: Dict[str, int] = {}
+        self._disk_versions: Dict[str, Tuple] = {}  # Wallet -> _disk_version after our last load or save
+        self._wallet_locks: Dict[str, asyncio.Lock] = {}
+        self._lock = threading.Lock()
+
+        if self.storage_dir:
+            os.makedirs(self.storage_dir, exist_ok=True)
+
+        logger.info("Initialized rolling metrics state store", storage_dir=self.storage_dir or "memory")
+
+    def _state_path(self, wallet_address: str) -> str:
+        return os.path.join(self.storage_dir, f"{wallet_address}.json")
+
+    def _journal_path(self, wallet_address: str) -> str:
+        return os.path.join(self.storage_dir, f"{wallet_address}.journal.jsonl")
+
+    @contextmanager
+    def _file_lock(self, wallet_address: str):
+        """Exclusive lock on a wallet's files, shared with other processes"""
+        with open(os.path.join(self.storage_dir, f"{wallet_address}.lock"), "a+b") as lock_file:
+            if FCNTL_AVAILABLE:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if FCNTL_AVAILABLE:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _disk_version(self, wallet_address: str) -> Tuple:
+        """Identity of a wallet's snapshot and journal; any process's save changes it"""
+        version = []
+        for path in (self._state_path(wallet_address), self._journal_path(wallet_address)):
+            try:
+                stat = os.stat(path)
+                version.append((stat.st_ino, stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                version.append(None)
+        return tuple(version)
+
+    def lock(self, wallet_address: str) -> asyncio.Lock:
+        """Lock serializing updates of one wallet's state (a run awaits prices mid-update)"""
+        with self._lock:
+            return self._wallet_locks.setdefault(wallet_address, asyncio.Lock())
+
+    def get(self, wallet_address: str) -> RollingWindowState:
+        """Get a wallet's state, loading it from disk on first access or after another process saved it"""
+        with self._lock:
+            state = self._states.get(wallet_address)
+            if not self.storage_dir:
+                if state is None:
+                    state = self._states[wallet_address] = RollingWindowState(wallet_address)
+                return state
+
+            with self._file_lock(wallet_address):
+                version = self._disk_version(wallet_address)
+                if state is not None and self._disk_versions.get(wallet_address) == version:
+                    return state
+                if state is not None:
+                    logger.info("Rolling state saved by another process, reloading", wallet=wallet_address)
+
+                state = RollingWindowState(wallet_address)
+                if version[0] is not None:
+                    try:
+                        state = self._load(wallet_address)
+                    except (OSError, ValueError, KeyError, TypeError) as e:
+                        logger.warning("Failed to load rolling state, rebuilding", wallet=wallet_address, error=str(e))
+                        state = RollingWindowState(wallet_address)
+                self._disk_versions[wallet_address] = version
+
+            self._states[wallet_address] = state
+            return state
+
+    def _load(self, wallet_address: str) -> RollingWindowState:
+        with open(self._state_path(wallet_address), "r") as f:
+            data = json.load(f)
+
+        replayed = 0
+        clean = True
+        if os.path.exists(self._journal_path(wallet_address)):
+            with open(self._journal_path(wallet_address), "r") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        clean = False  # Torn last append
+                        break
+                    if record["sequence"] <= data.get("sequence", 0):
+                        continue  # Already folded into the snapshot
+                    if record["sequence"] != data.get("sequence", 0) + 1:
+                        clean = False
+                        break
+                    apply_journal_record(data, record)
+                    replayed += 1
+
+        state = RollingWindowState.from_dict(data)
+        # A damaged journal is replaced by a snapshot on the next save
+        state.needs_snapshot = not clean
+        self._journal_records[wallet_address] = replayed
+        return state
+
+    def reset(self, wallet_address: str) -> RollingWindowState:
+        """Discard a wallet's state so the window is rebuilt from its trades"""
+        with self._lock:
+            previous = self._states.get(wallet_address)
+            state = RollingWindowState(wallet_address)
+            state.sequence = previous.sequence if previous is not None else 0
+            self._states[wallet_address] = state
+            return state
+
+    def save(self, state: RollingWindowState):
+        """Persist a wallet's changes since the last save"""
+        if not self.storage_dir:
+            state.mark_saved()
+            return
+
+        wallet_address = state.wallet_address
+        with self._file_lock(wallet_address):
+            if self._disk_version(wallet_address) != self._disk_versions.get(wallet_address, (None, None)):
+                # Another process saved after this state was loaded; our next sequence is
+                # already taken, so drop these changes and reload its state next run
+                logger.warning("Rolling state saved by another process, dropping this update", wallet=wallet_address)
+                with self._lock:
+                    if self._states.get(wallet_address) is state:
+                        del self._states[wallet_address]
+                return
+
+            state.sequence += 1
+            journal_records = self._journal_records.get(wallet_address, 0)
+
+            try:
+                if state.needs_snapshot or journal_records >= self.max_journal_records:
+                    path = self._state_path(wallet_address)
+                    tmp_path = f"{path}.tmp"
+                    with open(tmp_path, "w") as f:
+                        json.dump(state.to_dict(), f, separators=(",", ":"))
+                    os.replace(tmp_path, path)
+                    # Records up to this sequence are in the snapshot; truncating only saves space
+                    open(self._journal_path(wallet_address), "w").close()
+                    self._journal_records[wallet_address] = 0
+                else:
+                    with open(self._journal_path(wallet_address), "a") as f:
+                        f.write(json.dumps(state.changes_to_dict(), separators=(",", ":")) + "\n")
+                    self._journal_records[wallet_address] = journal_records + 1
+                state.mark_saved()
+            except OSError as e:
+                logger.error("Failed to persist rolling state", wallet=wallet_address, error=str(e))
+                state.needs_snapshot = True
+            self._disk_versions[wallet_address] = self._disk_version(wallet_address)
+
+
+def to_unix_us(timestamp: datetime) -> int:
+    """Convert a datetime (naive values are treated as UTC) to Unix microseconds"""
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return round(timestamp.timestamp() * 1_000_000)
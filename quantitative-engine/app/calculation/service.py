@@ -8,10 +8,10 @@ from datetime import datetime, timezone, timedelta
 from typing import Dict, List, Optional, Tuple
 from dataclasses import asdict
 
-from ..schemas.ingestion import RaydiumSwap
+from ..schemas.ingestion import SwapData
 from ..core.config import get_settings
 from ..core.logging import get_calculation_logger
-from .metrics import get_performance_calculator, PerformanceMetrics, TradeRecord
+from .metrics import get_performance_calculator, PerformanceMetrics, TradeRecord, MetricsEngine, TradeValuationCache
 from .price_feed import get_price_feed, close_price_feed
 
 settings = get_settings()
@@ -38,8 +38,10 @@ class CalculationService:
     async def calculate_wallet_performance(
         self,
         wallet_address: str,
-        trades: List[RaydiumSwap],
-        end_date: Optional[datetime] = None
+        trades: List[SwapData],
+        end_date: Optional[datetime] = None,
+        engine: Optional[MetricsEngine] = None,
+        valuation_cache: Optional[TradeValuationCache] = None
     ) -> Optional[PerformanceMetrics]:
         """
         Calculate comprehensive performance metrics for a wallet
@@ -48,6 +50,8 @@ class CalculationService:
             wallet_address: Wallet address to analyze
             trades: List of Raydium swap transactions
             end_date: End date for rolling period (defaults to now)
+            engine: Metrics backend (defaults to settings.metrics_engine)
+            valuation_cache: Per-run trade valuation cache (swaps already valued are reused)
             
         Returns:
             Complete performance metrics or None if calculation fails
@@ -66,7 +70,9 @@ class CalculationService:
             metrics = await self.calculator.calculate_performance_metrics(
                 wallet_address,
                 trades,
-                end_date
+                end_date,
+                engine,
+                valuation_cache
             )
             
             if metrics:
@@ -98,8 +104,10 @@ class CalculationService:
     
     async def calculate_batch_wallet_performance(
         self,
-        wallet_trades: Dict[str, List[RaydiumSwap]],
-        end_date: Optional[datetime] = None
+        wallet_trades: Dict[str, List[SwapData]],
+        end_date: Optional[datetime] = None,
+        engine: Optional[MetricsEngine] = None,
+        valuation_cache: Optional[TradeValuationCache] = None
     ) -> Dict[str, Optional[PerformanceMetrics]]:
         """
         Calculate performance metrics for multiple wallets efficiently
@@ -107,6 +115,8 @@ class CalculationService:
         Args:
             wallet_trades: Dict mapping wallet addresses to their trades
             end_date: End date for rolling period
+            engine: Metrics backend (defaults to settings.metrics_engine)
+            valuation_cache: Per-run trade valuation cache (swaps already valued are reused)
             
         Returns:
             Dict mapping wallet addresses to their performance metrics
@@ -123,7 +133,9 @@ class CalculationService:
         try:
             results = await self.calculator.calculate_batch_metrics(
                 wallet_trades,
-                end_date
+                end_date,
+                engine,
+                valuation_cache
             )
             
             successful_count = sum(1 for metrics in results.values() if metrics is not None)
@@ -147,13 +159,15 @@ class CalculationService:
     
     async def calculate_trade_usd_values(
         self,
-        trades: List[RaydiumSwap]
+        trades: List[SwapData],
+        valuation_cache: Optional[TradeValuationCache] = None
     ) -> List[TradeRecord]:
         """
         Calculate USD values for a list of trades at their execution times
         
         Args:
             trades: List of Raydium swap transactions
+            valuation_cache: Per-run trade valuation cache (swaps already valued are reused)
             
         Returns:
             List of TradeRecord objects with USD valuations
@@ -168,22 +182,25 @@ class CalculationService:
         
         trade_records = []
         
-        for trade in trades:
-            try:
-                trade_record = await self.calculator.calculate_trade_usd_values(trade)
-                if trade_record:
-                    trade_records.append(trade_record)
-                else:
-                    logger.warning(
-                        "Failed to calculate USD values for trade",
-                        signature=trade.signature,
-                        timestamp=trade.block_time.isoformat()
-                    )
-            except Exception as e:
-                logger.error(
-                    "Error calculating trade USD values",
+        try:
+            # One deduplicated price lookup pass for the whole window
+            batch_records = await self.calculator.calculate_trade_usd_values_batch(trades, valuation_cache)
+        except Exception as e:
+            logger.error(
+                "Error calculating trade USD values",
+                trade_count=len(trades),
+                error=str(e)
+            )
+            batch_records = []
+        
+        for trade, trade_record in zip(trades, batch_records):
+            if trade_record:
+                trade_records.append(trade_record)
+            else:
+                logger.warning(
+                    "Failed to calculate USD values for trade",
                     signature=trade.signature,
-                    error=str(e)
+                    timestamp=trade.block_time.isoformat()
                 )
         
         success_rate = len(trade_records) / len(trades) if trades else 0
@@ -200,8 +217,9 @@ class CalculationService:
     async def get_portfolio_summary(
         self,
         wallet_addresses: List[str],
-        wallet_trades: Dict[str, List[RaydiumSwap]],
-        end_date: Optional[datetime] = None
+        wallet_trades: Dict[str, List[SwapData]],
+        end_date: Optional[datetime] = None,
+        valuation_cache: Optional[TradeValuationCache] = None
     ) -> Dict[str, any]:
         """
         Generate comprehensive portfolio summary across multiple wallets
@@ -210,6 +228,7 @@ class CalculationService:
             wallet_addresses: List of wallet addresses to analyze
             wallet_trades: Dict mapping wallet addresses to their trades
             end_date: End date for analysis period
+            valuation_cache: Per-run trade valuation cache shared with scoring
             
         Returns:
             Comprehensive portfolio summary
@@ -223,7 +242,8 @@ class CalculationService:
         # Calculate metrics for all wallets
         wallet_metrics = await self.calculate_batch_wallet_performance(
             wallet_trades,
-            end_date
+            end_date,
+            valuation_cache=valuation_cache
         )
         
         # Aggregate portfolio statistics
@@ -338,6 +358,9 @@ class CalculationService:
         if self.price_feed:
             await close_price_feed()
         
+        if self.calculator:
+            self.calculator.shutdown_process_pool()
+        
         self.calculator = None
         self.price_feed = None
         
@@ -0,0 +1,148 @@
+"""
+XORJ Quantitative Engine - Vectorized Metrics Kernel
+Columnar float64/int64 implementation of the core performance metrics for high-volume ranking runs
+"""
+
+from typing import List, NamedTuple, Optional
+from dataclasses import dataclass
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+MICROSECONDS_PER_HOUR = 3_600_000_000
+
+
+@dataclass
+class TradeColumns:
+    """Columnar view of a wallet's trade records (one array per field)"""
+    timestamps_us: "np.ndarray"   # int64 microseconds since epoch
+    token_in_usd: "np.ndarray"    # float64
+    fee_usd: "np.ndarray"         # float64
+    net_profit_usd: "np.ndarray"  # float64
+    
+    @classmethod
+    def from_trade_records(cls, trades: List) -> "TradeColumns":
+        """
+        Load TradeRecords into NumPy arrays sorted by execution time
+        
+        Args:
+            trades: List of TradeRecord objects with Decimal USD values
+        
+        Returns:
+            TradeColumns with all arrays ordered by timestamp
+        """
+        count = len(trades)
+        timestamps_us = np.fromiter(
+            (round(trade.timestamp.timestamp() * 1_000_000) for trade in trades),
+            dtype=np.int64,
+            count=count
+        )
+        token_in_usd = np.fromiter((float(trade.token_in_usd) for trade in trades), dtype=np.float64, count=count)
+        fee_usd = np.fromiter((float(trade.fee_usd) for trade in trades), dtype=np.float64, count=count)
+        net_profit_usd = np.fromiter((float(trade.net_profit_usd) for trade in trades), dtype=np.float64, count=count)
+        
+        # Stable sort matches list.sort() ordering for trades sharing a timestamp
+        order = np.argsort(timestamps_us, kind="stable")
+        
+        return cls(
+            timestamps_us=timestamps_us[order],
+            token_in_usd=token_in_usd[order],
+            fee_usd=fee_usd[order],
+            net_profit_usd=net_profit_usd[order]
+        )
+    
+    def __len__(self) -> int:
+        return int(self.timestamps_us.shape[0])
+
+
+class VectorizedCoreMetrics(NamedTuple):
+    """Raw (unquantized) core metrics produced by the vectorized kernel"""
+    total_trades: int
+    winning_trades: int
+    losing_trades: int
+    total_volume_usd: float
+    total_fees_usd: float
+    total_profit_usd: float
+    net_roi_percent: float
+    maximum_drawdown_percent: float
+    sharpe_ratio: float
+    average_trade_size_usd: float
+    largest_win_usd: float
+    largest_loss_usd: float
+    average_holding_period_hours: float
+
+
+def compute_core_metrics(columns: TradeColumns) -> Optional[VectorizedCoreMetrics]:
+    """
+    Compute the core metrics of PerformanceCalculator._calculate_core_metrics in vectorized form
+    
+    Mirrors the Decimal path exactly in definition (simplified ROI on traded volume,
+    drawdown relative to the final running peak, sample standard deviation for Sharpe).
+    
+    Args:
+        columns: Timestamp-sorted trade columns
+    
+    Returns:
+        VectorizedCoreMetrics, or None if there are no trades
+    """
+    total_trades = len(columns)
+    if total_trades == 0:
+        return None
+    
+    profits = columns.net_profit_usd
+    
+    total_volume_usd = float(columns.token_in_usd.sum())
+    total_fees_usd = float(columns.fee_usd.sum())
+    total_profit_usd = float(profits.sum())
+    
+    # Win/Loss analysis
+    win_mask = profits > 0
+    loss_mask = profits < 0
+    winning_trades = int(np.count_nonzero(win_mask))
+    losing_trades = int(np.count_nonzero(loss_mask))
+    
+    # 1. Net ROI (%) on traded volume
+    net_roi_percent = (total_profit_usd / total_volume_usd * 100) if total_volume_usd > 0 else 0.0
+    
+    # 2. Maximum Drawdown (%) from the cumulative profit curve
+    cumulative_profits = np.cumsum(profits)
+    running_peak = np.maximum.accumulate(cumulative_profits)
+    max_drawdown = float((running_peak - cumulative_profits).max())
+    peak = float(running_peak[-1])
+    maximum_drawdown_percent = (max_drawdown / peak * 100) if peak > 0 else 0.0
+    
+    # 3. Sharpe Ratio on per-trade profits (risk-free rate of 0)
+    sharpe_ratio = 0.0
+    if total_trades >= 2:
+        std_dev = float(profits.std(ddof=1))
+        if std_dev > 0:
+            sharpe_ratio = float(profits.mean()) / std_dev
+    
+    # Supporting metrics
+    average_trade_size_usd = total_volume_usd / total_trades
+    largest_win_usd = float(profits[win_mask].max()) if winning_trades else 0.0
+    largest_loss_usd = float(profits[loss_mask].min()) if losing_trades else 0.0
+    
+    if total_trades > 1:
+        average_holding_period_hours = float(np.diff(columns.timestamps_us).mean()) / MICROSECONDS_PER_HOUR
+    else:
+        average_holding_period_hours = 0.0
+    
+    return VectorizedCoreMetrics(
+        total_trades=total_trades,
+        winning_trades=winning_trades,
+        losing_trades=losing_trades,
+        total_volume_usd=total_volume_usd,
+        total_fees_usd=total_fees_usd,
+        total_profit_usd=total_profit_usd,
+        net_roi_percent=net_roi_percent,
+        maximum_drawdown_percent=maximum_drawdown_percent,
+        sharpe_ratio=sharpe_ratio,
+        average_trade_size_usd=average_trade_size_usd,
+        largest_win_usd=largest_win_usd,
+        largest_loss_usd=largest_loss_usd,
+        average_holding_period_hours=average_holding_period_hours
+    )
@@ -0,0 +1,166 @@
+"""
+XORJ Quantitative Engine - Worker Async Runtime
+Long-lived event loop per worker process, so async clients and caches outlive individual Celery tasks
+"""
+
+import asyncio
+import concurrent.futures
+import os
+import threading
+from typing import Any, Awaitable, Callable, Coroutine, List, Optional
+
+from .logging import get_worker_logger
+
+logger = get_worker_logger()
+
+
+class AsyncRuntime:
+    """
+    Event loop running in a daemon thread for the life of a process
+
+    Celery tasks are synchronous; instead of creating an event loop per task they
+    submit coroutines here. Async singletons (HTTP and Solana clients, the database
+    engine, price feeds, rate limiters) are bound to the loop they were created on,
+    so keeping one loop keeps their connection pools and caches warm from task to task.
+
+    Threads do not survive fork: a runtime inherited by a forked child is treated as
+    stopped and started again, on a fresh loop, on first use.
+    """
+
+    def __init__(self, name: str = "async-runtime"):
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self._shutdown_hooks: List[Callable[[], Awaitable[Any]]] = []
+
+    @property
+    def running(self) -> bool:
+        return (
+            self._loop is not None
+            and self._pid == os.getpid()
+            and self._thread is not None
+            and self._thread.is_alive()
+        )
+
+    @property
+    def loop(self) -> Optional[asyncio.AbstractEventLoop]:
+        return self._loop if self.running else None
+
+    def add_shutdown_hook(self, hook: Callable[[], Awaitable[Any]]):
+        """Register a coroutine function awaited on the loop when the runtime stops (last added runs first)"""
+        if hook not in self._shutdown_hooks:
+            self._shutdown_hooks.append(hook)
+
+    def start(self):
+        """Start the loop thread if it is not running in this process"""
+        with self._lock:
+            if self.running:
+                return
+
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def run_loop():
+                asyncio.set_event_loop(loop)
+                loop.call_soon(ready.set)
+                loop.run_forever()
+
+            self._loop = loop
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=run_loop, name=self.name, daemon=True)
+            self._thread.start()
+            ready.wait()
+
+            logger.info("Started async runtime", runtime=self.name, pid=self._pid)
+
+    def run(self, coroutine: Coroutine[Any, Any, Any], timeout: Optional[float] = None) -> Any:
+        """
+        Run a coroutine on the runtime's loop and wait for its result
+
+        Args:
+            coroutine: Coroutine to run
+            timeout: Seconds to wait before cancelling it (optional)
+
+        Returns:
+            The coroutine's result; its exception is raised here
+        """
+        self.start()
+        if threading.current_thread() is self._thread:
+            coroutine.close()
+            raise RuntimeError("AsyncRuntime.run cannot be called from the runtime's own loop")
+
+        future = asyncio.run_coroutine_threadsafe(coroutine, self._loop)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise asyncio.TimeoutError(f"Coroutine did not finish within {timeout} seconds")
+        except BaseException:
+            # e.g. a Celery soft time limit interrupting the waiting task
+            future.cancel()
+            raise
+
+    async def _run_shutdown_hooks(self):
+        for hook in reversed(self._shutdown_hooks):
+            try:
+                await hook()
+            except Exception as e:
+                logger.error("Async runtime shutdown hook failed", hook=getattr(hook, "__name__", repr(hook)), error=str(e))
+
+        # Cancel whatever is still scheduled (e.g. background refresh tasks)
+        current = asyncio.current_task()
+        pending = [task for task in asyncio.all_tasks() if task is not current]
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    def stop(self, timeout: float = 30.0):
+        """Run the shutdown hooks on the loop, then stop and close it"""
+        with self._lock:
+            if not self.running:
+                self._loop = self._thread = None
+                return
+
+            loop, thread = self._loop, self._thread
+            try:
+                asyncio.run_coroutine_threadsafe(self._run_shutdown_hooks(), loop).result(timeout)
+            except Exception as e:
+                logger.error("Async runtime shutdown did not complete", runtime=self.name, error=str(e))
+
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout)
+            if not thread.is_alive():
+                loop.close()
+            self._loop = self._thread = None
+
+            logger.info("Stopped async runtime", runtime=self.name, pid=os.getpid())
+
+
+# Global runtime instance
+_async_runtime: Optional[AsyncRuntime] = None
+_async_runtime_lock = threading.Lock()
+
+
+def get_async_runtime() -> AsyncRuntime:
+    """Get the process-wide async runtime (started on first use)"""
+    global _async_runtime
+
+    with _async_runtime_lock:
+        if _async_runtime is None:
+            _async_runtime = AsyncRuntime()
+        return _async_runtime
+
+
+def run_async(coroutine: Coroutine[Any, Any, Any], timeout: Optional[float] = None) -> Any:
+    """Run a coroutine on the process-wide async runtime from synchronous code"""
+    return get_async_runtime().run(coroutine, timeout)
+
+
+def shutdown_async_runtime(timeout: float = 30.0):
+    """Stop the process-wide async runtime, running its shutdown hooks"""
+    with _async_runtime_lock:
+        runtime = _async_runtime
+    if runtime is not None:
+        runtime.stop(timeout)
@@ -4,20 +4,83 @@ Structured, tamper-proof audit logging for all scoring operations
 """
 
 import json
+import re
 import time
 import hashlib
+import hmac
 import uuid
+from collections import deque
 from datetime import datetime, timezone
-from typing import Dict, Any, Optional, List
+from typing import Deque, Dict, Any, Optional, List, Tuple, Union
 from dataclasses import dataclass, asdict
 from enum import Enum
 import logging
 import asyncio
 import os
+import threading
 from pathlib import Path
 
+from .config import get_settings
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    FCNTL_AVAILABLE = False
+
+settings = get_settings()
 logger = logging.getLogger(__name__)
 
+# Checkpoint records are serialized with this key first, so readers can spot them
+# without parsing the line
+CHECKPOINT_RECORD_TYPE = "checkpoint"
+CHECKPOINT_PREFIX = b'{"record_type":"checkpoint"'
+
+# Loggers sharing an audit directory each hold a writer slot (a locked .writer-N.lock
+# file) and keep a chain of their own across the files named with their slot
+MAX_WRITER_SLOTS = 64
+WRITER_ID_PATTERN = re.compile(r"_w([0-9a-f]+)_[0-9a-f]{8}\.jsonl$")
+
+
+def audit_file_writer(file_name: str) -> str:
+    """Writer whose chain an audit file belongs to (files named before writer slots: "0")"""
+    match = WRITER_ID_PATTERN.search(file_name)
+    return match.group(1) if match else "0"
+
+
+def compute_event_checksum(event_id: str,
+                           timestamp: str,
+                           event_type: str,
+                           component: str,
+                           message: str,
+                           details: Dict[str, Any],
+                           previous_checksum: str = "") -> str:
+    """Calculate the chained SHA-256 checksum of an audit event's core fields"""
+    # Create deterministic string from core fields
+    checksum_data = {
+        'event_id': event_id,
+        'timestamp': timestamp,
+        'event_type': event_type,
+        'component': component,
+        'message': message,
+        'details': json.dumps(details, sort_keys=True),
+        'previous_checksum': previous_checksum
+    }
+    
+    data_string = json.dumps(checksum_data, sort_keys=True)
+    return hashlib.sha256(data_string.encode()).hexdigest()
+
+
+def sign_checkpoint(key: bytes, file_name: str, events: int, chain: str, timestamp: str) -> str:
+    """HMAC-SHA256 signature binding a chain hash to its position in an audit file"""
+    message = f"{file_name}\n{events}\n{chain}\n{timestamp}".encode()
+    return hmac.new(key, message, hashlib.sha256).hexdigest()
+
+
+def get_checkpoint_key() -> bytes:
+    """Key used to sign and verify audit checkpoints"""
+    return (settings.audit_checkpoint_key or settings.secret_key).encode()
+
 
 class AuditEventType(Enum):
     """Types of audit events"""
@@ -82,99 +145,454 @@ class AuditEvent:
     
     def calculate_checksum(self, previous_checksum: str = "") -> str:
         """Calculate SHA-256 checksum for integrity verification"""
-        # Create deterministic string from core fields
-        checksum_data = {
-            'event_id': self.event_id,
-            'timestamp': self.timestamp,
-            'event_type': self.event_type.value,
-            'component': self.component,
-            'message': self.message,
-            'details': json.dumps(self.details, sort_keys=True),
-            'previous_checksum': previous_checksum
-        }
-        
-        data_string = json.dumps(checksum_data, sort_keys=True)
-        return hashlib.sha256(data_string.encode()).hexdigest()
+        return compute_event_checksum(
+            self.event_id,
+            self.timestamp,
+            self.event_type.value,
+            self.component,
+            self.message,
+            self.details,
+            previous_checksum
+        )
 
 
 class AuditLogger:
     """
     SR-3: Immutable audit logger for XORJ Quantitative Engine
     Provides tamper-evident logging for all scoring operations
+
+    Writes are group-committed: log_event only queues the event, and a dedicated
+    writer thread chains the checksums in queue order and commits everything queued
+    within flush_interval_ms (or max_batch_events) with one write and one fsync.
+    Callers that must not proceed before their event is on disk pass durable=True.
+    The queue holds at most max_pending_events: log_event waits (off the event loop)
+    up to enqueue_timeout seconds for room, then fails. If the writer thread dies,
+    the events it had not committed fail and the next log_event restarts it.
+
+    Every checkpoint_interval events (and when a file is opened or closed) the
+    writer adds a signed checkpoint record holding the chain hash, so verification
+    can check the segments between checkpoints in parallel and resume from the
+    last verified one (see audit_verifier).
+
+    Several loggers (one per process) may share a directory: each claims the lowest
+    free writer slot, names its files with it and chains only its own files, so a
+    restarted process continues its slot's chain without interleaving with others.
     """
     
     def __init__(self, 
                  audit_dir: str = "/app/audit",
                  max_file_size: int = 100 * 1024 * 1024,  # 100MB
-                 retention_days: int = 365):
+                 retention_days: int = 365,
+                 flush_interval_ms: Optional[float] = None,
+                 max_batch_events: Optional[int] = None,
+                 checkpoint_interval: Optional[int] = None,
+                 checkpoint_key: Optional[bytes] = None,
+                 max_pending_events: Optional[int] = None,
+                 enqueue_timeout: Optional[float] = None):
         self.audit_dir = Path(audit_dir)
         self.max_file_size = max_file_size
         self.retention_days = retention_days
+        self.flush_interval = (
+            settings.audit_flush_interval_ms if flush_interval_ms is None else flush_interval_ms
+        ) / 1000
+        self.max_batch_events = max(1, max_batch_events or settings.audit_max_batch_events)
+        self.max_pending_events = max(1, max_pending_events or settings.audit_max_pending_events)
+        self.enqueue_timeout = (
+            settings.audit_enqueue_timeout_seconds if enqueue_timeout is None else enqueue_timeout
+        )
+        self.checkpoint_interval = (
+            settings.audit_checkpoint_interval if checkpoint_interval is None else checkpoint_interval
+        )
+        self._checkpoint_key = checkpoint_key or get_checkpoint_key()
         
         # Create audit directory if it doesn't exist
         self.audit_dir.mkdir(parents=True, exist_ok=True)
+        self.writer_id, self._writer_lock = self._claim_writer_slot()
         
-        # Maintain chain of checksums for integrity
-        self._last_checksum = ""
+        # Maintain chain of checksums for integrity (owned by the writer thread);
+        # with checkpoints, a restarted logger continues the chain of its slot's newest file
+        self._last_checksum = self._restore_chain() if self.checkpoint_interval else ""
         self._current_file: Optional[Path] = None
         self._file_handle = None
+        self._current_size = 0
+        self._events_in_file = 0
+        self._checkpointed_events = 0
+        
+        # Queue of (event, waiter) handed to the writer thread
+        self._pending: Deque[Tuple[AuditEvent, Optional[Tuple[asyncio.AbstractEventLoop, asyncio.Future]]]] = deque()
+        self._condition = threading.Condition()
+        self._enqueued = 0
+        self._processed = 0
+        self._flush_requested = False
+        self._closed = False
+        
+        self.stats = {
+            'events_written': 0,
+            'events_failed': 0,
+            'batches_committed': 0,
+            'largest_batch': 0,
+            'checkpoints_written': 0,
+            'events_rejected': 0,
+            'writer_restarts': 0
+        }
         
         # Initialize first audit file
         self._rotate_file()
         
+        self._writer = self._start_writer()
+        
         logger.info(f"Audit logger initialized: {self.audit_dir}")
     
+    def _start_writer(self) -> threading.Thread:
+        self._writer_running = True
+        writer = threading.Thread(target=self._run_writer, name="audit-writer", daemon=True)
+        writer.start()
+        return writer
+    
+    def _claim_writer_slot(self) -> Tuple[str, Optional[Any]]:
+        """
+        Lock the lowest writer slot no other logger holds
+        
+        Returns:
+            Tuple of (writer id, open lock file held until close)
+        """
+        if FCNTL_AVAILABLE:
+            for slot in range(MAX_WRITER_SLOTS):
+                lock_file = open(self.audit_dir / f".writer-{slot}.lock", 'a')
+                try:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except OSError:
+                    lock_file.close()
+                    continue
+                return str(slot), lock_file
+        
+        # No locking, or every slot taken: a chain of its own that no restart continues
+        writer_id = uuid.uuid4().hex[:8]
+        logger.warning(f"No audit writer slot available in {self.audit_dir}; writing as {writer_id}")
+        return writer_id, None
+    
     def _get_audit_filename(self) -> str:
-        """Generate audit filename with timestamp"""
-        timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
-        return f"audit_{timestamp}_{uuid.uuid4().hex[:8]}.jsonl"
+        """Generate audit filename with timestamp and writer slot"""
+        # Microseconds keep names in write order (verification links files by it)
+        timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S_%f")
+        return f"audit_{timestamp}_w{self.writer_id}_{uuid.uuid4().hex[:8]}.jsonl"
     
     def _rotate_file(self):
         """Rotate audit file when size limit reached"""
         if self._file_handle:
+            self._write_closing_checkpoint()
             self._file_handle.close()
         
         self._current_file = self.audit_dir / self._get_audit_filename()
-        self._file_handle = open(self._current_file, 'a', encoding='utf-8')
+        self._file_handle = open(self._current_file, 'ab')
+        self._current_size = self._file_handle.tell()
+        self._events_in_file = self._checkpointed_events = 0
         
         logger.info(f"Rotated to new audit file: {self._current_file}")
     
+    def _restore_chain(self) -> str:
+        """
+        Chain hash at the end of this writer's newest audit file ("" if there is none)
+        
+        Files without a complete record (opened, then closed or crashed before any
+        write) are skipped; verification links past them the same way.
+        """
+        paths = [
+            path for path in sorted(self.audit_dir.glob("audit_*.jsonl"), reverse=True)
+            if audit_file_writer(path.name) == self.writer_id
+        ]
+        for path in paths:
+            try:
+                with open(path, 'rb') as f:
+                    f.seek(max(0, path.stat().st_size - 1024 * 1024))
+                    tail = f.read().splitlines()
+            except OSError as e:
+                logger.error(f"Failed to read audit file {path}: {e}")
+                continue
+            
+            for line in reversed(tail):
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # Partial line left by a crash
+                if record.get('record_type') == CHECKPOINT_RECORD_TYPE:
+                    return record.get('chain', "")
+                return record.get('checksum') or ""
+        return ""
+    
+    def _checkpoint_line(self) -> str:
+        """Signed checkpoint of the chain at the current position of the current file"""
+        timestamp = datetime.now(timezone.utc).isoformat()
+        file_name = self._current_file.name
+        record = {
+            'record_type': CHECKPOINT_RECORD_TYPE,
+            'file': file_name,
+            'events': self._events_in_file,
+            'chain': self._last_checksum,
+            'timestamp': timestamp,
+            'signature': sign_checkpoint(
+                self._checkpoint_key, file_name, self._events_in_file, self._last_checksum, timestamp
+            )
+        }
+        self._checkpointed_events = self._events_in_file
+        self.stats['checkpoints_written'] += 1
+        return json.dumps(record, separators=(',', ':'))
+    
+    def _write_closing_checkpoint(self):
+        """Seal the current file with a checkpoint after its last event"""
+        if not self.checkpoint_interval or self._events_in_file == self._checkpointed_events:
+            return
+        
+        try:
+            data = (self._checkpoint_line() + '\n').encode('utf-8')
+            self._file_handle.write(data)
+            self._file_handle.flush()
+            os.fsync(self._file_handle.fileno())
+            self._current_size += len(data)
+        except Exception as e:
+            logger.error(f"Failed to write closing audit checkpoint: {e}")
+    
     def _should_rotate(self) -> bool:
         """Check if file rotation is needed"""
         if not self._current_file or not self._current_file.exists():
             return True
         
-        return self._current_file.stat().st_size >= self.max_file_size
+        return self._current_size >= self.max_file_size
     
-    async def log_event(self, event: AuditEvent) -> bool:
+    async def log_event(self, event: Union[AuditEvent, Dict[str, Any]], durable: bool = False) -> bool:
         """
-        Log audit event with integrity verification
-        Returns True if successfully logged
+        Queue audit event for the writer thread
+        
+        Args:
+            event: Event to log (or the keyword arguments of one)
+            durable: Wait until the event's batch has been written and fsynced
+        
+        Returns:
+            True if the event was queued (durable: written to disk)
         """
         try:
-            # Calculate checksum with previous event for chain integrity
-            event.checksum = event.calculate_checksum(self._last_checksum)
-            event.previous_checksum = self._last_checksum
+            if isinstance(event, dict):
+                event = AuditEvent(**event)
             
-            # Check if file rotation needed
-            if self._should_rotate():
-                self._rotate_file()
+            waiter = None
+            if durable:
+                loop = asyncio.get_running_loop()
+                waiter = (loop, loop.create_future())
             
-            # Write event as JSON line
-            event_json = json.dumps(event.to_dict(), ensure_ascii=False, separators=(',', ':'))
-            self._file_handle.write(event_json + '\n')
-            self._file_handle.flush()
-            os.fsync(self._file_handle.fileno())  # Force write to disk
-            
-            # Update checksum chain
-            self._last_checksum = event.checksum
+            deadline = time.monotonic() + self.enqueue_timeout
+            while True:
+                with self._condition:
+                    if self._closed:
+                        logger.error("Audit logger is closed; event dropped")
+                        return False
+                    
+                    if not self._writer_running:
+                        logger.error("Audit writer thread is not running; restarting it")
+                        self.stats['writer_restarts'] += 1
+                        self._writer = self._start_writer()
+                    
+                    if len(self._pending) < self.max_pending_events:
+                        self._pending.append((event, waiter))
+                        self._enqueued += 1
+                        # Wake the writer to open a commit window, or to commit a full batch now
+                        if len(self._pending) == 1 or len(self._pending) >= self.max_batch_events:
+                            self._condition.notify_all()
+                        break
+                
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.error(f"Audit queue full ({self.max_pending_events} events); event dropped")
+                    with self._condition:
+                        self.stats['events_rejected'] += 1
+                    return False
+                await asyncio.to_thread(self._wait_for_room, remaining)
             
+            if waiter is not None:
+                return await waiter[1]
             return True
             
         except Exception as e:
-            logger.error(f"Failed to write audit event: {e}")
+            logger.error(f"Failed to queue audit event: {e}")
             return False
     
+    def _wait_for_room(self, timeout: float):
+        """Block until the queue has room (or the writer is gone), at most timeout seconds"""
+        with self._condition:
+            self._condition.wait_for(
+                lambda: (len(self._pending) < self.max_pending_events
+                         or self._closed or not self._writer_running),
+                timeout
+            )
+    
+    def _run_writer(self):
+        """Writer thread: run the commit loop; if it dies, fail every event it had not committed"""
+        batch: List[Tuple[AuditEvent, Any]] = []
+        try:
+            self._commit_loop(batch)
+        except BaseException as e:
+            logger.error(f"Audit writer thread died: {e}", exc_info=True)
+            with self._condition:
+                self._writer_running = False
+                failed = batch + list(self._pending)
+                self._pending.clear()
+                self._processed += len(failed)
+                self.stats['events_failed'] += len(failed)
+                self._condition.notify_all()
+            for _, waiter in failed:
+                if waiter is not None:
+                    self._resolve_waiter(waiter, False)
+    
+    def _commit_loop(self, batch: List[Tuple[AuditEvent, Any]]):
+        """Collect a batch per commit window and commit it; batch holds the events in flight"""
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if not self._pending:
+                    return
+                
+                # Group commit: let more events join until the window closes or the batch is full
+                deadline = time.monotonic() + self.flush_interval
+                while (len(self._pending) < self.max_batch_events
+                       and not self._closed and not self._flush_requested):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                
+                batch.extend(self._pending.popleft() for _ in range(min(len(self._pending), self.max_batch_events)))
+                if not self._pending:
+                    self._flush_requested = False
+            
+            written = self._commit_batch(batch)
+            
+            for (_, waiter), ok in zip(batch, written):
+                if waiter is not None:
+                    self._resolve_waiter(waiter, ok)
+            
+            with self._condition:
+                self._processed += len(batch)
+                batch.clear()
+                self._condition.notify_all()
+    
+    def _commit_batch(self, batch: List[Tuple[AuditEvent, Any]]) -> List[bool]:
+        """
+        Chain, serialize and write a batch with a single fsync
+        
+        Returns:
+            Whether each event of the batch reached the disk
+        """
+        try:
+            # Check if file rotation needed (checkpoints name the file they are in)
+            if self._should_rotate():
+                self._rotate_file()
+        except Exception as e:
+            logger.error(f"Failed to rotate audit file: {e}")
+            self.stats['events_failed'] += len(batch)
+            return [False] * len(batch)
+        
+        chain_start = self._last_checksum
+        events_start, checkpointed_start = self._events_in_file, self._checkpointed_events
+        lines = []
+        written = []
+        
+        if self.checkpoint_interval and self._current_size == 0:
+            # Opening checkpoint links a new file to the end of the previous one
+            lines.append(self._checkpoint_line())
+        
+        for event, _ in batch:
+            try:
+                # Calculate checksum with previous event for chain integrity
+                checksum = event.calculate_checksum(self._last_checksum)
+                event.checksum, event.previous_checksum = checksum, self._last_checksum
+                lines.append(json.dumps(event.to_dict(), ensure_ascii=False, separators=(',', ':')))
+                self._last_checksum = checksum
+                self._events_in_file += 1
+                written.append(True)
+            except Exception as e:
+                event.checksum = event.previous_checksum = None
+                logger.error(f"Failed to serialize audit event {getattr(event, 'event_id', None)}: {e}")
+                written.append(False)
+                continue
+            
+            if self.checkpoint_interval and self._events_in_file - self._checkpointed_events >= self.checkpoint_interval:
+                lines.append(self._checkpoint_line())
+        
+        try:
+            if any(written):
+                data = ('\n'.join(lines) + '\n').encode('utf-8')
+                self._file_handle.write(data)
+                self._file_handle.flush()
+                os.fsync(self._file_handle.fileno())  # Force write to disk, once per batch
+                self._current_size += len(data)
+        except Exception as e:
+            logger.error(f"Failed to write audit batch of {len(batch)} events: {e}")
+            # Drop whatever part of the batch reached the file and chain the next batch
+            # onto the last committed event
+            self._last_checksum = chain_start
+            self._events_in_file, self._checkpointed_events = events_start, checkpointed_start
+            self._discard_partial_write()
+            written = [False] * len(batch)
+        
+        succeeded = sum(written)
+        self.stats['events_written'] += succeeded
+        self.stats['events_failed'] += len(batch) - succeeded
+        if succeeded:
+            self.stats['batches_committed'] += 1
+            self.stats['largest_batch'] = max(self.stats['largest_batch'], succeeded)
+        return written
+    
+    def _discard_partial_write(self):
+        """Truncate the file back to its last committed size (or move to a new file)"""
+        try:
+            self._file_handle.truncate(self._current_size)
+            self._file_handle.seek(self._current_size)
+        except Exception as e:
+            logger.error(f"Failed to truncate audit file, rotating: {e}")
+            self._rotate_file()
+    
+    @staticmethod
+    def _resolve_waiter(waiter: Tuple[asyncio.AbstractEventLoop, asyncio.Future], ok: bool):
+        loop, future = waiter
+        
+        def resolve():
+            if not future.done():
+                future.set_result(ok)
+        
+        try:
+            loop.call_soon_threadsafe(resolve)
+        except RuntimeError:
+            pass  # The caller's loop has already closed
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Commit everything queued so far without waiting out the commit window
+        
+        Blocks the calling thread; from async code prefer log_event(..., durable=True).
+        
+        Returns:
+            True if every event queued before the call has been processed
+        """
+        with self._condition:
+            target = self._enqueued
+            self._flush_requested = True
+            self._condition.notify_all()
+            return self._condition.wait_for(lambda: self._processed >= target, timeout)
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get writer statistics"""
+        with self._condition:
+            pending = len(self._pending)
+        batches = self.stats['batches_committed']
+        return {
+            **self.stats,
+            'pending_events': pending,
+            'average_batch_size': round(self.stats['events_written'] / batches, 2) if batches else 0.0,
+            'flush_interval_ms': self.flush_interval * 1000,
+            'writer_id': self.writer_id,
+            'current_file': str(self._current_file) if self._current_file else None
+        }
+    
     async def log_scoring_request(self, 
                                   wallet_addresses: List[str],
                                   request_params: Dict[str, Any],
@@ -360,64 +778,56 @@ class AuditLogger:
         await self.log_event(event)
         return event_id
     
-    def verify_integrity(self, audit_file: Path = None) -> bool:
+    def verify_integrity(self, audit_file: Path = None, workers: Optional[int] = None) -> bool:
         """Verify integrity of audit log chain"""
         if audit_file is None:
+            self.flush()
             audit_file = self._current_file
         
-        if not audit_file or not audit_file.exists():
+        if not audit_file or not Path(audit_file).exists():
             return False
         
-        try:
-            previous_checksum = ""
-            with open(audit_file, 'r', encoding='utf-8') as f:
-                for line_num, line in enumerate(f, 1):
-                    if not line.strip():
-                        continue
-                    
-                    event_data = json.loads(line)
-                    
-                    # Reconstruct event for verification
-                    event = AuditEvent(
-                        event_id=event_data['event_id'],
-                        event_type=AuditEventType(event_data['event_type']),
-                        level=AuditLevel(event_data['level']),
-                        timestamp=event_data['timestamp'],
-                        component=event_data['component'],
-                        message=event_data['message'],
-                        details=event_data['details'],
-                        user_id=event_data.get('user_id'),
-                        session_id=event_data.get('session_id'),
-                        client_ip=event_data.get('client_ip'),
-                        user_agent=event_data.get('user_agent'),
-                        process_id=event_data.get('process_id', 0),
-                        thread_id=event_data.get('thread_id'),
-                        correlation_id=event_data.get('correlation_id'),
-                        version=event_data.get('version', '1.0')
-                    )
-                    
-                    # Verify checksum
-                    expected_checksum = event.calculate_checksum(previous_checksum)
-                    actual_checksum = event_data.get('checksum')
-                    
-                    if expected_checksum != actual_checksum:
-                        logger.error(f"Integrity violation at line {line_num}")
-                        return False
-                    
-                    previous_checksum = actual_checksum
-            
+        from .audit_verifier import verify_audit_file
+        
+        result = verify_audit_file(Path(audit_file), key=self._checkpoint_key, workers=workers)
+        for error in result.errors[:10]:
+            logger.error(f"Integrity violation: {error}")
+        if result.ok:
             logger.info(f"Audit log integrity verified: {audit_file}")
-            return True
-            
-        except Exception as e:
-            logger.error(f"Failed to verify audit log integrity: {e}")
-            return False
+        return result.ok
     
-    def close(self):
-        """Close audit logger and file handles"""
-        if self._file_handle:
+    def verify_history(self, full: bool = False, workers: Optional[int] = None):
+        """
+        Verify every audit file in the audit directory, resuming from the last verified checkpoints
+        
+        Args:
+            full: Ignore the saved verification state and check everything again
+            workers: Verification processes (defaults to settings.audit_verify_workers)
+        
+        Returns:
+            AuditVerificationReport
+        """
+        from .audit_verifier import verify_audit_history
+        
+        self.flush()
+        return verify_audit_history(self.audit_dir, key=self._checkpoint_key, workers=workers, full=full)
+    
+    def close(self, timeout: float = 30.0):
+        """Commit queued events, stop the writer and close file handles"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._writer.join(timeout)
+        
+        if self._file_handle and not self._writer.is_alive():
+            self._write_closing_checkpoint()
             self._file_handle.close()
             self._file_handle = None
+        
+        if self._writer_lock is not None and not self._writer.is_alive():
+            # Releases the writer slot for the next logger
+            self._writer_lock.close()
+            self._writer_lock = None
 
 
 # Global audit logger instance
@@ -434,6 +844,15 @@ def get_audit_logger() -> AuditLogger:
     return _audit_logger
 
 
+def close_audit_logger():
+    """Commit pending audit events and close the global audit logger"""
+    global _audit_logger
+    
+    if _audit_logger is not None:
+        _audit_logger.close()
+        _audit_logger = None
+
+
 async def init_audit_logging() -> AuditLogger:
     """Initialize audit logging system"""
     audit_logger = get_audit_logger()
@@ -0,0 +1,456 @@
+"""
+XORJ Quantitative Engine - Audit Log Verification (SR-3)
+Parallel, resumable verification of checkpointed audit log chains
+"""
+
+import hashlib
+import hmac
+import json
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .audit_logger import (
+    CHECKPOINT_PREFIX,
+    audit_file_writer,
+    compute_event_checksum,
+    get_checkpoint_key,
+    sign_checkpoint
+)
+from .config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Bytes of audit log handed to one verification task
+VERIFY_CHUNK_BYTES = 16 * 1024 * 1024
+STATE_FILE_NAME = "verification_state.json"
+
+
+@dataclass
+class RangeResult:
+    """Outcome of verifying the segments that start within one byte range of a file"""
+    start: int
+    started: bool = False  # False if no checkpoint begins in the range (the previous range covers it)
+    start_chain: Optional[str] = None
+    opening_checkpoint: bool = False
+    stop_offset: Optional[int] = None  # Offset of the checkpoint the range stopped at, None at end of file
+    end_chain: Optional[str] = None
+    end_events: int = 0
+    events_verified: int = 0
+    checkpoints: List[Dict[str, Any]] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+
+
+def _check_checkpoint(line: bytes, offset: int, key: bytes, file_name: str, result: RangeResult) -> Optional[Dict[str, Any]]:
+    """Parse a checkpoint line and verify its signature; returns None if it is not valid"""
+    try:
+        record = json.loads(line)
+        expected = sign_checkpoint(key, record['file'], record['events'], record['chain'], record['timestamp'])
+    except (ValueError, KeyError, TypeError) as e:
+        result.errors.append(f"{file_name}@{offset}: malformed checkpoint ({e})")
+        return None
+
+    if not hmac.compare_digest(expected, str(record.get('signature', ''))):
+        result.errors.append(f"{file_name}@{offset}: checkpoint signature mismatch")
+        return None
+    if record['file'] != file_name:
+        result.errors.append(f"{file_name}@{offset}: checkpoint belongs to {record['file']}")
+        return None
+
+    result.checkpoints.append({
+        'offset': offset,
+        'end': offset + len(line),
+        'events': record['events'],
+        'chain': record['chain'],
+        'digest': hashlib.sha256(line).hexdigest()
+    })
+    return record
+
+
+def verify_range(path: str,
+                 start: int,
+                 end: int,
+                 limit: int,
+                 key: bytes,
+                 initial: Optional[Tuple[str, int]] = None) -> RangeResult:
+    """
+    Verify the chain segments of an audit file that begin within [start, end)
+
+    A range begins at its first checkpoint (whose signed chain hash and event count
+    seed the check) and runs past `end` up to the next checkpoint, so consecutive
+    ranges cover the file without overlap and can be checked in separate processes.
+
+    Args:
+        path: Audit file
+        start: First byte of the range
+        end: Byte where the next range begins
+        limit: File size to verify up to (bytes appended later are ignored)
+        key: Checkpoint signing key
+        initial: (chain, events) at `start` when it is the file start or a resume point
+
+    Returns:
+        RangeResult
+    """
+    file_name = os.path.basename(path)
+    result = RangeResult(start=start)
+
+    with open(path, 'rb') as f:
+        if initial is None:
+            # Skip to the first checkpoint beginning inside the range
+            f.seek(start - 1)
+            f.readline()
+            while True:
+                offset = f.tell()
+                if offset >= end or offset >= limit:
+                    return result
+                line = f.readline()
+                if line.startswith(CHECKPOINT_PREFIX):
+                    record = _check_checkpoint(line, offset, key, file_name, result)
+                    if record is None:
+                        return result
+                    chain, events = record['chain'], record['events']
+                    break
+        else:
+            f.seek(start)
+            chain, events = initial
+
+        result.started = True
+        result.start_chain = chain
+
+        while True:
+            offset = f.tell()
+            if offset >= limit:
+                break
+            line = f.readline()
+            if not line or offset + len(line) > limit:
+                break
+            if not line.endswith(b'\n'):
+                result.errors.append(f"{file_name}@{offset}: incomplete record")
+                break
+
+            if line.startswith(CHECKPOINT_PREFIX):
+                if offset >= end:
+                    result.stop_offset = offset
+                record = _check_checkpoint(line, offset, key, file_name, result)
+                if record is not None:
+                    if offset == 0:
+                        # Opening checkpoint: the chain continues from the previous file
+                        result.start_chain = record['chain']
+                        result.opening_checkpoint = True
+                    elif record['chain'] != chain or record['events'] != events:
+                        result.errors.append(
+                            f"{file_name}@{offset}: checkpoint does not match the chain "
+                            f"({events} events verified, {record['events']} recorded)"
+                        )
+                    chain, events = record['chain'], record['events']
+                if result.stop_offset is not None:
+                    break
+                continue
+
+            if not line.strip():
+                continue
+
+            try:
+                data = json.loads(line)
+                expected = compute_event_checksum(
+                    data['event_id'],
+                    data['timestamp'],
+                    data['event_type'],
+                    data['component'],
+                    data['message'],
+                    data['details'],
+                    chain
+                )
+            except (ValueError, KeyError, TypeError) as e:
+                result.errors.append(f"{file_name}@{offset}: malformed event ({e})")
+                continue
+
+            actual = data.get('checksum')
+            if expected != actual:
+                result.errors.append(f"{file_name}@{offset}: checksum mismatch for event {data.get('event_id')}")
+            # Continue from the recorded checksum so every altered event is reported
+            chain = actual or expected
+            events += 1
+            result.events_verified += 1
+
+    result.end_chain, result.end_events = chain, events
+    return result
+
+
+@dataclass
+class AuditFileVerification:
+    """Verification outcome for one audit file"""
+    file: str
+    events: int = 0
+    events_verified: int = 0
+    resumed_from: int = 0  # Byte offset verification resumed at (0 = whole file)
+    start_chain: Optional[str] = None
+    end_chain: Optional[str] = None
+    opening_checkpoint: bool = False
+    checkpoints: int = 0
+    errors: List[str] = field(default_factory=list)
+    state: Optional[Dict[str, Any]] = None  # Resume point to persist when the file verified
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    @property
+    def has_records(self) -> bool:
+        """False for a file opened and closed (or crashed) before its first complete record"""
+        return self.opening_checkpoint or self.events > 0
+
+
+@dataclass
+class AuditVerificationReport:
+    """Verification outcome for a set of audit files"""
+    files: List[AuditFileVerification]
+    duration_seconds: float = 0.0
+    workers: int = 1
+
+    @property
+    def ok(self) -> bool:
+        return all(result.ok for result in self.files)
+
+    @property
+    def errors(self) -> List[str]:
+        return [error for result in self.files for error in result.errors]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Summary for logs"""
+        return {
+            "ok": self.ok,
+            "files": len(self.files),
+            "events": sum(result.events for result in self.files),
+            "events_verified": sum(result.events_verified for result in self.files),
+            "files_resumed": sum(1 for result in self.files if result.resumed_from),
+            "errors": len(self.errors),
+            "duration_seconds": round(self.duration_seconds, 2),
+            "workers": self.workers
+        }
+
+
+def _resume_point(path: Path, size: int, entry: Optional[Dict[str, Any]], errors: List[str]) -> Optional[Dict[str, Any]]:
+    """Saved resume point of a file, if the checkpoint it anchors on is unchanged"""
+    if not entry:
+        return None
+
+    if size < entry['offset']:
+        errors.append(f"{path.name}: file shrank below its last verified checkpoint")
+        return None
+
+    with open(path, 'rb') as f:
+        f.seek(entry['checkpoint_offset'])
+        line = f.read(entry['offset'] - entry['checkpoint_offset'])
+    if hashlib.sha256(line).hexdigest() != entry['digest']:
+        errors.append(f"{path.name}@{entry['checkpoint_offset']}: verified checkpoint changed since last verification")
+        return None
+    return entry
+
+
+def _plan_file(path: Path, key: bytes, entry: Optional[Dict[str, Any]], chunk_bytes: int):
+    """Split the unverified part of a file into range tasks"""
+    verification = AuditFileVerification(file=path.name)
+    size = path.stat().st_size
+    resume = _resume_point(path, size, entry, verification.errors)
+
+    if resume:
+        start, initial = resume['offset'], (resume['chain'], resume['events'])
+        verification.resumed_from = start
+        verification.start_chain = resume['start_chain']
+        verification.opening_checkpoint = resume['opening_checkpoint']
+    else:
+        start, initial = 0, ("", 0)
+
+    tasks = []
+    for range_start in range(start, size, max(1, chunk_bytes)):
+        range_end = min(range_start + chunk_bytes, size)
+        tasks.append((str(path), range_start, range_end, size, key, initial if range_start == start else None))
+
+    if not tasks:
+        # Nothing appended since the last verification
+        verification.end_chain, verification.events = initial
+    return verification, resume, tasks
+
+
+def _assemble(verification: AuditFileVerification, resume: Optional[Dict[str, Any]], results: List[RangeResult]):
+    """Check that the range results cover the file and build its resume point"""
+    results = sorted(results, key=lambda r: r.start)
+    ranges = [result for result in results if result.started]
+    checkpoints = {}
+
+    for result in results:
+        # A bad checkpoint between two ranges is reported by both
+        verification.errors.extend(error for error in result.errors if error not in verification.errors)
+
+    for index, result in enumerate(ranges):
+        verification.events_verified += result.events_verified
+        for checkpoint in result.checkpoints:
+            checkpoints[checkpoint['offset']] = checkpoint
+
+        following = ranges[index + 1] if index + 1 < len(ranges) else None
+        if following is not None and result.stop_offset != following.checkpoints[0]['offset']:
+            verification.errors.append(f"{verification.file}@{result.start}: verification ranges do not meet")
+
+    if ranges:
+        if not resume:
+            verification.start_chain = ranges[0].start_chain
+            verification.opening_checkpoint = ranges[0].opening_checkpoint
+        verification.end_chain, verification.events = ranges[-1].end_chain, ranges[-1].end_events
+    verification.checkpoints = len(checkpoints)
+
+    if verification.ok:
+        verification.state = dict(resume) if resume else None
+        if checkpoints:
+            last = checkpoints[max(checkpoints)]
+            verification.state = {
+                'checkpoint_offset': last['offset'],
+                'offset': last['end'],
+                'digest': last['digest'],
+                'chain': last['chain'],
+                'events': last['events'],
+                'start_chain': verification.start_chain,
+                'opening_checkpoint': verification.opening_checkpoint
+            }
+
+
+def _run_ranges(tasks: List[Tuple], workers: int) -> List[RangeResult]:
+    if workers <= 1 or len(tasks) <= 1:
+        return [verify_range(*task) for task in tasks]
+
+    # Spawned workers do not inherit the audit writer thread or its locks
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(tasks)),
+        mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        return list(executor.map(verify_range, *zip(*tasks)))
+
+
+def _resolve_workers(workers: Optional[int]) -> int:
+    workers = settings.audit_verify_workers if workers is None else workers
+    return workers or os.cpu_count() or 1
+
+
+def _verify_files(paths: List[Path],
+                  key: bytes,
+                  workers: int,
+                  state: Dict[str, Any],
+                  chunk_bytes: int) -> List[AuditFileVerification]:
+    """Verify several files with one pool, so small files do not serialize the run"""
+    plans = [_plan_file(path, key, state.get(path.name), chunk_bytes) for path in paths]
+    tasks = [task for _, _, file_tasks in plans for task in file_tasks]
+    results = _run_ranges(tasks, workers)
+
+    verifications = []
+    position = 0
+    for verification, resume, file_tasks in plans:
+        file_results = results[position:position + len(file_tasks)]
+        position += len(file_tasks)
+        if file_tasks:
+            _assemble(verification, resume, file_results)
+        else:
+            verification.state = resume
+        verifications.append(verification)
+    return verifications
+
+
+def verify_audit_file(path: Path,
+                      key: Optional[bytes] = None,
+                      workers: Optional[int] = None,
+                      chunk_bytes: int = VERIFY_CHUNK_BYTES) -> AuditFileVerification:
+    """
+    Verify the checksum chain and signed checkpoints of one audit file
+
+    Args:
+        path: Audit file
+        key: Checkpoint signing key (defaults to the configured one)
+        workers: Verification processes (defaults to settings.audit_verify_workers)
+        chunk_bytes: Bytes per verification task
+
+    Returns:
+        AuditFileVerification
+    """
+    return _verify_files([Path(path)], key or get_checkpoint_key(), _resolve_workers(workers), {}, chunk_bytes)[0]
+
+
+def verify_audit_history(audit_dir: Path,
+                         key: Optional[bytes] = None,
+                         workers: Optional[int] = None,
+                         full: bool = False,
+                         state_path: Optional[Path] = None,
+                         chunk_bytes: int = VERIFY_CHUNK_BYTES) -> AuditVerificationReport:
+    """
+    Verify every audit file in a directory and the links between consecutive files
+
+    Only what was appended after each file's last verified checkpoint is checked
+    (plus the unsealed tail after it); the resume points are saved for the next run.
+    Each writer slot keeps its own chain, so every file is linked to the previous
+    file of the same writer that holds records. Files without an opening checkpoint
+    predate checkpointing and are verified on their own, each chain starting empty.
+
+    Args:
+        audit_dir: Directory holding audit_*.jsonl files
+        key: Checkpoint signing key (defaults to the configured one)
+        workers: Verification processes (defaults to settings.audit_verify_workers)
+        full: Ignore saved resume points and verify everything
+        state_path: Resume state file (defaults to verification_state.json in audit_dir)
+        chunk_bytes: Bytes per verification task
+
+    Returns:
+        AuditVerificationReport
+    """
+    started = time.perf_counter()
+    audit_dir = Path(audit_dir)
+    state_path = Path(state_path) if state_path else audit_dir / STATE_FILE_NAME
+    workers = _resolve_workers(workers)
+
+    state: Dict[str, Any] = {}
+    if not full and state_path.exists():
+        try:
+            state = json.loads(state_path.read_text())
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable audit verification state {state_path}: {e}")
+
+    paths = sorted(audit_dir.glob("audit_*.jsonl"))
+    verifications = _verify_files(paths, key or get_checkpoint_key(), workers, state, chunk_bytes)
+
+    # Each file must continue its writer's chain where the writer's previous file ended
+    previous_by_writer: Dict[str, AuditFileVerification] = {}
+    for current in verifications:
+        if not current.has_records:
+            continue
+        writer = audit_file_writer(current.file)
+        previous = previous_by_writer.get(writer)
+        if (current.opening_checkpoint and previous is not None and previous.end_chain is not None
+                and current.start_chain != previous.end_chain):
+            current.errors.append(f"{current.file}: chain does not continue from {previous.file}")
+            current.state = None
+        previous_by_writer[writer] = current
+
+    new_state = {
+        verification.file: verification.state
+        for verification in verifications if verification.ok and verification.state
+    }
+    try:
+        temp_path = state_path.with_name(state_path.name + ".tmp")
+        temp_path.write_text(json.dumps(new_state, indent=2, sort_keys=True))
+        os.replace(temp_path, state_path)
+    except OSError as e:
+        logger.error(f"Failed to save audit verification state {state_path}: {e}")
+
+    report = AuditVerificationReport(
+        files=verifications,
+        duration_seconds=time.perf_counter() - started,
+        workers=workers
+    )
+    if report.ok:
+        logger.info(f"Audit history verified: {report.to_dict()}")
+    else:
+        logger.error(f"Audit history verification failed: {report.to_dict()}")
+    return report
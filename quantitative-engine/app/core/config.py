@@ -37,10 +37,27 @@ class Settings(BaseSettings):
     rpc_burst_limit: int = 100  # Allow larger bursts for premium
     rpc_cache_ttl_seconds: int = 15  # Shorter cache for fresher data
     rpc_retry_delay_seconds: float = 0.5  # Shorter retry delay
+    rpc_provider_rate_limits: str = ""  # Per-provider budgets overriding the defaults, "host=rate:burst,..."
+    # Rate limits above are the provider's budget for the whole deployment, but each process keeps its own
+    # token buckets. Every bucket gets 1/N of the rate and burst, where N is the number of processes calling
+    # the provider (API workers + Celery worker --concurrency across all hosts)
+    rpc_rate_limit_processes: int = 1
+    rpc_method_weights: str = "getProgramAccounts=10"  # Token cost per RPC method (others cost 1), "method=weight,..."
+    rpc_batch_item_weight: float = 0.0  # Extra tokens per call inside a JSON-RPC batch (1.0 for providers that meter each batched call)
+    rpc_transaction_transport: str = "batch"  # getTransaction transport: "batch" (JSON-RPC batch POSTs) or "individual"
+    rpc_max_batch_size: int = 100  # getTransaction calls per JSON-RPC batch (reduced automatically if rejected)
+    transaction_cache_enabled: bool = True  # Serve finalized getTransaction payloads from the shared on-disk cache
+    transaction_cache_dir: str = "data/transaction_cache"  # Segment and index files, shared by every process on the host
+    transaction_cache_segment_max_bytes: int = 256 * 1024 * 1024  # Start a new segment file past this size
+    transaction_cache_compression_level: int = 6  # zlib level for cached payloads (0 = store uncompressed)
+    transaction_cache_min_age_seconds: float = 60.0  # A "confirmed" transaction is cached once its block is this old
     
     # Price Data APIs
     coingecko_api_key: Optional[str] = None
     jupiter_api_url: str = "https://price.jup.ag/v6"
+    price_store_dir: str = "data/price_store"  # Persistent per-mint price series ("" = memory only)
+    price_store_range_days: int = 90  # Width of one aligned range fetch
+    price_store_max_gap_seconds: int = 21600  # Longest hole between stored points that is interpolated across (above the hourly spacing of <=90-day ranges)
     
     # Logging Configuration
     log_level: str = "INFO"
@@ -50,20 +67,51 @@ class Settings(BaseSettings):
     workers: int = 4
     max_concurrent_workers: int = 2
     task_timeout_seconds: int = 3600
+    ingestion_chunk_size: int = 8  # Wallets per process_wallet_batch task when a scheduled run fans out (its in-task concurrency)
+    ingestion_streaming: bool = True  # Stream signature pages -> transaction fetches -> parser instead of materializing each stage
+    ingestion_pipeline_queue_size: int = 4  # Batches buffered between pipeline stages (bounds per-wallet memory)
+    ingestion_pipeline_fetch_concurrency: int = 2  # Transaction batches fetched concurrently per wallet
+    parser_process_workers: int = 4  # Process pool size for parsing large transaction batches (0 or 1 = parse in the calling thread)
+    parser_process_min_transactions: int = 300  # Smaller parse batches stay in-process
+    parser_process_chunk_size: int = 100  # Transactions shipped to a pool worker per task
+    ingestion_prefilter_enabled: bool = True  # Drop failed and known non-swap signatures before fetching their transactions
+    signature_filter_path: str = "data/signature_filter.bin"  # Persisted bloom filter of (wallet, signature) pairs that yielded no swap ("" = memory only)
+    signature_filter_capacity: int = 2_000_000  # Learned pairs before the filter is cleared to keep false positives rare
+    signature_filter_error_rate: float = 0.0001  # Bloom false-positive rate; each false positive skips a real swap
     
     # Scheduling Configuration  
     ingestion_schedule_hours: int = 4  # Run every 4 hours for active monitoring
+    ingestion_cursor_enabled: bool = True  # Resume scheduled runs from each wallet's newest processed signature instead of the lookback window
     
     # Data Validation Configuration
     max_transactions_per_wallet: int = 100000  # Increased for high-frequency traders
     transaction_threshold: int = 50000  # Increased threshold - only sample for VERY high volume
     num_samples_per_day: int = 100  # Increased samples - capture more transactions per day
+    sampling_min_samples_per_day: int = 10  # Every active day of a sampled backfill contributes at least this many
+    sampling_max_samples_per_day: int = 1000  # Per-day reservoir kept while scanning, and the most samples one day can get
+    sampling_max_scan_pages: int = 1000  # Sequential signature pages (1000 each) scanned once a backfill is known to be sampled; windows busier than this are sampled from their newest part
     min_trade_value_usd: float = 1.0
     supported_tokens: str = "SOL,USDC,USDT,RAY,BONK,JUP,WIF,POPCAT,PEPE,MOODENG,GOAT,PNUT,ACT,FIDA,SRM,ORCA,SAMO,COPE,STEP,MEDIA,ROPE,ATLAS,STAR,GRAPE,SLIM,GME,WOOF,SLRS,POLIS,SHDW,MNGO,TULIP,PORT,LIQ,BSKT,CRWNY,KING,BASIS,MAPS,UXD,SUNNY,SBR,AURY,MEAN,SOCN,NINJA,JSOL,MSOL,STSOL,DXBL,REAL,PRT,DIP,LIKE,GST,GMT,CHEEMS,DOGE,SHIB,APT,BTC,ETH,BNB,ADA,AVAX,DOT,MATIC,LINK,UNI,ICP,NEAR,ALGO,FTM,XLM,VET,ETC,FIL,HBAR,EGLD,XTZ,THETA,MANA,SAND,CAKE,KLAY,MIOTA,BTT,ENJ,CHZ,BAT,SUSHI,YFI,COMP,MKR,AAVE,SNX,CRV,1INCH,ZRX,REN,LRC,KNC,BAL,UMA"
     
     # Monitoring Configuration
     prometheus_port: int = 9090
     health_check_interval: int = 30
+    api_access_log_sample_rate: float = 0.01  # Share of API requests written to the access log (5xx and failed requests are always logged)
+    system_metrics_interval_seconds: float = 30.0  # How often the sampler thread publishes CPU, RSS, fds, loop lag and GC pauses
+    event_loop_lag_probe_interval_seconds: float = 0.5  # How often the sampler thread probes the API event loop for lag (0 = off)
+    loop_instrumentation_enabled: bool = False  # Opt-in: log slow event loop callbacks and serve the /debug/profile sampling profiler
+    slow_callback_threshold_ms: float = 100.0  # Event loop callbacks running longer than this are logged with their stacks
+    profiler_max_seconds: float = 60.0  # Longest profile /debug/profile will take
+    profiler_sample_interval_ms: float = 5.0  # Stack sampling period of the on-demand profiler
+    
+    # Audit Logging Configuration
+    audit_flush_interval_ms: float = 20.0  # Group-commit window: audit events queued within it share one write and fsync
+    audit_max_batch_events: int = 1000  # A batch this large is committed without waiting out the window
+    audit_max_pending_events: int = 10000  # Audit events queued for the writer at most; log_event waits for room beyond that
+    audit_enqueue_timeout_seconds: float = 5.0  # How long log_event waits for room in a full queue before failing
+    audit_checkpoint_interval: int = 10000  # Signed chain checkpoint written every N audit events (0 = off)
+    audit_checkpoint_key: str = ""  # HMAC key signing audit checkpoints ("" = secret_key)
+    audit_verify_workers: int = 0  # Processes verifying audit log segments (0 = one per CPU)
     
     # Rate Limiting Configuration
     rpc_requests_per_second: int = 10
@@ -94,6 +142,18 @@ class Settings(BaseSettings):
     metrics_rolling_period_days: int = 90
     risk_free_rate_annual: float = 0.02  # 2% annual risk-free rate
     metrics_precision_places: int = 28
+    metrics_engine: str = "decimal"  # Default backend: "decimal" (audit), "vectorized" (NumPy) or "incremental" (rolling state)
+    ranking_metrics_engine: str = "vectorized"  # Backend used by batch Trust Score ranking runs
+    metrics_process_workers: int = 0  # Process pool size for batch metrics (0 or 1 = single event loop)
+    metrics_process_min_wallets: int = 200  # Smaller batches stay in-process
+    leaderboard_streaming_min_wallets: int = 1000  # Leaderboards this large consume scores as a stream
+    scoring_chunk_size: int = 500  # Wallets a batch Trust Score run values (and caches valuations for) at once
+    rolling_state_dir: str = "data/rolling_state"  # Persisted per-wallet state for the "incremental" engine ("" = memory only)
+    
+    # Ranked Traders API Configuration
+    ranked_traders_snapshot_enabled: bool = True  # Serve /internal/ranked-traders from the in-memory ranking snapshot
+    ranked_traders_snapshot_refresh_seconds: float = 30.0  # How often to check for a newer ranking calculation
+    ranked_traders_snapshot_max_buckets: int = 64  # Distinct (limit, min_trust_score) responses kept serialized
     
     @validator('supported_tokens')
     def parse_supported_tokens(cls, v):
@@ -102,6 +162,22 @@ class Settings(BaseSettings):
             return [token.strip().upper() for token in v.split(',')]
         return v
     
+    @validator('metrics_engine', 'ranking_metrics_engine')
+    def validate_metrics_engine(cls, v):
+        """Validate metrics engine setting"""
+        valid_engines = ['decimal', 'vectorized', 'incremental']
+        if v.lower() not in valid_engines:
+            raise ValueError(f'Metrics engine must be one of: {valid_engines}')
+        return v.lower()
+    
+    @validator('rpc_transaction_transport')
+    def validate_rpc_transaction_transport(cls, v):
+        """Validate getTransaction transport setting"""
+        valid_transports = ['batch', 'individual']
+        if v.lower() not in valid_transports:
+            raise ValueError(f'RPC transaction transport must be one of: {valid_transports}')
+        return v.lower()
+    
     @validator('environment')
     def validate_environment(cls, v):
         """Validate environment setting"""
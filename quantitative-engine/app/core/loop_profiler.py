@@ -0,0 +1,246 @@
+"""
+XORJ Quantitative Engine - NFR-3: Event Loop Profiling
+Opt-in slow-callback detection and an on-demand sampling profiler for the API event loop
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, deque
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from .config import get_settings
+from .logging import get_metrics_logger
+from .observability import MetricsCollector, get_metrics_collector
+
+logger = get_metrics_logger()
+settings = get_settings()
+
+MAX_STACK_DEPTH = 64
+
+_original_handle_run = asyncio.events.Handle._run
+_active_monitor: Optional["SlowCallbackMonitor"] = None
+
+
+@lru_cache(maxsize=4096)
+def _short_filename(filename: str) -> str:
+    """Path relative to the sys.path entry it was imported from"""
+    for prefix in sorted((p for p in sys.path if p), key=len, reverse=True):
+        if filename.startswith(prefix + os.sep):
+            return filename[len(prefix) + 1:]
+    return filename
+
+
+def format_stack(frame, limit: int = MAX_STACK_DEPTH) -> List[str]:
+    """Frames from the outermost call to `frame`, as "file:line in function" strings"""
+    return [
+        f"{_short_filename(summary.filename)}:{summary.lineno} in {summary.name}"
+        for summary in traceback.extract_stack(frame, limit=limit)
+    ]
+
+
+def collapse_stack(frame, limit: int = MAX_STACK_DEPTH) -> str:
+    """Frame labels root first, joined by semicolons (one line of a collapsed-stack profile)"""
+    labels = []
+    while frame is not None and len(labels) < limit:
+        code = frame.f_code
+        labels.append(f"{code.co_name} ({_short_filename(code.co_filename)}:{frame.f_lineno})")
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+def describe_callback(handle: asyncio.Handle) -> Dict[str, Any]:
+    """What an event loop handle runs: the task and its coroutine stack, or the plain callback"""
+    callback = handle._callback
+    owner = getattr(callback, '__self__', None)
+
+    if isinstance(owner, asyncio.Task):
+        coroutine = owner.get_coro()
+        return {
+            "task": owner.get_name(),
+            "coroutine": getattr(coroutine, '__qualname__', repr(coroutine)),
+            # Where the task is suspended now that the slow step has returned
+            "coroutine_stack": [
+                f"{_short_filename(frame.f_code.co_filename)}:{frame.f_lineno} in {frame.f_code.co_name}"
+                for frame in owner.get_stack(limit=MAX_STACK_DEPTH)
+            ]
+        }
+    return {"callback": getattr(callback, '__qualname__', repr(callback))}
+
+
+def _timed_handle_run(handle: asyncio.Handle):
+    """asyncio Handle._run, timed on the monitored loop's thread"""
+    monitor = _active_monitor
+    if monitor is None or threading.get_ident() != monitor.thread_id:
+        return _original_handle_run(handle)
+
+    current = (handle, time.perf_counter())
+    monitor._current = current
+    try:
+        return _original_handle_run(handle)
+    finally:
+        monitor._current = None
+        monitor._finished(current)
+
+
+class SlowCallbackMonitor:
+    """
+    Logs event loop callbacks that run longer than a threshold
+
+    Each callback on the monitored loop is timed (two perf_counter calls). A
+    watchdog thread checks what the loop is running, and once a callback passes
+    the threshold it captures the loop thread's actual stack, i.e. the code that
+    is blocking, which the log entry carries along with the task's coroutine stack.
+    """
+
+    def __init__(self,
+                 threshold_ms: Optional[float] = None,
+                 metrics_collector: MetricsCollector = None,
+                 max_recent: int = 100):
+        self.threshold = (threshold_ms or settings.slow_callback_threshold_ms) / 1000
+        self.metrics_collector = metrics_collector or get_metrics_collector()
+        self.thread_id: Optional[int] = None
+        self.slow_callbacks = 0
+        self.recent: Deque[Dict[str, Any]] = deque(maxlen=max_recent)
+
+        self._current: Optional[Tuple[asyncio.Handle, float]] = None
+        self._captured: Optional[Tuple[Tuple[asyncio.Handle, float], List[str]]] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    @property
+    def installed(self) -> bool:
+        return _active_monitor is self
+
+    def install(self):
+        """Start monitoring the event loop running in the calling thread"""
+        global _active_monitor
+
+        self.thread_id = threading.get_ident()
+        _active_monitor = self
+        asyncio.events.Handle._run = _timed_handle_run
+
+        if self._watchdog is None or not self._watchdog.is_alive():
+            self._stop.clear()
+            self._watchdog = threading.Thread(target=self._watch, name="slow-callback-watchdog", daemon=True)
+            self._watchdog.start()
+
+        logger.info("Slow callback monitor installed", threshold_ms=self.threshold * 1000)
+
+    def uninstall(self):
+        """Stop monitoring and restore asyncio's Handle._run"""
+        global _active_monitor
+
+        if _active_monitor is self:
+            _active_monitor = None
+            asyncio.events.Handle._run = _original_handle_run
+
+        self._stop.set()
+        if self._watchdog is not None:
+            self._watchdog.join(5.0)
+            self._watchdog = None
+
+    def _watch(self):
+        interval = max(self.threshold / 2, 0.005)
+        while not self._stop.wait(interval):
+            current = self._current
+            if current is None or time.perf_counter() - current[1] < self.threshold:
+                continue
+            if self._captured is not None and self._captured[0] is current:
+                continue
+
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = format_stack(frame)
+            if self._current is current:
+                self._captured = (current, stack)
+
+    def _finished(self, current: Tuple[asyncio.Handle, float]):
+        duration = time.perf_counter() - current[1]
+        if duration < self.threshold:
+            return
+
+        captured = self._captured
+        blocking_stack = captured[1] if captured is not None and captured[0] is current else None
+        self._report(current[0], duration, blocking_stack)
+
+    def _report(self, handle: asyncio.Handle, duration: float, blocking_stack: Optional[List[str]]):
+        entry = {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "duration_ms": round(duration * 1000, 2),
+            **describe_callback(handle),
+            "blocking_stack": blocking_stack
+        }
+        self.slow_callbacks += 1
+        self.recent.append(entry)
+        self.metrics_collector.record_slow_callback(duration)
+
+        logger.warning("Slow event loop callback", **entry)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        return {
+            "installed": self.installed,
+            "threshold_ms": self.threshold * 1000,
+            "slow_callbacks": self.slow_callbacks,
+            "recent": list(self.recent)
+        }
+
+
+class StackSampler:
+    """
+    Sampling profiler producing collapsed stacks
+
+    Samples the stacks of running threads from its own thread at a fixed interval;
+    the output ("frame;frame;frame count" per line) feeds flamegraph.pl, speedscope
+    or inferno directly.
+    """
+
+    def __init__(self, thread_id: Optional[int] = None, interval_ms: Optional[float] = None):
+        self.thread_id = thread_id  # Only this thread (None = every thread)
+        self.interval = (interval_ms or settings.profiler_sample_interval_ms) / 1000
+
+    def profile(self, seconds: float) -> Tuple[Counter, int]:
+        """
+        Sample stacks for a number of seconds (blocks the calling thread)
+
+        Returns:
+            (count per collapsed stack, number of sampling rounds)
+        """
+        own_thread = threading.get_ident()
+        stacks: Counter = Counter()
+        rounds = 0
+        deadline = time.monotonic() + seconds
+
+        while time.monotonic() < deadline:
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_thread or (self.thread_id is not None and thread_id != self.thread_id):
+                    continue
+                stacks[collapse_stack(frame)] += 1
+            rounds += 1
+            time.sleep(self.interval)
+
+        return stacks, rounds
+
+
+def format_collapsed(stacks: Counter) -> str:
+    """Collapsed-stack text, hottest stacks first"""
+    return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+# Global monitor instance
+_slow_callback_monitor: Optional[SlowCallbackMonitor] = None
+
+
+def get_slow_callback_monitor(metrics_collector: MetricsCollector = None) -> SlowCallbackMonitor:
+    """Get the process-wide slow callback monitor (installed by the metrics middleware when enabled)"""
+    global _slow_callback_monitor
+
+    if _slow_callback_monitor is None:
+        _slow_callback_monitor = SlowCallbackMonitor(metrics_collector=metrics_collector)
+    return _slow_callback_monitor
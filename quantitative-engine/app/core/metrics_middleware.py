@@ -3,144 +3,193 @@ XORJ Quantitative Engine - NFR-3: Metrics Middleware
 FastAPI middleware for automatic metrics collection and observability
 """
 
+import re
 import time
 import psutil
+import random
 import asyncio
-from typing import Callable, Dict, Any
+import threading
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timezone
-from fastapi import FastAPI, Request, Response
-from fastapi.middleware.base import BaseHTTPMiddleware
+from fastapi import FastAPI, HTTPException, Query, Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import structlog
 
-from .observability import get_metrics_collector, observe_operation, MetricsCollector
+from .observability import get_metrics_collector, observe_operation, start_metrics_server, MetricsCollector
 from .logging import get_metrics_logger
+from .config import get_settings
+from .system_sampler import get_system_sampler
+from .loop_profiler import StackSampler, format_collapsed, get_slow_callback_monitor
 
 logger = get_metrics_logger()
+settings = get_settings()
 
+UNMATCHED_ROUTE = "unmatched"  # Metrics label for requests no route matched (404s)
 
-class MetricsMiddleware(BaseHTTPMiddleware):
+
+class MetricsMiddleware:
     """
-    NFR-3: FastAPI middleware for automatic observability metrics collection
+    NFR-3: ASGI middleware for automatic observability metrics collection
+    
+    A plain ASGI layer (no BaseHTTPMiddleware request/response wrapping), so the
+    per-request cost is a few microseconds: the metrics label is the matched route's
+    path template, looked up by endpoint in a table built once from the router; the
+    Prometheus label children are bound once per method/route/status; and only a
+    sample of successful requests is written to the access log.
     """
     
-    def __init__(self, app: FastAPI, metrics_collector: MetricsCollector = None):
-        super().__init__(app)
+    def __init__(self,
+                 app: ASGIApp,
+                 metrics_collector: MetricsCollector = None,
+                 access_log_sample_rate: Optional[float] = None):
+        self.app = app
         self.metrics_collector = metrics_collector or get_metrics_collector()
+        self.access_log_sample_rate = (
+            settings.api_access_log_sample_rate if access_log_sample_rate is None else access_log_sample_rate
+        )
         self.start_time = datetime.now(timezone.utc)
         
+        self._route_templates: Dict[Any, str] = {}  # Endpoint -> path template
+        self._shared_routes: Dict[Any, List[Tuple[re.Pattern, str]]] = {}  # Endpoint serving several paths -> (path regex, template)
+        
         # Start system metrics collection
-        self._system_metrics_task = None
+        self.system_sampler = get_system_sampler(self.metrics_collector)
         self._start_system_monitoring()
         
-        logger.info("Metrics middleware initialized")
+        logger.info("Metrics middleware initialized", access_log_sample_rate=self.access_log_sample_rate)
     
     def _start_system_monitoring(self):
-        """Start background task for system metrics collection"""
-        async def collect_system_metrics():
-            while True:
-                try:
-                    # Collect system metrics
-                    memory_usage_mb = psutil.virtual_memory().used / (1024 * 1024)
-                    cpu_usage_percent = psutil.cpu_percent(interval=1)
-                    
-                    self.metrics_collector.record_system_metrics(memory_usage_mb, cpu_usage_percent)
-                    
-                    # Sleep for 30 seconds before next collection
-                    await asyncio.sleep(30)
-                    
-                except Exception as e:
-                    logger.error("Error collecting system metrics", error=str(e))
-                    await asyncio.sleep(60)  # Wait longer on error
-        
-        # Schedule the system metrics collection
+        """Start the system metrics sampler thread (nothing is sampled on the event loop)"""
+        self.system_sampler.start()
         try:
-            loop = asyncio.get_event_loop()
-            self._system_metrics_task = loop.create_task(collect_system_metrics())
+            self._attach_event_loop(asyncio.get_running_loop())
         except RuntimeError:
-            # No event loop running yet, will start later
+            # No event loop running yet; attached on the first request
             pass
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    def _attach_event_loop(self, loop: asyncio.AbstractEventLoop):
+        """Point lag probing (and, when enabled, slow callback monitoring) at the request loop"""
+        self.system_sampler.attach_loop(loop)
+        if settings.loop_instrumentation_enabled:
+            get_slow_callback_monitor(self.metrics_collector).install()
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
         """Process request and collect metrics"""
-        start_time = time.time()
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
         
-        # Extract request information
-        method = request.method
-        path = request.url.path
+        start_time = time.perf_counter()
         
-        # Normalize path for metrics (remove dynamic segments)
-        normalized_path = self._normalize_path(path)
+        if self.system_sampler.loop is None:
+            self._attach_event_loop(asyncio.get_running_loop())
         
-        response = None
         status_code = 500  # Default to error
         
+        async def send_with_status(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+        
+        error = None
         try:
             # Process the request
-            response = await call_next(request)
-            status_code = response.status_code
+            await self.app(scope, receive, send_with_status)
             
         except Exception as e:
-            # Record error metrics
-            error_type = type(e).__name__
-            self.metrics_collector.record_error(error_type.lower(), "api")
-            
-            logger.error(
-                "API request error",
-                method=method,
-                path=path,
-                error=str(e),
-                error_type=error_type
-            )
+            error = e
             raise
             
         finally:
             # Calculate request duration
-            duration_seconds = time.time() - start_time
+            duration_seconds = time.perf_counter() - start_time
             
-            # Record API metrics
-            self.metrics_collector.record_api_request(
-                method=method,
-                endpoint=normalized_path,
-                status_code=status_code,
-                duration_seconds=duration_seconds
-            )
+            # Record API metrics (the route is known once the router has matched it)
+            method = scope["method"]
+            self.metrics_collector.api_request_recorder(
+                method, self._route_template(scope), status_code
+            ).record(duration_seconds)
             
-            # Log request details
-            logger.info(
-                "API request completed",
-                method=method,
-                path=path,
-                status_code=status_code,
-                duration_ms=round(duration_seconds * 1000, 2)
-            )
+            if error is not None:
+                # Record error metrics
+                error_type = type(error).__name__
+                self.metrics_collector.record_error(error_type.lower(), "api")
+                
+                logger.error(
+                    "API request error",
+                    method=method,
+                    path=scope["path"],
+                    error=str(error),
+                    error_type=error_type
+                )
+            elif status_code >= 500 or random.random() < self.access_log_sample_rate:
+                # Log request details
+                logger.info(
+                    "API request completed",
+                    method=method,
+                    path=scope["path"],
+                    status_code=status_code,
+                    duration_ms=round(duration_seconds * 1000, 2),
+                    sample_rate=1.0 if status_code >= 500 else self.access_log_sample_rate
+                )
+    
+    def _route_template(self, scope: Scope) -> str:
+        """Metrics label for a handled request: its route's path template"""
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            # No route matched (404s): one label however many paths are requested
+            return UNMATCHED_ROUTE
+        
+        template = self._route_templates.get(endpoint)
+        if template is not None:
+            return template
         
-        return response
+        shared_routes = self._shared_routes.get(endpoint)
+        if shared_routes is None:
+            # First request to this endpoint (or routes added since the table was built)
+            self._load_route_templates(scope.get("router"))
+            template = self._route_templates.get(endpoint)
+            if template is not None:
+                return template
+            shared_routes = self._shared_routes.setdefault(endpoint, [])
+        
+        # The endpoint serves several paths: the template of the one the request matched
+        path = scope["path"]
+        for path_regex, path_format in shared_routes:
+            if path_regex.match(path):
+                return path_format
+        return UNMATCHED_ROUTE
     
-    def _normalize_path(self, path: str) -> str:
-        """Normalize API paths for consistent metrics"""
-        # Remove query parameters
-        if '?' in path:
-            path = path.split('?')[0]
+    def _load_route_templates(self, router: Any):
+        """Rebuild the endpoint -> path template table from the router (and mounted sub-routers)"""
+        endpoint_routes: Dict[Any, List[Tuple[re.Pattern, str]]] = {}
         
-        # Replace dynamic segments with placeholders
-        # This is a simple implementation - can be enhanced based on routing patterns
-        path_parts = path.split('/')
-        normalized_parts = []
+        def collect(routes: List[Any], prefix: str):
+            for route in routes:
+                path_format = prefix + getattr(route, "path_format", "")
+                sub_routes = getattr(route, "routes", None)
+                if sub_routes is not None:
+                    collect(sub_routes, path_format)
+                    continue
+                endpoint = getattr(route, "endpoint", None)
+                path_regex = getattr(route, "path_regex", None)
+                if endpoint is None or path_regex is None:
+                    continue
+                # Mounted routes match the path left after their mount prefix, which is
+                # what the request scope holds once routed
+                endpoint_routes.setdefault(endpoint, []).append((path_regex, path_format))
         
-        for part in path_parts:
-            # Replace wallet addresses (typically long alphanumeric strings)
-            if len(part) > 20 and part.isalnum():
-                normalized_parts.append('{wallet_address}')
-            # Replace UUIDs
-            elif len(part) == 36 and '-' in part:
-                normalized_parts.append('{id}')
-            # Replace numeric IDs
-            elif part.isdigit():
-                normalized_parts.append('{id}')
+        collect(getattr(router, "routes", []), "")
+        templates: Dict[Any, str] = {}
+        shared_routes: Dict[Any, List[Tuple[re.Pattern, str]]] = {}
+        for endpoint, routes in endpoint_routes.items():
+            if len({path_format for _, path_format in routes}) == 1:
+                templates[endpoint] = routes[0][1]
             else:
-                normalized_parts.append(part)
-        
-        return '/'.join(normalized_parts)
+                shared_routes[endpoint] = routes
+        self._route_templates = templates
+        self._shared_routes = shared_routes
 
 
 class HealthMetricsCollector:
@@ -262,8 +311,7 @@ def create_metrics_endpoints(app: FastAPI, metrics_collector: MetricsCollector =
             "prometheus_enabled": collector.enable_prometheus,
             "datadog_enabled": collector.enable_datadog,
             "system_info": {
-                "memory_usage_mb": psutil.virtual_memory().used / (1024 * 1024),
-                "cpu_usage_percent": psutil.cpu_percent(),
+                **get_system_sampler(collector).latest,
                 "disk_usage_percent": psutil.disk_usage('/').percent
             },
             "uptime_seconds": (datetime.now(timezone.utc) - collector._current_metrics.timestamp).total_seconds()
@@ -272,12 +320,78 @@ def create_metrics_endpoints(app: FastAPI, metrics_collector: MetricsCollector =
     logger.info("Observability endpoints created", endpoints=["/metrics", "/metrics/summary", "/health/metrics", "/debug/metrics"])
 
 
-def setup_observability(app: FastAPI) -> MetricsCollector:
+# One on-demand profile at a time
+_profile_lock = threading.Lock()
+
+
+def create_profiling_endpoints(app: FastAPI,
+                               metrics_collector: MetricsCollector = None,
+                               dependencies: Optional[List[Any]] = None):
+    """
+    Add opt-in event loop profiling endpoints to FastAPI application
+    
+    The endpoints expose stacks and timings of the running process, so they are
+    only registered behind at least one guard dependency.
+    
+    Args:
+        app: FastAPI application instance
+        metrics_collector: Collector the slow callback monitor reports to
+        dependencies: Route dependencies guarding the endpoints (e.g. API key verification)
+    
+    Raises:
+        ValueError: If no guard dependency is given
+    """
+    if not dependencies:
+        raise ValueError("Profiling endpoints require a guard dependency (e.g. Depends(verify_api_key))")
+    
+    monitor = get_slow_callback_monitor(metrics_collector)
+    
+    @app.get("/debug/profile", include_in_schema=False, dependencies=dependencies)
+    async def sampling_profile(
+        seconds: float = Query(10.0, gt=0),
+        all_threads: bool = Query(False, description="Sample every thread, not only the event loop's")
+    ):
+        """Sample stacks for N seconds and return them as collapsed stacks (flamegraph input)"""
+        if seconds > settings.profiler_max_seconds:
+            raise HTTPException(status_code=400, detail=f"seconds must be at most {settings.profiler_max_seconds}")
+        if not _profile_lock.acquire(blocking=False):
+            raise HTTPException(status_code=409, detail="A profile is already being taken")
+        
+        try:
+            # This handler runs on the loop thread; sampling happens in an executor thread
+            sampler = StackSampler(thread_id=None if all_threads else threading.get_ident())
+            stacks, rounds = await asyncio.get_running_loop().run_in_executor(None, sampler.profile, seconds)
+        finally:
+            _profile_lock.release()
+        
+        logger.info("Sampling profile taken", seconds=seconds, rounds=rounds, distinct_stacks=len(stacks))
+        return Response(
+            content=format_collapsed(stacks),
+            media_type="text/plain; charset=utf-8",
+            headers={"X-Profile-Samples": str(rounds), "X-Profile-Interval-Ms": str(sampler.interval * 1000)}
+        )
+    
+    @app.get("/debug/slow-callbacks", include_in_schema=False, dependencies=dependencies)
+    async def slow_callbacks():
+        """Recent event loop callbacks that exceeded the slow callback threshold"""
+        return monitor.get_statistics()
+    
+    logger.info("Profiling endpoints created", endpoints=["/debug/profile", "/debug/slow-callbacks"])
+
+
+def setup_observability(app: FastAPI, profiling_dependencies: Optional[List[Any]] = None) -> MetricsCollector:
     """
     Setup complete observability for FastAPI application
     
+    Installs the metrics middleware and endpoints, so it must run where the app is
+    built (module level), not in the lifespan: Starlette refuses new middleware once
+    the application has started. The Prometheus exporter is started separately by
+    start_observability() during startup.
+    
     Args:
         app: FastAPI application instance
+        profiling_dependencies: Route dependencies guarding the opt-in profiling endpoints;
+            without them the endpoints are not registered
         
     Returns:
         MetricsCollector instance
@@ -290,16 +404,27 @@ def setup_observability(app: FastAPI) -> MetricsCollector:
     
     # Create metrics endpoints
     create_metrics_endpoints(app, metrics_collector)
+    if settings.loop_instrumentation_enabled:
+        if profiling_dependencies:
+            create_profiling_endpoints(app, metrics_collector, profiling_dependencies)
+        else:
+            logger.warning("Profiling endpoints not registered: no guard dependency given")
     
-    # Start metrics server (Prometheus)
+    return metrics_collector
+
+
+def start_observability(port: int = 8001):
+    """
+    Start the Prometheus metrics server; call from the application's startup
+    
+    Args:
+        port: Port the metrics server listens on
+    """
     try:
-        from .observability import start_metrics_server
-        start_metrics_server(port=8001)
-        logger.info("Observability setup completed", prometheus_port=8001)
+        start_metrics_server(port=port)
+        logger.info("Observability setup completed", prometheus_port=port)
     except Exception as e:
         logger.warning("Failed to start metrics server", error=str(e))
-    
-    return metrics_collector
 
 
 # Decorator for observing specific operations
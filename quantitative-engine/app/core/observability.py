@@ -6,7 +6,7 @@ Comprehensive metrics export to Prometheus and Datadog monitoring systems
 import time
 import asyncio
 from datetime import datetime, timezone, timedelta
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Tuple, Union
 from dataclasses import dataclass, field
 from enum import Enum
 import threading
@@ -112,6 +112,7 @@ class MetricsCollector:
         self._metrics_buffer = deque(maxlen=1000)
         self._current_metrics = OperationalMetrics()
         self._lock = threading.Lock()
+        self._api_request_recorders: Dict[Tuple[str, str, int], "ApiRequestRecorder"] = {}
         
         logger.info(
             "Metrics collector initialized",
@@ -192,6 +193,22 @@ class MetricsCollector:
                 registry=self.registry
             )
             
+            # RPC rate limiting metrics
+            self.prometheus_metrics['rpc_rate_limit_wait_seconds'] = Histogram(
+                'xorj_rpc_rate_limit_wait_seconds',
+                'Time RPC calls waited for rate limit tokens',
+                ['provider', 'method'],
+                buckets=[0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0],
+                registry=self.registry
+            )
+            
+            self.prometheus_metrics['rpc_rate_limit_queue_depth'] = Gauge(
+                'xorj_rpc_rate_limit_queue_depth',
+                'RPC calls waiting for rate limit tokens',
+                ['provider'],
+                registry=self.registry
+            )
+            
             # System metrics
             self.prometheus_metrics['memory_usage_bytes'] = Gauge(
                 'xorj_memory_usage_bytes',
@@ -205,6 +222,52 @@ class MetricsCollector:
                 registry=self.registry
             )
             
+            # Process metrics (published by the system metrics sampler thread)
+            self.prometheus_metrics['process_resident_memory_bytes'] = Gauge(
+                'xorj_process_resident_memory_bytes',
+                'Resident set size of this process in bytes',
+                registry=self.registry
+            )
+            
+            self.prometheus_metrics['process_cpu_percent'] = Gauge(
+                'xorj_process_cpu_percent',
+                'CPU usage of this process since the previous sample',
+                registry=self.registry
+            )
+            
+            self.prometheus_metrics['process_open_fds'] = Gauge(
+                'xorj_process_open_fds',
+                'Open file descriptors of this process',
+                registry=self.registry
+            )
+            
+            self.prometheus_metrics['event_loop_lag_max_seconds'] = Gauge(
+                'xorj_event_loop_lag_max_seconds',
+                'Largest event loop scheduling delay seen since the previous sample',
+                registry=self.registry
+            )
+            
+            self.prometheus_metrics['event_loop_lag_seconds'] = Histogram(
+                'xorj_event_loop_lag_seconds',
+                'Event loop scheduling delay of lag probes',
+                buckets=[0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0],
+                registry=self.registry
+            )
+            
+            self.prometheus_metrics['event_loop_slow_callbacks_total'] = Counter(
+                'xorj_event_loop_slow_callbacks_total',
+                'Event loop callbacks that ran longer than the slow callback threshold',
+                registry=self.registry
+            )
+            
+            self.prometheus_metrics['gc_pause_seconds'] = Histogram(
+                'xorj_gc_pause_seconds',
+                'Garbage collection pause duration',
+                ['generation'],
+                buckets=[0.0001, 0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0],
+                registry=self.registry
+            )
+            
             # Business metrics
             self.prometheus_metrics['total_volume_usd'] = Gauge(
                 'xorj_total_volume_usd',
@@ -352,26 +415,39 @@ class MetricsCollector:
             elif error_type == "timeout":
                 self._current_metrics.timeout_errors += 1
     
+    def api_request_recorder(self, method: str, endpoint: str, status_code: int) -> "ApiRequestRecorder":
+        """Get the recorder bound to one method/endpoint/status combination (created once)"""
+        key = (method, endpoint, status_code)
+        recorder = self._api_request_recorders.get(key)
+        if recorder is None:
+            recorder = self._api_request_recorders.setdefault(
+                key, ApiRequestRecorder(self, method, endpoint, status_code)
+            )
+        return recorder
+    
     def record_api_request(self, method: str, endpoint: str, status_code: int, duration_seconds: float):
         """Record API request metrics"""
+        self.api_request_recorder(method, endpoint, status_code).record(duration_seconds)
+    
+    def record_api_response_time(self, duration_seconds: float):
+        """Record the latest API response time in the current metrics"""
+        with self._lock:
+            self._current_metrics.api_response_time_ms = duration_seconds * 1000
+    
+    def record_rate_limit_wait(self, provider: str, method: str, wait_seconds: float, queue_depth: int):
+        """Record time an RPC call spent waiting for rate limit tokens"""
         # Prometheus
         if self.enable_prometheus:
-            self.prometheus_metrics['api_requests_total'].labels(
-                method=method, endpoint=endpoint, status_code=str(status_code)
-            ).inc()
-            self.prometheus_metrics['api_request_duration_seconds'].labels(
-                method=method, endpoint=endpoint
-            ).observe(duration_seconds)
+            self.prometheus_metrics['rpc_rate_limit_wait_seconds'].labels(
+                provider=provider, method=method
+            ).observe(wait_seconds)
+            self.prometheus_metrics['rpc_rate_limit_queue_depth'].labels(provider=provider).set(queue_depth)
         
         # Datadog
         if self.enable_datadog:
-            tags = [f'method:{method}', f'endpoint:{endpoint}', f'status_code:{status_code}']
-            statsd.increment('xorj.api.requests', tags=tags)
-            statsd.histogram('xorj.api.request_duration', duration_seconds, tags=tags)
-        
-        # Update current metrics
-        with self._lock:
-            self._current_metrics.api_response_time_ms = duration_seconds * 1000
+            tags = [f'provider:{provider}', f'method:{method}']
+            statsd.histogram('xorj.rpc.rate_limit_wait', wait_seconds, tags=tags)
+            statsd.gauge('xorj.rpc.rate_limit_queue_depth', queue_depth, tags=[f'provider:{provider}'])
     
     def record_business_metrics(self, volume_usd: float, profit_usd: float, trades_count: int):
         """Record business metrics"""
@@ -410,6 +486,60 @@ class MetricsCollector:
             self._current_metrics.memory_usage_mb = memory_usage_mb
             self._current_metrics.cpu_usage_percent = cpu_usage_percent
     
+    def record_process_metrics(self,
+                               rss_bytes: int,
+                               cpu_percent: float,
+                               open_fds: Optional[int] = None,
+                               event_loop_lag_seconds: Optional[float] = None,
+                               gc_pauses: Optional[List[Tuple[int, float]]] = None):
+        """Record process resource, event loop lag and GC pause metrics"""
+        gc_pauses = gc_pauses or []
+        
+        # Prometheus
+        if self.enable_prometheus:
+            self.prometheus_metrics['process_resident_memory_bytes'].set(rss_bytes)
+            self.prometheus_metrics['process_cpu_percent'].set(cpu_percent)
+            if open_fds is not None:
+                self.prometheus_metrics['process_open_fds'].set(open_fds)
+            if event_loop_lag_seconds is not None:
+                self.prometheus_metrics['event_loop_lag_max_seconds'].set(event_loop_lag_seconds)
+            for generation, pause_seconds in gc_pauses:
+                self.prometheus_metrics['gc_pause_seconds'].labels(generation=str(generation)).observe(pause_seconds)
+        
+        # Datadog
+        if self.enable_datadog:
+            statsd.gauge('xorj.process.rss_bytes', rss_bytes)
+            statsd.gauge('xorj.process.cpu_percent', cpu_percent)
+            if open_fds is not None:
+                statsd.gauge('xorj.process.open_fds', open_fds)
+            if event_loop_lag_seconds is not None:
+                statsd.gauge('xorj.event_loop.lag_max', event_loop_lag_seconds)
+            for generation, pause_seconds in gc_pauses:
+                statsd.histogram('xorj.gc.pause', pause_seconds, tags=[f'generation:{generation}'])
+    
+    def record_event_loop_lag(self, lag_seconds: List[float]):
+        """Record event loop lag probe results"""
+        # Prometheus
+        if self.enable_prometheus:
+            for lag in lag_seconds:
+                self.prometheus_metrics['event_loop_lag_seconds'].observe(lag)
+        
+        # Datadog
+        if self.enable_datadog:
+            for lag in lag_seconds:
+                statsd.histogram('xorj.event_loop.lag', lag)
+    
+    def record_slow_callback(self, duration_seconds: float):
+        """Record an event loop callback that exceeded the slow callback threshold"""
+        # Prometheus
+        if self.enable_prometheus:
+            self.prometheus_metrics['event_loop_slow_callbacks_total'].inc()
+        
+        # Datadog
+        if self.enable_datadog:
+            statsd.increment('xorj.event_loop.slow_callbacks')
+            statsd.histogram('xorj.event_loop.slow_callback_duration', duration_seconds)
+    
     def record_service_health(self, service_name: str, healthy: bool):
         """Record service health metrics"""
         health_value = 1.0 if healthy else 0.0
@@ -518,6 +648,46 @@ class MetricsCollector:
         logger.info("Metrics reset")
 
 
+class ApiRequestRecorder:
+    """
+    API request metrics for one method/endpoint/status combination
+    
+    The Prometheus label children and Datadog tags are bound once, so recording a
+    request is an increment and an observe without any label lookups.
+    """
+    
+    __slots__ = ('collector', 'tags', 'request_counter', 'duration_histogram')
+    
+    def __init__(self, collector: MetricsCollector, method: str, endpoint: str, status_code: int):
+        self.collector = collector
+        self.tags = [f'method:{method}', f'endpoint:{endpoint}', f'status_code:{status_code}']
+        self.request_counter = None
+        self.duration_histogram = None
+        
+        if collector.enable_prometheus:
+            self.request_counter = collector.prometheus_metrics['api_requests_total'].labels(
+                method=method, endpoint=endpoint, status_code=str(status_code)
+            )
+            self.duration_histogram = collector.prometheus_metrics['api_request_duration_seconds'].labels(
+                method=method, endpoint=endpoint
+            )
+    
+    def record(self, duration_seconds: float):
+        """Record one request"""
+        # Prometheus
+        if self.request_counter is not None:
+            self.request_counter.inc()
+            self.duration_histogram.observe(duration_seconds)
+        
+        # Datadog
+        if self.collector.enable_datadog:
+            statsd.increment('xorj.api.requests', tags=self.tags)
+            statsd.histogram('xorj.api.request_duration', duration_seconds, tags=self.tags)
+        
+        # Update current metrics
+        self.collector.record_api_response_time(duration_seconds)
+
+
 @contextmanager
 def observe_operation(metrics_collector: MetricsCollector, operation_name: str, **labels):
     """Context manager for timing operations and recording metrics"""
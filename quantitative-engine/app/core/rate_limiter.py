@@ -0,0 +1,230 @@
+"""
+XORJ Quantitative Engine - Shared RPC Rate Limiter
+Async token buckets with per-provider budgets, per-method weights and FIFO fairness
+"""
+
+import asyncio
+import threading
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+from .config import get_settings
+from .logging import get_reliability_logger
+from .observability import get_metrics_collector
+
+settings = get_settings()
+logger = get_reliability_logger()
+
+
+def parse_weighted_pairs(value: str) -> Dict[str, str]:
+    """Parse a "key=value,key=value" setting into a dict"""
+    pairs = {}
+    for item in (value or "").split(","):
+        if "=" in item:
+            key, raw = item.split("=", 1)
+            pairs[key.strip()] = raw.strip()
+    return pairs
+
+
+def provider_for_url(url: str) -> str:
+    """Rate limit budget key for an RPC endpoint (its host, so API keys never appear in metrics)"""
+    return urlparse(url).hostname or url
+
+
+class TokenBucket:
+    """
+    Async token bucket shared by every coroutine calling one RPC provider
+
+    Tokens refill continuously at `rate` per second up to `capacity`. Callers are
+    served strictly in arrival order: the head of the queue holds the lock while it
+    waits for its tokens, so a stream of cheap calls cannot starve an expensive one
+    and concurrent callers can never spend the same tokens twice.
+    """
+
+    def __init__(self, provider: str, rate: float, capacity: float):
+        self.provider = provider
+        self.rate = rate
+        self.capacity = capacity
+
+        self._tokens = capacity
+        self._updated_at: Optional[float] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Usage statistics
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.acquisitions = 0
+        self.tokens_spent = 0.0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def _get_lock(self) -> asyncio.Lock:
+        # Celery tasks and worker processes run successive event loops; a lock
+        # bound to a finished loop cannot be awaited from a new one
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._loop is not loop:
+            self._lock = asyncio.Lock()
+            self._loop = loop
+            self._updated_at = None
+        return self._lock
+
+    def _refill(self, now: float):
+        if self._updated_at is not None:
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    async def acquire(self, weight: float = 1.0, method: str = "rpc") -> float:
+        """
+        Wait until `weight` tokens are available and spend them
+
+        Args:
+            weight: Tokens this call costs
+            method: RPC method name, for wait-time metrics
+
+        Returns:
+            Seconds spent waiting
+        """
+        loop = asyncio.get_running_loop()
+        lock = self._get_lock()
+        started = loop.time()
+
+        self.queue_depth += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        try:
+            async with lock:
+                self._refill(loop.time())
+                deficit = weight - self._tokens
+                if deficit > 0:
+                    await asyncio.sleep(deficit / self.rate)
+                    self._refill(loop.time())
+                # A weight above capacity leaves the bucket in debt, delaying the next caller
+                self._tokens -= weight
+        finally:
+            self.queue_depth -= 1
+
+        waited = loop.time() - started
+        self.acquisitions += 1
+        self.tokens_spent += weight
+        self.total_wait_seconds += waited
+        self.max_wait_seconds = max(self.max_wait_seconds, waited)
+        get_metrics_collector().record_rate_limit_wait(self.provider, method, waited, self.queue_depth)
+
+        return waited
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get bucket usage statistics"""
+        return {
+            "provider": self.provider,
+            "rate_per_second": self.rate,
+            "capacity": self.capacity,
+            "available_tokens": round(self._tokens, 3),
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "acquisitions": self.acquisitions,
+            "tokens_spent": self.tokens_spent,
+            "average_wait_seconds": self.total_wait_seconds / self.acquisitions if self.acquisitions else 0.0,
+            "max_wait_seconds": self.max_wait_seconds
+        }
+
+
+class RPCRateLimiter:
+    """
+    Registry of per-provider token buckets plus the RPC method weight table
+
+    Every Solana RPC path in the engine acquires from here, so calls to the same
+    provider share one budget regardless of which client makes them.
+
+    Buckets live in this process only. The configured provider budgets are divided by
+    rpc_rate_limit_processes so that all processes together stay within them.
+    """
+
+    def __init__(
+        self,
+        default_rate: float = None,
+        default_capacity: float = None,
+        provider_limits: str = None,
+        method_weights: str = None,
+        processes: int = None
+    ):
+        self.default_rate = float(default_rate or settings.rpc_requests_per_second)
+        self.default_capacity = float(default_capacity or settings.rpc_burst_limit)
+        self.processes = max(1, int(processes or settings.rpc_rate_limit_processes))
+
+        # "host=rate:burst" overrides for individual providers
+        self.provider_limits: Dict[str, Tuple[float, float]] = {}
+        for provider, limit in parse_weighted_pairs(
+            settings.rpc_provider_rate_limits if provider_limits is None else provider_limits
+        ).items():
+            rate, _, capacity = limit.partition(":")
+            self.provider_limits[provider] = (float(rate), float(capacity or rate))
+
+        self.method_weights: Dict[str, float] = {
+            method: float(weight)
+            for method, weight in parse_weighted_pairs(
+                settings.rpc_method_weights if method_weights is None else method_weights
+            ).items()
+        }
+
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, provider: str) -> TokenBucket:
+        """Get (creating on first use) the bucket for a provider"""
+        with self._lock:
+            bucket = self._buckets.get(provider)
+            if bucket is None:
+                rate, capacity = self.provider_limits.get(provider, (self.default_rate, self.default_capacity))
+                # This process's share of the deployment-wide budget
+                rate /= self.processes
+                capacity /= self.processes
+                bucket = TokenBucket(provider, rate, capacity)
+                self._buckets[provider] = bucket
+                logger.info(
+                    "Created RPC rate limit bucket",
+                    provider=provider,
+                    rate_per_second=rate,
+                    capacity=capacity,
+                    processes=self.processes
+                )
+            return bucket
+
+    def weight(self, method: str, count: int = 1) -> float:
+        """Token cost of `count` calls to an RPC method"""
+        return self.method_weights.get(method, 1.0) * count
+
+    async def acquire(self, provider: str, method: str, count: int = 1, weight: float = None) -> float:
+        """
+        Wait for budget for an RPC call
+
+        Args:
+            provider: Provider key (see provider_for_url)
+            method: JSON-RPC method name
+            count: Number of calls of this method the request carries
+            weight: Explicit token cost, overriding the method weight table
+
+        Returns:
+            Seconds spent waiting
+        """
+        cost = weight if weight is not None else self.weight(method, count)
+        return await self.bucket(provider).acquire(cost, method)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get statistics for every provider bucket"""
+        with self._lock:
+            buckets = list(self._buckets.values())
+        return {bucket.provider: bucket.get_statistics() for bucket in buckets}
+
+
+# Global rate limiter instance
+_rpc_rate_limiter: Optional[RPCRateLimiter] = None
+
+
+def get_rpc_rate_limiter() -> RPCRateLimiter:
+    """Get global RPC rate limiter instance"""
+    global _rpc_rate_limiter
+
+    if _rpc_rate_limiter is None:
+        _rpc_rate_limiter = RPCRateLimiter()
+
+    return _rpc_rate_limiter
@@ -4,7 +4,6 @@ Handles rate limiting (429 errors) gracefully with exponential backoff
 """
 
 import asyncio
-import time
 import httpx
 import json
 import hashlib
@@ -15,6 +14,8 @@ from dataclasses import dataclass
 from contextlib import asynccontextmanager
 
 from .config import get_settings
+from .rate_limiter import get_rpc_rate_limiter, provider_for_url
+from .transaction_cache import get_transaction_cache, is_finalized, transaction_key
 
 logger = logging.getLogger(__name__)
 
@@ -35,10 +36,10 @@ class RateLimitedRPCClient:
     def __init__(self):
         self.settings = get_settings()
         self.http_client: Optional[httpx.AsyncClient] = None
-        self._last_request_time = 0.0
-        self._request_count = 0
-        self._burst_window_start = 0.0
+        self.rate_limiter = get_rpc_rate_limiter()
+        self.provider = provider_for_url(self.settings.solana_rpc_url)
         self._memory_cache: Dict[str, CacheEntry] = {}
+        self.transaction_cache = get_transaction_cache()
         
     async def initialize(self):
         """Initialize HTTP client"""
@@ -106,34 +107,9 @@ class RateLimitedRPCClient:
             for key in expired_keys:
                 del self._memory_cache[key]
     
-    async def _enforce_rate_limit(self):
-        """Enforce rate limiting before making requests"""
-        now = time.time()
-        
-        # Reset burst window if needed (every second)
-        if now - self._burst_window_start >= 1.0:
-            self._request_count = 0
-            self._burst_window_start = now
-        
-        # Check if we're within burst limit
-        if self._request_count >= self.settings.rpc_burst_limit:
-            # Wait until next window
-            wait_time = 1.0 - (now - self._burst_window_start)
-            if wait_time > 0:
-                await asyncio.sleep(wait_time)
-                self._request_count = 0
-                self._burst_window_start = time.time()
-        
-        # Enforce minimum time between requests
-        time_since_last = now - self._last_request_time
-        min_interval = 1.0 / self.settings.rpc_requests_per_second
-        
-        if time_since_last < min_interval:
-            wait_time = min_interval - time_since_last
-            await asyncio.sleep(wait_time)
-        
-        self._last_request_time = time.time()
-        self._request_count += 1
+    async def _enforce_rate_limit(self, method: str):
+        """Wait for the provider's shared rate limit budget before making a request"""
+        await self.rate_limiter.acquire(self.provider, method)
     
     async def make_rpc_request(
         self, 
@@ -168,7 +144,7 @@ class RateLimitedRPCClient:
         
         for attempt in range(max_retries + 1):
             try:
-                await self._enforce_rate_limit()
+                await self._enforce_rate_limit(method)
                 
                 async with self.client_context() as client:
                     response = await client.post(
@@ -259,13 +235,30 @@ class RateLimitedRPCClient:
         return []
     
     async def get_transaction(self, signature: str) -> Optional[Dict[str, Any]]:
-        """Get transaction details"""
+        """Get transaction details, from the shared transaction cache when already fetched"""
+        # No maxSupportedTransactionVersion, so only legacy transactions are returned
+        cache_key = transaction_key(signature, "jsonParsed", None)
+        if self.transaction_cache:
+            # Cache reads and writes touch disk and a lock file: run them off the event loop
+            cached = await asyncio.to_thread(self.transaction_cache.get, cache_key)
+            if cached is not None:
+                return cached
+        
         params = [signature, {"encoding": "jsonParsed"}]
         
         result = await self.make_rpc_request("getTransaction", params)
         
         if result and "result" in result:
-            return result["result"]
+            transaction = result["result"]
+            # Without a commitment parameter the node answers at "finalized"
+            if self.transaction_cache and transaction and is_finalized(transaction.get("blockTime"), "finalized"):
+                try:
+                    await asyncio.to_thread(
+                        self.transaction_cache.put, cache_key, json.dumps(transaction, separators=(",", ":"))
+                    )
+                except OSError as e:
+                    logger.warning(f"Failed to write transaction cache: {e}")
+            return transaction
         
         return None
 
@@ -0,0 +1,267 @@
+"""
+XORJ Quantitative Engine - NFR-3: System Metrics Sampler
+Process resources, event-loop lag and GC pauses sampled off the request event loop
+"""
+
+import asyncio
+import gc
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import psutil
+
+from .config import get_settings
+from .logging import get_metrics_logger
+from .observability import MetricsCollector, get_metrics_collector
+
+logger = get_metrics_logger()
+settings = get_settings()
+
+
+class GCPauseTracker:
+    """
+    Times garbage collection pauses through gc.callbacks
+
+    The callback only takes timestamps; pauses are drained and published by the
+    sampler thread.
+    """
+
+    def __init__(self, max_pauses: int = 10000):
+        self.pauses: Deque[Tuple[int, float]] = deque(maxlen=max_pauses)
+        self._started: Optional[float] = None
+
+    def __call__(self, phase: str, info: Dict[str, Any]):
+        if phase == "start":
+            self._started = time.perf_counter()
+        elif self._started is not None:
+            self.pauses.append((info.get("generation", 0), time.perf_counter() - self._started))
+            self._started = None
+
+    def install(self):
+        if self not in gc.callbacks:
+            gc.callbacks.append(self)
+
+    def uninstall(self):
+        if self in gc.callbacks:
+            gc.callbacks.remove(self)
+
+    def drain(self) -> List[Tuple[int, float]]:
+        """Take the (generation, seconds) pauses recorded since the last drain"""
+        pauses = []
+        while True:
+            try:
+                pauses.append(self.pauses.popleft())
+            except IndexError:
+                return pauses
+
+
+class SystemMetricsSampler:
+    """
+    Daemon thread publishing system and process metrics to MetricsCollector
+
+    CPU usage is delta-based (psutil's interval=None form compares against the
+    previous sample), so nothing ever sleeps or blocks waiting for a measurement.
+    Event-loop lag is measured by scheduling a no-op callback on the loop from
+    this thread and timing how long the loop takes to run it; a probe that has
+    not run by sampling time counts as lag too, so a stalled loop is still seen.
+    """
+
+    def __init__(self,
+                 metrics_collector: MetricsCollector = None,
+                 interval: Optional[float] = None,
+                 lag_probe_interval: Optional[float] = None):
+        self.metrics_collector = metrics_collector or get_metrics_collector()
+        self.interval = interval or settings.system_metrics_interval_seconds
+        self.lag_probe_interval = (
+            settings.event_loop_lag_probe_interval_seconds if lag_probe_interval is None else lag_probe_interval
+        )
+
+        self._process = psutil.Process()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._lag_samples: Deque[float] = deque(maxlen=10000)
+        self._window_lags: List[float] = []
+        self._probe_sent: Optional[float] = None
+        self._gc_tracker = GCPauseTracker()
+
+        self.latest: Dict[str, Any] = {}
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def loop(self) -> Optional[asyncio.AbstractEventLoop]:
+        return self._loop
+
+    def attach_loop(self, loop: asyncio.AbstractEventLoop):
+        """Measure lag on this event loop (the one serving requests)"""
+        self._loop = loop
+        self._probe_sent = None
+
+    def start(self):
+        """Start the sampler thread if it is not running"""
+        if self.running:
+            return
+
+        # The first delta-based reading has nothing to compare against
+        psutil.cpu_percent(interval=None)
+        self._process.cpu_percent(interval=None)
+        self._gc_tracker.install()
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="system-metrics-sampler", daemon=True)
+        self._thread.start()
+
+        logger.info(
+            "System metrics sampler started",
+            interval_seconds=self.interval,
+            lag_probe_interval_seconds=self.lag_probe_interval
+        )
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the sampler thread"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self._gc_tracker.uninstall()
+
+    def _run(self):
+        next_sample = time.monotonic() + self.interval
+        while True:
+            wait = max(0.0, next_sample - time.monotonic())
+            if self.lag_probe_interval > 0:
+                wait = min(wait, self.lag_probe_interval)
+            if self._stop.wait(wait):
+                return
+
+            self._collect_lag()
+            self._probe_loop()
+            if time.monotonic() >= next_sample:
+                self.sample()
+                next_sample = time.monotonic() + self.interval
+
+    def _probe_loop(self):
+        """Schedule a lag probe on the attached loop, unless the last one has not run yet"""
+        loop = self._loop
+        if self.lag_probe_interval <= 0 or loop is None or self._probe_sent is not None:
+            return
+        if loop.is_closed():
+            self._loop = None
+            return
+
+        sent = time.perf_counter()
+        self._probe_sent = sent
+        try:
+            loop.call_soon_threadsafe(self._probe_answered, sent)
+        except RuntimeError:
+            # Loop closed between the check and the call
+            self._probe_sent = None
+            self._loop = None
+
+    def _probe_answered(self, sent: float):
+        # Runs on the event loop: one timestamp, nothing else
+        self._lag_samples.append(time.perf_counter() - sent)
+        self._probe_sent = None
+
+    def _collect_lag(self):
+        """Move answered probes into the lag histogram and the current sampling window"""
+        lags = []
+        while True:
+            try:
+                lags.append(self._lag_samples.popleft())
+            except IndexError:
+                break
+
+        if lags:
+            self.metrics_collector.record_event_loop_lag(lags)
+            self._window_lags.extend(lags)
+
+    def _drain_lag(self) -> List[float]:
+        self._collect_lag()
+        lags, self._window_lags = self._window_lags, []
+
+        outstanding = self._probe_sent
+        if outstanding is not None:
+            lags.append(time.perf_counter() - outstanding)
+        return lags
+
+    def sample(self) -> Dict[str, Any]:
+        """
+        Take one sample and publish it
+
+        Returns:
+            The published snapshot (also kept as `latest`)
+        """
+        try:
+            with self._process.oneshot():
+                rss_bytes = self._process.memory_info().rss
+                process_cpu_percent = self._process.cpu_percent(interval=None)
+                try:
+                    open_fds = self._process.num_fds()
+                except (AttributeError, psutil.Error):
+                    open_fds = None  # Not available on this platform
+
+            system_cpu_percent = psutil.cpu_percent(interval=None)
+            memory_usage_mb = psutil.virtual_memory().used / (1024 * 1024)
+
+            lags = self._drain_lag()
+            gc_pauses = self._gc_tracker.drain()
+
+            snapshot = {
+                "memory_usage_mb": round(memory_usage_mb, 2),
+                "cpu_usage_percent": system_cpu_percent,
+                "process_cpu_percent": process_cpu_percent,
+                "process_rss_mb": round(rss_bytes / (1024 * 1024), 2),
+                "open_fds": open_fds,
+                "event_loop_lag_max_ms": round(max(lags) * 1000, 3) if lags else None,
+                "event_loop_lag_avg_ms": round(sum(lags) / len(lags) * 1000, 3) if lags else None,
+                "gc_collections": len(gc_pauses),
+                "gc_pause_max_ms": round(max(pause for _, pause in gc_pauses) * 1000, 3) if gc_pauses else 0.0,
+                "gc_pause_total_ms": round(sum(pause for _, pause in gc_pauses) * 1000, 3)
+            }
+
+            self.metrics_collector.record_system_metrics(memory_usage_mb, system_cpu_percent)
+            self.metrics_collector.record_process_metrics(
+                rss_bytes=rss_bytes,
+                cpu_percent=process_cpu_percent,
+                open_fds=open_fds,
+                event_loop_lag_seconds=max(lags) if lags else None,
+                gc_pauses=gc_pauses
+            )
+
+            self.latest = snapshot
+            return snapshot
+
+        except Exception as e:
+            logger.error("Error collecting system metrics", error=str(e))
+            return {}
+
+
+# Global sampler instance
+_system_sampler: Optional[SystemMetricsSampler] = None
+_system_sampler_lock = threading.Lock()
+
+
+def get_system_sampler(metrics_collector: MetricsCollector = None) -> SystemMetricsSampler:
+    """Get the process-wide system metrics sampler"""
+    global _system_sampler
+
+    with _system_sampler_lock:
+        if _system_sampler is None:
+            _system_sampler = SystemMetricsSampler(metrics_collector)
+        return _system_sampler
+
+
+def stop_system_sampler():
+    """Stop the process-wide system metrics sampler"""
+    global _system_sampler
+
+    with _system_sampler_lock:
+        sampler, _system_sampler = _system_sampler, None
+    if sampler is not None:
+        sampler.stop()
@@ -0,0 +1,384 @@
+"""
+XORJ Quantitative Engine - Raw Transaction Cache
+Disk-backed, signature-keyed store of finalized getTransaction payloads shared by every RPC client
+"""
+
+import json
+import os
+import re
+import struct
+import threading
+import time
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .config import get_settings
+from .logging import get_reliability_logger
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    FCNTL_AVAILABLE = False
+
+settings = get_settings()
+logger = get_reliability_logger()
+
+# Segment record: crc32(key + payload), key length, flags, payload length, then key and payload
+RECORD_HEADER = struct.Struct("<IHBI")
+# Index entry: segment number, record offset, record length, key length, then key
+INDEX_ENTRY = struct.Struct("<IQIH")
+
+FLAG_ZLIB = 0x01
+
+SEGMENT_PATTERN = re.compile(r"^segment-(\d{6})\.dat$")
+INDEX_FILENAME = "index.dat"
+LOCK_FILENAME = "writer.lock"
+
+
+def transaction_key(
+    signature: str,
+    encoding: str = "jsonParsed",
+    max_supported_transaction_version: Optional[int] = 0
+) -> str:
+    """
+    Cache key for a getTransaction payload
+
+    The same signature fetched with another encoding or version setting is a different payload.
+    """
+    version = "legacy" if max_supported_transaction_version is None else str(max_supported_transaction_version)
+    return f"{signature}:{encoding}:{version}"
+
+
+def is_finalized(block_time: Optional[int], commitment: str = None, now: float = None) -> bool:
+    """
+    Whether a fetched transaction can be cached forever
+
+    Results fetched at "finalized" commitment always can. "confirmed" results are
+    accepted once their block is older than transaction_cache_min_age_seconds, well
+    past the ~13 seconds a block takes to finalize.
+
+    Args:
+        block_time: The transaction's blockTime (Unix seconds)
+        commitment: Commitment level the transaction was fetched at
+        now: Current Unix time (defaults to time.time())
+    """
+    if commitment == "finalized":
+        return True
+    if not block_time:
+        return False
+    return (now or time.time()) - block_time >= settings.transaction_cache_min_age_seconds
+
+
+class TransactionCache:
+    """
+    Append-only, compressed, signature-keyed cache of raw getTransaction payloads
+
+    Payloads are stored zlib-compressed in numbered segment files; a new segment is
+    started once the active one exceeds segment_max_bytes. Each record is also
+    appended to a small index file (key -> segment, offset, length) that every
+    process loads on open and tails on cache misses, so API workers, Celery
+    workers and discovery scripts share one cache directory. Appends are
+    serialized across processes with a lock file. Records are checksummed: a torn
+    write left by a crash reads as a miss and is simply fetched again.
+
+    Finalized transactions never change, so entries have no TTL.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = None,
+        segment_max_bytes: int = None,
+        compression_level: int = None
+    ):
+        self.cache_dir = cache_dir or settings.transaction_cache_dir
+        self.segment_max_bytes = segment_max_bytes or settings.transaction_cache_segment_max_bytes
+        self.compression_level = (
+            settings.transaction_cache_compression_level if compression_level is None else compression_level
+        )
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._index_path = os.path.join(self.cache_dir, INDEX_FILENAME)
+        self._lock_path = os.path.join(self.cache_dir, LOCK_FILENAME)
+
+        self._index: Dict[str, Tuple[int, int, int]] = {}
+        self._index_offset = 0
+        self._readers: Dict[int, Any] = {}
+        self._lock = threading.RLock()
+
+        # Usage statistics
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.corrupt_records = 0
+        self.raw_bytes_written = 0
+        self.stored_bytes_written = 0
+
+        with self._lock:
+            self._refresh_index()
+
+        logger.info(
+            "Opened transaction cache",
+            cache_dir=self.cache_dir,
+            entries=len(self._index),
+            segments=len(self._segment_numbers())
+        )
+
+    def _refresh_index(self):
+        """Load index entries appended (by this or another process) since the last refresh"""
+        try:
+            size = os.path.getsize(self._index_path)
+        except FileNotFoundError:
+            return
+        if size <= self._index_offset:
+            return
+
+        with open(self._index_path, "rb") as f:
+            f.seek(self._index_offset)
+            data = f.read(size - self._index_offset)
+
+        position = 0
+        while position + INDEX_ENTRY.size <= len(data):
+            segment, offset, length, key_length = INDEX_ENTRY.unpack_from(data, position)
+            end = position + INDEX_ENTRY.size + key_length
+            if end > len(data):
+                break  # Entry still being written, or torn by a crash
+            key = data[position + INDEX_ENTRY.size:end].decode("utf-8")
+            self._index[key] = (segment, offset, length)
+            position = end
+
+        self._index_offset += position
+
+    def _truncate_torn_index(self):
+        """Drop a partial trailing index entry before appending (called with the writer lock held)"""
+        try:
+            size = os.path.getsize(self._index_path)
+        except FileNotFoundError:
+            return
+        if size > self._index_offset:
+            logger.warning(
+                "Truncating torn transaction cache index entry",
+                cache_dir=self.cache_dir,
+                bytes=size - self._index_offset
+            )
+            with open(self._index_path, "r+b") as f:
+                f.truncate(self._index_offset)
+
+    def _segment_path(self, segment: int) -> str:
+        return os.path.join(self.cache_dir, f"segment-{segment:06d}.dat")
+
+    def _segment_numbers(self) -> List[int]:
+        return sorted(
+            int(match.group(1))
+            for match in (SEGMENT_PATTERN.match(name) for name in os.listdir(self.cache_dir))
+            if match
+        )
+
+    def _read_record(self, key: str, location: Tuple[int, int, int]) -> Optional[bytes]:
+        segment, offset, length = location
+        reader = self._readers.get(segment)
+        if reader is None:
+            reader = open(self._segment_path(segment), "rb")
+            self._readers[segment] = reader
+
+        reader.seek(offset)
+        record = reader.read(length)
+        if len(record) != length:
+            return None
+
+        checksum, key_length, flags, payload_length = RECORD_HEADER.unpack_from(record)
+        body = record[RECORD_HEADER.size:]
+        if (
+            len(body) != key_length + payload_length
+            or zlib.crc32(body) != checksum
+            or body[:key_length].decode("utf-8") != key
+        ):
+            return None
+
+        payload = body[key_length:]
+        return zlib.decompress(payload) if flags & FLAG_ZLIB else payload
+
+    def get_raw(self, key: str) -> Optional[str]:
+        """
+        Get a cached payload as its JSON text
+
+        Args:
+            key: Cache key (see transaction_key)
+
+        Returns:
+            The getTransaction "result" JSON, or None on a miss
+        """
+        with self._lock:
+            location = self._index.get(key)
+            if location is None:
+                # Another process may have cached it since our last look
+                self._refresh_index()
+                location = self._index.get(key)
+
+            payload = None
+            if location is not None:
+                try:
+                    payload = self._read_record(key, location)
+                except (OSError, ValueError, struct.error, zlib.error) as e:
+                    logger.warning("Failed to read transaction cache record", key=key, error=str(e))
+                if payload is None:
+                    self.corrupt_records += 1
+                    del self._index[key]
+
+            if payload is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            return payload.decode("utf-8")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get a cached getTransaction "result" object, or None on a miss"""
+        raw = self.get_raw(key)
+        return json.loads(raw) if raw is not None else None
+
+    def put_many(self, payloads: Iterable[Tuple[str, str]]) -> int:
+        """
+        Append payloads that are not cached yet
+
+        Args:
+            payloads: (key, result JSON text) pairs of finalized transactions
+
+        Returns:
+            Number of records written
+        """
+        with self._lock:
+            pending = [(key, raw) for key, raw in payloads if key not in self._index]
+            if not pending:
+                return 0
+
+            with open(self._lock_path, "a+b") as lock_file:
+                if FCNTL_AVAILABLE:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                try:
+                    return self._append_locked(pending)
+                finally:
+                    if FCNTL_AVAILABLE:
+                        fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def put(self, key: str, raw: str) -> bool:
+        """Append one payload; False if it was already cached"""
+        return self.put_many([(key, raw)]) == 1
+
+    def _append_locked(self, pending: List[Tuple[str, str]]) -> int:
+        # Another process may have appended since our last refresh
+        self._refresh_index()
+        self._truncate_torn_index()
+
+        segments = self._segment_numbers()
+        segment = segments[-1] if segments else 0
+        segment_path = self._segment_path(segment)
+        offset = os.path.getsize(segment_path) if os.path.exists(segment_path) else 0
+        if offset >= self.segment_max_bytes:
+            segment, offset = segment + 1, 0
+            segment_path = self._segment_path(segment)
+
+        records = bytearray()
+        index_entries = bytearray()
+        new_locations = {}
+        for key, raw in pending:
+            if key in self._index or key in new_locations:
+                continue
+
+            encoded_key = key.encode("utf-8")
+            payload = raw.encode("utf-8")
+            self.raw_bytes_written += len(payload)
+            flags = 0
+            if self.compression_level:
+                payload = zlib.compress(payload, self.compression_level)
+                flags |= FLAG_ZLIB
+
+            body = encoded_key + payload
+            record = RECORD_HEADER.pack(zlib.crc32(body), len(encoded_key), flags, len(payload)) + body
+            location = (segment, offset + len(records), len(record))
+            records += record
+            index_entries += INDEX_ENTRY.pack(*location, len(encoded_key)) + encoded_key
+            new_locations[key] = location
+
+        # Segment data first, so an index entry never points past the end of its segment
+        with open(segment_path, "ab") as f:
+            f.write(records)
+        with open(self._index_path, "ab") as f:
+            f.write(index_entries)
+
+        self._index.update(new_locations)
+        self._index_offset += len(index_entries)
+        self.writes += len(new_locations)
+        self.stored_bytes_written += len(records)
+        return len(new_locations)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            if key not in self._index:
+                self._refresh_index()
+            return key in self._index
+
+    def close(self):
+        """Close open segment readers"""
+        with self._lock:
+            for reader in self._readers.values():
+                reader.close()
+            self._readers.clear()
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        with self._lock:
+            segments = self._segment_numbers()
+            lookups = self.hits + self.misses
+            return {
+                "cache_dir": self.cache_dir,
+                "entries": len(self._index),
+                "segments": len(segments),
+                "bytes_on_disk": sum(os.path.getsize(self._segment_path(s)) for s in segments),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "writes": self.writes,
+                "corrupt_records": self.corrupt_records,
+                "compression_ratio": (
+                    self.raw_bytes_written / self.stored_bytes_written if self.stored_bytes_written else 0.0
+                )
+            }
+
+
+# Global transaction cache instance
+_transaction_cache: Optional[TransactionCache] = None
+_transaction_cache_failed = False
+_transaction_cache_lock = threading.Lock()
+
+
+def get_transaction_cache() -> Optional[TransactionCache]:
+    """Get the global transaction cache, or None when disabled or the directory is unusable"""
+    global _transaction_cache, _transaction_cache_failed
+
+    if not settings.transaction_cache_enabled or _transaction_cache_failed:
+        return None
+
+    with _transaction_cache_lock:
+        if _transaction_cache is None:
+            try:
+                _transaction_cache = TransactionCache()
+            except OSError as e:
+                _transaction_cache_failed = True
+                logger.error(
+                    "Transaction cache unavailable, fetching from RPC",
+                    cache_dir=settings.transaction_cache_dir,
+                    error=str(e)
+                )
+                return None
+        return _transaction_cache
+
+
+def close_transaction_cache():
+    """Close the global transaction cache"""
+    global _transaction_cache
+
+    with _transaction_cache_lock:
+        if _transaction_cache is not None:
+            _transaction_cache.close()
+            _transaction_cache = None
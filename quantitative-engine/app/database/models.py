@@ -158,6 +158,19 @@ class TraderRanking(Base):
     )
 
 
+class WalletIngestionCursor(Base):
+    """
+    Newest processed signature per wallet, where the next scheduled ingestion resumes
+    """
+    __tablename__ = "wallet_ingestion_cursors"
+    
+    wallet_address = Column(String(44), primary_key=True)
+    newest_signature = Column(String(128), nullable=False)
+    newest_slot = Column(BigInteger, nullable=False)
+    newest_block_time = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc))
+
+
 class DataIngestionLog(Base):
     """
     Track data ingestion progress and status
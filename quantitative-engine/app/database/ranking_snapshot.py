@@ -0,0 +1,282 @@
+"""
+In-memory snapshot of the latest trader ranking calculation, served by /internal/ranked-traders
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from ..core.config import get_settings
+from .service import DatabaseService, get_database_service
+
+logger = logging.getLogger(__name__)
+
+# Meta fields that do not depend on the request or the calculation
+RANKED_TRADERS_STATIC_META = {
+    "algorithm_version": "2.0.0",  # Updated version for real data
+    "data_source": "mainnet_blockchain",  # Now using real data
+    "eligibility_criteria": {
+        "min_trading_days": 90,  # FR-3 specification: 90+ days required
+        "min_total_trades": 50,  # FR-3 specification: 50+ trades required
+        "max_single_day_roi_spike": "50%",  # FR-3 specification: no extreme spikes
+        "anti_manipulation": "enabled"  # FR-3 specification: anti-manipulation checks
+    },
+    "scoring_weights": {
+        "sharpe_weight": "40%",  # FR-3 specification: primary weight for risk-adjusted returns
+        "roi_weight": "15%",     # FR-3 specification: secondary weight for raw returns
+        "drawdown_penalty_weight": "45%"  # FR-3 specification: heavy penalty for max drawdown
+    }
+}
+
+# Requests without these parameters land in this bucket, so it is serialized up front
+DEFAULT_BUCKET = (100, 0.0)
+
+
+def _response_trader(trader: Dict[str, Any]) -> Dict[str, Any]:
+    """Coerce a stored ranking row to the RankedTrader response shape"""
+    metrics = trader["metrics"]
+    return {
+        "rank": int(trader["rank"]),
+        "wallet_address": trader["wallet_address"],
+        "trust_score": float(trader["trust_score"]),
+        "performance_breakdown": {
+            key: float(value) for key, value in trader["performance_breakdown"].items()
+        },
+        "metrics": {
+            "net_roi_percent": float(metrics["net_roi_percent"]),
+            "sharpe_ratio": float(metrics["sharpe_ratio"]),
+            "maximum_drawdown_percent": float(metrics["maximum_drawdown_percent"]),
+            "total_trades": int(metrics["total_trades"]),
+            "win_loss_ratio": float(metrics["win_loss_ratio"]),
+            "total_volume_usd": float(metrics["total_volume_usd"]),
+            "total_profit_usd": float(metrics["total_profit_usd"])
+        }
+    }
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header value (possibly a list or "*") against an ETag"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == "*" or candidate == etag:
+            return True
+    return False
+
+
+class RankingSnapshot:
+    """
+    One trader_rankings calculation held in memory
+
+    Response bodies are serialized once per (limit, min_trust_score) bucket and
+    reused until the snapshot is replaced. The snapshot is never mutated after it
+    is published apart from filling the bucket cache.
+    """
+
+    def __init__(self, calculation_timestamp: datetime, traders: List[Dict[str, Any]], max_buckets: int = 64):
+        self.calculation_timestamp = calculation_timestamp
+        self.traders = [_response_trader(trader) for trader in traders]  # Ordered by rank
+        self.max_buckets = max_buckets
+        self._buckets: Dict[Tuple[int, float], Tuple[bytes, str]] = {}
+
+    def response(self, limit: int, min_trust_score: float) -> Tuple[bytes, str]:
+        """
+        Serialized response body and ETag for one request bucket
+
+        Args:
+            limit: Maximum number of traders to return
+            min_trust_score: Minimum Trust Score filter
+
+        Returns:
+            Tuple of (JSON body bytes, quoted strong ETag)
+
+        Raises:
+            ValueError: If limit is not positive
+        """
+        if limit < 1:
+            # A negative slice would drop the lowest-ranked traders instead
+            raise ValueError(f"limit must be positive, got {limit}")
+
+        key = (limit, min_trust_score)
+        cached = self._buckets.get(key)
+        if cached is not None:
+            return cached
+
+        data = [trader for trader in self.traders if trader["trust_score"] >= min_trust_score][:limit]
+        body = json.dumps(
+            {
+                "status": "success",
+                "data": data,
+                "meta": {
+                    "total_traders": len(data),
+                    "returned_count": len(data),
+                    "min_trust_score_applied": min_trust_score,
+                    "limit_applied": limit,
+                    "calculation_timestamp": self.calculation_timestamp.isoformat(),
+                    **RANKED_TRADERS_STATIC_META
+                }
+            },
+            ensure_ascii=False,
+            allow_nan=False,
+            separators=(",", ":")
+        ).encode("utf-8")
+        cached = (body, f'"{hashlib.blake2b(body, digest_size=12).hexdigest()}"')
+
+        # Arbitrary query parameters must not grow memory without bound
+        if len(self._buckets) < self.max_buckets:
+            self._buckets[key] = cached
+        return cached
+
+
+class RankedTradersSnapshotCache:
+    """
+    Serves ranked-traders responses from the latest calculation without a database round-trip
+
+    The first request loads the snapshot. Afterwards a background task checks the
+    latest calculation_timestamp at most once per refresh interval and, when a new
+    calculation has landed, loads it and swaps the snapshot reference in one step.
+    In-flight requests keep the snapshot they started with.
+    """
+
+    def __init__(
+        self,
+        refresh_interval_seconds: float = 30.0,
+        max_buckets: int = 64,
+        period_days: int = 90,
+        database_service_getter: Callable[[], Awaitable[DatabaseService]] = get_database_service
+    ):
+        self.refresh_interval_seconds = refresh_interval_seconds
+        self.max_buckets = max_buckets
+        self.period_days = period_days
+        self._get_database_service = database_service_getter
+
+        self._snapshot: Optional[RankingSnapshot] = None
+        self._last_check = 0.0
+        self._lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+
+        # Usage statistics
+        self.served = 0
+        self.snapshot_loads = 0
+        self.refresh_failures = 0
+
+    async def get_response(self, limit: int, min_trust_score: float) -> Optional[Tuple[bytes, str]]:
+        """
+        Response body and ETag for a request
+
+        Args:
+            limit: Maximum number of traders to return
+            min_trust_score: Minimum Trust Score filter
+
+        Returns:
+            Tuple of (JSON body bytes, ETag), or None if no ranking calculation exists yet
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            async with self._lock:
+                if self._snapshot is None:
+                    await self._refresh_locked()
+            snapshot = self._snapshot
+            if snapshot is None:
+                return None
+        elif time.monotonic() - self._last_check >= self.refresh_interval_seconds:
+            self._schedule_refresh()
+
+        self.served += 1
+        return snapshot.response(limit, min_trust_score)
+
+    def _schedule_refresh(self):
+        """Start a background freshness check unless one is already running"""
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+        self._last_check = time.monotonic()
+        self._refresh_task = asyncio.create_task(self._background_refresh())
+
+    async def _background_refresh(self):
+        try:
+            await self.refresh()
+        except Exception as e:
+            # Keep serving the current snapshot; the next interval retries
+            self.refresh_failures += 1
+            logger.error(f"Ranked traders snapshot refresh failed: {e}")
+
+    async def refresh(self) -> Optional[RankingSnapshot]:
+        """Load the latest calculation if it differs from the current snapshot"""
+        async with self._lock:
+            return await self._refresh_locked()
+
+    async def _refresh_locked(self) -> Optional[RankingSnapshot]:
+        self._last_check = time.monotonic()
+        db_service = await self._get_database_service()
+        latest_calc_time = await db_service.get_latest_ranking_timestamp(self.period_days)
+
+        current = self._snapshot
+        if latest_calc_time is None or (current is not None and current.calculation_timestamp == latest_calc_time):
+            return current
+
+        traders = await db_service.get_ranking_snapshot(latest_calc_time, self.period_days)
+        snapshot = RankingSnapshot(latest_calc_time, traders, self.max_buckets)
+        snapshot.response(*DEFAULT_BUCKET)
+
+        self._snapshot = snapshot
+        self.snapshot_loads += 1
+        logger.info(
+            f"Loaded ranked traders snapshot: calculation_timestamp={latest_calc_time}, "
+            f"traders={len(snapshot.traders)}"
+        )
+        return snapshot
+
+    async def close(self):
+        """Cancel any in-flight background refresh"""
+        if self._refresh_task is not None and not self._refresh_task.done():
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get snapshot cache statistics"""
+        snapshot = self._snapshot
+        return {
+            "calculation_timestamp": snapshot.calculation_timestamp.isoformat() if snapshot else None,
+            "traders": len(snapshot.traders) if snapshot else 0,
+            "buckets": len(snapshot._buckets) if snapshot else 0,
+            "served": self.served,
+            "snapshot_loads": self.snapshot_loads,
+            "refresh_failures": self.refresh_failures
+        }
+
+
+# Global snapshot cache instance
+_ranked_traders_cache: Optional[RankedTradersSnapshotCache] = None
+
+
+def get_ranked_traders_cache() -> RankedTradersSnapshotCache:
+    """Get global ranked traders snapshot cache instance"""
+    global _ranked_traders_cache
+
+    if _ranked_traders_cache is None:
+        settings = get_settings()
+        _ranked_traders_cache = RankedTradersSnapshotCache(
+            refresh_interval_seconds=settings.ranked_traders_snapshot_refresh_seconds,
+            max_buckets=settings.ranked_traders_snapshot_max_buckets
+        )
+
+    return _ranked_traders_cache
+
+
+async def close_ranked_traders_cache():
+    """Close global ranked traders snapshot cache"""
+    global _ranked_traders_cache
+
+    if _ranked_traders_cache is not None:
+        await _ranked_traders_cache.close()
+        _ranked_traders_cache = None
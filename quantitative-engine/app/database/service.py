@@ -14,7 +14,7 @@ import json
 
 from .models import (
     Base, TraderProfile, TraderTransaction, TraderPerformanceMetrics, 
-    TraderRanking, DataIngestionLog
+    TraderRanking, DataIngestionLog, WalletIngestionCursor
 )
 from ..core.config import get_settings
 # Import statements removed - using dict format instead of classes
@@ -147,28 +147,7 @@ class DatabaseService:
                 for row in result:
                     row_count += 1
                     logger.debug(f"Processing trader row {row_count}: {row.wallet_address}")
-                    # Parse the JSON performance metrics
-                    metrics = row.performance_metrics
-                    
-                    trader_data = {
-                        "rank": row.rank,
-                        "wallet_address": row.wallet_address,
-                        "trust_score": row.trust_score,
-                        "performance_breakdown": {
-                            "performance_score": metrics.get("performance_score", 0.0),
-                            "risk_penalty": metrics.get("risk_penalty", 0.0)
-                        },
-                        "metrics": {
-                            "net_roi_percent": metrics.get("net_roi_percent", 0.0),
-                            "sharpe_ratio": metrics.get("sharpe_ratio", 0.0),
-                            "maximum_drawdown_percent": metrics.get("maximum_drawdown_percent", 0.0),
-                            "total_trades": metrics.get("total_trades", 0),
-                            "win_loss_ratio": metrics.get("win_loss_ratio", 0.0),
-                            "total_volume_usd": metrics.get("total_volume_usd", 0.0),
-                            "total_profit_usd": metrics.get("total_profit_usd", 0.0)
-                        }
-                    }
-                    traders.append(trader_data)
+                    traders.append(self._ranking_row_to_trader(row))
                 
                 logger.info(f"Retrieved {len(traders)} ranked traders from database")
                 return traders
@@ -179,6 +158,90 @@ class DatabaseService:
             async with self.get_session() as session:
                 return await self._calculate_emergency_rankings(session, limit, min_trust_score)
     
+    @staticmethod
+    def _ranking_row_to_trader(row) -> Dict[str, Any]:
+        """Convert a trader_rankings row to the ranked trader dict format"""
+        # Parse the JSON performance metrics
+        metrics = row.performance_metrics
+        
+        return {
+            "rank": row.rank,
+            "wallet_address": row.wallet_address,
+            "trust_score": row.trust_score,
+            "performance_breakdown": {
+                "performance_score": metrics.get("performance_score", 0.0),
+                "risk_penalty": metrics.get("risk_penalty", 0.0)
+            },
+            "metrics": {
+                "net_roi_percent": metrics.get("net_roi_percent", 0.0),
+                "sharpe_ratio": metrics.get("sharpe_ratio", 0.0),
+                "maximum_drawdown_percent": metrics.get("maximum_drawdown_percent", 0.0),
+                "total_trades": metrics.get("total_trades", 0),
+                "win_loss_ratio": metrics.get("win_loss_ratio", 0.0),
+                "total_volume_usd": metrics.get("total_volume_usd", 0.0),
+                "total_profit_usd": metrics.get("total_profit_usd", 0.0)
+            }
+        }
+    
+    async def get_latest_ranking_timestamp(self, period_days: int = 90) -> Optional[datetime]:
+        """
+        Get the timestamp of the most recent ranking calculation
+        
+        Args:
+            period_days: Ranking period to look up
+            
+        Returns:
+            Latest calculation_timestamp, or None if no rankings exist
+        """
+        async with self.get_session() as session:
+            result = await session.execute(
+                text("""
+                SELECT MAX(calculation_timestamp) 
+                FROM trader_rankings 
+                WHERE period_days = :period_days 
+                  AND is_eligible = true
+                """),
+                {"period_days": period_days}
+            )
+            return result.scalar()
+    
+    async def get_ranking_snapshot(
+        self, 
+        calculation_timestamp: datetime, 
+        period_days: int = 90
+    ) -> List[Dict[str, Any]]:
+        """
+        Get every eligible trader of one ranking calculation, ordered by rank
+        
+        Args:
+            calculation_timestamp: Calculation to load
+            period_days: Ranking period to load
+            
+        Returns:
+            Ranked trader dicts in the get_ranked_traders format
+        """
+        async with self.get_session() as session:
+            result = await session.execute(
+                text("""
+                SELECT 
+                    tr.rank,
+                    tr.wallet_address,
+                    tr.trust_score,
+                    tr.performance_metrics,
+                    tr.eligibility_check
+                FROM trader_rankings tr
+                WHERE tr.calculation_timestamp = :calc_time
+                  AND tr.period_days = :period_days
+                  AND tr.is_eligible = true
+                ORDER BY tr.rank ASC
+                """),
+                {"calc_time": calculation_timestamp, "period_days": period_days}
+            )
+            
+            traders = [self._ranking_row_to_trader(row) for row in result]
+            logger.info(f"Loaded ranking snapshot with {len(traders)} traders for {calculation_timestamp}")
+            return traders
+    
     async def _calculate_emergency_rankings(
         self, 
         session: AsyncSession, 
@@ -354,6 +417,67 @@ class DatabaseService:
         except Exception as e:
             logger.error(f"Error storing trader transaction: {e}")
     
+    async def get_ingestion_cursors(self, wallet_addresses: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the stored ingestion cursors for a set of wallets
+        
+        Args:
+            wallet_addresses: Wallets to look up
+            
+        Returns:
+            Dict mapping wallet address to its cursor; wallets never ingested are absent
+        """
+        if not wallet_addresses:
+            return {}
+        
+        async with self.get_session() as session:
+            result = await session.execute(
+                select(WalletIngestionCursor).where(
+                    WalletIngestionCursor.wallet_address.in_(wallet_addresses)
+                )
+            )
+            return {
+                cursor.wallet_address: {
+                    "wallet_address": cursor.wallet_address,
+                    "signature": cursor.newest_signature,
+                    "slot": cursor.newest_slot,
+                    "block_time": cursor.newest_block_time
+                }
+                for cursor in result.scalars()
+            }
+    
+    async def save_ingestion_cursors(self, cursors: List[Dict[str, Any]]):
+        """
+        Upsert ingestion cursors
+        
+        A cursor only moves forward: an older slot (from an overlapping run that
+        finished late) never replaces a newer one.
+        
+        Args:
+            cursors: Dicts with wallet_address, signature, slot and block_time
+        """
+        if not cursors:
+            return
+        
+        async with self.get_session() as session:
+            await session.execute(
+                text("""
+                INSERT INTO wallet_ingestion_cursors 
+                    (wallet_address, newest_signature, newest_slot, newest_block_time, updated_at)
+                VALUES (:wallet_address, :signature, :slot, :block_time, :updated_at)
+                ON CONFLICT (wallet_address) DO UPDATE SET
+                    newest_signature = EXCLUDED.newest_signature,
+                    newest_slot = EXCLUDED.newest_slot,
+                    newest_block_time = EXCLUDED.newest_block_time,
+                    updated_at = EXCLUDED.updated_at
+                WHERE wallet_ingestion_cursors.newest_slot <= EXCLUDED.newest_slot
+                """),
+                [{**cursor, "updated_at": datetime.now(timezone.utc)} for cursor in cursors]
+            )
+            await session.commit()
+        
+        logger.info(f"Saved ingestion cursors for {len(cursors)} wallets")
+    
     async def update_trader_metrics(self, wallet_address: str, period_days: int = 90):
         """Recalculate and update trader performance metrics"""
         try:
@@ -384,4 +508,13 @@ async def get_database_service() -> DatabaseService:
         _database_service = DatabaseService()
         await _database_service.initialize()
     
-    return _database_service
\ No newline at end of file
+    return _database_service
+
+
+async def close_database_service():
+    """Close global database service instance"""
+    global _database_service
+    
+    if _database_service:
+        await _database_service.close()
+        _database_service = None
\ No newline at end of file
@@ -0,0 +1,202 @@
+"""
+XORJ Quantitative Engine - Backfill Planner
+Per-day signature density of a backfill window, and density-proportional sample sizes for high-volume wallets
+"""
+
+import random
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+
+def signature_day(sig_info: Any) -> Optional[date]:
+    """UTC day of a signature's block time, or None if it has none"""
+    block_time = getattr(sig_info, 'block_time', None)
+    if not block_time:
+        return None
+    return datetime.fromtimestamp(block_time, timezone.utc).date()
+
+
+class SignatureHistogram:
+    """
+    Signature counts per UTC day, with a uniform reservoir sample of each day
+
+    Built from a single pass over signature pages; memory is bounded by
+    reservoir_size per day however many signatures a day holds.
+    """
+
+    def __init__(self, reservoir_size: int, seed: Any = None):
+        self.reservoir_size = max(1, reservoir_size)
+        self.counts: Dict[date, int] = {}
+        self.reservoirs: Dict[date, List[Any]] = {}
+        self.total = 0
+        self.newest_time: Optional[int] = None
+        self.oldest_time: Optional[int] = None
+        self._rng = random.Random(seed)
+
+    def add(self, sig_info: Any) -> bool:
+        """
+        Count one signature and keep it in its day's reservoir with probability reservoir_size / count
+
+        Returns:
+            False if the signature has no block time and was not counted
+        """
+        day = signature_day(sig_info)
+        if day is None:
+            return False
+
+        block_time = sig_info.block_time
+        if self.newest_time is None or block_time > self.newest_time:
+            self.newest_time = block_time
+        if self.oldest_time is None or block_time < self.oldest_time:
+            self.oldest_time = block_time
+        count = self.counts.get(day, 0) + 1
+        self.counts[day] = count
+        self.total += 1
+
+        reservoir = self.reservoirs.setdefault(day, [])
+        if count <= self.reservoir_size:
+            reservoir.append(sig_info)
+        else:
+            slot = self._rng.randrange(count)
+            if slot < self.reservoir_size:
+                reservoir[slot] = sig_info
+        return True
+
+    def add_page(self, signatures: List[Any]):
+        for sig_info in signatures:
+            self.add(sig_info)
+
+    def projected_total(self, start_time: Optional[float]) -> float:
+        """
+        Signatures the window back to start_time would hold at the density scanned so far
+
+        Args:
+            start_time: Unix start of the window; without one only the scanned count is known
+
+        Returns:
+            The projected signature count (at least the scanned total)
+        """
+        if not self.total or start_time is None:
+            return self.total
+
+        unscanned = self.oldest_time - start_time
+        if unscanned <= 0:
+            return self.total
+        scanned = max(self.newest_time - self.oldest_time, 1)
+        return self.total * (1 + unscanned / scanned)
+
+    def sample(self, samples_per_day: Dict[date, int], taken: Iterable[Any] = ()) -> List[Any]:
+        """
+        Draw each day's planned number of signatures from its reservoir
+
+        Args:
+            samples_per_day: Number of signatures to draw per day
+            taken: Signatures already fetched; they count towards their day's
+                samples and are not drawn again
+
+        Returns:
+            Sampled signature objects, newest first
+        """
+        taken_per_day: Dict[date, int] = {}
+        taken_signatures = set()
+        for sig_info in taken:
+            day = signature_day(sig_info)
+            taken_per_day[day] = taken_per_day.get(day, 0) + 1
+            taken_signatures.add(str(getattr(sig_info, 'signature', None)))
+
+        sampled = []
+        for day in sorted(samples_per_day, reverse=True):
+            wanted = samples_per_day[day] - taken_per_day.get(day, 0)
+            if wanted <= 0:
+                continue
+            reservoir = self.reservoirs.get(day, [])
+            if taken_signatures:
+                reservoir = [
+                    sig_info for sig_info in reservoir
+                    if str(getattr(sig_info, 'signature', None)) not in taken_signatures
+                ]
+            chosen = self._rng.sample(reservoir, min(wanted, len(reservoir)))
+            chosen.sort(key=lambda sig_info: getattr(sig_info, 'block_time', 0), reverse=True)
+            sampled.extend(chosen)
+        return sampled
+
+
+def allocate_samples(
+    counts: Dict[date, int],
+    budget: int,
+    min_per_day: int = 0,
+    max_per_day: Optional[int] = None
+) -> Dict[date, int]:
+    """
+    Split a sample budget across days in proportion to their signature counts
+
+    Every active day first gets min(count, min_per_day); the rest of the budget is
+    water-filled in proportion to density, never giving a day more samples than it
+    has signatures or than max_per_day.
+
+    Args:
+        counts: Signature count per day
+        budget: Total number of samples to draw
+        min_per_day: Floor for each active day (quiet days are not starved)
+        max_per_day: Ceiling for each day (optional)
+
+    Returns:
+        Number of samples per day, for the days with signatures
+    """
+    caps = {
+        day: min(count, max_per_day) if max_per_day is not None else count
+        for day, count in counts.items() if count > 0
+    }
+    if sum(caps.values()) <= budget:
+        return caps
+
+    allocation = {day: min(cap, min_per_day) for day, cap in caps.items()}
+    remaining = budget - sum(allocation.values())
+    active = [day for day in caps if allocation[day] < caps[day]]
+
+    while remaining > 0 and active:
+        density = sum(counts[day] for day in active)
+        given = 0
+        for day in active:
+            extra = min(remaining * counts[day] // density, caps[day] - allocation[day])
+            allocation[day] += extra
+            given += extra
+
+        if not given:
+            # Shares rounded down to nothing: hand out the last few to the densest days
+            for day in sorted(active, key=lambda d: counts[d], reverse=True)[:remaining]:
+                allocation[day] += 1
+                given += 1
+
+        remaining -= given
+        active = [day for day in active if allocation[day] < caps[day]]
+
+    return allocation
+
+
+@dataclass
+class BackfillPlan:
+    """Outcome of the planning pass over a wallet's backfill window"""
+    method: str  # "FULL" or "SAMPLED"
+    histogram: SignatureHistogram
+    signatures: List[Any] = field(default_factory=list)  # Collected by plan_backfill: every signature (FULL) or those streamed before sampling plus the samples (SAMPLED)
+    samples_per_day: Dict[date, int] = field(default_factory=dict)
+    streamed: int = 0  # Signatures handed to the fetch stage while the window still looked small enough for a full backfill
+    selected: int = 0  # Signatures handed to the fetch stage in all
+    pages: int = 0
+    complete: bool = True  # False if a signature page failed and the histogram is partial
+    errors: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Summary for logs"""
+        return {
+            "method": self.method,
+            "signatures_scanned": self.histogram.total,
+            "active_days": len(self.histogram.counts),
+            "peak_day_signatures": max(self.histogram.counts.values(), default=0),
+            "streamed": self.streamed,
+            "selected": self.selected,
+            "pages": self.pages,
+            "complete": self.complete
+        }
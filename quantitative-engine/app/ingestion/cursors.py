@@ -0,0 +1,105 @@
+"""
+XORJ Quantitative Engine - Wallet Ingestion Cursors
+Persisted newest-processed signature per wallet, so scheduled runs only fetch new history
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from ..core.logging import get_ingestion_logger
+from ..database.service import DatabaseService, get_database_service
+
+logger = get_ingestion_logger()
+
+
+@dataclass
+class IngestionCursor:
+    """Newest signature already ingested for a wallet"""
+    wallet_address: str
+    signature: str
+    slot: int
+    block_time: Optional[datetime] = None
+
+    @classmethod
+    def from_signature_info(cls, wallet_address: str, sig_info: Any) -> "IngestionCursor":
+        """Build a cursor from a getSignaturesForAddress result item"""
+        block_time = getattr(sig_info, 'block_time', None)
+        return cls(
+            wallet_address=wallet_address,
+            signature=str(getattr(sig_info, 'signature', None)),
+            slot=int(getattr(sig_info, 'slot', 0) or 0),
+            block_time=datetime.fromtimestamp(block_time, timezone.utc) if block_time else None
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "wallet_address": self.wallet_address,
+            "signature": self.signature,
+            "slot": self.slot,
+            "block_time": self.block_time
+        }
+
+
+class IngestionCursorStore:
+    """
+    Loads and saves wallet ingestion cursors through the database service
+
+    Cursors are an optimization: when the database is unreachable, load returns
+    no cursors (every wallet falls back to its lookback window) and save is skipped.
+    """
+
+    def __init__(
+        self,
+        database_service_getter: Callable[[], Awaitable[DatabaseService]] = get_database_service
+    ):
+        self._get_database_service = database_service_getter
+
+    async def load(self, wallet_addresses: List[str]) -> Dict[str, IngestionCursor]:
+        """
+        Load the cursors of a set of wallets
+
+        Args:
+            wallet_addresses: Wallets about to be ingested
+
+        Returns:
+            Dict mapping wallet address to its cursor; wallets never ingested are absent
+        """
+        try:
+            database_service = await self._get_database_service()
+            rows = await database_service.get_ingestion_cursors(list(wallet_addresses))
+        except Exception as e:
+            logger.warning(
+                "Ingestion cursors unavailable, using lookback window",
+                wallet_count=len(wallet_addresses),
+                error=str(e)
+            )
+            return {}
+
+        return {wallet: IngestionCursor(**row) for wallet, row in rows.items()}
+
+    async def save(self, cursors: List[IngestionCursor]) -> int:
+        """
+        Persist advanced cursors
+
+        Args:
+            cursors: Cursors of wallets whose ingestion completed
+
+        Returns:
+            Number of cursors saved
+        """
+        if not cursors:
+            return 0
+
+        try:
+            database_service = await self._get_database_service()
+            await database_service.save_ingestion_cursors([cursor.to_dict() for cursor in cursors])
+        except Exception as e:
+            logger.warning(
+                "Failed to save ingestion cursors",
+                wallet_count=len(cursors),
+                error=str(e)
+            )
+            return 0
+
+        return len(cursors)
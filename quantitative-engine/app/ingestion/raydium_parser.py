@@ -3,20 +3,31 @@ XORJ Quantitative Engine - Raydium Transaction Parser
 Parse Raydium AMM swap transactions from Solana transaction data
 """
 
+import json
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timezone
 from decimal import Decimal
-from typing import Any, Dict, List, Optional, Set, Tuple
-import json
-import base64
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
 
 from ..core.config import get_settings, get_supported_token_mints
 from ..core.logging import get_ingestion_logger
-from ..schemas.ingestion import RaydiumSwap, TokenBalance, SwapType, TransactionStatus
+from ..schemas.ingestion import RaydiumSwap, SwapData, SwapRecord, SwapType, TokenAmount, TransactionStatus
+from .transaction_view import TransactionView
 
 settings = get_settings()
 logger = get_ingestion_logger()
 
 
+class SwapParseResult(NamedTuple):
+    """Outcome of parsing a batch of transactions"""
+    swaps: List[SwapRecord]
+    non_swaps: List[str]  # Signatures read in full that hold no swap for their wallet
+
+
 class RaydiumTransactionParser:
     """Parser for Raydium AMM swap transactions"""
     
@@ -27,6 +38,9 @@ class RaydiumTransactionParser:
         # Token symbol reverse mapping
         self.mint_to_symbol = {mint: symbol for symbol, mint in self.supported_tokens.items()}
         
+        # Supported DEX program IDs (Raydium, Jupiter, Orca, Serum)
+        self.supported_programs = frozenset(settings.get_supported_dex_programs())
+        
         # Common instruction types we look for
         self.swap_instruction_types = {
             "swapBaseIn",
@@ -34,264 +48,138 @@ class RaydiumTransactionParser:
             "swap"
         }
         
+        # Large batches are parsed on a process pool so backfills scale with cores
+        # (more workers than cores would only add IPC overhead)
+        self.process_workers = min(settings.parser_process_workers, os.cpu_count() or 1)
+        self.process_min_transactions = settings.parser_process_min_transactions
+        self.process_chunk_size = max(1, settings.parser_process_chunk_size)
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._process_pool_failed = False
+        self._process_pool_lock = threading.Lock()
+        
         logger.info(
             "Initialized Raydium parser",
             supported_tokens=list(self.supported_tokens.keys()),
             raydium_program_id=self.raydium_program_id
         )
     
-    def is_raydium_transaction(self, transaction: Dict[str, Any]) -> bool:
+    def is_raydium_transaction(self, transaction: Any) -> bool:
         """
         Check if transaction involves supported DEX programs (Raydium, Jupiter, Orca, Serum)
         
         Args:
-            transaction: Parsed transaction data from Solana RPC
+            transaction: Transaction from Solana RPC (solders object or dict) or its TransactionView
             
         Returns:
             True if transaction involves any supported DEX program
         """
-        if not transaction:
-            return False
-        
-        # Handle both dict and solders object formats
-        if hasattr(transaction, 'transaction'):
-            # Solders object - access attributes directly
-            tx_data = transaction.transaction
-        elif hasattr(transaction, '__dict__'):
-            # Convert solders object to dict for consistent access
-            transaction = transaction.__dict__
-            if 'transaction' not in transaction:
-                return False
-            tx_data = transaction['transaction']
-        elif isinstance(transaction, dict):
-            if 'transaction' not in transaction:
-                return False
-            tx_data = transaction['transaction']
-        else:
+        view = TransactionView.from_rpc(transaction) if transaction else None
+        if view is None:
             return False
         
-        # Handle nested solders objects in transaction data
-        if hasattr(tx_data, 'message'):
-            message = tx_data.message
-        elif hasattr(tx_data, '__dict__') and 'message' in tx_data.__dict__:
-            message = tx_data.__dict__['message']
-        elif isinstance(tx_data, dict) and 'message' in tx_data:
-            message = tx_data['message']
-        else:
-            return False
-        
-        # Get all supported DEX program IDs
-        supported_programs = [
-            self.raydium_program_id,
-            "JUP6LkbZbjS1jKKwapdHNy74zcZ3tLUZoi5QNyVTaV4K",  # Jupiter
-            "9W959DqEETiGZocYWCQPaJ6sBmUzgfxXfqGeTEdp3aQP",  # Orca
-            "9xQeWvG816bUx9EPjHmaT23yvVM2ZWbrrpZb9PusVFin",  # Serum
-        ]
-        
-        # Handle message attributes vs dict access
-        if hasattr(message, 'account_keys'):
-            account_keys = message.account_keys
-        elif hasattr(message, '__dict__') and 'accountKeys' in message.__dict__:
-            account_keys = message.__dict__['accountKeys']
-        elif isinstance(message, dict) and 'accountKeys' in message:
-            account_keys = message['accountKeys']
-        else:
-            account_keys = []
-        
-        # Check account keys for any supported DEX program
-        for account in account_keys:
-            if hasattr(account, 'pubkey'):
-                pubkey = str(account.pubkey)
-                if pubkey in supported_programs:
-                    return True
-            elif isinstance(account, dict):
-                pubkey = account.get('pubkey')
-                if pubkey in supported_programs:
-                    return True
-            elif isinstance(account, str) and account in supported_programs:
-                return True
-        
-        # Handle instructions attributes vs dict access
-        if hasattr(message, 'instructions'):
-            instructions = message.instructions
-        elif hasattr(message, '__dict__') and 'instructions' in message.__dict__:
-            instructions = message.__dict__['instructions']
-        elif isinstance(message, dict) and 'instructions' in message:
-            instructions = message['instructions']
-        else:
-            instructions = []
-        
-        # Check instructions for any supported DEX program
-        for instruction in instructions:
-            if hasattr(instruction, 'program_id'):
-                program_id = str(instruction.program_id)
-                if program_id in supported_programs:
-                    return True
-            elif isinstance(instruction, dict):
-                program_id = instruction.get('programId') or instruction.get('program_id')
-                if program_id in supported_programs:
-                    return True
-        
-        return False
+        return not self.supported_programs.isdisjoint(view.program_ids)
     
-    def extract_token_balances(self, transaction: Dict[str, Any]) -> Dict[str, Dict[str, Decimal]]:
+    def extract_token_balances(
+        self,
+        transaction: Any,
+        owner: Optional[str] = None
+    ) -> Dict[str, Dict[str, Decimal]]:
         """
         Extract token balance changes from transaction
         
+        Pre and post balances are matched by token account index, and the changes of
+        all of an owner's accounts for the same mint are summed.
+        
         Args:
-            transaction: Parsed transaction data
+            transaction: Transaction from Solana RPC or its TransactionView
+            owner: Only compute changes for this owner (all owners if None)
             
         Returns:
-            Dict mapping account addresses to token balance changes
+            Dict mapping owner addresses to token balance changes by mint
         """
         balance_changes = {}
         
-        # Handle both dict and solders object formats for transaction
-        if hasattr(transaction, 'meta'):
-            # Solders object - access attributes directly
-            meta = transaction.meta
-        elif hasattr(transaction, '__dict__'):
-            transaction = transaction.__dict__
-            if not transaction or 'meta' not in transaction:
-                return balance_changes
-            meta = transaction['meta']
-        elif isinstance(transaction, dict):
-            if not transaction or 'meta' not in transaction:
-                return balance_changes
-            meta = transaction['meta']
-        else:
+        view = TransactionView.from_rpc(transaction) if transaction else None
+        if view is None:
             return balance_changes
         
-        # Handle meta attributes vs dict access
-        if hasattr(meta, 'pre_token_balances'):
-            pre_balances = meta.pre_token_balances or []
-            post_balances = meta.post_token_balances or []
-        elif hasattr(meta, '__dict__'):
-            meta_dict = meta.__dict__
-            pre_balances = meta_dict.get('preTokenBalances', [])
-            post_balances = meta_dict.get('postTokenBalances', [])
-        elif isinstance(meta, dict):
-            pre_balances = meta.get('preTokenBalances', [])
-            post_balances = meta.get('postTokenBalances', [])
-        else:
-            pre_balances = []
-            post_balances = []
-        
-        # Create lookup for pre-balances
-        pre_lookup = {}
-        for balance in pre_balances:
-            # Handle solders balance objects vs dict
-            if hasattr(balance, 'owner'):
-                account = str(balance.owner)
-                mint = str(balance.mint)
-                if hasattr(balance, 'ui_token_amount') and balance.ui_token_amount:
-                    amount = balance.ui_token_amount.ui_amount or 0
-                else:
-                    amount = 0
-            elif isinstance(balance, dict):
-                account = balance.get('owner')
-                mint = balance.get('mint')
-                amount = balance.get('uiTokenAmount', {}).get('uiAmount', 0)
-            else:
+        pre_balances = view.pre_token_balances
+        for index, post in view.post_token_balances.items():
+            if not post.owner or not post.mint or (owner is not None and post.owner != owner):
                 continue
             
-            if account and mint:
-                if account not in pre_lookup:
-                    pre_lookup[account] = {}
-                pre_lookup[account][mint] = Decimal(str(amount or 0))
-        
-        # Calculate changes using post-balances
-        for balance in post_balances:
-            # Handle solders balance objects vs dict
-            if hasattr(balance, 'owner'):
-                account = str(balance.owner)
-                mint = str(balance.mint)
-                if hasattr(balance, 'ui_token_amount') and balance.ui_token_amount:
-                    post_amount = balance.ui_token_amount.ui_amount or 0
-                    decimals = balance.ui_token_amount.decimals or 0
-                else:
-                    post_amount = 0
-                    decimals = 0
-            elif isinstance(balance, dict):
-                account = balance.get('owner')
-                mint = balance.get('mint')
-                post_amount = balance.get('uiTokenAmount', {}).get('uiAmount', 0)
-                decimals = balance.get('uiTokenAmount', {}).get('decimals', 0)
-            else:
-                continue
-            
-            if not account or not mint:
-                continue
-            
-            post_amount = Decimal(str(post_amount or 0))
-            pre_amount = pre_lookup.get(account, {}).get(mint, Decimal('0'))
-            
-            change = post_amount - pre_amount
+            pre = pre_balances.get(index)
+            post_amount = Decimal(str(post.ui_amount or 0))
+            pre_amount = Decimal(str(pre.ui_amount or 0)) if pre is not None else Decimal('0')
             
-            if change != 0:
-                if account not in balance_changes:
-                    balance_changes[account] = {}
-                
-                balance_changes[account][mint] = {
-                    'amount': change,
-                    'decimals': decimals,
+            owner_changes = balance_changes.setdefault(post.owner, {})
+            change_info = owner_changes.get(post.mint)
+            if change_info is None:
+                owner_changes[post.mint] = {
+                    'amount': post_amount - pre_amount,
+                    'decimals': post.decimals,
                     'pre_balance': pre_amount,
                     'post_balance': post_amount
                 }
+            else:
+                change_info['amount'] += post_amount - pre_amount
+                change_info['pre_balance'] += pre_amount
+                change_info['post_balance'] += post_amount
+        
+        # Drop unchanged balances
+        for owner_address in list(balance_changes):
+            owner_changes = {
+                mint: info for mint, info in balance_changes[owner_address].items() if info['amount'] != 0
+            }
+            if owner_changes:
+                balance_changes[owner_address] = owner_changes
+            else:
+                del balance_changes[owner_address]
         
         return balance_changes
     
-    def identify_swap_type(self, transaction: Dict[str, Any]) -> SwapType:
+    def identify_swap_type(self, transaction: Any) -> SwapType:
         """
         Identify the type of swap from transaction instructions
         
         Args:
-            transaction: Parsed transaction data
+            transaction: Transaction from Solana RPC or its TransactionView
             
         Returns:
             SwapType enum value
         """
-        # Handle both dict and solders object formats
-        if hasattr(transaction, '__dict__'):
-            transaction = transaction.__dict__
-        
-        if not transaction or 'transaction' not in transaction:
+        view = TransactionView.from_rpc(transaction) if transaction else None
+        if view is None:
             return SwapType.UNKNOWN
         
-        tx_data = transaction['transaction']
-        message = tx_data.get('message', {})
-        instructions = message.get('instructions', [])
-        
-        for instruction in instructions:
-            if instruction.get('programId') != self.raydium_program_id:
+        for instruction in view.instructions:
+            if instruction.program_id != self.raydium_program_id:
                 continue
             
             # Try to extract instruction type from parsed data
-            if 'parsed' in instruction:
-                parsed = instruction['parsed']
-                if isinstance(parsed, dict):
-                    instruction_type = parsed.get('type', '').lower()
-                    if 'swapbasein' in instruction_type:
-                        return SwapType.SWAP_BASE_IN
-                    elif 'swapbaseout' in instruction_type:
-                        return SwapType.SWAP_BASE_OUT
-                    elif 'swap' in instruction_type:
-                        return SwapType.SWAP
+            if instruction.parsed_type is not None:
+                instruction_type = instruction.parsed_type.lower()
+                if 'swapbasein' in instruction_type:
+                    return SwapType.SWAP_BASE_IN
+                elif 'swapbaseout' in instruction_type:
+                    return SwapType.SWAP_BASE_OUT
+                elif 'swap' in instruction_type:
+                    return SwapType.SWAP
             
             # Try to identify from instruction data
-            if 'data' in instruction:
+            if instruction.has_data:
                 # This would require decoding the instruction data
                 # For now, we'll default to generic swap
                 return SwapType.SWAP
         
         return SwapType.UNKNOWN
     
-    def extract_pool_info(self, transaction: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
+    def extract_pool_info(self, transaction: Any) -> Tuple[Optional[str], Optional[str]]:
         """
         Extract pool ID and program ID from transaction
         
         Args:
-            transaction: Parsed transaction data
+            transaction: Transaction from Solana RPC or its TransactionView
             
         Returns:
             Tuple of (pool_id, program_id)
@@ -299,25 +187,15 @@ class RaydiumTransactionParser:
         pool_id = None
         program_id = self.raydium_program_id
         
-        # Handle both dict and solders object formats
-        if hasattr(transaction, '__dict__'):
-            transaction = transaction.__dict__
-        
-        if not transaction or 'transaction' not in transaction:
+        view = TransactionView.from_rpc(transaction) if transaction else None
+        if view is None:
             return pool_id, program_id
         
-        tx_data = transaction['transaction']
-        message = tx_data.get('message', {})
-        
         # Look for pool-related accounts in instructions
-        instructions = message.get('instructions', [])
-        for instruction in instructions:
-            if instruction.get('programId') == self.raydium_program_id:
-                # The first account after program ID is often the pool
-                accounts = instruction.get('accounts', [])
-                if accounts:
-                    # Heuristic: pool ID is often the first or second account
-                    pool_id = accounts[0] if accounts else None
+        for instruction in view.instructions:
+            if instruction.program_id == self.raydium_program_id:
+                # Heuristic: the first account after program ID is often the pool
+                pool_id = instruction.accounts[0] if instruction.accounts else None
                 break
         
         return pool_id, program_id
@@ -339,49 +217,68 @@ class RaydiumTransactionParser:
         Returns:
             RaydiumSwap object or None if parsing fails
         """
+        record = self.parse_swap_record(transaction, signature, wallet_address)
+        return record.to_raydium_swap() if record else None
+    
+    def parse_swap_record(
+        self,
+        transaction: Any,
+        signature: str,
+        wallet_address: str
+    ) -> Optional[SwapRecord]:
+        """
+        Parse a Raydium swap transaction into a compact, validated SwapRecord
+        
+        Args:
+            transaction: Raw transaction data from Solana RPC
+            signature: Transaction signature
+            wallet_address: Wallet address that performed the swap
+            
+        Returns:
+            SwapRecord or None if parsing or validation fails
+        """
+        return self._parse_swap_outcome(transaction, signature, wallet_address)[0]
+    
+    def _parse_swap_outcome(
+        self,
+        transaction: Any,
+        signature: str,
+        wallet_address: str
+    ) -> Tuple[Optional[SwapRecord], bool]:
+        """
+        Parse one transaction and say whether a missing swap is a positive classification
+        
+        Returns:
+            Tuple of (swap_record, not_a_swap). not_a_swap is True only when the
+            transaction was read in full and holds no swap for the wallet; odd
+            payloads and parse errors leave it False.
+        """
         try:
+            # Normalize once; every step below reads the same view
+            view = TransactionView.from_rpc(transaction) if transaction else None
+            if view is None:
+                if transaction:
+                    logger.warning("Unknown transaction format", signature=signature, type=type(transaction))
+                return None, False
+            
             # Basic validation
-            if not transaction or not self.is_raydium_transaction(transaction):
-                return None
-            
-            # Extract basic transaction info - handle both dict and solders object formats
-            if hasattr(transaction, 'block_time'):
-                # Solders object
-                block_time = transaction.block_time
-                slot = transaction.slot
-                meta = transaction.meta if hasattr(transaction, 'meta') else None
-            elif hasattr(transaction, '__dict__'):
-                # Convert solders object to dict
-                tx_dict = transaction.__dict__
-                block_time = tx_dict.get('blockTime')
-                slot = tx_dict.get('slot', 0)
-                meta = tx_dict.get('meta', {})
-            elif isinstance(transaction, dict):
-                # Already a dict
-                block_time = transaction.get('blockTime')
-                slot = transaction.get('slot', 0)
-                meta = transaction.get('meta', {})
-            else:
-                logger.warning("Unknown transaction format", signature=signature, type=type(transaction))
-                return None
+            if not self.is_raydium_transaction(view):
+                return None, True
+            
+            block_time = view.block_time
+            slot = view.slot
             
             if not block_time:
                 logger.warning("Transaction missing block time", signature=signature)
-                return None
+                return None, False
             
             block_time_dt = datetime.fromtimestamp(block_time, timezone.utc)
             
             # Determine transaction status
-            if hasattr(meta, 'err'):
-                err = meta.err
-            elif isinstance(meta, dict):
-                err = meta.get('err')
-            else:
-                err = None
-            status = TransactionStatus.FAILED if err else TransactionStatus.SUCCESS
+            status = TransactionStatus.FAILED if view.err else TransactionStatus.SUCCESS
             
             # Extract token balance changes
-            balance_changes = self.extract_token_balances(transaction)
+            balance_changes = self.extract_token_balances(view, owner=wallet_address)
             
             if wallet_address not in balance_changes:
                 logger.warning(
@@ -389,7 +286,7 @@ class RaydiumTransactionParser:
                     signature=signature,
                     wallet=wallet_address
                 )
-                return None
+                return None, True
             
             wallet_changes = balance_changes[wallet_address]
             
@@ -400,7 +297,7 @@ class RaydiumTransactionParser:
                     signature=signature,
                     changes=len(wallet_changes)
                 )
-                return None
+                return None, True
             
             # Identify input and output tokens
             token_in = None
@@ -418,19 +315,9 @@ class RaydiumTransactionParser:
                     symbol = mint[:8].upper()
                 
                 if amount < 0:  # Token decreased = input token
-                    token_in = TokenBalance(
-                        mint=mint,
-                        symbol=symbol,
-                        decimals=decimals,
-                        amount=abs(amount)  # Store as positive amount
-                    )
+                    token_in = TokenAmount(mint, symbol, decimals, abs(amount))  # Store as positive amount
                 elif amount > 0:  # Token increased = output token
-                    token_out = TokenBalance(
-                        mint=mint,
-                        symbol=symbol,
-                        decimals=decimals,
-                        amount=amount
-                    )
+                    token_out = TokenAmount(mint, symbol, decimals, amount)
             
             if not token_in or not token_out:
                 logger.warning(
@@ -439,11 +326,11 @@ class RaydiumTransactionParser:
                     wallet=wallet_address,
                     changes=list(wallet_changes.keys())
                 )
-                return None
+                return None, True
             
             # Extract additional info
-            swap_type = self.identify_swap_type(transaction)
-            pool_id, program_id = self.extract_pool_info(transaction)
+            swap_type = self.identify_swap_type(view)
+            pool_id, program_id = self.extract_pool_info(view)
             
             if not pool_id:
                 logger.warning("Could not identify pool ID", signature=signature)
@@ -451,15 +338,10 @@ class RaydiumTransactionParser:
                 pool_id = "unknown_pool"
             
             # Extract transaction fee
-            if hasattr(meta, 'fee'):
-                fee_lamports = meta.fee or 0
-            elif isinstance(meta, dict):
-                fee_lamports = meta.get('fee', 0)
-            else:
-                fee_lamports = 0
+            fee_lamports = view.fee
             
-            # Create the swap object
-            raydium_swap = RaydiumSwap(
+            # Create the swap record; the model checks run here, once
+            swap_record = SwapRecord(
                 signature=signature,
                 block_time=block_time_dt,
                 slot=slot,
@@ -471,7 +353,7 @@ class RaydiumTransactionParser:
                 pool_id=pool_id,
                 program_id=program_id,
                 fee_lamports=fee_lamports
-            )
+            ).validate()
             
             logger.debug(
                 "Successfully parsed Raydium swap",
@@ -482,7 +364,7 @@ class RaydiumTransactionParser:
                 swap_type=swap_type.value
             )
             
-            return raydium_swap
+            return swap_record, False
             
         except Exception as e:
             logger.error(
@@ -492,12 +374,12 @@ class RaydiumTransactionParser:
                 error=str(e),
                 error_type=type(e).__name__
             )
-            return None
+            return None, False
     
     def parse_multiple_swaps(
         self, 
         transactions: List[Tuple[Dict[str, Any], str, str]]
-    ) -> List[RaydiumSwap]:
+    ) -> List[SwapRecord]:
         """
         Parse multiple transactions in batch
         
@@ -505,20 +387,66 @@ class RaydiumTransactionParser:
             transactions: List of (transaction_data, signature, wallet_address) tuples
             
         Returns:
-            List of successfully parsed RaydiumSwap objects
+            List of successfully parsed swaps as SwapRecords
+        """
+        return self.parse_swap_batch(transactions).swaps
+    
+    def parse_swap_batch(
+        self,
+        transactions: List[Tuple[Any, str, str]]
+    ) -> SwapParseResult:
+        """
+        Parse multiple transactions in batch and report the positive non-swaps
+        
+        Batches of at least parser_process_min_transactions are parsed on a process
+        pool. The call blocks until they are done, so async callers should run it
+        in a thread (asyncio.to_thread) to keep the event loop free.
+        
+        Args:
+            transactions: List of (transaction_data, signature, wallet_address) tuples
+            
+        Returns:
+            SwapParseResult with the parsed swaps and the signatures classified as
+            non-swaps (transactions that failed to parse are in neither)
         """
-        parsed_swaps = []
+        parallel = self._use_process_pool(len(transactions))
         
         logger.info(
             "Parsing multiple Raydium transactions",
-            count=len(transactions)
+            count=len(transactions),
+            parallel=parallel
+        )
+        
+        result = None
+        if parallel:
+            result = self._parse_multiple_swaps_parallel(transactions)
+        if result is None:
+            result = self._parse_swaps(transactions)
+        
+        success_rate = len(result.swaps) / len(transactions) if transactions else 0
+        
+        logger.info(
+            "Completed batch parsing",
+            total_transactions=len(transactions),
+            successful_parses=len(result.swaps),
+            non_swaps=len(result.non_swaps),
+            unparsed=len(transactions) - len(result.swaps) - len(result.non_swaps),
+            success_rate=f"{success_rate:.2%}"
         )
         
+        return result
+    
+    def _parse_swaps(self, transactions: Iterable[Tuple[Any, str, str]]) -> SwapParseResult:
+        """Parse transactions one after another in the calling thread"""
+        result = SwapParseResult([], [])
+        
         for transaction_data, signature, wallet_address in transactions:
             try:
-                swap = self.parse_raydium_swap(transaction_data, signature, wallet_address)
+                swap, not_a_swap = self._parse_swap_outcome(transaction_data, signature, wallet_address)
                 if swap:
-                    parsed_swaps.append(swap)
+                    result.swaps.append(swap)
+                elif not_a_swap:
+                    result.non_swaps.append(signature)
             except Exception as e:
                 logger.error(
                     "Error parsing transaction in batch",
@@ -527,18 +455,107 @@ class RaydiumTransactionParser:
                 )
                 continue
         
-        success_rate = len(parsed_swaps) / len(transactions) if transactions else 0
-        
-        logger.info(
-            "Completed batch parsing",
-            total_transactions=len(transactions),
-            successful_parses=len(parsed_swaps),
-            success_rate=f"{success_rate:.2%}"
+        return result
+    
+    def _use_process_pool(self, transaction_count: int) -> bool:
+        """Parse on the process pool only when enabled and the batch is large enough to pay off"""
+        return (
+            self.process_workers > 1
+            and not self._process_pool_failed
+            and transaction_count >= self.process_min_transactions
+            # Daemonic processes (e.g. pool workers themselves) cannot start children
+            and not multiprocessing.current_process().daemon
         )
+    
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        """Create the parser process pool on first use"""
+        with self._process_pool_lock:
+            if self._process_pool is None:
+                # Spawned workers do not inherit the event loop, locks or open sockets of this process
+                self._process_pool = ProcessPoolExecutor(
+                    max_workers=self.process_workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+                logger.info("Started parser process pool", workers=self.process_workers)
+            return self._process_pool
+    
+    def _parse_multiple_swaps_parallel(
+        self,
+        transactions: List[Tuple[Any, str, str]]
+    ) -> Optional[SwapParseResult]:
+        """
+        Parse a batch on the process pool
+        
+        Payloads cross the process boundary as their getTransaction JSON bytes, in
+        chunks of parser_process_chunk_size; workers return SwapParseResults.
+        Payloads that cannot be encoded are parsed in this process.
         
-        return parsed_swaps
+        Returns:
+            SwapParseResult with swaps in input order, or None if the pool is unavailable
+        """
+        encoded = []
+        local = []
+        for transaction_data, signature, wallet_address in transactions:
+            payload = _encode_payload(transaction_data)
+            if payload is None:
+                local.append((transaction_data, signature, wallet_address))
+            else:
+                encoded.append((payload, signature, wallet_address))
+        
+        chunks = [
+            encoded[i:i + self.process_chunk_size]
+            for i in range(0, len(encoded), self.process_chunk_size)
+        ]
+        
+        try:
+            pool = self._get_process_pool()
+            futures = [pool.submit(_parse_swap_chunk, chunk) for chunk in chunks]
+            result = SwapParseResult([], [])
+            for future in futures:
+                chunk_result = future.result()
+                result.swaps.extend(chunk_result.swaps)
+                result.non_swaps.extend(chunk_result.non_swaps)
+        except (BrokenProcessPool, OSError, RuntimeError, AssertionError) as e:
+            # Parsing must not depend on the pool: fall back to this process for good
+            self._process_pool_failed = True
+            logger.error(
+                "Parser process pool unavailable, parsing in-process",
+                error=str(e),
+                error_type=type(e).__name__
+            )
+            self.shutdown_process_pool()
+            return None
+        except Exception as e:
+            logger.error(
+                "Parallel parse failed, parsing batch in-process",
+                count=len(transactions),
+                error=str(e),
+                error_type=type(e).__name__
+            )
+            return None
+        
+        if local:
+            local_result = self._parse_swaps(local)
+            result.swaps.extend(local_result.swaps)
+            result.non_swaps.extend(local_result.non_swaps)
+            # Put the locally parsed swaps back at their input positions
+            position = {
+                (signature, wallet_address): index
+                for index, (_, signature, wallet_address) in enumerate(transactions)
+            }
+            result.swaps.sort(key=lambda swap: position[(swap.signature, swap.wallet_address)])
+        
+        return result
+    
+    def shutdown_process_pool(self):
+        """Stop parser process pool workers"""
+        with self._process_pool_lock:
+            if self._process_pool is not None:
+                self._process_pool.shutdown(wait=True, cancel_futures=True)
+                self._process_pool = None
+                logger.info("Stopped parser process pool")
     
-    def validate_swap_data(self, swap: RaydiumSwap) -> List[str]:
+    def validate_swap_data(self, swap: SwapData) -> List[str]:
         """
         Validate parsed swap data for consistency
         
@@ -579,6 +596,34 @@ class RaydiumTransactionParser:
         return errors
 
 
+def _encode_payload(transaction: Any) -> Optional[bytes]:
+    """getTransaction JSON bytes of a dict or solders payload"""
+    try:
+        if isinstance(transaction, dict):
+            return json.dumps(transaction, separators=(",", ":")).encode("utf-8")
+        if hasattr(transaction, "to_json"):
+            return transaction.to_json().encode("utf-8")
+    except (TypeError, ValueError):
+        pass
+    return None
+
+
+# Parser reused by every chunk a process-pool worker handles
+_worker_parser: Optional[RaydiumTransactionParser] = None
+
+
+def _parse_swap_chunk(chunk: List[Tuple[bytes, str, str]]) -> SwapParseResult:
+    """Process-pool entry point for _parse_multiple_swaps_parallel"""
+    global _worker_parser
+    
+    if _worker_parser is None:
+        _worker_parser = RaydiumTransactionParser()
+    
+    return _worker_parser._parse_swaps(
+        (json.loads(payload), signature, wallet_address) for payload, signature, wallet_address in chunk
+    )
+
+
 # Global parser instance
 _parser_instance: Optional[RaydiumTransactionParser] = None
 
@@ -590,4 +635,4 @@ def get_raydium_parser() -> RaydiumTransactionParser:
     if _parser_instance is None:
         _parser_instance = RaydiumTransactionParser()
     
-    return _parser_instance
\ No newline at end of file
+    return _parser_instance
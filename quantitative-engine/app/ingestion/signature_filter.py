@@ -0,0 +1,318 @@
+"""
+XORJ Quantitative Engine - Signature Pre-Filter
+Drops signatures that cannot yield a swap before their transactions are downloaded
+"""
+
+import hashlib
+import math
+import os
+import struct
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ..core.config import get_settings, get_supported_token_mints
+from ..core.logging import get_ingestion_logger
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    FCNTL_AVAILABLE = False
+
+settings = get_settings()
+logger = get_ingestion_logger()
+
+# Bump whenever the parser code changes which transactions yield swaps; filters learned
+# by an older parser are discarded on load (settings changes are caught by the digest)
+FILTER_VERSION = 3
+FILE_MAGIC = b"XSGF"
+# File header: magic, version, parser settings digest, generation, bit count, hash count, then the bit array
+FILE_HEADER = struct.Struct("<4sH8sQQI")
+
+
+def parser_settings_digest() -> bytes:
+    """Digest of the settings that decide which transactions the parser turns into swaps"""
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(",".join(sorted(settings.get_supported_dex_programs())).encode())
+    digest.update(b";")
+    digest.update(",".join(sorted(get_supported_token_mints().values())).encode())
+    return digest.digest()
+
+
+class BloomFilter:
+    """
+    Fixed-size bloom filter over string keys
+
+    Bit positions come from double hashing one 128-bit blake2b digest, so a lookup
+    costs a single hash however many positions it checks.
+    """
+
+    def __init__(self, num_bits: int, num_hashes: int, bits: Optional[bytearray] = None):
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+        self.bits = bits if bits is not None else bytearray((num_bits + 7) // 8)
+
+    @classmethod
+    def for_capacity(cls, capacity: int, error_rate: float) -> "BloomFilter":
+        """Size a filter to hold `capacity` keys at the given false-positive rate"""
+        num_bits = max(64, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        num_hashes = max(1, round(num_bits / capacity * math.log(2)))
+        return cls(num_bits, num_hashes)
+
+    def _positions(self, key: str) -> List[int]:
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        num_bits = self.num_bits
+        return [(h1 + i * h2) % num_bits for i in range(self.num_hashes)]
+
+    def add(self, key: str):
+        bits = self.bits
+        for position in self._positions(key):
+            bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: str) -> bool:
+        bits = self.bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    def union(self, other: "BloomFilter"):
+        """Add every key of another filter with the same dimensions"""
+        merged = int.from_bytes(self.bits, "little") | int.from_bytes(other.bits, "little")
+        self.bits = bytearray(merged.to_bytes(len(self.bits), "little"))
+
+    def clear(self):
+        self.bits = bytearray(len(self.bits))
+
+    def approximate_count(self) -> int:
+        """Estimate of the number of keys added, from the share of bits set"""
+        set_bits = int.from_bytes(self.bits, "little").bit_count()
+        if set_bits >= self.num_bits:
+            return self.num_bits
+        return round(-self.num_bits / self.num_hashes * math.log(1 - set_bits / self.num_bits))
+
+
+class SignatureFilter:
+    """
+    Pre-fetch filter over getSignaturesForAddress results
+
+    Two checks run on each signature before its transaction is fetched:
+    - Failed transactions (err set on the signature info) are dropped: their token
+      balance changes were rolled back, so they never parse into a swap.
+    - Signatures already fetched for the wallet that produced no swap are dropped
+      when the bloom filter of such (wallet, signature) pairs contains them.
+
+    A bloom filter false positive skips a real swap, so the error rate is kept low
+    and the filter is cleared (a new generation) once it has seen its capacity.
+    The learned pairs are persisted to `path`; save merges them with what other
+    processes saved in the same generation, under an exclusive lock on `path`.lock.
+    A file learned with other supported programs or tokens is discarded on load.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        capacity: Optional[int] = None,
+        error_rate: Optional[float] = None
+    ):
+        self.path = settings.signature_filter_path if path is None else path
+        self.capacity = capacity or settings.signature_filter_capacity
+        self.settings_digest = parser_settings_digest()
+        self.bloom = BloomFilter.for_capacity(self.capacity, error_rate or settings.signature_filter_error_rate)
+        self.generation = 0
+        self._entries = 0
+        self._dirty = False
+        self._lock = threading.Lock()
+
+        self.stats = {
+            'signatures_checked': 0,
+            'skipped_failed': 0,
+            'skipped_known_non_swap': 0,
+            'non_swaps_learned': 0,
+            'generations_cleared': 0
+        }
+
+        if self.path:
+            loaded = self._read()
+            if loaded is not None:
+                self.generation, self.bloom = loaded
+                self._entries = self.bloom.approximate_count()
+
+    @staticmethod
+    def _key(wallet_address: str, signature: Any) -> str:
+        return f"{wallet_address}:{signature}"
+
+    def select(self, wallet_address: str, signatures: List[Any]) -> List[Any]:
+        """
+        Keep the signatures whose transactions are worth fetching
+
+        Args:
+            wallet_address: Wallet the signatures belong to
+            signatures: getSignaturesForAddress result items
+
+        Returns:
+            The signature items that passed both checks, in input order
+        """
+        kept = []
+        failed = 0
+        known = 0
+        bloom = self.bloom
+
+        for sig in signatures:
+            if getattr(sig, 'err', None) is not None:
+                failed += 1
+            elif self._key(wallet_address, getattr(sig, 'signature', None)) in bloom:
+                known += 1
+            else:
+                kept.append(sig)
+
+        self.stats['signatures_checked'] += len(signatures)
+        self.stats['skipped_failed'] += failed
+        self.stats['skipped_known_non_swap'] += known
+        return kept
+
+    def record_non_swaps(self, pairs: Iterable[Tuple[str, str]]) -> int:
+        """
+        Remember fetched transactions that produced no swap
+
+        Only transactions that were fetched and parsed belong here; failed fetches
+        must be retried by later runs.
+
+        Args:
+            pairs: (wallet_address, signature) pairs
+
+        Returns:
+            Number of pairs recorded
+        """
+        recorded = 0
+        with self._lock:
+            for wallet_address, signature in pairs:
+                if self._entries >= self.capacity:
+                    self._new_generation()
+                self.bloom.add(self._key(wallet_address, signature))
+                self._entries += 1
+                recorded += 1
+            if recorded:
+                self._dirty = True
+
+        self.stats['non_swaps_learned'] += recorded
+        return recorded
+
+    def _new_generation(self):
+        self.bloom.clear()
+        self.generation += 1
+        self._entries = 0
+        self.stats['generations_cleared'] += 1
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of checked signatures that were not fetched"""
+        skipped = self.stats['skipped_failed'] + self.stats['skipped_known_non_swap']
+        return skipped / self.stats['signatures_checked'] if self.stats['signatures_checked'] else 0.0
+
+    def _read(self) -> Optional[Tuple[int, BloomFilter]]:
+        """Read the persisted filter, or None if it is missing or was built with other settings"""
+        try:
+            with open(self.path, "rb") as f:
+                header = f.read(FILE_HEADER.size)
+                bits = bytearray(f.read())
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning("Could not read signature filter", path=self.path, error=str(e))
+            return None
+
+        if len(header) < FILE_HEADER.size:
+            return None
+        magic, version, digest, generation, num_bits, num_hashes = FILE_HEADER.unpack(header)
+        if (
+            magic != FILE_MAGIC
+            or version != FILTER_VERSION
+            or digest != self.settings_digest
+            or (num_bits, num_hashes) != (self.bloom.num_bits, self.bloom.num_hashes)
+            or len(bits) != len(self.bloom.bits)
+        ):
+            logger.info("Discarding incompatible signature filter", path=self.path, version=version)
+            return None
+        return generation, BloomFilter(num_bits, num_hashes, bits)
+
+    def save(self) -> bool:
+        """
+        Persist the learned pairs, merged with the copy on disk
+
+        The read-merge-write holds an exclusive lock on `path`.lock, so concurrent
+        processes saving the same file cannot drop each other's pairs.
+
+        Returns:
+            True if the file was written
+        """
+        if not self.path or not self._dirty:
+            return False
+
+        with self._lock:
+            try:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                with open(f"{self.path}.lock", "a+b") as lock_file:
+                    if FCNTL_AVAILABLE:
+                        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                    try:
+                        self._merge_and_write()
+                    finally:
+                        if FCNTL_AVAILABLE:
+                            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            except OSError as e:
+                logger.warning("Could not save signature filter", path=self.path, error=str(e))
+                return False
+
+            self._dirty = False
+            return True
+
+    def _merge_and_write(self):
+        """Fold in the pairs other processes saved, then replace the file (lock held)"""
+        on_disk = self._read()
+        if on_disk is not None:
+            generation, bloom = on_disk
+            if generation == self.generation:
+                self.bloom.union(bloom)
+            elif generation > self.generation:
+                # Another process cleared the filter since we loaded it
+                self.generation, self.bloom = generation, bloom
+            self._entries = self.bloom.approximate_count()
+        if self._entries >= self.capacity:
+            self._new_generation()
+
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(FILE_HEADER.pack(
+                FILE_MAGIC, FILTER_VERSION, self.settings_digest, self.generation,
+                self.bloom.num_bits, self.bloom.num_hashes
+            ))
+            f.write(self.bloom.bits)
+        os.replace(temp_path, self.path)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Filter counters, hit rate and size"""
+        return {
+            **self.stats,
+            'hit_rate': round(self.hit_rate, 4),
+            'entries': self._entries,
+            'capacity': self.capacity,
+            'generation': self.generation,
+            'size_bytes': len(self.bloom.bits)
+        }
+
+
+# Global signature filter instance
+_signature_filter: Optional[SignatureFilter] = None
+_signature_filter_lock = threading.Lock()
+
+
+def get_signature_filter() -> SignatureFilter:
+    """Get the process-wide signature filter, shared by every ingestion worker"""
+    global _signature_filter
+
+    with _signature_filter_lock:
+        if _signature_filter is None:
+            _signature_filter = SignatureFilter()
+        return _signature_filter
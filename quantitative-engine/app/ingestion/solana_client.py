@@ -4,41 +4,94 @@ High-performance Solana client with rate limiting and retry logic
 """
 
 import asyncio
+import json
 from typing import Any, Dict, List, Optional, Union
 from datetime import datetime, timezone
 import httpx
 from solana.rpc.async_api import AsyncClient
 from solana.rpc.commitment import Commitment
 from solana.rpc.types import DataSliceOpts, TokenAccountOpts
+from solders.commitment_config import CommitmentLevel
 from solders.pubkey import Pubkey
+from solders.rpc.config import RpcTransactionConfig
+from solders.rpc.requests import GetTransaction
+from solders.rpc.responses import GetTransactionResp
 from solders.signature import Signature
+from solders.transaction_status import EncodedConfirmedTransactionWithStatusMeta, UiTransactionEncoding
 
 from ..core.config import get_settings
 from ..core.logging import get_ingestion_logger
+from ..core.rate_limiter import RPCRateLimiter, get_rpc_rate_limiter, provider_for_url
 from ..core.retry import retry_with_backoff, RetrySession, RateLimitError, TransientError
+from ..core.transaction_cache import TransactionCache, get_transaction_cache, is_finalized, transaction_key
 
 settings = get_settings()
 logger = get_ingestion_logger()
 
+# JSON-RPC error codes worth retrying for a single item of a batch
+RETRYABLE_RPC_ERROR_CODES = {
+    -32004,  # Block not available for slot
+    -32005,  # Node is behind / rate limited
+    -32603,  # Internal error
+    429,     # Too many requests (some providers return HTTP codes inside the body)
+}
 
-class SolanaRateLimiter:
-    """Rate limiter for Solana RPC requests"""
+COMMITMENT_LEVELS = {
+    "processed": CommitmentLevel.Processed,
+    "confirmed": CommitmentLevel.Confirmed,
+    "finalized": CommitmentLevel.Finalized,
+}
+
+# Only these exceptions retry a whole batch POST; a rejected batch is resized instead
+BATCH_RETRYABLE_EXCEPTIONS = (ConnectionError, TimeoutError, TransientError, RateLimitError)
+
+
+class BatchRejectedError(Exception):
+    """The RPC provider refused a JSON-RPC batch as a whole"""
     
-    def __init__(self, requests_per_second: int = None):
-        self.requests_per_second = requests_per_second or settings.rpc_requests_per_second
-        self.min_interval = 1.0 / self.requests_per_second
-        self.last_request_time = 0.0
+    def __init__(self, message: str, too_large: bool):
+        super().__init__(message)
+        self.too_large = too_large
+
+
+class SolanaRateLimiter:
+    """Rate limiter for Solana RPC requests, drawing on one provider's shared token bucket"""
     
-    async def acquire(self):
-        """Wait for rate limit before allowing request"""
-        current_time = asyncio.get_event_loop().time()
-        time_since_last = current_time - self.last_request_time
+    def __init__(self, requests_per_second: int = None, provider: str = None):
+        self.provider = provider or provider_for_url(settings.solana_rpc_url)
+        
+        if requests_per_second:
+            # An explicit rate gets a private budget instead of the shared provider bucket
+            self.limiter = RPCRateLimiter(
+                default_rate=requests_per_second,
+                default_capacity=requests_per_second,
+                provider_limits=""
+            )
+        else:
+            self.limiter = get_rpc_rate_limiter()
         
-        if time_since_last < self.min_interval:
-            sleep_time = self.min_interval - time_since_last
-            await asyncio.sleep(sleep_time)
+        self.requests_per_second = self.limiter.bucket(self.provider).rate
+    
+    async def acquire(self, method: str = "rpc", count: int = 1, batch: bool = False):
+        """
+        Wait for rate limit before allowing request
         
-        self.last_request_time = asyncio.get_event_loop().time()
+        Args:
+            method: JSON-RPC method name (selects the token weight)
+            count: Number of calls the request carries
+            batch: Whether the calls travel in one JSON-RPC batch POST
+        """
+        weight = None
+        if batch:
+            single = self.limiter.weight(method)
+            weight = single + single * max(count - 1, 0) * settings.rpc_batch_item_weight
+        await self.limiter.acquire(self.provider, method, count, weight=weight)
+
+
+def _rpc_method_name(method_name: str) -> str:
+    """JSON-RPC name of a solana-py client method (get_signatures_for_address -> getSignaturesForAddress)"""
+    head, *rest = method_name.split("_")
+    return head + "".join(part.capitalize() for part in rest)
 
 
 class EnhancedSolanaClient:
@@ -49,12 +102,24 @@ class EnhancedSolanaClient:
         rpc_url: str = None,
         commitment: str = None,
         timeout: int = 30,
-        rate_limiter: SolanaRateLimiter = None
+        rate_limiter: SolanaRateLimiter = None,
+        transaction_transport: str = None,
+        max_rpc_batch_size: int = None,
+        transaction_cache: Optional[TransactionCache] = None
     ):
         self.rpc_url = rpc_url or settings.solana_rpc_url
         self.commitment = Commitment(commitment or settings.solana_commitment_level)
         self.timeout = timeout
-        self.rate_limiter = rate_limiter or SolanaRateLimiter()
+        self.rate_limiter = rate_limiter or SolanaRateLimiter(provider=provider_for_url(self.rpc_url))
+        
+        # getTransaction transport: "batch" packs many calls into one JSON-RPC POST,
+        # "individual" sends one request per signature
+        self.transaction_transport = transaction_transport or settings.rpc_transaction_transport
+        self.rpc_batch_size = max_rpc_batch_size or settings.rpc_max_batch_size  # Shrinks when the provider rejects a batch
+        self.batch_supported = self.transaction_transport == "batch"
+        
+        # Finalized getTransaction payloads are served from the shared on-disk cache
+        self.transaction_cache = transaction_cache if transaction_cache is not None else get_transaction_cache()
         
         # Create async client
         self.client = AsyncClient(
@@ -67,12 +132,16 @@ class EnhancedSolanaClient:
         self.request_count = 0
         self.error_count = 0
         self.retry_count = 0
+        self.batch_request_count = 0
+        self.batched_transaction_count = 0
+        self.batch_rejection_count = 0
         
         logger.info(
             "Initialized Solana client",
             rpc_url=self.rpc_url,
             commitment=commitment,
-            timeout=timeout
+            timeout=timeout,
+            transaction_transport=self.transaction_transport
         )
     
     async def __aenter__(self):
@@ -89,7 +158,7 @@ class EnhancedSolanaClient:
     
     async def _make_request(self, method_name: str, *args, **kwargs) -> Any:
         """Make a rate-limited, retried RPC request"""
-        await self.rate_limiter.acquire()
+        await self.rate_limiter.acquire(_rpc_method_name(method_name))
         self.request_count += 1
         
         try:
@@ -167,7 +236,8 @@ class EnhancedSolanaClient:
     async def get_transaction(
         self,
         signature: Union[str, Signature],
-        max_supported_transaction_version: int = 0
+        max_supported_transaction_version: int = 0,
+        use_cache: bool = True
     ) -> Optional[Dict[str, Any]]:
         """
         Get transaction details by signature
@@ -175,6 +245,7 @@ class EnhancedSolanaClient:
         Args:
             signature: Transaction signature
             max_supported_transaction_version: Maximum transaction version to support
+            use_cache: Consult and fill the transaction cache (callers that already did pass False)
         
         Returns:
             Transaction details or None if not found
@@ -182,6 +253,11 @@ class EnhancedSolanaClient:
         if isinstance(signature, str):
             signature = Signature.from_string(signature)
         
+        if use_cache:
+            cached = await self._get_cached_transactions([signature], max_supported_transaction_version)
+            if cached:
+                return cached[0]
+        
         result = await self._make_request(
             "get_transaction",
             signature,
@@ -193,9 +269,56 @@ class EnhancedSolanaClient:
         
         if transaction is None:
             logger.warning("Transaction not found", signature=str(signature))
+        elif use_cache:
+            await self._cache_transactions([signature], [transaction], max_supported_transaction_version)
         
         return transaction
     
+    async def _get_cached_transactions(
+        self,
+        signatures: List[Signature],
+        max_supported_transaction_version: int
+    ) -> Dict[int, EncodedConfirmedTransactionWithStatusMeta]:
+        """Look signatures up in the transaction cache, returning hits by position"""
+        if not self.transaction_cache:
+            return {}
+        
+        def read_hits() -> Dict[int, EncodedConfirmedTransactionWithStatusMeta]:
+            hits = {}
+            for i, sig in enumerate(signatures):
+                raw = self.transaction_cache.get_raw(
+                    transaction_key(str(sig), "jsonParsed", max_supported_transaction_version)
+                )
+                if raw is not None:
+                    hits[i] = EncodedConfirmedTransactionWithStatusMeta.from_json(raw)
+            return hits
+        
+        # Segment reads, index tailing and decompression block: keep them off the event loop
+        return await asyncio.to_thread(read_hits)
+    
+    async def _cache_transactions(
+        self,
+        signatures: List[Signature],
+        transactions: List[Any],
+        max_supported_transaction_version: int
+    ):
+        """Store fetched transactions that are finalized in the transaction cache"""
+        if not self.transaction_cache:
+            return
+        
+        commitment = str(self.commitment)
+        payloads = [
+            (transaction_key(str(sig), "jsonParsed", max_supported_transaction_version), tx.to_json())
+            for sig, tx in zip(signatures, transactions)
+            if isinstance(tx, EncodedConfirmedTransactionWithStatusMeta) and is_finalized(tx.block_time, commitment)
+        ]
+        if payloads:
+            try:
+                # Appends wait on the cross-process lock file: keep them off the event loop
+                await asyncio.to_thread(self.transaction_cache.put_many, payloads)
+            except OSError as e:
+                logger.warning("Failed to write transaction cache", count=len(payloads), error=str(e))
+    
     @retry_with_backoff(max_attempts=2, base_delay=2.0)
     async def get_multiple_transactions(
         self,
@@ -225,26 +348,28 @@ class EnhancedSolanaClient:
             else:
                 sig_objects.append(sig)
         
+        # Serve already finalized transactions from the cache and fetch the rest
+        cached = await self._get_cached_transactions(sig_objects, max_supported_transaction_version)
+        pending = [sig for i, sig in enumerate(sig_objects) if i not in cached]
+        
         logger.debug(
             "Fetching multiple transactions",
             count=len(sig_objects),
+            cached=len(cached),
             batch_size=batch_size
         )
         
-        all_transactions = []
+        fetched = []
         
         # Process in batches to avoid overwhelming the RPC
-        for i in range(0, len(sig_objects), batch_size):
-            batch = sig_objects[i:i + batch_size]
+        for i in range(0, len(pending), batch_size):
+            batch = pending[i:i + batch_size]
             
             try:
-                # Use parallel requests for better performance
-                tasks = [
-                    self.get_transaction(sig, max_supported_transaction_version)
-                    for sig in batch
-                ]
-                
-                batch_results = await asyncio.gather(*tasks, return_exceptions=True)
+                if self.batch_supported:
+                    batch_results = await self._fetch_transactions_batched(batch, max_supported_transaction_version)
+                else:
+                    batch_results = await self._fetch_transactions_individually(batch, max_supported_transaction_version)
                 
                 # Handle results and exceptions
                 for j, result in enumerate(batch_results):
@@ -254,9 +379,9 @@ class EnhancedSolanaClient:
                             signature=str(batch[j]),
                             error=str(result)
                         )
-                        all_transactions.append(None)
+                        fetched.append(None)
                     else:
-                        all_transactions.append(result)
+                        fetched.append(result)
                         
             except Exception as e:
                 logger.error(
@@ -266,7 +391,15 @@ class EnhancedSolanaClient:
                     error=str(e)
                 )
                 # Add None for all transactions in this batch
-                all_transactions.extend([None] * len(batch))
+                fetched.extend([None] * len(batch))
+        
+        await self._cache_transactions(pending, fetched, max_supported_transaction_version)
+        
+        fetched_iter = iter(fetched)
+        all_transactions = [
+            cached[i] if i in cached else next(fetched_iter)
+            for i in range(len(sig_objects))
+        ]
         
         success_count = sum(1 for tx in all_transactions if tx is not None)
         
@@ -274,11 +407,188 @@ class EnhancedSolanaClient:
             "Completed multiple transaction fetch",
             requested=len(signatures),
             retrieved=success_count,
+            from_cache=len(cached),
             failed=len(signatures) - success_count
         )
         
         return all_transactions
     
+    async def _fetch_transactions_individually(
+        self,
+        signatures: List[Signature],
+        max_supported_transaction_version: int
+    ) -> List[Any]:
+        """Fetch transactions with one parallel getTransaction request each (exceptions in failed slots)"""
+        tasks = [
+            self.get_transaction(sig, max_supported_transaction_version, use_cache=False)
+            for sig in signatures
+        ]
+        return await asyncio.gather(*tasks, return_exceptions=True)
+    
+    async def _fetch_transactions_batched(
+        self,
+        signatures: List[Signature],
+        max_supported_transaction_version: int
+    ) -> List[Any]:
+        """
+        Fetch transactions through JSON-RPC batch POSTs of up to rpc_batch_size calls
+        
+        A batch the provider rejects as too large is retried at half the size, and the
+        smaller size is kept for later calls. A provider that refuses batches outright
+        switches this client to individual requests. Items that failed with a transient
+        error are refetched individually.
+        
+        Args:
+            signatures: Transaction signatures
+            max_supported_transaction_version: Maximum transaction version to support
+        
+        Returns:
+            Results aligned with signatures (transaction, None if not found, or the exception)
+        """
+        results: List[Any] = [None] * len(signatures)
+        start = 0
+        
+        while start < len(signatures):
+            if not self.batch_supported:
+                results[start:] = await self._fetch_transactions_individually(
+                    signatures[start:], max_supported_transaction_version
+                )
+                break
+            
+            chunk = signatures[start:start + self.rpc_batch_size]
+            try:
+                results[start:start + len(chunk)] = await self._post_transaction_batch(
+                    chunk, max_supported_transaction_version
+                )
+            except BatchRejectedError as e:
+                self._handle_batch_rejection(len(chunk), e)
+                continue
+            except Exception as e:
+                results[start:start + len(chunk)] = [e] * len(chunk)
+            start += len(chunk)
+        
+        # Refetch items that failed transiently inside an otherwise successful batch
+        retry_indices = [
+            i for i, result in enumerate(results)
+            if isinstance(result, (TransientError, RateLimitError))
+        ]
+        if retry_indices:
+            retried = await self._fetch_transactions_individually(
+                [signatures[i] for i in retry_indices], max_supported_transaction_version
+            )
+            for i, result in zip(retry_indices, retried):
+                results[i] = result
+        
+        return results
+    
+    def _handle_batch_rejection(self, size: int, error: BatchRejectedError):
+        """Shrink the batch size after a too-large rejection, or give up on batching"""
+        self.batch_rejection_count += 1
+        
+        if error.too_large and size > 1:
+            self.rpc_batch_size = max(1, size // 2)
+            logger.warning(
+                "RPC batch rejected as too large, reducing batch size",
+                rejected_size=size,
+                batch_size=self.rpc_batch_size,
+                error=str(error)
+            )
+        else:
+            self.batch_supported = False
+            logger.warning(
+                "RPC provider rejected batch requests, using individual requests",
+                rpc_url=self.rpc_url,
+                error=str(error)
+            )
+    
+    @retry_with_backoff(max_attempts=3, base_delay=1.0, retryable_exceptions=BATCH_RETRYABLE_EXCEPTIONS)
+    async def _post_transaction_batch(
+        self,
+        signatures: List[Signature],
+        max_supported_transaction_version: int
+    ) -> List[Any]:
+        """
+        Send one JSON-RPC batch of getTransaction calls
+        
+        Args:
+            signatures: Transaction signatures for this batch
+            max_supported_transaction_version: Maximum transaction version to support
+        
+        Returns:
+            Results aligned with signatures (transaction, None if not found, or the item's exception)
+        
+        Raises:
+            BatchRejectedError: If the provider refused the batch as a whole
+        """
+        config = RpcTransactionConfig(
+            encoding=UiTransactionEncoding.JsonParsed,
+            commitment=COMMITMENT_LEVELS.get(str(self.commitment), CommitmentLevel.Confirmed),
+            max_supported_transaction_version=max_supported_transaction_version
+        )
+        bodies = tuple(GetTransaction(sig, config, id=i) for i, sig in enumerate(signatures))
+        
+        await self.rate_limiter.acquire("getTransaction", count=len(signatures), batch=True)
+        self.request_count += 1
+        self.batch_request_count += 1
+        
+        try:
+            raw = await self.client._provider.make_batch_request_unparsed(bodies)
+        except httpx.HTTPStatusError as e:
+            self.error_count += 1
+            status = e.response.status_code
+            if status == 429:
+                raise RateLimitError(f"Rate limited: {str(e)}")
+            if status == 413:
+                raise BatchRejectedError(str(e), too_large=True)
+            if status in (400, 403, 405):
+                raise BatchRejectedError(str(e), too_large=len(signatures) > 1)
+            raise TransientError(f"HTTP error: {str(e)}")
+        except httpx.HTTPError as e:
+            self.error_count += 1
+            raise TransientError(f"Network error: {str(e)}")
+        
+        payload = json.loads(raw)
+        
+        # A single error object instead of a list means the whole batch was refused
+        if isinstance(payload, dict):
+            self.error_count += 1
+            error = payload.get("error") or {}
+            message = str(error.get("message", payload))
+            lowered = message.lower()
+            if error.get("code") == 429 or "rate limit" in lowered or "too many requests" in lowered:
+                raise RateLimitError(f"Rate limited: {message}")
+            too_large = any(pattern in lowered for pattern in ["too large", "too many", "exceed", "maximum", "size"])
+            raise BatchRejectedError(message, too_large=too_large and len(signatures) > 1)
+        
+        by_id = {item.get("id"): item for item in payload if isinstance(item, dict)}
+        results: List[Any] = []
+        for i, sig in enumerate(signatures):
+            item = by_id.get(i)
+            if item is None:
+                results.append(TransientError(f"Missing from batch response: {sig}"))
+            elif "error" in item:
+                results.append(self._batch_item_error(item["error"]))
+            else:
+                transaction = GetTransactionResp.from_json(json.dumps(item)).value
+                if transaction is None:
+                    logger.warning("Transaction not found", signature=str(sig))
+                results.append(transaction)
+        
+        self.batched_transaction_count += len(signatures)
+        return results
+    
+    def _batch_item_error(self, error: Dict[str, Any]) -> Exception:
+        """Map a per-item JSON-RPC error to the exception types used by _make_request"""
+        self.error_count += 1
+        code = error.get("code")
+        message = f"RPC error {code}: {error.get('message', '')}"
+        
+        if code == 429 or "rate limit" in message.lower():
+            return RateLimitError(message)
+        if code in RETRYABLE_RPC_ERROR_CODES:
+            return TransientError(message)
+        return Exception(message)
+    
     @retry_with_backoff(max_attempts=3, base_delay=1.0)
     async def get_account_info(
         self,
@@ -322,6 +632,14 @@ class EnhancedSolanaClient:
             "error_count": self.error_count,
             "retry_count": self.retry_count,
             "error_rate": self.error_count / max(self.request_count, 1),
+            "transaction_transport": self.transaction_transport if self.batch_supported else "individual",
+            "rpc_batch_size": self.rpc_batch_size,
+            "batch_request_count": self.batch_request_count,
+            "batched_transaction_count": self.batched_transaction_count,
+            "batch_rejection_count": self.batch_rejection_count,
+            "transaction_cache": (
+                await asyncio.to_thread(self.transaction_cache.get_statistics) if self.transaction_cache else None
+            ),
             "last_check": datetime.now(timezone.utc).isoformat()
         }
 
@@ -5,20 +5,23 @@ Scheduled worker for ingesting Raydium swap transaction data
 
 import asyncio
 from datetime import datetime, timezone, timedelta
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
 import uuid
 
 from ..core.config import get_settings
 from ..core.logging import get_ingestion_logger, CorrelationContext, RequestLogger
 from ..core.retry import RetrySession
 from ..schemas.ingestion import (
-    RaydiumSwap, 
+    SwapRecord,
     WalletIngestionStatus, 
     IngestionBatch,
     TransactionStatus
 )
 from .solana_client import get_helius_client, EnhancedSolanaClient
 from .raydium_parser import get_raydium_parser, RaydiumTransactionParser
+from .cursors import IngestionCursor, IngestionCursorStore
+from .signature_filter import SignatureFilter, get_signature_filter
+from .backfill_planner import BackfillPlan, SignatureHistogram, allocate_samples
 
 settings = get_settings()
 logger = get_ingestion_logger()
@@ -35,13 +38,29 @@ class DataIngestionWorker:
         solana_client: Optional[EnhancedSolanaClient] = None,
         parser: Optional[RaydiumTransactionParser] = None,
         batch_size: int = 100,
-        max_transactions_per_wallet: int = None
+        max_transactions_per_wallet: int = None,
+        streaming: bool = None,
+        cursor_store: Optional[IngestionCursorStore] = None,
+        signature_filter: Optional[SignatureFilter] = None
     ):
         self.solana_client = solana_client
         self.parser = parser or get_raydium_parser()
         self.batch_size = batch_size
         self.max_transactions_per_wallet = max_transactions_per_wallet or settings.max_transactions_per_wallet
         
+        # Streaming pipeline: signature pages feed transaction fetches, which feed the parser
+        self.streaming = settings.ingestion_streaming if streaming is None else streaming
+        self.pipeline_queue_size = max(1, settings.ingestion_pipeline_queue_size)
+        self.pipeline_fetch_concurrency = max(1, settings.ingestion_pipeline_fetch_concurrency)
+        
+        # Scheduled runs resume each wallet from its newest ingested signature
+        self.cursor_store = cursor_store or (IngestionCursorStore() if settings.ingestion_cursor_enabled else None)
+        
+        # Failed and known non-swap signatures are dropped before their transactions are fetched
+        self.signature_filter = signature_filter or (
+            get_signature_filter() if settings.ingestion_prefilter_enabled else None
+        )
+        
         # Retry session for robust error handling
         self.retry_session = RetrySession(
             max_attempts=settings.max_retries,
@@ -53,6 +72,7 @@ class DataIngestionWorker:
         self.stats = {
             'total_wallets_processed': 0,
             'total_transactions_fetched': 0,
+            'total_signatures_skipped': 0,
             'total_swaps_extracted': 0,
             'total_errors': 0,
             'processing_time_seconds': 0
@@ -62,6 +82,8 @@ class DataIngestionWorker:
             "Initialized Data Ingestion Worker",
             batch_size=self.batch_size,
             max_transactions_per_wallet=self.max_transactions_per_wallet,
+            streaming=self.streaming,
+            prefilter=self.signature_filter is not None,
             retry_config={
                 'max_attempts': settings.max_retries,
                 'base_delay': 1.0,
@@ -81,13 +103,25 @@ class DataIngestionWorker:
         if self.solana_client:
             await self.solana_client.close()
         
+        if self.parser:
+            self.parser.shutdown_process_pool()
+        
+        await self.save_signature_filter()
+        
         logger.info("Data ingestion worker shutdown complete")
     
+    async def save_signature_filter(self):
+        """Persist the signature pre-filter's newly learned pairs (a no-op when nothing changed)"""
+        if self.signature_filter:
+            await asyncio.to_thread(self.signature_filter.save)
+    
     async def fetch_wallet_signatures(
         self, 
         wallet_address: str,
         start_date: Optional[datetime] = None,
-        end_date: Optional[datetime] = None
+        end_date: Optional[datetime] = None,
+        until: Optional[str] = None,
+        progress: Optional[Dict[str, Any]] = None
     ) -> List[Dict[str, any]]:
         """
         Fetch transaction signatures for a wallet with date filtering
@@ -96,165 +130,276 @@ class DataIngestionWorker:
             wallet_address: Wallet address to fetch signatures for
             start_date: Start date for fetching (optional)
             end_date: End date for fetching (optional)
+            until: Stop at this already ingested signature (optional)
+            progress: Filled in as by iter_signature_pages (optional)
             
         Returns:
             List of transaction signature objects
         """
         all_signatures = []
+        async for page in self.iter_signature_pages(wallet_address, start_date, end_date, until, progress):
+            all_signatures.extend(page)
+        
+        logger.info(
+            "Completed signature fetching",
+            wallet=wallet_address,
+            total_signatures=len(all_signatures)
+        )
+        
+        return all_signatures
+    
+    async def iter_signature_pages(
+        self,
+        wallet_address: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        until: Optional[str] = None,
+        progress: Optional[Dict[str, Any]] = None,
+        max_signatures: Optional[int] = None
+    ) -> AsyncIterator[List[Any]]:
+        """
+        Yield date-filtered pages of transaction signatures, newest first, as they are fetched
+        
+        Args:
+            wallet_address: Wallet address to fetch signatures for
+            start_date: Start date for fetching (optional)
+            end_date: End date for fetching (optional)
+            until: Already ingested signature; paging stops when it is reached (optional)
+            progress: Dict filled with "newest" (the first signature yielded) and
+                "complete" (False if a signature page failed to fetch) (optional)
+            max_signatures: Stop after this many signatures (defaults to max_transactions_per_wallet)
+            
+        Yields:
+            Non-empty lists of signature objects, at most max_signatures in total
+        """
+        if max_signatures is None:
+            max_signatures = self.max_transactions_per_wallet
+        collected = 0
         before_signature = None
+        if progress is None:
+            progress = {}
+        progress.update(newest=None, complete=False, pages=0)
         
         logger.debug(
             "Fetching signatures for wallet",
             wallet=wallet_address,
             start_date=start_date.isoformat() if start_date else None,
-            end_date=end_date.isoformat() if end_date else None
+            end_date=end_date.isoformat() if end_date else None,
+            until=until
         )
         
-        while len(all_signatures) < self.max_transactions_per_wallet:
+        while collected < max_signatures:
             try:
                 # Fetch batch of signatures
                 signatures = await self.retry_session.execute_with_retry(
                     self.solana_client.get_transaction_signatures,
                     wallet_address,
                     before=before_signature,
-                    limit=min(1000, self.max_transactions_per_wallet - len(all_signatures))
+                    until=until,
+                    limit=min(1000, max_signatures - collected)
                 )
-                
-                if not signatures:
-                    logger.debug("No more signatures found", wallet=wallet_address)
-                    break
-                
-                # Filter by date if specified
-                filtered_signatures = []
-                for sig_info in signatures:
-                    # Handle solders object properties
-                    block_time = getattr(sig_info, 'block_time', None)
-                    if not block_time:
-                        continue
-                    
-                    sig_date = datetime.fromtimestamp(block_time, timezone.utc)
-                    
-                    # Check date filters
-                    if start_date and sig_date < start_date:
-                        # We've gone back too far, stop here
-                        logger.debug(
-                            "Reached start date limit",
-                            wallet=wallet_address,
-                            sig_date=sig_date.isoformat(),
-                            start_date=start_date.isoformat()
-                        )
-                        return all_signatures
-                    
-                    if end_date and sig_date > end_date:
-                        continue
-                    
-                    filtered_signatures.append(sig_info)
-                
-                all_signatures.extend(filtered_signatures)
-                
-                # Set up for next batch
-                if signatures:
-                    before_signature = str(getattr(signatures[-1], 'signature', None))
-                    
-                logger.debug(
-                    "Fetched signature batch",
-                    wallet=wallet_address,
-                    batch_size=len(signatures),
-                    filtered_size=len(filtered_signatures),
-                    total_collected=len(all_signatures)
-                )
-                
-                # If we got fewer than requested, we've reached the end
-                if len(signatures) < 1000:
-                    break
-                    
+                progress["pages"] += 1
             except Exception as e:
                 logger.error(
                     "Failed to fetch signatures batch",
                     wallet=wallet_address,
                     error=str(e),
-                    collected_so_far=len(all_signatures)
+                    collected_so_far=collected
                 )
                 # Continue with what we have
-                break
-        
-        logger.info(
-            "Completed signature fetching",
-            wallet=wallet_address,
-            total_signatures=len(all_signatures)
-        )
+                return
+            
+            if not signatures:
+                logger.debug("No more signatures found", wallet=wallet_address)
+                progress["complete"] = True
+                return
+            
+            # Filter by date if specified
+            filtered_signatures = []
+            reached_start = False
+            for sig_info in signatures:
+                # Handle solders object properties
+                block_time = getattr(sig_info, 'block_time', None)
+                if not block_time:
+                    continue
+                
+                sig_date = datetime.fromtimestamp(block_time, timezone.utc)
+                
+                # Check date filters
+                if start_date and sig_date < start_date:
+                    # We've gone back too far, stop after this page
+                    logger.debug(
+                        "Reached start date limit",
+                        wallet=wallet_address,
+                        sig_date=sig_date.isoformat(),
+                        start_date=start_date.isoformat()
+                    )
+                    reached_start = True
+                    break
+                
+                if end_date and sig_date > end_date:
+                    continue
+                
+                filtered_signatures.append(sig_info)
+            
+            collected += len(filtered_signatures)
+            
+            logger.debug(
+                "Fetched signature batch",
+                wallet=wallet_address,
+                batch_size=len(signatures),
+                filtered_size=len(filtered_signatures),
+                total_collected=collected
+            )
+            
+            if filtered_signatures:
+                if progress["newest"] is None:
+                    progress["newest"] = filtered_signatures[0]
+                yield filtered_signatures
+            
+            # Stop at the start date, or if we got fewer than requested (the end of
+            # history, or the `until` signature)
+            if reached_start or len(signatures) < 1000:
+                progress["complete"] = True
+                return
+            
+            # Set up for next batch
+            before_signature = str(getattr(signatures[-1], 'signature', None))
         
-        return all_signatures
+        # max_signatures reached; older history is out of scope as before
+        progress["complete"] = True
     
-    async def estimate_transaction_count(
+    async def iter_backfill_pages(
         self,
         wallet_address: str,
-        start_date: Optional[datetime] = None,
-        end_date: Optional[datetime] = None
-    ) -> int:
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        plan: BackfillPlan,
+        progress: Optional[Dict[str, Any]] = None,
+        force_sampling: bool = False
+    ) -> AsyncIterator[List[Any]]:
         """
-        Pre-flight check to estimate transaction count without fetching all data
+        Yield the signatures a first-time backfill should fetch, deciding between a full and a sampled backfill on the way
+        
+        Signature pages are walked once, newest first, into a per-day histogram
+        that keeps a uniform reservoir of each day. Each page is yielded as soon as
+        it arrives, so fetching overlaps paging, while the window looks small: at
+        most transaction_threshold signatures scanned and projected over the whole
+        window at the density scanned so far. Once it looks bigger, pages are held
+        back while the scan goes on. Only a window whose scanned signatures really
+        exceed transaction_threshold is sampled (a burst of recent activity projects
+        high but is fetched in full); its scan covers the window unless it reaches
+        sampling_max_scan_pages first. Each day then gets a share of the
+        num_samples_per_day * days budget in proportion to its density (counting
+        what was already yielded), drawn from its reservoir.
         
         Args:
-            wallet_address: Wallet address to check
-            start_date: Start date for estimation (optional)
-            end_date: End date for estimation (optional)
+            wallet_address: Wallet address to plan for
+            start_date: Start of the window (optional)
+            end_date: End of the window (optional)
+            plan: Filled in with the method, histogram counts and errors as the scan goes
+            progress: Filled in as by iter_signature_pages (optional)
+            force_sampling: Sample even if the window is below the threshold
             
-        Returns:
-            Estimated transaction count
+        Yields:
+            Non-empty lists of signature objects, newest first within each phase
         """
-        try:
-            # Use a small sample to estimate total volume
-            sample_signatures = await self.retry_session.execute_with_retry(
-                self.solana_client.get_transaction_signatures,
-                wallet_address,
-                limit=100  # Small sample for estimation
-            )
-            
-            if not sample_signatures or len(sample_signatures) < 2:
-                return 0
-            
-            # Get timestamps from first and last signatures in sample
-            first_timestamp = getattr(sample_signatures[0], 'block_time', None)
-            last_timestamp = getattr(sample_signatures[-1], 'block_time', None)
-            
-            if not first_timestamp or not last_timestamp:
-                return len(sample_signatures)
-            
-            # Calculate time span in the sample
-            sample_time_span = first_timestamp - last_timestamp  # in seconds
-            if sample_time_span <= 0:
-                return len(sample_signatures)
+        if progress is None:
+            progress = {}
+        histogram = plan.histogram
+        start_time = start_date.timestamp() if start_date else None
+        streamed: List[Any] = []  # Yielded before the window proved high-volume
+        held: Optional[List[Any]] = None if force_sampling else []  # Scanned but not yet yielded, while within the threshold
+        high_volume = force_sampling
+        
+        async for page in self.iter_signature_pages(wallet_address, start_date, end_date, progress=progress):
+            histogram.add_page(page)
+            if held is not None and histogram.total > settings.transaction_threshold:
+                held = None  # Too many to fetch in full: keep only the histogram from here on
+            if not high_volume and histogram.projected_total(start_time) > settings.transaction_threshold:
+                high_volume = True
+                logger.info(
+                    "Backfill window looks high-volume, holding back signature pages",
+                    wallet=wallet_address,
+                    signatures_scanned=histogram.total,
+                    projected_signatures=int(histogram.projected_total(start_time))
+                )
             
-            # Calculate target time span (90 days if no dates provided)
-            if not start_date or not end_date:
-                target_time_span = 90 * 24 * 3600  # 90 days in seconds
+            if not high_volume:
+                streamed.extend(page)
+                yield page
+                continue
+            if held is not None:
+                held.extend(page)
+            elif progress["pages"] >= settings.sampling_max_scan_pages:
+                break  # Sampling is certain; the cap only bounds how much of the window it covers
+        
+        plan.pages = progress.get("pages", 0)
+        plan.complete = progress.get("complete", False)
+        plan.streamed = plan.selected = len(streamed)
+        if not plan.complete:
+            plan.errors.append(f"Signature scan stopped after {plan.pages} pages; the plan covers the newest {histogram.total} signatures")
+        
+        if held is not None:
+            # At most transaction_threshold signatures: fetch the held back pages too
+            plan.method = "FULL"
+            for i in range(0, len(held), self.batch_size):
+                plan.selected += len(held[i:i + self.batch_size])
+                yield held[i:i + self.batch_size]
+        else:
+            plan.method = "SAMPLED"
+            if start_date and end_date:
+                window_days = (end_date.date() - start_date.date()).days + 1
             else:
-                target_time_span = int((end_date - start_date).total_seconds())
-            
-            # Estimate total transactions based on sample rate
-            transactions_per_second = len(sample_signatures) / sample_time_span
-            estimated_total = int(transactions_per_second * target_time_span)
-            
-            logger.info(
-                "Transaction count estimation",
-                wallet=wallet_address,
-                sample_size=len(sample_signatures),
-                sample_time_span=sample_time_span,
-                transactions_per_second=transactions_per_second,
-                estimated_total=estimated_total
+                window_days = len(histogram.counts)
+            plan.samples_per_day = allocate_samples(
+                histogram.counts,
+                settings.num_samples_per_day * window_days,
+                settings.sampling_min_samples_per_day,
+                settings.sampling_max_samples_per_day
             )
+            samples = histogram.sample(plan.samples_per_day, taken=streamed)
+            for i in range(0, len(samples), self.batch_size):
+                plan.selected += len(samples[i:i + self.batch_size])
+                yield samples[i:i + self.batch_size]
+        
+        logger.info("Planned backfill", wallet=wallet_address, **plan.to_dict())
+    
+    async def plan_backfill(
+        self,
+        wallet_address: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        progress: Optional[Dict[str, Any]] = None,
+        force_sampling: bool = False
+    ) -> BackfillPlan:
+        """
+        Plan a wallet's first-time backfill and collect the signatures it fetches (see iter_backfill_pages)
+        
+        Args:
+            wallet_address: Wallet address to plan for
+            start_date: Start of the window (optional)
+            end_date: End of the window (optional)
+            progress: Filled in as by iter_signature_pages (optional)
+            force_sampling: Sample even if the window is below the threshold
             
-            return estimated_total
-            
-        except Exception as e:
-            logger.error(
-                "Failed to estimate transaction count",
-                wallet=wallet_address,
-                error=str(e)
-            )
-            # Conservative estimate - assume high volume
-            return settings.transaction_threshold + 1
+        Returns:
+            BackfillPlan with the signatures to fetch
+        """
+        plan = self.new_backfill_plan(wallet_address, force_sampling)
+        async for page in self.iter_backfill_pages(
+            wallet_address, start_date, end_date, plan, progress, force_sampling
+        ):
+            plan.signatures.extend(page)
+        return plan
+    
+    @staticmethod
+    def new_backfill_plan(wallet_address: str, force_sampling: bool = False) -> BackfillPlan:
+        """An empty plan for iter_backfill_pages to fill in"""
+        return BackfillPlan(
+            method="SAMPLED" if force_sampling else "FULL",
+            histogram=SignatureHistogram(settings.sampling_max_samples_per_day, seed=wallet_address)
+        )
     
     async def execute_sampling_backfill(
         self,
@@ -265,6 +410,9 @@ class DataIngestionWorker:
         """
         Execute sampling backfill strategy for high-volume wallets
         
+        Samples every day of the window in proportion to its signature density,
+        from a single pass of signature pages (see plan_backfill).
+        
         Args:
             wallet_address: Wallet address to sample
             start_date: Start date for sampling
@@ -273,94 +421,29 @@ class DataIngestionWorker:
         Returns:
             Tuple of (sampled_signatures, errors)
         """
-        all_sampled_signatures = []
-        errors = []
-        
-        logger.info(
-            "Starting sampling backfill",
-            wallet=wallet_address,
-            start_date=start_date.isoformat(),
-            end_date=end_date.isoformat(),
-            samples_per_day=settings.num_samples_per_day
-        )
-        
-        # Loop through each day in the range
-        current_date = start_date.date()
-        end_date_only = end_date.date()
-        
-        while current_date <= end_date_only:
-            try:
-                # Create datetime objects for start and end of day
-                day_start = datetime.combine(current_date, datetime.min.time()).replace(tzinfo=timezone.utc)
-                day_end = datetime.combine(current_date, datetime.max.time()).replace(tzinfo=timezone.utc)
-                
-                # Fetch sample transactions for this day
-                # Note: Due to API limitations, we'll sample recent transactions and filter by date
-                try:
-                    day_signatures = await self.retry_session.execute_with_retry(
-                        self.solana_client.get_transaction_signatures,
-                        wallet_address,
-                        limit=settings.num_samples_per_day * 4  # Get more to have options for filtering
-                    )
-                    
-                    # Filter for transactions actually within this day and take samples
-                    day_filtered = []
-                    for sig in day_signatures or []:
-                        sig_time = getattr(sig, 'block_time', None)
-                        if sig_time:
-                            sig_date = datetime.fromtimestamp(sig_time, timezone.utc)
-                            if day_start <= sig_date <= day_end:
-                                day_filtered.append(sig)
-                                # Take limited samples per day
-                                if len(day_filtered) >= settings.num_samples_per_day:
-                                    break
-                    
-                    all_sampled_signatures.extend(day_filtered)
-                    
-                    # Log sampling for this day
-                    if day_filtered:
-                        logger.debug(
-                            "Sampled transactions for day",
-                            wallet=wallet_address,
-                            date=current_date.isoformat(),
-                            samples=len(day_filtered)
-                        )
-                    
-                except Exception as e:
-                    errors.append(f"Failed to fetch samples for {current_date}: {str(e)}")
-                
-                # Move to next day
-                current_date += timedelta(days=1)
-                
-            except Exception as e:
-                errors.append(f"Failed to process day {current_date}: {str(e)}")
-                current_date += timedelta(days=1)
-                continue
-        
-        logger.info(
-            "Completed sampling backfill",
-            wallet=wallet_address,
-            total_samples=len(all_sampled_signatures),
-            errors=len(errors)
-        )
-        
-        return all_sampled_signatures, errors
+        plan = await self.plan_backfill(wallet_address, start_date, end_date, force_sampling=True)
+        return plan.signatures, plan.errors
     
     async def fetch_and_parse_transactions(
         self,
         wallet_address: str,
-        signatures: List[Dict[str, any]]
-    ) -> Tuple[List[RaydiumSwap], List[str]]:
+        signatures: List[Dict[str, any]],
+        fetch_stats: Optional[Dict[str, int]] = None
+    ) -> Tuple[List[SwapRecord], List[str]]:
         """
         Fetch full transaction data and parse Raydium swaps
         
         Args:
             wallet_address: Wallet address being processed
             signatures: List of signature objects to fetch
+            fetch_stats: Updated in place with the "fetch_failures" count (optional)
             
         Returns:
             Tuple of (parsed_swaps, errors)
         """
+        if fetch_stats is None:
+            fetch_stats = {}
+        fetch_stats.setdefault("fetch_failures", 0)
         parsed_swaps = []
         errors = []
         
@@ -376,21 +459,34 @@ class DataIngestionWorker:
         # Extract signature strings
         sig_strings = [str(getattr(sig, 'signature', None)) for sig in signatures if getattr(sig, 'signature', None)]
         
-        # Fetch transactions in batches
+        # Fetch transactions in batches, pipeline_fetch_concurrency of them at once
+        chunks = [sig_strings[i:i + self.batch_size] for i in range(0, len(sig_strings), self.batch_size)]
+        semaphore = asyncio.Semaphore(self.pipeline_fetch_concurrency)
+        
+        async def fetch_chunk(chunk: List[str]) -> List[Optional[Dict[str, Any]]]:
+            async with semaphore:
+                return await self.retry_session.execute_with_retry(
+                    self.solana_client.get_multiple_transactions,
+                    chunk,
+                    batch_size=self.batch_size
+                )
+        
         try:
-            transactions = await self.retry_session.execute_with_retry(
-                self.solana_client.get_multiple_transactions,
-                sig_strings,
-                batch_size=self.batch_size
-            )
+            results = await asyncio.gather(*(fetch_chunk(chunk) for chunk in chunks), return_exceptions=True)
             
             # Filter for successful transactions
             valid_transactions = []
-            for i, tx in enumerate(transactions):
-                if tx is not None:
-                    valid_transactions.append((tx, sig_strings[i], wallet_address))
-                else:
-                    errors.append(f"Failed to fetch transaction: {sig_strings[i]}")
+            for chunk, transactions in zip(chunks, results):
+                if isinstance(transactions, Exception):
+                    errors.append(f"Failed to fetch/parse transactions: {str(transactions)}")
+                    fetch_stats["fetch_failures"] += 1
+                    continue
+                for sig, tx in zip(chunk, transactions):
+                    if tx is not None:
+                        valid_transactions.append((tx, sig, wallet_address))
+                    else:
+                        errors.append(f"Failed to fetch transaction: {sig}")
+                        fetch_stats["fetch_failures"] += 1
             
             logger.debug(
                 "Fetched transactions",
@@ -399,25 +495,16 @@ class DataIngestionWorker:
                 received=len(valid_transactions)
             )
             
-            # Parse Raydium swaps
+            # Parse Raydium swaps off the event loop (large batches fan out to the parser's process pool)
             if valid_transactions:
-                parsed_swaps = self.parser.parse_multiple_swaps(valid_transactions)
-                
-                # Validate parsed swaps
-                validated_swaps = []
-                for swap in parsed_swaps:
-                    validation_errors = self.parser.validate_swap_data(swap)
-                    if validation_errors:
-                        errors.extend([f"Validation error for {swap.signature}: {err}" for err in validation_errors])
-                    else:
-                        validated_swaps.append(swap)
-                
-                parsed_swaps = validated_swaps
+                parsed_swaps, validation_errors = await asyncio.to_thread(self._parse_and_validate, valid_transactions)
+                errors.extend(validation_errors)
             
         except Exception as e:
             error_msg = f"Failed to fetch/parse transactions: {str(e)}"
             logger.error(error_msg, wallet=wallet_address)
             errors.append(error_msg)
+            fetch_stats["fetch_failures"] += 1
         
         logger.info(
             "Completed transaction parsing",
@@ -429,11 +516,213 @@ class DataIngestionWorker:
         
         return parsed_swaps, errors
     
+    def _parse_and_validate(
+        self,
+        transactions: List[Tuple[Any, str, str]]
+    ) -> Tuple[List[SwapRecord], List[str]]:
+        """
+        Parse fetched transactions and keep the swaps that pass validation
+        
+        Args:
+            transactions: List of (transaction_data, signature, wallet_address) tuples
+            
+        Returns:
+            Tuple of (validated_swaps, validation_errors)
+        """
+        validated_swaps = []
+        errors = []
+        parse_result = self.parser.parse_swap_batch(transactions)
+        
+        if self.signature_filter is not None and parse_result.non_swaps:
+            # Only positive non-swap classifications are learned: a transaction the parser
+            # failed on may still be a swap, and swaps failing validation depend on settings
+            non_swaps = set(parse_result.non_swaps)
+            self.signature_filter.record_non_swaps(
+                (wallet_address, signature)
+                for _, signature, wallet_address in transactions
+                if signature in non_swaps
+            )
+        
+        for swap in parse_result.swaps:
+            validation_errors = self.parser.validate_swap_data(swap)
+            if validation_errors:
+                errors.extend([f"Validation error for {swap.signature}: {err}" for err in validation_errors])
+            else:
+                validated_swaps.append(swap)
+        
+        return validated_swaps, errors
+    
+    def prefilter_signatures(self, wallet_address: str, signatures: List[Any]) -> List[Any]:
+        """
+        Drop signatures whose transactions cannot yield a swap before they are fetched
+        
+        Args:
+            wallet_address: Wallet the signatures belong to
+            signatures: getSignaturesForAddress result items
+            
+        Returns:
+            Signatures still worth a getTransaction call
+        """
+        if self.signature_filter is None:
+            return signatures
+        return self.signature_filter.select(wallet_address, signatures)
+    
+    async def iter_parsed_swaps(
+        self,
+        wallet_address: str,
+        signature_pages: AsyncIterator[List[Any]],
+        pipeline_stats: Dict[str, int],
+        errors: List[str]
+    ) -> AsyncIterator[List[SwapRecord]]:
+        """
+        Streaming fetch -> parse -> validate pipeline over pages of signatures
+        
+        Signature pages are cut into batch_size chunks on a bounded queue, fetched by
+        pipeline_fetch_concurrency tasks onto a second bounded queue, and parsed in a
+        worker thread while the next fetches are in flight. Batches that pile up while
+        a parse runs are parsed together, on the parser's process pool once large
+        enough. At most a few batches of raw transactions are held at once, whatever
+        the wallet's history size.
+        
+        Args:
+            wallet_address: Wallet address being processed
+            signature_pages: Async iterator of signature object lists
+            pipeline_stats: Updated in place with "signatures", "signatures_skipped",
+                "transactions_fetched" and "fetch_failures" counts
+            errors: Fetch, parse and validation errors are appended here
+            
+        Yields:
+            Lists of validated swaps, one per parsed group of fetched batches that produced any
+        """
+        signature_queue: asyncio.Queue = asyncio.Queue(maxsize=self.pipeline_queue_size)
+        transaction_queue: asyncio.Queue = asyncio.Queue(maxsize=self.pipeline_queue_size)
+        pipeline_stats.setdefault("signatures", 0)
+        pipeline_stats.setdefault("signatures_skipped", 0)
+        pipeline_stats.setdefault("transactions_fetched", 0)
+        pipeline_stats.setdefault("fetch_failures", 0)
+        
+        # Sentinels are queued outside finally blocks: a cancelled stage must not
+        # block on a full queue nobody reads any more
+        async def produce_signatures():
+            try:
+                async for page in signature_pages:
+                    pipeline_stats["signatures"] += len(page)
+                    for i in range(0, len(page), self.batch_size):
+                        await signature_queue.put(page[i:i + self.batch_size])
+            except Exception as e:
+                errors.append(f"Failed to fetch signatures: {str(e)}")
+                pipeline_stats["fetch_failures"] += 1
+            for _ in range(self.pipeline_fetch_concurrency):
+                await signature_queue.put(None)
+        
+        async def fetch_transactions():
+            while True:
+                chunk = await signature_queue.get()
+                if chunk is None:
+                    break
+                
+                candidates = self.prefilter_signatures(wallet_address, chunk)
+                pipeline_stats["signatures_skipped"] += len(chunk) - len(candidates)
+                sig_strings = [str(getattr(sig, 'signature', None)) for sig in candidates if getattr(sig, 'signature', None)]
+                if not sig_strings:
+                    continue
+                try:
+                    transactions = await self.retry_session.execute_with_retry(
+                        self.solana_client.get_multiple_transactions,
+                        sig_strings,
+                        batch_size=self.batch_size
+                    )
+                except Exception as e:
+                    errors.append(f"Failed to fetch/parse transactions: {str(e)}")
+                    pipeline_stats["fetch_failures"] += 1
+                    continue
+                
+                valid_transactions = []
+                for sig, tx in zip(sig_strings, transactions):
+                    if tx is not None:
+                        valid_transactions.append((tx, sig, wallet_address))
+                    else:
+                        errors.append(f"Failed to fetch transaction: {sig}")
+                        pipeline_stats["fetch_failures"] += 1
+                
+                pipeline_stats["transactions_fetched"] += len(valid_transactions)
+                if valid_transactions:
+                    await transaction_queue.put(valid_transactions)
+            
+            await transaction_queue.put(None)
+        
+        tasks = [asyncio.create_task(produce_signatures())]
+        tasks.extend(asyncio.create_task(fetch_transactions()) for _ in range(self.pipeline_fetch_concurrency))
+        
+        try:
+            running_fetchers = self.pipeline_fetch_concurrency
+            while running_fetchers:
+                valid_transactions = await transaction_queue.get()
+                if valid_transactions is None:
+                    running_fetchers -= 1
+                    continue
+                
+                # When fetches outpace parsing, take every batch already waiting: a
+                # large enough group is parsed across the parser's process pool
+                while not transaction_queue.empty():
+                    queued = transaction_queue.get_nowait()
+                    if queued is None:
+                        running_fetchers -= 1
+                    else:
+                        valid_transactions = valid_transactions + queued
+                
+                # Parse off the event loop so fetches keep flowing
+                swaps, validation_errors = await asyncio.to_thread(self._parse_and_validate, valid_transactions)
+                errors.extend(validation_errors)
+                if swaps:
+                    yield swaps
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    
+    async def _stream_wallet(
+        self,
+        wallet_address: str,
+        signature_pages: AsyncIterator[List[Any]],
+        errors: List[str]
+    ) -> Tuple[int, int, int, int]:
+        """
+        Run the streaming pipeline for one wallet
+        
+        Returns:
+            Tuple of (signatures_found, signatures_skipped, valid_swaps_extracted, fetch_failures)
+        """
+        pipeline_stats: Dict[str, int] = {}
+        swap_count = 0
+        
+        async for swaps in self.iter_parsed_swaps(wallet_address, signature_pages, pipeline_stats, errors):
+            swap_count += len(swaps)
+        
+        logger.info(
+            "Completed streaming transaction parsing",
+            wallet=wallet_address,
+            total_signatures=pipeline_stats["signatures"],
+            signatures_skipped=pipeline_stats["signatures_skipped"],
+            transactions_fetched=pipeline_stats["transactions_fetched"],
+            parsed_swaps=swap_count,
+            fetch_failures=pipeline_stats["fetch_failures"],
+            errors=len(errors)
+        )
+        
+        return (
+            pipeline_stats["signatures"],
+            pipeline_stats["signatures_skipped"],
+            swap_count,
+            pipeline_stats["fetch_failures"]
+        )
+    
     async def process_wallet(
         self,
         wallet_address: str,
         start_date: Optional[datetime] = None,
-        end_date: Optional[datetime] = None
+        end_date: Optional[datetime] = None,
+        cursor: Optional[IngestionCursor] = None
     ) -> WalletIngestionStatus:
         """
         Process a single wallet for Raydium swap data
@@ -442,11 +731,18 @@ class DataIngestionWorker:
             wallet_address: Wallet address to process
             start_date: Start date for data collection
             end_date: End date for data collection
+            cursor: Newest signature ingested by a previous run; when given, only
+                newer signatures are fetched and start_date is ignored
             
         Returns:
             WalletIngestionStatus with processing results
         """
         status = WalletIngestionStatus(wallet_address=wallet_address)
+        until = cursor.signature if cursor else None
+        signature_progress: Dict[str, Any] = {}
+        if cursor:
+            start_date = None
+            status.resumed_from_cursor = True
         
         with CorrelationContext(wallet=wallet_address, operation="wallet_ingestion"):
             with RequestLogger("wallet_ingestion", wallet=wallet_address):
@@ -455,90 +751,120 @@ class DataIngestionWorker:
                         "Starting wallet processing",
                         wallet=wallet_address,
                         start_date=start_date.isoformat() if start_date else None,
-                        end_date=end_date.isoformat() if end_date else None
+                        end_date=end_date.isoformat() if end_date else None,
+                        cursor_signature=until,
+                        cursor_slot=cursor.slot if cursor else None
                     )
                     
-                    # Step 1: Pre-flight transaction count check
-                    estimated_count = await self.estimate_transaction_count(
-                        wallet_address, start_date, end_date
-                    )
-                    
-                    ingestion_method = "FULL"
+                    plan = None
+                    if cursor:
+                        # A resumed wallet only fetches signatures newer than its cursor;
+                        # when streaming, signature pages are fetched inside the pipeline
+                        ingestion_method = "INCREMENTAL"
+                        logger.info("Resuming wallet from ingestion cursor", wallet=wallet_address)
+                        signatures = None if self.streaming else await self.fetch_wallet_signatures(
+                            wallet_address, start_date, end_date, until, signature_progress
+                        )
+                        errors = []
+                    else:
+                        # Step 1: One pass over the window's signatures decides between a
+                        # full backfill and density-proportional sampling (high-volume wallets);
+                        # when streaming, a full backfill's pages are fetched as they are scanned
+                        plan_progress: Dict[str, Any] = {}
+                        if self.streaming:
+                            plan = self.new_backfill_plan(wallet_address)
+                            signatures = None
+                        else:
+                            plan = await self.plan_backfill(wallet_address, start_date, end_date, plan_progress)
+                            signatures = plan.signatures
+                        errors = []
                     
-                    # Step 2: Conditional logic based on transaction threshold
-                    if estimated_count > settings.transaction_threshold:
-                        logger.info(
-                            "High-volume wallet detected, using sampling strategy",
-                            wallet=wallet_address,
-                            estimated_count=estimated_count,
-                            threshold=settings.transaction_threshold
+                    if self.streaming:
+                        if plan is not None:
+                            signature_pages = self.iter_backfill_pages(
+                                wallet_address, start_date, end_date, plan, plan_progress
+                            )
+                        elif signatures is None:
+                            signature_pages = self.iter_signature_pages(
+                                wallet_address, start_date, end_date, until, signature_progress
+                            )
+                        else:
+                            signature_pages = _as_signature_pages(signatures, self.batch_size)
+                        signature_count, skipped_count, swap_count, fetch_failures = await self._stream_wallet(
+                            wallet_address, signature_pages, errors
                         )
+                        status.total_transactions_found = signature_count
                         
-                        # Execute sampling backfill for high-volume wallets
-                        signatures, errors = await self.execute_sampling_backfill(
-                            wallet_address, start_date, end_date
-                        )
-                        ingestion_method = "SAMPLED"
+                        if not signature_count:
+                            if not cursor:
+                                status.add_warning("No transactions found for wallet")
+                            status.mark_completed(success=True)
+                            return status
+                        
+                        # Signatures that survived the pre-filter; the parser drops the remaining non-Raydium ones
+                        status.signatures_skipped = skipped_count
+                        status.raydium_transactions_found = signature_count - skipped_count
                     else:
-                        logger.info(
-                            "Low-volume wallet detected, using full backfill",
-                            wallet=wallet_address,
-                            estimated_count=estimated_count,
-                            threshold=settings.transaction_threshold
-                        )
+                        status.total_transactions_found = len(signatures)
                         
-                        # Execute full backfill for low-volume wallets
-                        signatures = await self.fetch_wallet_signatures(
-                            wallet_address, start_date, end_date
-                        )
-                        errors = []
-                        ingestion_method = "FULL"
-                    
-                    status.total_transactions_found = len(signatures)
-                    
-                    if not signatures:
-                        status.add_warning("No transactions found for wallet")
-                        status.mark_completed(success=True)
-                        return status
-                    
-                    # Step 3: Filter for potential Raydium transactions
-                    # For now, we'll process all signatures and let the parser filter
-                    status.raydium_transactions_found = len(signatures)
-                    
-                    # Step 4: Fetch and parse transactions (if not already done in sampling)
-                    if ingestion_method == "SAMPLED":
-                        # Signatures are already fetched, now parse them
+                        if not signatures:
+                            if not cursor:
+                                status.add_warning("No transactions found for wallet")
+                            status.mark_completed(success=True)
+                            return status
+                        
+                        # Step 2: Drop failed and known non-swap signatures before fetching;
+                        # the parser filters the remaining non-Raydium transactions itself
+                        candidates = self.prefilter_signatures(wallet_address, signatures)
+                        status.signatures_skipped = len(signatures) - len(candidates)
+                        status.raydium_transactions_found = len(candidates)
+                        
+                        # Step 3: Fetch and parse the planned (full or sampled) transactions
+                        fetch_stats: Dict[str, int] = {}
                         parsed_swaps, parse_errors = await self.fetch_and_parse_transactions(
-                            wallet_address, signatures
+                            wallet_address, candidates, fetch_stats
                         )
                         errors.extend(parse_errors)
-                    else:
-                        # Full backfill - fetch and parse transactions
-                        parsed_swaps, errors = await self.fetch_and_parse_transactions(
-                            wallet_address, signatures
-                        )
+                        
+                        signature_count, swap_count = len(signatures), len(parsed_swaps)
+                        fetch_failures = fetch_stats["fetch_failures"]
+                    
+                    if plan is not None:
+                        # Only a full backfill saw every signature, so only it may set the cursor
+                        ingestion_method = plan.method
+                        errors.extend(plan.errors)
+                        if plan.method == "FULL":
+                            signature_progress.update(plan_progress)
                     
-                    status.valid_swaps_extracted = len(parsed_swaps)
-                    status.invalid_transactions = len(signatures) - len(parsed_swaps)
+                    status.valid_swaps_extracted = swap_count
+                    status.invalid_transactions = signature_count - swap_count
                     
                     # Add errors to status
                     for error in errors:
                         status.add_error(error)
                     
                     # Update statistics
-                    self.stats['total_transactions_fetched'] += len(signatures)
-                    self.stats['total_swaps_extracted'] += len(parsed_swaps)
+                    self.stats['total_transactions_fetched'] += signature_count - status.signatures_skipped
+                    self.stats['total_signatures_skipped'] += status.signatures_skipped
+                    self.stats['total_swaps_extracted'] += swap_count
                     self.stats['total_errors'] += len(errors)
                     
-                    # Mark as completed
-                    success = len(parsed_swaps) > 0 or len(signatures) == 0
+                    # Mark as completed. Validation errors recur on every run and do not hold the
+                    # wallet back; a failed fetch would be lost behind an advanced cursor
+                    fetched_all = fetch_failures == 0
+                    success = fetched_all or swap_count > 0
+                    if fetched_all:
+                        self._record_newest_signature(status, signature_progress)
                     status.mark_completed(success=success)
                     
                     logger.info(
                         "Completed wallet processing",
                         wallet=wallet_address,
+                        method=ingestion_method,
                         transactions_found=status.total_transactions_found,
+                        signatures_skipped=status.signatures_skipped,
                         swaps_extracted=status.valid_swaps_extracted,
+                        fetch_failures=fetch_failures,
                         success=success,
                         duration=status.duration_seconds
                     )
@@ -559,12 +885,32 @@ class DataIngestionWorker:
         
         return status
     
-    async def process_batch(self, batch: IngestionBatch) -> Dict[str, WalletIngestionStatus]:
+    @staticmethod
+    def _record_newest_signature(status: WalletIngestionStatus, signature_progress: Dict[str, Any]):
+        """Expose the wallet's next cursor on its status once signature paging ran to completion"""
+        newest = signature_progress.get("newest")
+        if newest is None or not signature_progress.get("complete"):
+            return
+        
+        cursor = IngestionCursor.from_signature_info(status.wallet_address, newest)
+        status.newest_signature = cursor.signature
+        status.newest_slot = cursor.slot
+        status.newest_block_time = cursor.block_time
+    
+    async def process_batch(
+        self,
+        batch: IngestionBatch,
+        cursors: Optional[Dict[str, IngestionCursor]] = None,
+        save_signature_filter: bool = True
+    ) -> Dict[str, WalletIngestionStatus]:
         """
         Process a batch of wallets for ingestion
         
         Args:
             batch: Batch of wallet addresses to process
+            cursors: Stored ingestion cursors by wallet (optional)
+            save_signature_filter: Persist the signature pre-filter afterwards; callers
+                running many small batches pass False and call save_signature_filter once
             
         Returns:
             Dict mapping wallet addresses to their ingestion status
@@ -588,7 +934,8 @@ class DataIngestionWorker:
                     return await self.process_wallet(
                         wallet_address,
                         batch.start_date,
-                        batch.end_date
+                        batch.end_date,
+                        cursors.get(wallet_address) if cursors else None
                     )
             
             # Create tasks for all wallets
@@ -633,21 +980,40 @@ class DataIngestionWorker:
                 duration_seconds=total_duration,
                 success_rate=f"{successful_wallets/len(results):.2%}" if results else "0%"
             )
+            
+            if self.signature_filter:
+                if save_signature_filter:
+                    await self.save_signature_filter()
+                logger.info(
+                    "Signature pre-filter",
+                    batch_id=batch.batch_id,
+                    signatures_skipped=sum(status.signatures_skipped for status in results.values()),
+                    **self.signature_filter.get_statistics()
+                )
         
         return results
     
     async def run_scheduled_ingestion(
         self,
         wallet_addresses: List[str],
-        lookback_hours: int = None
+        lookback_hours: int = None,
+        use_cursors: bool = True,
+        save_signature_filter: bool = True
     ) -> Dict[str, WalletIngestionStatus]:
         """
         Run scheduled ingestion for a list of wallet addresses
         This is the main entry point for scheduled execution
         
+        Wallets with a stored ingestion cursor only fetch signatures newer than it;
+        lookback_hours applies to wallets ingested for the first time. Cursors of
+        successfully processed wallets are advanced afterwards.
+        
         Args:
             wallet_addresses: List of wallet addresses to process
-            lookback_hours: Hours to look back for new transactions
+            lookback_hours: Hours to look back for wallets without a cursor
+            use_cursors: Resume from stored cursors; False forces the lookback window
+                for every wallet (cursors still advance)
+            save_signature_filter: Persist the signature pre-filter when done
             
         Returns:
             Dict mapping wallet addresses to their processing status
@@ -681,8 +1047,29 @@ class DataIngestionWorker:
         await self.initialize()
         
         try:
+            cursors = await self.cursor_store.load(wallet_addresses) if self.cursor_store and use_cursors else {}
+            
             # Process the batch
-            results = await self.process_batch(batch)
+            results = await self.process_batch(batch, cursors, save_signature_filter)
+            
+            if self.cursor_store:
+                advanced = [
+                    IngestionCursor(
+                        wallet_address=wallet,
+                        signature=status.newest_signature,
+                        slot=status.newest_slot,
+                        block_time=status.newest_block_time
+                    )
+                    for wallet, status in results.items()
+                    if status.success and status.newest_signature
+                ]
+                saved = await self.cursor_store.save(advanced)
+                logger.info(
+                    "Updated ingestion cursors",
+                    batch_id=batch.batch_id,
+                    resumed_wallets=len(cursors),
+                    advanced_cursors=saved
+                )
             
             # Log summary statistics
             logger.info(
@@ -707,10 +1094,17 @@ class DataIngestionWorker:
             ),
             'swaps_per_wallet_average': (
                 self.stats['total_swaps_extracted'] / max(self.stats['total_wallets_processed'], 1)
-            )
+            ),
+            'signature_filter': self.signature_filter.get_statistics() if self.signature_filter else None
         }
 
 
+async def _as_signature_pages(signatures: List[Any], page_size: int) -> AsyncIterator[List[Any]]:
+    """Feed an already collected signature list to the streaming pipeline"""
+    for i in range(0, len(signatures), page_size):
+        yield signatures[i:i + page_size]
+
+
 # Global worker instance
 _worker_instance: Optional[DataIngestionWorker] = None
 
@@ -725,19 +1119,38 @@ def get_ingestion_worker() -> DataIngestionWorker:
     return _worker_instance
 
 
+async def close_ingestion_worker():
+    """Shut down the global ingestion worker"""
+    global _worker_instance
+    
+    if _worker_instance:
+        await _worker_instance.shutdown()
+        _worker_instance = None
+
+
 async def run_ingestion_for_wallets(
     wallet_addresses: List[str],
-    lookback_hours: int = None
+    lookback_hours: int = None,
+    use_cursors: bool = True,
+    save_signature_filter: bool = True
 ) -> Dict[str, WalletIngestionStatus]:
     """
     Convenience function to run ingestion for a list of wallets
     
     Args:
         wallet_addresses: List of wallet addresses to process
-        lookback_hours: Hours to look back for transactions
+        lookback_hours: Hours to look back for wallets without an ingestion cursor
+        use_cursors: Resume wallets from their ingestion cursors
+        save_signature_filter: Persist the signature pre-filter when done; pass False
+            when calling once per wallet and use save_signature_filter() at the end
         
     Returns:
         Processing results for each wallet
     """
     worker = get_ingestion_worker()
-    return await worker.run_scheduled_ingestion(wallet_addresses, lookback_hours)
\ No newline at end of file
+    return await worker.run_scheduled_ingestion(wallet_addresses, lookback_hours, use_cursors, save_signature_filter)
+
+
+async def save_signature_filter():
+    """Persist the global ingestion worker's signature pre-filter"""
+    await get_ingestion_worker().save_signature_filter()
\ No newline at end of file
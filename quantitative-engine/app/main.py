@@ -9,19 +9,24 @@ from datetime import datetime, timezone, timedelta
 from typing import Any, Dict, List, Optional
 import uvicorn
 
-from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks, Header
+from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks, Header, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from pydantic import BaseModel
 
 from .core.config import get_settings
 from .core.logging import get_api_logger, CorrelationContext
+from .core.metrics_middleware import setup_observability
+from .core.system_sampler import stop_system_sampler
 from .ingestion.worker import get_ingestion_worker, run_ingestion_for_wallets, DataIngestionWorker
 from .ingestion.solana_client import get_helius_client, close_all_clients
 from .calculation.service import get_calculation_service, close_calculation_service
 from .scoring.service import get_scoring_service, close_scoring_service
 from .blockchain.trader_discovery import MainnetTraderDiscovery, get_trader_discovery
 from .worker import process_wallet_batch
+from .database.ranking_snapshot import (
+    RANKED_TRADERS_STATIC_META, etag_matches, get_ranked_traders_cache, close_ranked_traders_cache
+)
 
 settings = get_settings()
 logger = get_api_logger()
@@ -302,6 +307,8 @@ async def lifespan(app: FastAPI):
     await close_all_clients()
     await close_calculation_service()
     await close_scoring_service()
+    await close_ranked_traders_cache()
+    stop_system_sampler()
 
 
 # Create FastAPI app
@@ -361,6 +368,10 @@ async def verify_auth_token(authorization: Optional[str] = Header(None)) -> bool
     return True
 
 
+# Metrics middleware and endpoints; Starlette only accepts middleware before startup
+setup_observability(app, profiling_dependencies=[Depends(verify_api_key)])
+
+
 @app.get("/", include_in_schema=False)
 async def root():
     """Root endpoint redirect"""
@@ -1044,14 +1055,18 @@ async def get_scoring_health():
 
 @app.get("/internal/ranked-traders", response_model=RankedTradersResponse)
 async def get_ranked_traders(
-    limit: Optional[int] = 100,
-    min_trust_score: Optional[float] = 0.0
+    limit: int = Query(100, ge=1),
+    min_trust_score: Optional[float] = 0.0,
+    if_none_match: Optional[str] = Header(None)
 ):
     """
     FR-4: API Module - GET /internal/ranked-traders
     Secure, internal REST API endpoint to expose ranked traders with Trust Scores
     Uses real blockchain data analysis and database integration
     Requires authentication token in Authorization header
+    
+    Responses come from an in-memory snapshot of the latest ranking calculation
+    and carry an ETag; a matching If-None-Match returns 304 Not Modified.
     """
     with CorrelationContext(endpoint="ranked_traders"):
         logger.info(
@@ -1060,6 +1075,23 @@ async def get_ranked_traders(
             min_trust_score=min_trust_score
         )
         
+        if settings.ranked_traders_snapshot_enabled:
+            try:
+                cached = await get_ranked_traders_cache().get_response(
+                    limit or 100,
+                    float(min_trust_score or 0.0)
+                )
+            except Exception as e:
+                logger.warning("Ranked traders snapshot unavailable, querying database", error=str(e))
+                cached = None
+            
+            if cached is not None:
+                body, etag = cached
+                headers = {"ETag": etag, "Cache-Control": "no-cache"}
+                if etag_matches(if_none_match, etag):
+                    return Response(status_code=304, headers=headers)
+                return Response(content=body, media_type="application/json", headers=headers)
+        
         try:
             logger.info("LIVE DATA: Using real mainnet trader data from database")
             
@@ -1103,19 +1135,7 @@ async def get_ranked_traders(
                 "min_trust_score_applied": min_trust_score,
                 "limit_applied": limit,
                 "calculation_timestamp": datetime.now(timezone.utc).isoformat(),
-                "algorithm_version": "2.0.0",  # Updated version for real data
-                "data_source": "mainnet_blockchain",  # Now using real data
-                "eligibility_criteria": {
-                    "min_trading_days": 90,  # FR-3 specification: 90+ days required
-                    "min_total_trades": 50,  # FR-3 specification: 50+ trades required
-                    "max_single_day_roi_spike": "50%",  # FR-3 specification: no extreme spikes
-                    "anti_manipulation": "enabled"  # FR-3 specification: anti-manipulation checks
-                },
-                "scoring_weights": {
-                    "sharpe_weight": "40%",  # FR-3 specification: primary weight for risk-adjusted returns
-                    "roi_weight": "15%",     # FR-3 specification: secondary weight for raw returns
-                    "drawdown_penalty_weight": "45%"  # FR-3 specification: heavy penalty for max drawdown
-                }
+                **RANKED_TRADERS_STATIC_META
             }
             
             response = RankedTradersResponse(
@@ -9,11 +9,11 @@ import uuid
 import secrets  # SR-4: Import for constant-time comparison
 from contextlib import asynccontextmanager
 from datetime import datetime, timezone
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 import uvicorn
 import httpx  # For secure bot service communication
 
-from fastapi import (FastAPI, HTTPException, Depends, Request, Header)
+from fastapi import (FastAPI, HTTPException, Depends, Request, Header, Query)
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
@@ -24,10 +24,10 @@ from typing import Union
 # SR-2: Secure configuration management
 from .core.config_secure import get_secure_settings, init_secure_settings
 # SR-3: Immutable audit logging
-from .core.audit_logger import get_audit_logger, init_audit_logging, AuditEventType, AuditLevel
+from .core.audit_logger import get_audit_logger, init_audit_logging, close_audit_logger, AuditEventType, AuditLevel
 # NFR-3: Observability
-from .core.metrics_middleware import setup_observability, observe_async_operation
-from .core.observability import get_metrics_collector
+from .core.metrics_middleware import setup_observability, start_observability, observe_async_operation
+from .core.system_sampler import stop_system_sampler
 # Existing modules
 from .core.logging import get_api_logger, CorrelationContext
 from .ingestion.worker import get_ingestion_worker, run_ingestion_for_wallets
@@ -174,7 +174,7 @@ class RankedTrader(BaseModel):
 class RankedTradersResponse(BaseModel):
     status: str = "success"
     data: List[RankedTrader]
-    meta: Dict[str, any]
+    meta: Dict[str, Any]
 
 # Bot Service Models (API Gateway)
 class BotConfiguration(BaseModel):
@@ -196,7 +196,7 @@ class BotStatus(BaseModel):
     circuit_breakers: Dict[str, CircuitBreaker]
     kill_switch_active: bool
     configuration: BotConfiguration
-    performance: Dict[str, any]
+    performance: Dict[str, Any]
 
 class BotConfigurationRequest(BaseModel):
     user_id: str
@@ -223,7 +223,7 @@ class HealthResponse(BaseModel):
     version: str
     environment: str
     components: Dict[str, bool]
-    details: Dict[str, any]
+    details: Dict[str, Any]
 
 class AuthRequest(BaseModel):
     wallet_address: str
@@ -240,7 +240,7 @@ class AuthResponse(BaseModel):
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """SR-2, SR-3, NFR-3: Secure application lifespan with audit logging and observability"""
-    global settings, audit_logger, metrics_collector, bot_service_client
+    global settings, audit_logger, bot_service_client
     
     # SR-2: Initialize secure settings with secrets manager
     logger.info("Initializing secure configuration...")
@@ -260,17 +260,12 @@ async def lifespan(app: FastAPI):
         logger.error("Failed to initialize audit logging", error=str(e))
         raise
     
-    # NFR-3: Initialize observability and metrics
+    # NFR-3: Start the metrics exporter (middleware and endpoints are installed at import)
     logger.info("Initializing observability system...")
-    try:
-        metrics_collector = setup_observability(app)
-        logger.info("Observability system initialized", 
-                   prometheus_enabled=metrics_collector.enable_prometheus,
-                   datadog_enabled=metrics_collector.enable_datadog)
-    except Exception as e:
-        logger.error("Failed to initialize observability", error=str(e))
-        # Don't fail startup for metrics - continue with degraded observability
-        metrics_collector = get_metrics_collector()
+    start_observability()
+    logger.info("Observability system initialized", 
+               prometheus_enabled=metrics_collector.enable_prometheus,
+               datadog_enabled=metrics_collector.enable_datadog)
     
     # Log secure startup
     await audit_logger.log_event({
@@ -330,12 +325,14 @@ async def lifespan(app: FastAPI):
         "details": {
             "shutdown_timestamp": datetime.now(timezone.utc).isoformat()
         }
-    })
+    }, durable=True)
     
     logger.info("Shutting down XORJ Quantitative Engine...")
     await close_all_clients()
     await close_calculation_service()
     await close_scoring_service()
+    stop_system_sampler()
+    close_audit_logger()
 
 
 # --- FastAPI App Initialization ---
@@ -540,6 +537,11 @@ async def security_and_logging_middleware(request: Request, call_next):
     return response
 
 
+# NFR-3: Metrics middleware and endpoints; Starlette only accepts middleware before startup,
+# so this runs here rather than in lifespan. Added last, the metrics middleware is outermost.
+metrics_collector = setup_observability(app, profiling_dependencies=[Depends(verify_api_key)])
+
+
 # --- API Endpoints ---
 @app.get("/", include_in_schema=False)
 async def root():
@@ -728,8 +730,8 @@ async def authenticate_user(auth_request: AuthRequest, request: Request):
 )
 async def get_ranked_traders(
     request: Request,
-    limit: int = Field(100, gt=0, le=500),
-    min_trust_score: float = Field(0.0, ge=0, le=100)
+    limit: int = Query(100, gt=0, le=500),
+    min_trust_score: float = Query(0.0, ge=0, le=100)
 ):
     """FR-4: Secure endpoint to retrieve ranked traders based on trust score."""
     scoring_service = await get_scoring_service()
@@ -969,8 +971,8 @@ async def disable_bot_secure(
 async def get_bot_trades_secure(
     request: Request,
     user: AuthenticatedUser = Depends(verify_user_session),
-    limit: int = Field(50, gt=0, le=500),
-    offset: int = Field(0, ge=0)
+    limit: int = Query(50, gt=0, le=500),
+    offset: int = Query(0, ge=0)
 ):
     """
     SECURE API GATEWAY: Get bot trades through secure server-to-server communication
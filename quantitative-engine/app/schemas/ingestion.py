@@ -25,6 +25,55 @@ class SwapType(str, Enum):
     UNKNOWN = "unknown"
 
 
+STABLE_TOKEN_MINTS = frozenset({
+    "So11111111111111111111111111111111111111112",
+    "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",
+    "Es9vMFrzaCERmJfrF4H2FYD4KCoNkY11McCe8BenwNYB"
+})
+
+
+# Field checks shared by the Pydantic models and SwapRecord.validate
+def _check_mint(v):
+    if not v or len(v) < 32:
+        raise ValueError("Invalid mint address format")
+    return v
+
+
+def _check_amount(v):
+    if v == 0:
+        raise ValueError("Token amount cannot be zero")
+    return v
+
+
+def _check_signature(v):
+    if not v or len(v) < 64:
+        raise ValueError("Invalid transaction signature format")
+    return v
+
+
+def _check_wallet_address(v):
+    if not v or len(v) < 32:
+        raise ValueError("Invalid wallet address format")
+    return v
+
+
+def _check_pool_id(v):
+    if not v or len(v) < 32:
+        raise ValueError("Invalid pool ID format")
+    return v
+
+
+def _check_fee(v):
+    if v < 0:
+        raise ValueError("Transaction fee cannot be negative")
+    return v
+
+
+def _check_swap_direction(token_in_mint, token_out_mint):
+    if token_out_mint == token_in_mint:
+        raise ValueError("Input and output tokens cannot be the same")
+
+
 class TokenBalance(BaseModel):
     """Token balance change in a transaction"""
     mint: str = Field(..., description="Token mint address")
@@ -36,16 +85,12 @@ class TokenBalance(BaseModel):
     @validator('mint')
     def validate_mint(cls, v):
         """Validate mint address format"""
-        if not v or len(v) < 32:
-            raise ValueError("Invalid mint address format")
-        return v
+        return _check_mint(v)
     
     @validator('amount')
     def validate_amount(cls, v):
         """Ensure amount is not zero"""
-        if v == 0:
-            raise ValueError("Token amount cannot be zero")
-        return v
+        return _check_amount(v)
 
 
 class RaydiumSwap(BaseModel):
@@ -82,45 +127,34 @@ class RaydiumSwap(BaseModel):
     @validator('signature')
     def validate_signature(cls, v):
         """Validate transaction signature format"""
-        if not v or len(v) < 64:
-            raise ValueError("Invalid transaction signature format")
-        return v
+        return _check_signature(v)
     
     @validator('wallet_address')
     def validate_wallet_address(cls, v):
         """Validate wallet address format"""
-        if not v or len(v) < 32:
-            raise ValueError("Invalid wallet address format")
-        return v
+        return _check_wallet_address(v)
     
     @validator('pool_id')
     def validate_pool_id(cls, v):
         """Validate pool ID format"""
-        if not v or len(v) < 32:
-            raise ValueError("Invalid pool ID format")
-        return v
+        return _check_pool_id(v)
     
     @validator('fee_lamports')
     def validate_fee(cls, v):
         """Validate transaction fee"""
-        if v < 0:
-            raise ValueError("Transaction fee cannot be negative")
-        return v
+        return _check_fee(v)
     
     @validator('token_out')
     def validate_swap_direction(cls, v, values):
         """Validate that token_in and token_out are different"""
-        if 'token_in' in values and v.mint == values['token_in'].mint:
-            raise ValueError("Input and output tokens cannot be the same")
+        if 'token_in' in values:
+            _check_swap_direction(values['token_in'].mint, v.mint)
         return v
     
     @property
     def is_buy(self) -> bool:
         """Check if this is a buy transaction (token_out is not SOL/USDC/USDT)"""
-        stable_tokens = {"So11111111111111111111111111111111111111112", 
-                        "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",
-                        "Es9vMFrzaCERmJfrF4H2FYD4KCoNkY11McCe8BenwNYB"}
-        return self.token_in.mint in stable_tokens
+        return self.token_in.mint in STABLE_TOKEN_MINTS
     
     @property
     def is_sell(self) -> bool:
@@ -163,6 +197,214 @@ class RaydiumSwap(BaseModel):
         }
 
 
+class TokenAmount:
+    """
+    Compact token leg of a SwapRecord
+
+    Same fields as TokenBalance, without per-construction validation.
+    """
+
+    __slots__ = ("mint", "symbol", "decimals", "amount", "usd_value")
+
+    def __init__(
+        self,
+        mint: str,
+        symbol: Optional[str],
+        decimals: int,
+        amount: Decimal,
+        usd_value: Optional[Decimal] = None
+    ):
+        self.mint = mint
+        self.symbol = symbol
+        self.decimals = decimals
+        self.amount = amount
+        self.usd_value = usd_value
+
+    @classmethod
+    def from_token_balance(cls, balance: TokenBalance) -> "TokenAmount":
+        return cls(balance.mint, balance.symbol, balance.decimals, balance.amount, balance.usd_value)
+
+    def to_token_balance(self) -> TokenBalance:
+        return TokenBalance(
+            mint=self.mint,
+            symbol=self.symbol,
+            decimals=self.decimals,
+            amount=self.amount,
+            usd_value=self.usd_value
+        )
+
+    def _fields(self):
+        return (self.mint, self.symbol, self.decimals, self.amount, self.usd_value)
+
+    def __reduce__(self):
+        return (TokenAmount, self._fields())
+
+    def __eq__(self, other):
+        return isinstance(other, TokenAmount) and self._fields() == other._fields()
+
+    def __repr__(self):
+        return f"TokenAmount(mint={self.mint!r}, symbol={self.symbol!r}, amount={self.amount!r})"
+
+
+class SwapRecord:
+    """
+    Compact swap representation used between ingestion and calculation
+
+    Carries exactly the fields of RaydiumSwap in slots. Constructing one runs no
+    validators: the parser calls validate() once when the record is created, and
+    to_raydium_swap() converts losslessly to the Pydantic model where one is
+    needed (API responses). Calculation code reads the same attribute names from
+    either type (see SwapData).
+    """
+
+    __slots__ = (
+        "signature",
+        "block_time",
+        "slot",
+        "wallet_address",
+        "status",
+        "swap_type",
+        "token_in",
+        "token_out",
+        "pool_id",
+        "program_id",
+        "fee_lamports",
+        "fee_usd",
+        "processed_at",
+        "data_source",
+    )
+
+    def __init__(
+        self,
+        signature: str,
+        block_time: datetime,
+        slot: int,
+        wallet_address: str,
+        status: TransactionStatus,
+        swap_type: SwapType,
+        token_in: TokenAmount,
+        token_out: TokenAmount,
+        pool_id: str,
+        program_id: str,
+        fee_lamports: int,
+        fee_usd: Optional[Decimal] = None,
+        processed_at: Optional[datetime] = None,
+        data_source: str = "helius"
+    ):
+        self.signature = signature
+        self.block_time = block_time
+        self.slot = slot
+        self.wallet_address = wallet_address
+        self.status = status
+        self.swap_type = swap_type
+        self.token_in = token_in
+        self.token_out = token_out
+        self.pool_id = pool_id
+        self.program_id = program_id
+        self.fee_lamports = fee_lamports
+        self.fee_usd = fee_usd
+        self.processed_at = processed_at or datetime.utcnow()
+        self.data_source = data_source
+
+    def validate(self) -> "SwapRecord":
+        """
+        Apply the RaydiumSwap / TokenBalance field checks
+
+        Returns:
+            self
+
+        Raises:
+            ValueError: With the same message the Pydantic model would report
+        """
+        _check_signature(self.signature)
+        _check_wallet_address(self.wallet_address)
+        _check_pool_id(self.pool_id)
+        _check_fee(self.fee_lamports)
+        for token in (self.token_in, self.token_out):
+            _check_mint(token.mint)
+            _check_amount(token.amount)
+        _check_swap_direction(self.token_in.mint, self.token_out.mint)
+        return self
+
+    @classmethod
+    def from_raydium_swap(cls, swap: RaydiumSwap) -> "SwapRecord":
+        """Record carrying the same values as a (validated) RaydiumSwap"""
+        return cls(
+            signature=swap.signature,
+            block_time=swap.block_time,
+            slot=swap.slot,
+            wallet_address=swap.wallet_address,
+            status=swap.status,
+            swap_type=swap.swap_type,
+            token_in=TokenAmount.from_token_balance(swap.token_in),
+            token_out=TokenAmount.from_token_balance(swap.token_out),
+            pool_id=swap.pool_id,
+            program_id=swap.program_id,
+            fee_lamports=swap.fee_lamports,
+            fee_usd=swap.fee_usd,
+            processed_at=swap.processed_at,
+            data_source=swap.data_source
+        )
+
+    def to_raydium_swap(self) -> RaydiumSwap:
+        """Pydantic model with the same values, e.g. for API responses"""
+        return RaydiumSwap(
+            signature=self.signature,
+            block_time=self.block_time,
+            slot=self.slot,
+            wallet_address=self.wallet_address,
+            status=self.status,
+            swap_type=self.swap_type,
+            token_in=self.token_in.to_token_balance(),
+            token_out=self.token_out.to_token_balance(),
+            pool_id=self.pool_id,
+            program_id=self.program_id,
+            fee_lamports=self.fee_lamports,
+            fee_usd=self.fee_usd,
+            processed_at=self.processed_at,
+            data_source=self.data_source
+        )
+
+    @property
+    def is_buy(self) -> bool:
+        """Check if this is a buy transaction (token_out is not SOL/USDC/USDT)"""
+        return self.token_in.mint in STABLE_TOKEN_MINTS
+
+    @property
+    def is_sell(self) -> bool:
+        """Check if this is a sell transaction (token_in is not SOL/USDC/USDT)"""
+        return not self.is_buy
+
+    @property
+    def trade_size_usd(self) -> Optional[Decimal]:
+        """Get trade size in USD (using token_in value)"""
+        return self.token_in.usd_value
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for database storage"""
+        return self.to_raydium_swap().to_dict()
+
+    def _fields(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __reduce__(self):
+        # Positional state keeps process-pool transfers small
+        return (SwapRecord, self._fields())
+
+    def __eq__(self, other):
+        return isinstance(other, SwapRecord) and self._fields() == other._fields()
+
+    def __repr__(self):
+        return (
+            f"SwapRecord(signature={self.signature!r}, wallet_address={self.wallet_address!r}, "
+            f"token_in={self.token_in!r}, token_out={self.token_out!r})"
+        )
+
+
+# Swap representations accepted by calculation and scoring
+SwapData = Union[RaydiumSwap, SwapRecord]
+
+
 class WalletIngestionStatus(BaseModel):
     """Status of wallet data ingestion process"""
     
@@ -173,9 +415,16 @@ class WalletIngestionStatus(BaseModel):
     # Processing Statistics
     total_transactions_found: int = Field(0, description="Total transactions found for wallet")
     raydium_transactions_found: int = Field(0, description="Raydium transactions found")
+    signatures_skipped: int = Field(0, description="Failed or known non-swap signatures dropped before fetching")
     valid_swaps_extracted: int = Field(0, description="Valid swaps successfully extracted")
     invalid_transactions: int = Field(0, description="Transactions that failed validation")
-    
+
+    # Ingestion Cursor
+    resumed_from_cursor: bool = Field(False, description="Whether only signatures newer than the stored cursor were fetched")
+    newest_signature: Optional[str] = Field(None, description="Newest signature ingested in this run")
+    newest_slot: Optional[int] = Field(None, description="Slot of the newest signature ingested in this run")
+    newest_block_time: Optional[datetime] = Field(None, description="Block time of the newest signature ingested in this run")
+
     # Error Tracking
     errors: List[str] = Field(default_factory=list, description="Errors encountered during processing")
     warnings: List[str] = Field(default_factory=list, description="Warnings encountered during processing")
@@ -0,0 +1,101 @@
+"""
+XORJ Quantitative Engine - Streaming Leaderboard
+Bounded-memory top-K ranking and one-pass Trust Score statistics
+"""
+
+import heapq
+import math
+from typing import Dict, List, Tuple
+
+from .trust_score import TrustScoreResult, EligibilityStatus
+
+
+class LeaderboardAccumulator:
+    """
+    Consumes TrustScoreResults one at a time and keeps only what the leaderboard needs
+
+    Memory is O(limit) for the ranking plus a bounded histogram of scores rounded
+    to 0.01 for the median, independent of how many wallets stream through.
+    """
+
+    def __init__(self, limit: int, min_trust_score: float = 0.0):
+        self.limit = limit
+        self.min_trust_score = min_trust_score
+
+        # Min-heap of (score, -arrival, result): the root is the entry to evict next.
+        # Among equal scores the latest arrival is evicted first, matching a stable sort.
+        self._heap: List[Tuple[float, int, TrustScoreResult]] = []
+        self._arrivals = 0
+
+        self.total_results = 0
+        self.qualifying_results = 0  # Eligible and at or above min_trust_score
+        self.eligibility_breakdown: Dict[str, int] = {}
+
+        # Welford running mean / sum of squared deviations of qualifying scores
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._maximum = None
+        self._minimum = None
+        self._rounded_counts: Dict[float, int] = {}
+
+    def add(self, result: TrustScoreResult):
+        """Account for one wallet's result"""
+        self.total_results += 1
+        status = result.eligibility_status.value
+        self.eligibility_breakdown[status] = self.eligibility_breakdown.get(status, 0) + 1
+
+        score = float(result.trust_score)
+        if result.eligibility_status != EligibilityStatus.ELIGIBLE or score < self.min_trust_score:
+            return
+
+        self.qualifying_results += 1
+        delta = score - self._mean
+        self._mean += delta / self.qualifying_results
+        self._m2 += delta * (score - self._mean)
+        self._maximum = score if self._maximum is None else max(self._maximum, score)
+        self._minimum = score if self._minimum is None else min(self._minimum, score)
+
+        rounded = round(score, 2)
+        self._rounded_counts[rounded] = self._rounded_counts.get(rounded, 0) + 1
+
+        self._arrivals += 1
+        item = (score, -self._arrivals, result)
+        if len(self._heap) < self.limit:
+            heapq.heappush(self._heap, item)
+        elif self.limit > 0 and item[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, item)
+
+    def record_failures(self, count: int):
+        """Count wallets that produced no result because the batch scorer failed"""
+        if count > 0:
+            self.total_results += count
+            status = EligibilityStatus.CALCULATION_ERROR.value
+            self.eligibility_breakdown[status] = self.eligibility_breakdown.get(status, 0) + count
+
+    def top_results(self) -> List[TrustScoreResult]:
+        """Best results first (ties keep arrival order)"""
+        return [result for _, _, result in sorted(self._heap, key=lambda item: item[:2], reverse=True)]
+
+    def trust_score_stats(self) -> Dict[str, float]:
+        """Average, median, extremes and population standard deviation of qualifying scores"""
+        if not self.qualifying_results:
+            return {"average": 0, "median": 0, "maximum": 0, "minimum": 0, "std_deviation": 0}
+
+        return {
+            "average": round(self._mean, 2),
+            "median": self._median(),
+            "maximum": round(self._maximum, 2),
+            "minimum": round(self._minimum, 2),
+            "std_deviation": round(math.sqrt(self._m2 / self.qualifying_results), 2) if self.qualifying_results > 1 else 0
+        }
+
+    def _median(self) -> float:
+        # Upper median of the scores; rounding is monotonic, so the median of
+        # rounded scores equals the rounded median
+        target = self.qualifying_results // 2
+        seen = 0
+        for rounded in sorted(self._rounded_counts):
+            seen += self._rounded_counts[rounded]
+            if seen > target:
+                return rounded
+        return 0
@@ -8,10 +8,11 @@ from datetime import datetime, timezone, timedelta
 from typing import Dict, List, Optional, Tuple
 from dataclasses import asdict
 
-from ..schemas.ingestion import RaydiumSwap
+from ..schemas.ingestion import SwapData
 from ..core.config import get_settings
 from ..core.logging import get_calculation_logger
 from .trust_score import get_trust_score_engine, TrustScoreResult, EligibilityStatus
+from .leaderboard import LeaderboardAccumulator
 from ..calculation.service import get_calculation_service
 
 settings = get_settings()
@@ -38,8 +39,8 @@ class ScoringService:
     async def calculate_wallet_trust_score(
         self,
         wallet_address: str,
-        trades: List[RaydiumSwap],
-        benchmark_wallets: Optional[Dict[str, List[RaydiumSwap]]] = None,
+        trades: List[SwapData],
+        benchmark_wallets: Optional[Dict[str, List[SwapData]]] = None,
         end_date: Optional[datetime] = None
     ) -> TrustScoreResult:
         """
@@ -110,7 +111,7 @@ class ScoringService:
     
     async def calculate_batch_trust_scores(
         self,
-        wallet_trades: Dict[str, List[RaydiumSwap]],
+        wallet_trades: Dict[str, List[SwapData]],
         end_date: Optional[datetime] = None
     ) -> Dict[str, TrustScoreResult]:
         """
@@ -181,52 +182,57 @@ class ScoringService:
     
     async def get_trust_score_leaderboard(
         self,
-        wallet_trades: Dict[str, List[RaydiumSwap]],
+        wallet_trades: Dict[str, List[SwapData]],
         limit: int = 100,
         min_trust_score: float = 0.0,
-        end_date: Optional[datetime] = None
+        end_date: Optional[datetime] = None,
+        streaming: Optional[bool] = None
     ) -> Dict[str, any]:
         """
         Generate XORJ Trust Score leaderboard with rankings and statistics
         
+        Results are folded into a LeaderboardAccumulator (top-K heap plus one-pass
+        statistics). In streaming mode they are consumed straight from the batch
+        scorer, so memory stays flat as the candidate wallet set grows.
+        
         Args:
             wallet_trades: Dict mapping wallet addresses to their trades
             limit: Maximum number of wallets to return
             min_trust_score: Minimum Trust Score threshold
             end_date: End date for calculation period
+            streaming: Consume results as they are produced (defaults to on for
+                batches of at least settings.leaderboard_streaming_min_wallets)
             
         Returns:
             Leaderboard data with rankings and statistics
         """
+        if streaming is None:
+            streaming = len(wallet_trades) >= settings.leaderboard_streaming_min_wallets
+        
         logger.info(
             "Generating Trust Score leaderboard",
             wallet_count=len(wallet_trades),
             limit=limit,
-            min_trust_score=min_trust_score
+            min_trust_score=min_trust_score,
+            streaming=streaming
         )
         
-        # Calculate Trust Scores for all wallets
-        trust_score_results = await self.calculate_batch_trust_scores(wallet_trades, end_date)
-        
-        # Filter eligible wallets and apply minimum score threshold
-        eligible_results = [
-            (wallet, result) for wallet, result in trust_score_results.items()
-            if result.eligibility_status == EligibilityStatus.ELIGIBLE 
-            and float(result.trust_score) >= min_trust_score
-        ]
-        
-        # Sort by Trust Score (descending)
-        eligible_results.sort(key=lambda x: x[1].trust_score, reverse=True)
+        accumulator = LeaderboardAccumulator(limit, min_trust_score)
         
-        # Apply limit
-        top_results = eligible_results[:limit]
+        if streaming:
+            await self._stream_trust_scores(wallet_trades, end_date, accumulator)
+        else:
+            # Calculate Trust Scores for all wallets
+            trust_score_results = await self.calculate_batch_trust_scores(wallet_trades, end_date)
+            for result in trust_score_results.values():
+                accumulator.add(result)
         
         # Build leaderboard entries
         leaderboard_entries = []
-        for rank, (wallet, result) in enumerate(top_results, 1):
+        for rank, result in enumerate(accumulator.top_results(), 1):
             entry = {
                 "rank": rank,
-                "wallet_address": wallet,
+                "wallet_address": result.wallet_address,
                 "trust_score": round(float(result.trust_score), 2),
                 "performance_breakdown": {
                     "performance_score": round(float(result.performance_score), 4) if result.performance_score else None,
@@ -243,34 +249,18 @@ class ScoringService:
             leaderboard_entries.append(entry)
         
         # Calculate statistics
-        all_trust_scores = [float(result.trust_score) for _, result in eligible_results]
-        
         statistics = {
             "total_wallets_analyzed": len(wallet_trades),
-            "eligible_wallets": len(eligible_results),
-            "wallets_above_threshold": len(all_trust_scores),
-            "eligibility_rate": f"{len(eligible_results)/len(wallet_trades):.2%}" if wallet_trades else "0%",
-            "trust_score_stats": {
-                "average": round(sum(all_trust_scores) / len(all_trust_scores), 2) if all_trust_scores else 0,
-                "median": round(sorted(all_trust_scores)[len(all_trust_scores)//2], 2) if all_trust_scores else 0,
-                "maximum": round(max(all_trust_scores), 2) if all_trust_scores else 0,
-                "minimum": round(min(all_trust_scores), 2) if all_trust_scores else 0,
-                "std_deviation": round(
-                    (sum((x - sum(all_trust_scores)/len(all_trust_scores))**2 for x in all_trust_scores) / len(all_trust_scores))**0.5, 2
-                ) if len(all_trust_scores) > 1 else 0
-            }
+            "eligible_wallets": accumulator.qualifying_results,
+            "wallets_above_threshold": accumulator.qualifying_results,
+            "eligibility_rate": f"{accumulator.qualifying_results/len(wallet_trades):.2%}" if wallet_trades else "0%",
+            "trust_score_stats": accumulator.trust_score_stats()
         }
         
-        # Eligibility breakdown
-        eligibility_breakdown = {}
-        for result in trust_score_results.values():
-            status = result.eligibility_status.value
-            eligibility_breakdown[status] = eligibility_breakdown.get(status, 0) + 1
-        
         leaderboard = {
             "leaderboard": leaderboard_entries,
             "statistics": statistics,
-            "eligibility_breakdown": eligibility_breakdown,
+            "eligibility_breakdown": accumulator.eligibility_breakdown,
             "calculation_parameters": {
                 "analysis_period": {
                     "start_date": (end_date - timedelta(days=settings.metrics_rolling_period_days)).isoformat() if end_date else None,
@@ -294,13 +284,36 @@ class ScoringService:
         logger.info(
             "Trust Score leaderboard generated",
             total_analyzed=len(wallet_trades),
-            eligible_count=len(eligible_results),
+            eligible_count=accumulator.qualifying_results,
             leaderboard_size=len(leaderboard_entries),
             avg_score=statistics["trust_score_stats"]["average"]
         )
         
         return leaderboard
     
+    async def _stream_trust_scores(
+        self,
+        wallet_trades: Dict[str, List[SwapData]],
+        end_date: Optional[datetime],
+        accumulator: LeaderboardAccumulator
+    ):
+        """Feed batch scorer results into the accumulator as they are produced"""
+        if not self.scoring_engine:
+            await self.initialize()
+        
+        try:
+            async for result in self.scoring_engine.iter_batch_trust_scores(wallet_trades, end_date):
+                accumulator.add(result)
+        except Exception as e:
+            logger.error(
+                "Error in streaming Trust Score calculation",
+                error=str(e),
+                error_type=type(e).__name__,
+                results_received=accumulator.total_results
+            )
+            # Wallets the scorer never reached count as calculation errors
+            accumulator.record_failures(len(wallet_trades) - accumulator.total_results)
+    
     async def get_scoring_health(self) -> Dict[str, any]:
         """
         Get health status of scoring components
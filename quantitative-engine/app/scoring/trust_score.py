@@ -4,16 +4,17 @@ Implements the proprietary XORJ Trust Score calculation with wallet eligibility
 """
 
 import asyncio
+from itertools import islice
 from datetime import datetime, timezone, timedelta
 from decimal import Decimal, getcontext
-from typing import Dict, List, Optional, Tuple, Any
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass
 from enum import Enum
 import statistics
 
-from ..calculation.metrics import PerformanceMetrics, TradeRecord
+from ..calculation.metrics import PerformanceMetrics, MetricsEngine, TradeValuationCache
 from ..calculation.service import get_calculation_service
-from ..schemas.ingestion import RaydiumSwap
+from ..schemas.ingestion import SwapData
 from ..core.config import get_settings
 from ..core.logging import get_calculation_logger
 
@@ -68,6 +69,67 @@ class NormalizedMetrics:
     drawdown_max: Decimal
 
 
+@dataclass
+class NormalizationBounds:
+    """Running min/max of the normalized metrics across a batch of wallets"""
+    count: int = 0
+    sharpe_min: Optional[Decimal] = None
+    sharpe_max: Optional[Decimal] = None
+    roi_min: Optional[Decimal] = None
+    roi_max: Optional[Decimal] = None
+    drawdown_min: Optional[Decimal] = None
+    drawdown_max: Optional[Decimal] = None
+    
+    def add(self, metrics: PerformanceMetrics):
+        """Widen the bounds to include one wallet's metrics"""
+        if not self.count:
+            self.sharpe_min = self.sharpe_max = metrics.sharpe_ratio
+            self.roi_min = self.roi_max = metrics.net_roi_percent
+            self.drawdown_min = self.drawdown_max = metrics.maximum_drawdown_percent
+        else:
+            self.sharpe_min = min(self.sharpe_min, metrics.sharpe_ratio)
+            self.sharpe_max = max(self.sharpe_max, metrics.sharpe_ratio)
+            self.roi_min = min(self.roi_min, metrics.net_roi_percent)
+            self.roi_max = max(self.roi_max, metrics.net_roi_percent)
+            self.drawdown_min = min(self.drawdown_min, metrics.maximum_drawdown_percent)
+            self.drawdown_max = max(self.drawdown_max, metrics.maximum_drawdown_percent)
+        self.count += 1
+    
+    def normalize(self, metrics: PerformanceMetrics) -> NormalizedMetrics:
+        """Normalize one wallet's metrics to the 0.0-1.0 scale of these bounds"""
+        # Avoid division by zero
+        sharpe_range = max(self.sharpe_max - self.sharpe_min, Decimal('0.001'))
+        roi_range = max(self.roi_max - self.roi_min, Decimal('0.001'))
+        drawdown_range = max(self.drawdown_max - self.drawdown_min, Decimal('0.001'))
+        
+        # Normalize to 0.0-1.0 scale
+        normalized_sharpe = (metrics.sharpe_ratio - self.sharpe_min) / sharpe_range
+        normalized_roi = (metrics.net_roi_percent - self.roi_min) / roi_range
+        
+        # For drawdown, invert so lower drawdown = higher score
+        normalized_max_drawdown = Decimal('1.0') - ((metrics.maximum_drawdown_percent - self.drawdown_min) / drawdown_range)
+        
+        # Ensure bounds
+        normalized_sharpe = max(Decimal('0.0'), min(Decimal('1.0'), normalized_sharpe))
+        normalized_roi = max(Decimal('0.0'), min(Decimal('1.0'), normalized_roi))
+        normalized_max_drawdown = max(Decimal('0.0'), min(Decimal('1.0'), normalized_max_drawdown))
+        
+        return NormalizedMetrics(
+            normalized_sharpe=normalized_sharpe,
+            normalized_roi=normalized_roi,
+            normalized_max_drawdown=normalized_max_drawdown,
+            original_sharpe=metrics.sharpe_ratio,
+            original_roi=metrics.net_roi_percent,
+            original_max_drawdown=metrics.maximum_drawdown_percent,
+            sharpe_min=self.sharpe_min,
+            sharpe_max=self.sharpe_max,
+            roi_min=self.roi_min,
+            roi_max=self.roi_max,
+            drawdown_min=self.drawdown_min,
+            drawdown_max=self.drawdown_max
+        )
+
+
 @dataclass
 class TrustScoreResult:
     """Complete XORJ Trust Score result with breakdown"""
@@ -102,6 +164,8 @@ class XORJTrustScoreEngine:
         self.min_history_days = MIN_TRADING_DAYS
         self.min_trades = MIN_TOTAL_TRADES
         self.max_single_day_roi_spike = MAX_SINGLE_DAY_ROI_SPIKE
+        self.ranking_engine = MetricsEngine(settings.ranking_metrics_engine)
+        self.chunk_size = settings.scoring_chunk_size
         
         logger.info(
             "Initialized XORJ Trust Score Engine",
@@ -110,7 +174,8 @@ class XORJTrustScoreEngine:
             max_roi_spike=str(self.max_single_day_roi_spike),
             sharpe_weight=str(SHARPE_WEIGHT),
             roi_weight=str(ROI_WEIGHT),
-            drawdown_weight=str(DRAWDOWN_PENALTY_WEIGHT)
+            drawdown_weight=str(DRAWDOWN_PENALTY_WEIGHT),
+            ranking_engine=self.ranking_engine.value
         )
     
     async def initialize(self):
@@ -121,8 +186,9 @@ class XORJTrustScoreEngine:
     async def check_wallet_eligibility(
         self,
         wallet_address: str,
-        trades: List[RaydiumSwap],
-        metrics: Optional[PerformanceMetrics] = None
+        trades: List[SwapData],
+        metrics: Optional[PerformanceMetrics] = None,
+        valuation_cache: Optional[TradeValuationCache] = None
     ) -> Tuple[EligibilityStatus, Optional[str]]:
         """
         Check if wallet meets eligibility criteria for XORJ Trust Score
@@ -131,6 +197,7 @@ class XORJTrustScoreEngine:
             wallet_address: Wallet address to check
             trades: List of wallet's trades
             metrics: Pre-calculated performance metrics (optional)
+            valuation_cache: Per-run trade valuation cache reused by metrics calculation
             
         Returns:
             Tuple of (eligibility_status, reason)
@@ -163,7 +230,7 @@ class XORJTrustScoreEngine:
         
         # Check 3: No extreme single-day ROI spikes
         try:
-            if await self._has_extreme_roi_spikes(trades):
+            if await self._has_extreme_roi_spikes(trades, valuation_cache):
                 reason = f"Detected single-day ROI spike exceeding {self.max_single_day_roi_spike * 100}%"
                 return EligibilityStatus.EXTREME_ROI_SPIKE, reason
         except Exception as e:
@@ -183,12 +250,17 @@ class XORJTrustScoreEngine:
         
         return EligibilityStatus.ELIGIBLE, None
     
-    async def _has_extreme_roi_spikes(self, trades: List[RaydiumSwap]) -> bool:
+    async def _has_extreme_roi_spikes(
+        self,
+        trades: List[SwapData],
+        valuation_cache: Optional[TradeValuationCache] = None
+    ) -> bool:
         """
         Check for extreme single-day ROI spikes that indicate wash trading or manipulation
         
         Args:
             trades: List of trades to analyze
+            valuation_cache: Per-run trade valuation cache (filled here, reused by metrics)
             
         Returns:
             True if extreme spikes detected, False otherwise
@@ -196,33 +268,22 @@ class XORJTrustScoreEngine:
         if not self.calculation_service:
             await self.initialize()
         
+        # Value all trades in one pass (failed valuations are skipped)
+        trade_records = await self.calculation_service.calculate_trade_usd_values(trades, valuation_cache)
+        
         # Group trades by day and calculate daily P&L
         daily_pnl = {}
         
-        for trade in trades:
-            try:
-                # Calculate USD values for this trade
-                trade_record = await self.calculation_service.calculate_trade_usd_values(trade)
-                if not trade_record:
-                    continue
-                
-                trade_date = trade.block_time.date()
-                if trade_date not in daily_pnl:
-                    daily_pnl[trade_date] = {
-                        'profit': Decimal('0'),
-                        'volume': Decimal('0')
-                    }
-                
-                daily_pnl[trade_date]['profit'] += trade_record.net_profit_usd
-                daily_pnl[trade_date]['volume'] += trade_record.token_in_usd
-                
-            except Exception as e:
-                logger.warning(
-                    "Failed to process trade for ROI spike analysis",
-                    signature=trade.signature,
-                    error=str(e)
-                )
-                continue
+        for trade_record in trade_records:
+            trade_date = trade_record.timestamp.date()
+            if trade_date not in daily_pnl:
+                daily_pnl[trade_date] = {
+                    'profit': Decimal('0'),
+                    'volume': Decimal('0')
+                }
+            
+            daily_pnl[trade_date]['profit'] += trade_record.net_profit_usd
+            daily_pnl[trade_date]['volume'] += trade_record.token_in_usd
         
         # Check each day for extreme ROI spikes
         for date, data in daily_pnl.items():
@@ -260,58 +321,21 @@ class XORJTrustScoreEngine:
             wallet_count=len(metrics_list)
         )
         
-        # Extract values for normalization
-        sharpe_values = [m.sharpe_ratio for m in metrics_list]
-        roi_values = [m.net_roi_percent for m in metrics_list]
-        drawdown_values = [m.maximum_drawdown_percent for m in metrics_list]
-        
-        # Calculate min/max for normalization
-        sharpe_min, sharpe_max = min(sharpe_values), max(sharpe_values)
-        roi_min, roi_max = min(roi_values), max(roi_values)
-        drawdown_min, drawdown_max = min(drawdown_values), max(drawdown_values)
-        
-        # Avoid division by zero
-        sharpe_range = max(sharpe_max - sharpe_min, Decimal('0.001'))
-        roi_range = max(roi_max - roi_min, Decimal('0.001'))
-        drawdown_range = max(drawdown_max - drawdown_min, Decimal('0.001'))
+        bounds = NormalizationBounds()
+        for metrics in metrics_list:
+            bounds.add(metrics)
         
         normalized_results = {}
         
         for metrics in metrics_list:
-            # Normalize to 0.0-1.0 scale
-            normalized_sharpe = (metrics.sharpe_ratio - sharpe_min) / sharpe_range
-            normalized_roi = (metrics.net_roi_percent - roi_min) / roi_range
-            
-            # For drawdown, invert so lower drawdown = higher score
-            normalized_max_drawdown = Decimal('1.0') - ((metrics.maximum_drawdown_percent - drawdown_min) / drawdown_range)
-            
-            # Ensure bounds
-            normalized_sharpe = max(Decimal('0.0'), min(Decimal('1.0'), normalized_sharpe))
-            normalized_roi = max(Decimal('0.0'), min(Decimal('1.0'), normalized_roi))
-            normalized_max_drawdown = max(Decimal('0.0'), min(Decimal('1.0'), normalized_max_drawdown))
-            
             wallet_key = f"wallet_{len(normalized_results)}"  # Will be replaced with actual address
-            
-            normalized_results[wallet_key] = NormalizedMetrics(
-                normalized_sharpe=normalized_sharpe,
-                normalized_roi=normalized_roi,
-                normalized_max_drawdown=normalized_max_drawdown,
-                original_sharpe=metrics.sharpe_ratio,
-                original_roi=metrics.net_roi_percent,
-                original_max_drawdown=metrics.maximum_drawdown_percent,
-                sharpe_min=sharpe_min,
-                sharpe_max=sharpe_max,
-                roi_min=roi_min,
-                roi_max=roi_max,
-                drawdown_min=drawdown_min,
-                drawdown_max=drawdown_max
-            )
+            normalized_results[wallet_key] = bounds.normalize(metrics)
         
         logger.debug(
             "Metrics normalization completed",
-            sharpe_range=(str(sharpe_min), str(sharpe_max)),
-            roi_range=(str(roi_min), str(roi_max)),
-            drawdown_range=(str(drawdown_min), str(drawdown_max))
+            sharpe_range=(str(bounds.sharpe_min), str(bounds.sharpe_max)),
+            roi_range=(str(bounds.roi_min), str(bounds.roi_max)),
+            drawdown_range=(str(bounds.drawdown_min), str(bounds.drawdown_max))
         )
         
         return normalized_results
@@ -357,7 +381,7 @@ class XORJTrustScoreEngine:
     async def calculate_single_wallet_trust_score(
         self,
         wallet_address: str,
-        trades: List[RaydiumSwap],
+        trades: List[SwapData],
         benchmark_metrics: Optional[List[PerformanceMetrics]] = None,
         end_date: Optional[datetime] = None
     ) -> TrustScoreResult:
@@ -382,10 +406,13 @@ class XORJTrustScoreEngine:
             trade_count=len(trades)
         )
         
+        # Share trade valuations between the eligibility check and metrics calculation
+        valuation_cache = TradeValuationCache()
+        
         try:
             # Step 1: Check eligibility
             eligibility_status, eligibility_reason = await self.check_wallet_eligibility(
-                wallet_address, trades
+                wallet_address, trades, valuation_cache=valuation_cache
             )
             
             if eligibility_status != EligibilityStatus.ELIGIBLE:
@@ -399,7 +426,7 @@ class XORJTrustScoreEngine:
             
             # Step 2: Calculate performance metrics
             metrics = await self.calculation_service.calculate_wallet_performance(
-                wallet_address, trades, end_date
+                wallet_address, trades, end_date, valuation_cache=valuation_cache
             )
             
             if not metrics:
@@ -480,118 +507,128 @@ class XORJTrustScoreEngine:
     
     async def calculate_batch_trust_scores(
         self,
-        wallet_trades: Dict[str, List[RaydiumSwap]],
-        end_date: Optional[datetime] = None
+        wallet_trades: Dict[str, List[SwapData]],
+        end_date: Optional[datetime] = None,
+        valuation_cache: Optional[TradeValuationCache] = None
     ) -> Dict[str, TrustScoreResult]:
         """
         Calculate XORJ Trust Scores for multiple wallets with proper normalization
         
+        Each swap is valued once per run: eligibility checks fill the valuation cache
+        and metrics calculation reuses it. Pass a cache to share it further (for
+        example with CalculationService.get_portfolio_summary); a passed cache keeps
+        every valuation instead of being evicted chunk by chunk.
+        
         Args:
             wallet_trades: Dict mapping wallet addresses to their trades
             end_date: End date for analysis period
+            valuation_cache: Per-run trade valuation cache (a new one is created if omitted)
             
         Returns:
             Dict mapping wallet addresses to TrustScoreResult
         """
+        return {
+            result.wallet_address: result
+            async for result in self.iter_batch_trust_scores(wallet_trades, end_date, valuation_cache)
+        }
+    
+    async def iter_batch_trust_scores(
+        self,
+        wallet_trades: Dict[str, List[SwapData]],
+        end_date: Optional[datetime] = None,
+        valuation_cache: Optional[TradeValuationCache] = None
+    ) -> AsyncIterator[TrustScoreResult]:
+        """
+        Yield XORJ Trust Score results as they become available
+        
+        Eligibility and metrics are calculated over chunks of scoring_chunk_size
+        wallets. Ineligible wallets are yielded straight away; eligible wallets keep
+        only their PerformanceMetrics, which widen the running normalization bounds.
+        Once every chunk is done the kept metrics are scored against the bounds.
+        When the run owns the valuation cache, each chunk's valuations are evicted
+        as soon as the chunk is done, so the cache never holds more than one chunk.
+        
+        Args:
+            wallet_trades: Dict mapping wallet addresses to their trades
+            end_date: End date for analysis period
+            valuation_cache: Trade valuation cache to share with the caller (a run-owned,
+                chunk-evicted one is created if omitted)
+            
+        Yields:
+            One TrustScoreResult per wallet
+        """
         if not self.calculation_service:
             await self.initialize()
         
+        evict_chunks = valuation_cache is None
+        if evict_chunks:
+            valuation_cache = TradeValuationCache()
+        
         logger.info(
             "Calculating batch XORJ Trust Scores",
-            wallet_count=len(wallet_trades)
+            wallet_count=len(wallet_trades),
+            chunk_size=self.chunk_size
         )
         
-        results = {}
-        eligible_wallets = []
-        benchmark_metrics = []
-        
-        # Step 1: Check eligibility for all wallets and gather eligible ones
-        for wallet_address, trades in wallet_trades.items():
-            eligibility_status, eligibility_reason = await self.check_wallet_eligibility(
-                wallet_address, trades
-            )
-            
-            if eligibility_status == EligibilityStatus.ELIGIBLE:
-                eligible_wallets.append(wallet_address)
-            else:
-                results[wallet_address] = TrustScoreResult(
+        # Eligibility and normalization benchmarks
+        bounds = NormalizationBounds()
+        eligible_metrics: Dict[str, Optional[PerformanceMetrics]] = {}
+        async for wallet_address, status, reason, metrics in self._iter_chunk_metrics(
+            wallet_trades, end_date, valuation_cache, evict_chunks
+        ):
+            if status != EligibilityStatus.ELIGIBLE:
+                yield TrustScoreResult(
                     wallet_address=wallet_address,
                     trust_score=Decimal('0'),
-                    eligibility_status=eligibility_status,
-                    eligibility_reason=eligibility_reason,
+                    eligibility_status=status,
+                    eligibility_reason=reason,
                     calculation_timestamp=datetime.now(timezone.utc)
                 )
+                continue
+            
+            eligible_metrics[wallet_address] = metrics
+            if metrics:
+                bounds.add(metrics)
         
-        if not eligible_wallets:
+        if not eligible_metrics:
             logger.warning("No eligible wallets found for Trust Score calculation")
-            return results
-        
-        # Step 2: Calculate performance metrics for eligible wallets
-        logger.info(f"Calculating metrics for {len(eligible_wallets)} eligible wallets")
-        
-        eligible_wallet_trades = {
-            wallet: wallet_trades[wallet] for wallet in eligible_wallets
-        }
-        
-        wallet_metrics = await self.calculation_service.calculate_batch_wallet_performance(
-            eligible_wallet_trades, end_date
-        )
+            return
         
-        # Step 3: Gather metrics for normalization benchmark
-        for wallet_address in eligible_wallets:
-            metrics = wallet_metrics.get(wallet_address)
-            if metrics:
-                benchmark_metrics.append(metrics)
-        
-        if not benchmark_metrics:
+        if not bounds.count:
             logger.error("No metrics calculated for eligible wallets")
-            for wallet_address in eligible_wallets:
-                results[wallet_address] = TrustScoreResult(
-                    wallet_address=wallet_address,
-                    trust_score=Decimal('0'),
-                    eligibility_status=EligibilityStatus.CALCULATION_ERROR,
-                    eligibility_reason="Failed to calculate performance metrics",
-                    calculation_timestamp=datetime.now(timezone.utc)
-                )
-            return results
+            missing_reason = "Failed to calculate performance metrics"
+        else:
+            missing_reason = "Performance metrics not available"
         
-        # Step 4: Normalize metrics across all eligible wallets
-        normalized_metrics_dict = self.normalize_metrics(benchmark_metrics)
+        logger.info(
+            "Calculated normalization benchmarks",
+            eligible_wallets=len(eligible_metrics),
+            benchmark_wallets=bounds.count
+        )
         
-        # Step 5: Calculate Trust Scores for eligible wallets
-        metric_index = 0
-        for wallet_address in eligible_wallets:
-            metrics = wallet_metrics.get(wallet_address)
+        # Scores against the benchmarks
+        successful_scores = 0
+        for wallet_address, metrics in eligible_metrics.items():
             if not metrics:
-                results[wallet_address] = TrustScoreResult(
+                yield TrustScoreResult(
                     wallet_address=wallet_address,
                     trust_score=Decimal('0'),
                     eligibility_status=EligibilityStatus.CALCULATION_ERROR,
-                    eligibility_reason="Performance metrics not available",
+                    eligibility_reason=missing_reason,
                     calculation_timestamp=datetime.now(timezone.utc)
                 )
                 continue
             
-            # Get normalized metrics for this wallet
-            wallet_key = f"wallet_{metric_index}"
-            wallet_normalized_metrics = normalized_metrics_dict.get(wallet_key)
-            
-            if not wallet_normalized_metrics:
-                results[wallet_address] = TrustScoreResult(
-                    wallet_address=wallet_address,
-                    trust_score=Decimal('0'),
-                    eligibility_status=EligibilityStatus.CALCULATION_ERROR,
-                    eligibility_reason="Failed to normalize metrics",
-                    calculation_timestamp=datetime.now(timezone.utc)
-                )
-                continue
+            wallet_normalized_metrics = bounds.normalize(metrics)
             
             # Calculate XORJ Trust Score
             trust_score, performance_score, risk_penalty = self.calculate_xorj_trust_score(
                 wallet_normalized_metrics
             )
             
-            results[wallet_address] = TrustScoreResult(
+            successful_scores += 1
+            
+            yield TrustScoreResult(
                 wallet_address=wallet_address,
                 trust_score=trust_score,
                 eligibility_status=EligibilityStatus.ELIGIBLE,
@@ -601,20 +638,65 @@ class XORJTrustScoreEngine:
                 original_metrics=metrics,
                 calculation_timestamp=datetime.now(timezone.utc)
             )
-            
-            metric_index += 1
-        
-        successful_scores = sum(1 for result in results.values() 
-                               if result.eligibility_status == EligibilityStatus.ELIGIBLE)
         
         logger.info(
             "Batch XORJ Trust Score calculation completed",
             total_wallets=len(wallet_trades),
-            eligible_wallets=len(eligible_wallets),
-            successful_scores=successful_scores
+            eligible_wallets=len(eligible_metrics),
+            successful_scores=successful_scores,
+            **valuation_cache.get_statistics()
         )
+    
+    async def _iter_chunk_metrics(
+        self,
+        wallet_trades: Dict[str, List[SwapData]],
+        end_date: Optional[datetime],
+        valuation_cache: TradeValuationCache,
+        evict_chunks: bool = False
+    ) -> AsyncIterator[Tuple[str, EligibilityStatus, Optional[str], Optional[PerformanceMetrics]]]:
+        """
+        Yield (wallet, eligibility status, reason, metrics) chunk by chunk
         
-        return results
+        Metrics are calculated in one batch per chunk of eligible wallets and are
+        None for ineligible wallets or when calculation failed.
+        
+        Args:
+            wallet_trades: Dict mapping wallet addresses to their trades
+            end_date: End date for analysis period
+            valuation_cache: Per-run trade valuation cache
+            evict_chunks: Drop each chunk's valuations from the cache once it is done
+        """
+        wallets = iter(wallet_trades.items())
+        while True:
+            chunk = list(islice(wallets, self.chunk_size))
+            if not chunk:
+                return
+            
+            eligibility = []
+            for wallet_address, trades in chunk:
+                status, reason = await self.check_wallet_eligibility(
+                    wallet_address, trades, valuation_cache=valuation_cache
+                )
+                eligibility.append((wallet_address, status, reason))
+            
+            eligible_trades = {
+                wallet_address: wallet_trades[wallet_address]
+                for wallet_address, status, _ in eligibility
+                if status == EligibilityStatus.ELIGIBLE
+            }
+            wallet_metrics = {}
+            if eligible_trades:
+                wallet_metrics = await self.calculation_service.calculate_batch_wallet_performance(
+                    eligible_trades, end_date, self.ranking_engine, valuation_cache
+                )
+            
+            if evict_chunks:
+                valuation_cache.evict(
+                    trade.signature for _, trades in chunk for trade in trades
+                )
+            
+            for wallet_address, status, reason in eligibility:
+                yield wallet_address, status, reason, wallet_metrics.get(wallet_address)
 
 
 # Global scoring engine instance
@@ -3,23 +3,49 @@ XORJ Quantitative Engine - Celery Worker Configuration
 Configures Celery for scheduled data ingestion tasks
 """
 
-import asyncio
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
-from celery import Celery
+from typing import Any, Dict, List, Optional
+import uuid
+from celery import Celery, chord, group
 from celery.schedules import crontab
+from celery.signals import worker_process_init, worker_process_shutdown, worker_shutdown
 
+from .core.async_runtime import get_async_runtime, run_async, shutdown_async_runtime
 from .core.config import get_settings
 from .core.logging import get_worker_logger, CorrelationContext
 from .core.reliability import get_fault_tolerant_processor, ReliabilityConfig, reliable_operation
 from .core.observability import get_metrics_collector
-from .ingestion.worker import run_ingestion_for_wallets
+from .ingestion.worker import run_ingestion_for_wallets, close_ingestion_worker, save_signature_filter
+from .ingestion.solana_client import close_all_clients
+from .calculation.price_feed import close_price_feed
+from .calculation.service import close_calculation_service
+from .scoring.service import close_scoring_service
+from .database.service import close_database_service
 from .schemas.ingestion import WalletIngestionStatus
 
 settings = get_settings()
 logger = get_worker_logger()
 metrics_collector = get_metrics_collector()
 
+# NFR-1: Fault-tolerance settings (ReliabilityConfig fields) of scheduled runs, whether
+# they run in one task or as fanned-out chunks, and of manually triggered batches
+SCHEDULED_RELIABILITY = {
+    "max_retries": 2,
+    "retry_delay_seconds": 5.0,
+    "max_concurrent_wallets": 5,
+    "timeout_seconds": 120.0,  # 2 minutes per wallet
+    "circuit_breaker_threshold": 0.8,  # Stop if >80% failure rate
+    "continue_on_failure": True
+}
+BATCH_RELIABILITY = {
+    "max_retries": 2,
+    "retry_delay_seconds": 3.0,
+    "max_concurrent_wallets": 8,
+    "timeout_seconds": 90.0,
+    "circuit_breaker_threshold": 0.7,
+    "continue_on_failure": True
+}
+
 # Initialize Celery app
 celery_app = Celery(
     "xorj-quantitative-engine",
@@ -34,7 +60,7 @@ celery_app.conf.update(settings.celery_config)
 # Configure periodic tasks
 celery_app.conf.beat_schedule = {
     'scheduled-data-ingestion': {
-        'task': 'app.worker.run_scheduled_data_ingestion',
+        'task': 'app.worker.dispatch_scheduled_ingestion',
         'schedule': crontab(minute=0, hour=f'*/{settings.ingestion_schedule_hours}'),  # Every N hours
         'options': {
             'expires': 60 * 60 * 2,  # Task expires after 2 hours
@@ -61,6 +87,36 @@ celery_app.conf.beat_schedule = {
 celery_app.conf.timezone = 'UTC'
 
 
+async def close_worker_services():
+    """Close the async services tasks share within a worker process"""
+    await close_ingestion_worker()
+    await close_all_clients()
+    await close_calculation_service()
+    await close_scoring_service()
+    await close_price_feed()
+    await close_database_service()
+
+
+@worker_process_init.connect
+def start_worker_async_runtime(**kwargs):
+    """
+    Give each worker process one long-lived event loop
+    
+    Tasks run their coroutines on it (run_async), so clients, connection pools and
+    caches created by one task are reused by the next instead of being rebuilt.
+    """
+    runtime = get_async_runtime()
+    runtime.add_shutdown_hook(close_worker_services)
+    runtime.start()
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def stop_worker_async_runtime(**kwargs):
+    """Close the shared services and stop the process's event loop"""
+    shutdown_async_runtime()
+
+
 async def get_monitored_wallets() -> List[str]:
     """
     Get list of wallet addresses to monitor from live mainnet discovery
@@ -98,23 +154,31 @@ async def get_monitored_wallets() -> List[str]:
         return ["5Q544fKrFoe6tsEbD7S8EmxGTJYAKtTVhAW5Q5pge4j1"]
 
 
-async def process_single_wallet_ingestion(wallet_address: str, lookback_hours: int = None) -> WalletIngestionStatus:
+async def process_single_wallet_ingestion(
+    wallet_address: str,
+    lookback_hours: int = None,
+    use_cursors: bool = True
+) -> WalletIngestionStatus:
     """
     NFR-1: Fault-tolerant single wallet ingestion
     Processes one wallet and returns its status without affecting other wallets
     
     Args:
         wallet_address: Wallet to process
-        lookback_hours: Hours of data to ingest
+        lookback_hours: Hours of data to ingest when the wallet has no ingestion cursor
+        use_cursors: Resume from the wallet's ingestion cursor; False forces the lookback window
     
     Returns:
         WalletIngestionStatus for this specific wallet
     """
     try:
         # Run ingestion for single wallet
+        # The calling task saves the signature pre-filter once, not once per wallet
         results = await run_ingestion_for_wallets(
             [wallet_address],
-            lookback_hours=lookback_hours
+            lookback_hours=lookback_hours,
+            use_cursors=use_cursors,
+            save_signature_filter=False
         )
         
         # Return the result for this wallet
@@ -139,6 +203,74 @@ async def process_single_wallet_ingestion(wallet_address: str, lookback_hours: i
         )
 
 
+def chunk_wallets(wallet_addresses: List[str], chunk_size: Optional[int] = None) -> List[List[str]]:
+    """
+    Split a wallet set into process_wallet_batch-sized chunks
+    
+    Args:
+        wallet_addresses: Wallets to split; duplicates are dropped, order is kept
+        chunk_size: Wallets per chunk (defaults to settings.ingestion_chunk_size)
+    
+    Returns:
+        List of wallet chunks
+    """
+    chunk_size = max(1, chunk_size or settings.ingestion_chunk_size)
+    wallets = list(dict.fromkeys(wallet_addresses))
+    return [wallets[i:i + chunk_size] for i in range(0, len(wallets), chunk_size)]
+
+
+def record_ingestion_metrics(results: Dict[str, WalletIngestionStatus], duration: float):
+    """NFR-3: Record batch, per-wallet and error metrics of an ingestion run"""
+    successful_wallets = sum(1 for status in results.values() if status.success)
+    metrics_collector.record_batch_processing(duration, len(results), successful_wallets)
+    
+    for wallet, status in results.items():
+        metrics_collector.record_wallet_processing(duration / len(results), status.success)
+        if not status.success:
+            # Record errors
+            for error in status.errors:
+                if "timeout" in error.lower():
+                    metrics_collector.record_error("timeout", "ingestion")
+                elif "network" in error.lower() or "connection" in error.lower():
+                    metrics_collector.record_error("network", "ingestion")
+                else:
+                    metrics_collector.record_error("calculation", "ingestion")
+
+
+def summarize_ingestion_run(
+    task_id: str,
+    start_time: datetime,
+    end_time: datetime,
+    results: Dict[str, WalletIngestionStatus]
+) -> Dict[str, Any]:
+    """Task result of a scheduled ingestion run, whether it ran in one task or fanned out"""
+    successful_wallets = sum(1 for status in results.values() if status.success)
+    
+    return {
+        "success": True,
+        "task_id": task_id,
+        "start_time": start_time.isoformat(),
+        "end_time": end_time.isoformat(),
+        "duration_seconds": (end_time - start_time).total_seconds(),
+        "processed_wallets": len(results),
+        "successful_wallets": successful_wallets,
+        "total_swaps_extracted": sum(status.valid_swaps_extracted for status in results.values()),
+        "total_errors": sum(len(status.errors) for status in results.values()),
+        "resumed_wallets": sum(1 for status in results.values() if status.resumed_from_cursor),
+        "wallet_results": {
+            wallet: {
+                "success": status.success,
+                "transactions_found": status.total_transactions_found,
+                "swaps_extracted": status.valid_swaps_extracted,
+                "errors": len(status.errors),
+                "resumed_from_cursor": status.resumed_from_cursor,
+                "newest_slot": status.newest_slot
+            }
+            for wallet, status in results.items()
+        }
+    }
+
+
 @celery_app.task(bind=True, name="app.worker.run_scheduled_data_ingestion")
 def run_scheduled_data_ingestion(self, wallet_addresses: Optional[List[str]] = None):
     """
@@ -166,7 +298,7 @@ def run_scheduled_data_ingestion(self, wallet_addresses: Optional[List[str]] = N
         try:
             # Get wallets to monitor
             if not wallet_addresses:
-                wallet_addresses = get_monitored_wallets()
+                wallet_addresses = run_async(get_monitored_wallets())
             
             if not wallet_addresses:
                 logger.warning("No wallet addresses to process")
@@ -179,105 +311,55 @@ def run_scheduled_data_ingestion(self, wallet_addresses: Optional[List[str]] = N
             
             # NFR-1: Use fault-tolerant processing
             # Configure reliability settings for production workloads
-            reliability_config = ReliabilityConfig(
-                max_retries=2,
-                retry_delay_seconds=5.0,
-                max_concurrent_wallets=5,
-                timeout_seconds=120.0,  # 2 minutes per wallet
-                circuit_breaker_threshold=0.8,  # Stop if >80% failure rate
-                continue_on_failure=True
-            )
+            reliability_config = ReliabilityConfig(**SCHEDULED_RELIABILITY)
             
-            # Since Celery tasks can't be async, we need to run async code in event loop
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
+            # Celery tasks are synchronous; the async work runs on the worker process's event loop
+            async def run_ingestion():
+                async with reliable_operation("scheduled_data_ingestion"):
+                    # Use fault-tolerant processor
+                    processor = get_fault_tolerant_processor(reliability_config)
+                    batch_result = await processor.process_wallet_batch(
+                        wallet_addresses,
+                        process_single_wallet_ingestion,
+                        lookback_hours=settings.ingestion_schedule_hours
+                    )
+                    await save_signature_filter()
+                    return batch_result
             
-            try:
-                async def run_ingestion():
-                    async with reliable_operation("scheduled_data_ingestion"):
-                        # Use fault-tolerant processor
-                        processor = get_fault_tolerant_processor(reliability_config)
-                        batch_result = await processor.process_wallet_batch(
-                            wallet_addresses,
-                            process_single_wallet_ingestion,
-                            lookback_hours=settings.ingestion_schedule_hours
-                        )
-                        return batch_result
-                
-                batch_result = loop.run_until_complete(run_ingestion())
-                
-                # Extract results from fault-tolerant wrapper
-                results = {}
-                for wallet, proc_result in batch_result.results.items():
-                    if proc_result.result:
-                        results[wallet] = proc_result.result
-                    else:
-                        # Create failure status
-                        results[wallet] = WalletIngestionStatus(
-                            wallet_address=wallet,
-                            success=False,
-                            errors=[proc_result.error or "Unknown processing error"]
-                        )
-            finally:
-                loop.close()
+            batch_result = run_async(run_ingestion())
             
-            # Process results
-            successful_wallets = sum(1 for status in results.values() if status.success)
-            total_swaps = sum(status.valid_swaps_extracted for status in results.values())
-            total_errors = sum(len(status.errors) for status in results.values())
+            # Extract results from fault-tolerant wrapper
+            results = {}
+            for wallet, proc_result in batch_result.results.items():
+                if proc_result.result:
+                    results[wallet] = proc_result.result
+                else:
+                    # Create failure status
+                    results[wallet] = WalletIngestionStatus(
+                        wallet_address=wallet,
+                        success=False,
+                        errors=[proc_result.error or "Unknown processing error"]
+                    )
             
             end_time = datetime.utcnow()
-            duration = (end_time - start_time).total_seconds()
+            summary = summarize_ingestion_run(task_id, start_time, end_time, results)
             
             # NFR-3: Record operational metrics
-            metrics_collector.record_batch_processing(duration, len(results), successful_wallets)
-            
-            # Record wallet processing metrics
-            for wallet, status in results.items():
-                metrics_collector.record_wallet_processing(duration / len(results), status.success)
-                if not status.success:
-                    # Record errors
-                    for error in status.errors:
-                        if "timeout" in error.lower():
-                            metrics_collector.record_error("timeout", "ingestion")
-                        elif "network" in error.lower() or "connection" in error.lower():
-                            metrics_collector.record_error("network", "ingestion")
-                        else:
-                            metrics_collector.record_error("calculation", "ingestion")
+            record_ingestion_metrics(results, summary["duration_seconds"])
             
             # Log completion
             logger.info(
                 "Completed scheduled data ingestion task",
                 task_id=task_id,
-                duration_seconds=duration,
-                processed_wallets=len(results),
-                successful_wallets=successful_wallets,
-                total_swaps_extracted=total_swaps,
-                total_errors=total_errors,
-                success_rate=f"{successful_wallets/len(results):.2%}" if results else "0%"
+                duration_seconds=summary["duration_seconds"],
+                processed_wallets=summary["processed_wallets"],
+                successful_wallets=summary["successful_wallets"],
+                total_swaps_extracted=summary["total_swaps_extracted"],
+                total_errors=summary["total_errors"],
+                success_rate=f"{summary['successful_wallets']/len(results):.2%}" if results else "0%"
             )
             
-            # Return summary
-            return {
-                "success": True,
-                "task_id": task_id,
-                "start_time": start_time.isoformat(),
-                "end_time": end_time.isoformat(),
-                "duration_seconds": duration,
-                "processed_wallets": len(results),
-                "successful_wallets": successful_wallets,
-                "total_swaps_extracted": total_swaps,
-                "total_errors": total_errors,
-                "wallet_results": {
-                    wallet: {
-                        "success": status.success,
-                        "transactions_found": status.total_transactions_found,
-                        "swaps_extracted": status.valid_swaps_extracted,
-                        "errors": len(status.errors)
-                    }
-                    for wallet, status in results.items()
-                }
-            }
+            return summary
             
         except Exception as e:
             end_time = datetime.utcnow()
@@ -304,19 +386,25 @@ def process_wallet_batch(
     self, 
     wallet_addresses: List[str], 
     start_date: Optional[str] = None,
-    end_date: Optional[str] = None
+    end_date: Optional[str] = None,
+    raise_on_failure: bool = True,
+    reliability: Optional[Dict[str, Any]] = None
 ):
     """
     Celery task for processing a specific batch of wallets
-    Can be triggered manually or by other systems
+    Can be triggered manually, by other systems, or as one chunk of a fanned-out scheduled run
     
     Args:
         wallet_addresses: List of wallet addresses to process
         start_date: Optional start date (ISO format string)
         end_date: Optional end date (ISO format string)
+        raise_on_failure: Once retries are exhausted, raise (True) or return a failed
+            result (False, so the chord aggregating a fanned-out run still fires)
+        reliability: ReliabilityConfig fields (defaults to BATCH_RELIABILITY; chunks of a
+            scheduled run pass SCHEDULED_RELIABILITY)
     
     Returns:
-        Dictionary with processing results
+        Dictionary with processing results, including each wallet's serialized WalletIngestionStatus
     """
     task_id = self.request.id
     start_time = datetime.utcnow()
@@ -343,45 +431,35 @@ def process_wallet_batch(
                 lookback_hours = int((end_dt - start_dt).total_seconds() / 3600)
             
             # NFR-1: Use fault-tolerant processing for batch operations too
-            reliability_config = ReliabilityConfig(
-                max_retries=2,
-                retry_delay_seconds=3.0,
-                max_concurrent_wallets=8,
-                timeout_seconds=90.0,
-                circuit_breaker_threshold=0.7,
-                continue_on_failure=True
-            )
+            reliability_config = ReliabilityConfig(**(reliability or BATCH_RELIABILITY))
+            
+            # Run the processing on the worker process's event loop
+            async def run_batch_processing():
+                async with reliable_operation("wallet_batch_processing"):
+                    processor = get_fault_tolerant_processor(reliability_config)
+                    # An explicit date range is a backfill, so it ignores ingestion cursors
+                    batch_result = await processor.process_wallet_batch(
+                        wallet_addresses,
+                        process_single_wallet_ingestion,
+                        lookback_hours=lookback_hours,
+                        use_cursors=lookback_hours is None
+                    )
+                    await save_signature_filter()
+                    return batch_result
             
-            # Run the processing
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
+            batch_result = run_async(run_batch_processing())
             
-            try:
-                async def run_batch_processing():
-                    async with reliable_operation("wallet_batch_processing"):
-                        processor = get_fault_tolerant_processor(reliability_config)
-                        batch_result = await processor.process_wallet_batch(
-                            wallet_addresses,
-                            process_single_wallet_ingestion,
-                            lookback_hours=lookback_hours
-                        )
-                        return batch_result
-                
-                batch_result = loop.run_until_complete(run_batch_processing())
-                
-                # Extract results from fault-tolerant wrapper
-                results = {}
-                for wallet, proc_result in batch_result.results.items():
-                    if proc_result.result:
-                        results[wallet] = proc_result.result
-                    else:
-                        results[wallet] = WalletIngestionStatus(
-                            wallet_address=wallet,
-                            success=False,
-                            errors=[proc_result.error or "Unknown processing error"]
-                        )
-            finally:
-                loop.close()
+            # Extract results from fault-tolerant wrapper
+            results = {}
+            for wallet, proc_result in batch_result.results.items():
+                if proc_result.result:
+                    results[wallet] = proc_result.result
+                else:
+                    results[wallet] = WalletIngestionStatus(
+                        wallet_address=wallet,
+                        success=False,
+                        errors=[proc_result.error or "Unknown processing error"]
+                    )
             
             # Calculate metrics
             successful_wallets = sum(1 for status in results.values() if status.success)
@@ -412,6 +490,10 @@ def process_wallet_batch(
                         "errors": len(status.errors)
                     }
                     for wallet, status in results.items()
+                },
+                "statuses": {
+                    wallet: status.model_dump(mode="json")
+                    for wallet, status in results.items()
                 }
             }
             
@@ -426,9 +508,212 @@ def process_wallet_batch(
                 duration_seconds=duration
             )
             
+            if not raise_on_failure and self.request.retries >= 3:
+                return {
+                    "success": False,
+                    "task_id": task_id,
+                    "duration_seconds": duration,
+                    "wallet_addresses": wallet_addresses,
+                    "error": str(e)
+                }
+            
             raise self.retry(exc=e, countdown=60, max_retries=3)
 
 
+@celery_app.task(bind=True, name="app.worker.dispatch_scheduled_ingestion")
+def dispatch_scheduled_ingestion(
+    self,
+    wallet_addresses: Optional[List[str]] = None,
+    chunk_size: Optional[int] = None
+):
+    """
+    Celery task that fans a scheduled ingestion run out across the ingestion workers
+    
+    The wallet set is split into chunks of ingestion_chunk_size wallets, each processed
+    by its own process_wallet_batch task on the ingestion queue, so the run scales with
+    worker replicas and a slow wallet only holds up its own chunk. The chunks run as a
+    chord whose callback, aggregate_ingestion_results, combines their wallet statuses;
+    if a chunk task fails outright (a crash or its hard time limit), the chord's error
+    callback, recover_ingestion_run, aggregates the run instead. This task returns as
+    soon as the chord is dispatched.
+    
+    Args:
+        wallet_addresses: Optional list of specific wallets to process
+                         If None, will fetch from monitoring configuration
+        chunk_size: Wallets per chunk task (defaults to settings.ingestion_chunk_size)
+    
+    Returns:
+        Dictionary describing the dispatched chord
+    """
+    task_id = self.request.id
+    start_time = datetime.utcnow()
+    
+    with CorrelationContext(task_id=task_id, task_type="scheduled_ingestion_dispatch"):
+        if not wallet_addresses:
+            wallet_addresses = run_async(get_monitored_wallets())
+        
+        chunks = chunk_wallets(wallet_addresses or [], chunk_size)
+        if not chunks:
+            logger.warning("No wallet addresses to process")
+            return {
+                "success": False,
+                "error": "No wallet addresses configured for monitoring",
+                "processed_wallets": 0,
+                "task_id": task_id
+            }
+        
+        # Routed to the ingestion queue by task_routes; the chunk task ids let the error
+        # callback collect the results of the chunks that did finish
+        chunk_task_ids = [str(uuid.uuid4()) for _ in chunks]
+        header = group(
+            process_wallet_batch.s(chunk, raise_on_failure=False, reliability=SCHEDULED_RELIABILITY).set(task_id=chunk_task_id)
+            for chunk, chunk_task_id in zip(chunks, chunk_task_ids)
+        )
+        callback = aggregate_ingestion_results.s(run_id=task_id, start_time=start_time.isoformat())
+        callback.on_error(recover_ingestion_run.s(
+            chunk_task_ids=chunk_task_ids, chunks=chunks, run_id=task_id, start_time=start_time.isoformat()
+        ))
+        chord_result = chord(header)(callback)
+        
+        logger.info(
+            "Dispatched scheduled data ingestion",
+            task_id=task_id,
+            chord_id=chord_result.id,
+            wallet_count=sum(len(chunk) for chunk in chunks),
+            chunk_count=len(chunks),
+            chunk_size=len(chunks[0])
+        )
+        
+        return {
+            "success": True,
+            "task_id": task_id,
+            "chord_id": chord_result.id,
+            "dispatched_wallets": sum(len(chunk) for chunk in chunks),
+            "chunks": len(chunks)
+        }
+
+
+@celery_app.task(bind=True, name="app.worker.aggregate_ingestion_results")
+def aggregate_ingestion_results(
+    self,
+    batch_results: List[Dict[str, Any]],
+    run_id: Optional[str] = None,
+    start_time: Optional[str] = None
+):
+    """
+    Chord callback combining the chunk results of a fanned-out ingestion run
+    
+    Args:
+        batch_results: process_wallet_batch results, one per chunk
+        run_id: Task id of the dispatching task
+        start_time: When the run was dispatched (ISO format string)
+    
+    Returns:
+        Run summary in the same shape as run_scheduled_data_ingestion's
+    """
+    run_id = run_id or self.request.id
+    started = datetime.fromisoformat(start_time) if start_time else datetime.utcnow()
+    
+    with CorrelationContext(task_id=run_id, task_type="scheduled_ingestion"):
+        results: Dict[str, WalletIngestionStatus] = {}
+        failed_chunks = 0
+        
+        for batch in batch_results:
+            for wallet, status in (batch.get("statuses") or {}).items():
+                results[wallet] = WalletIngestionStatus.model_validate(status)
+            
+            if not batch.get("success"):
+                # The whole chunk failed; its wallets are reported as failed
+                failed_chunks += 1
+                for wallet in batch.get("wallet_addresses", []):
+                    results.setdefault(wallet, WalletIngestionStatus(
+                        wallet_address=wallet,
+                        success=False,
+                        errors=[f"Batch task failed: {batch.get('error') or 'unknown error'}"]
+                    ))
+        
+        summary = summarize_ingestion_run(run_id, started, datetime.utcnow(), results)
+        summary["chunks"] = len(batch_results)
+        summary["failed_chunks"] = failed_chunks
+        
+        record_ingestion_metrics(results, summary["duration_seconds"])
+        
+        logger.info(
+            "Completed scheduled data ingestion run",
+            task_id=run_id,
+            duration_seconds=summary["duration_seconds"],
+            chunks=len(batch_results),
+            failed_chunks=failed_chunks,
+            processed_wallets=summary["processed_wallets"],
+            successful_wallets=summary["successful_wallets"],
+            total_swaps_extracted=summary["total_swaps_extracted"],
+            total_errors=summary["total_errors"]
+        )
+        
+        return summary
+
+
+@celery_app.task(name="app.worker.recover_ingestion_run")
+def recover_ingestion_run(
+    request,
+    exc,
+    traceback,
+    chunk_task_ids: List[str],
+    chunks: List[List[str]],
+    run_id: Optional[str] = None,
+    start_time: Optional[str] = None
+):
+    """
+    Chord error callback of a fanned-out ingestion run
+    
+    A chunk task that crashed or hit its hard time limit fails the chord, so
+    aggregate_ingestion_results never runs. This collects every chunk's stored result,
+    reports the chunks that failed as failed batches and dispatches the aggregation.
+    
+    Args:
+        request, exc, traceback: Failure of the chord (passed by Celery)
+        chunk_task_ids: Task ids of the chunk tasks
+        chunks: Wallets of each chunk, in the same order
+        run_id: Task id of the dispatching task
+        start_time: When the run was dispatched (ISO format string)
+    
+    Returns:
+        Task id of the dispatched aggregation, or None if there was nothing to recover
+    """
+    batch_results = []
+    failed_chunks = 0
+    for chunk_task_id, chunk in zip(chunk_task_ids, chunks):
+        result = celery_app.AsyncResult(chunk_task_id)
+        if result.successful():
+            batch_results.append(result.result)
+            continue
+        
+        failed_chunks += 1
+        batch_results.append({
+            "success": False,
+            "task_id": chunk_task_id,
+            "wallet_addresses": chunk,
+            "error": f"{result.state}: {result.result!r}"
+        })
+    
+    if not failed_chunks:
+        # Every chunk finished, so the aggregation itself failed; dispatching it again would not help
+        logger.error("Scheduled data ingestion aggregation failed", task_id=run_id, error=str(exc))
+        return None
+    
+    logger.error(
+        "Scheduled data ingestion chunks failed, aggregating the run without them",
+        task_id=run_id,
+        failed_chunks=failed_chunks,
+        chunks=len(chunks),
+        error=str(exc)
+    )
+    aggregation = aggregate_ingestion_results.apply_async(
+        (batch_results,), {"run_id": run_id, "start_time": start_time}
+    )
+    return aggregation.id
+
+
 @celery_app.task(name="app.worker.health_check")
 def health_check():
     """
@@ -508,6 +793,9 @@ def debug_task(self):
 celery_app.conf.task_routes = {
     'app.worker.run_scheduled_data_ingestion': {'queue': 'ingestion'},
     'app.worker.process_wallet_batch': {'queue': 'ingestion'},
+    'app.worker.dispatch_scheduled_ingestion': {'queue': 'ingestion'},
+    'app.worker.aggregate_ingestion_results': {'queue': 'ingestion'},
+    'app.worker.recover_ingestion_run': {'queue': 'ingestion'},
     'app.worker.health_check': {'queue': 'monitoring'},
     'app.worker.debug_task': {'queue': 'testing'},
 }
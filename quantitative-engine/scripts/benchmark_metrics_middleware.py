@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Benchmark the per-request overhead of MetricsMiddleware by driving a FastAPI app through
+ASGI directly (no server or HTTP client), with and without the middleware
+
+Reports microseconds per request for the bare app, the app behind MetricsMiddleware, and
+the app behind an equivalent BaseHTTPMiddleware (path normalization, label lookups and an
+access log line on every request) for comparison.
+
+Usage: python scripts/benchmark_metrics_middleware.py [--requests 20000] [--repeat 5] [--sample-rate 0.01]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import FastAPI
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.core.logging import get_metrics_logger
+from app.core.metrics_middleware import MetricsMiddleware
+from app.core.observability import MetricsCollector
+
+WALLET = "9WzDXwBbmkg8ZTbNMqUxvQRAyrZzDsGYdLVL9zYtAWWM"
+
+
+def normalize_path(path: str) -> str:
+    """Per-request path normalization the BaseHTTPMiddleware version labelled requests with"""
+    normalized_parts = []
+    for part in path.split('?')[0].split('/'):
+        if len(part) > 20 and part.isalnum():
+            normalized_parts.append('{wallet_address}')
+        elif (len(part) == 36 and '-' in part) or part.isdigit():
+            normalized_parts.append('{id}')
+        else:
+            normalized_parts.append(part)
+    return '/'.join(normalized_parts)
+
+
+class BaseHTTPMetricsMiddleware(BaseHTTPMiddleware):
+    """Reference: the same metrics recorded the BaseHTTPMiddleware way"""
+
+    def __init__(self, app, metrics_collector: MetricsCollector):
+        super().__init__(app)
+        self.metrics_collector = metrics_collector
+        self.logger = get_metrics_logger()
+
+    async def dispatch(self, request, call_next):
+        start_time = time.perf_counter()
+        response = await call_next(request)
+        duration_seconds = time.perf_counter() - start_time
+        collector = self.metrics_collector
+        endpoint = normalize_path(request.url.path)
+        collector.prometheus_metrics['api_requests_total'].labels(
+            method=request.method, endpoint=endpoint, status_code=str(response.status_code)
+        ).inc()
+        collector.prometheus_metrics['api_request_duration_seconds'].labels(
+            method=request.method, endpoint=endpoint
+        ).observe(duration_seconds)
+        self.logger.info("API request completed", method=request.method, path=request.url.path,
+                         status_code=response.status_code, duration_ms=round(duration_seconds * 1000, 2))
+        return response
+
+
+def make_app(middleware=None, **options) -> FastAPI:
+    app = FastAPI()
+    if middleware is not None:
+        app.add_middleware(middleware, **options)
+
+    @app.get("/api/v1/wallets/{wallet_address}/score")
+    async def wallet_score(wallet_address: str):
+        return {"wallet": wallet_address, "trust_score": 87.5}
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok"}
+
+    return app
+
+
+def make_scope(path: str):
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"benchmark")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("benchmark", 80)
+    }
+
+
+def make_receive():
+    """The request body once, then (like a server) nothing until the client disconnects"""
+    messages = [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive():
+        if messages:
+            return messages.pop()
+        await asyncio.get_running_loop().create_future()
+
+    return receive
+
+
+async def send(message):
+    pass
+
+
+async def time_requests(app, paths, requests: int) -> float:
+    """Seconds per request, averaged over `requests` calls cycling through `paths`"""
+    # Warm up: build the middleware stack, route tables and label children
+    for path in paths:
+        await app(make_scope(path), make_receive(), send)
+
+    started = time.perf_counter()
+    for i in range(requests):
+        await app(make_scope(paths[i % len(paths)]), make_receive(), send)
+    return (time.perf_counter() - started) / requests
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--requests", type=int, default=20000)
+    arg_parser.add_argument("--repeat", type=int, default=5, help="Best of this many runs is reported")
+    arg_parser.add_argument("--sample-rate", type=float, default=0.01, help="Access log sample rate")
+    args = arg_parser.parse_args()
+
+    # Log lines go through the application's logging pipeline but are not written to the terminal
+    devnull = open(os.devnull, "w")
+    for handler in logging.getLogger().handlers:
+        handler.setStream(devnull)
+
+    paths = [f"/api/v1/wallets/{WALLET[:-2]}{i:02d}/score" for i in range(50)] + ["/health"]
+
+    with patch('app.core.observability.DATADOG_AVAILABLE', False), \
+         patch('app.core.system_sampler.SystemMetricsSampler.start'):
+        apps = {
+            "bare app": make_app(),
+            "MetricsMiddleware (ASGI)": make_app(
+                MetricsMiddleware,
+                metrics_collector=MetricsCollector(enable_prometheus=True, enable_datadog=False),
+                access_log_sample_rate=args.sample_rate
+            ),
+            "BaseHTTPMiddleware reference": make_app(
+                BaseHTTPMetricsMiddleware,
+                metrics_collector=MetricsCollector(enable_prometheus=True, enable_datadog=False)
+            )
+        }
+
+        results = {}
+        for name, app in apps.items():
+            results[name] = min(
+                asyncio.run(time_requests(app, paths, args.requests)) for _ in range(args.repeat)
+            )
+
+    bare = results["bare app"]
+    print(f"{args.requests} requests x {args.repeat} runs (best), access log sample rate {args.sample_rate}")
+    for name, seconds in results.items():
+        overhead = "" if name == "bare app" else f"  overhead {(seconds - bare) * 1e6:7.1f} us"
+        print(f"{name:30s} {seconds * 1e6:8.1f} us/request{overhead}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Benchmark RaydiumTransactionParser throughput on a synthetic corpus of recorded-style
+getTransaction payloads, as JSON dicts and as the solders objects EnhancedSolanaClient returns
+
+With --baseline, the same corpus is also parsed by the app/ package of an earlier git
+revision (exported to a temporary directory and run in a subprocess) for a before/after.
+
+Usage: python scripts/benchmark_raydium_parser.py [--transactions 5000] [--repeat 3] [--baseline REF]
+"""
+
+import argparse
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+from solders.pubkey import Pubkey
+from solders.signature import Signature
+from solders.transaction_status import EncodedConfirmedTransactionWithStatusMeta
+
+RAYDIUM = "675kPX9MHTjS2zt1qfr1NYHuzeLXfQM9H24wFSUt1Mp8"
+TOKEN_PROGRAM = "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA"
+COMPUTE_BUDGET = "ComputeBudget111111111111111111111111111111"
+SOL = "So11111111111111111111111111111111111111112"
+USDC = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"
+
+
+def token_balance(index, mint, owner, raw_amount, decimals):
+    return {
+        "accountIndex": index,
+        "mint": mint,
+        "owner": owner,
+        "programId": TOKEN_PROGRAM,
+        "uiTokenAmount": {
+            "amount": str(raw_amount),
+            "decimals": decimals,
+            "uiAmount": raw_amount / 10 ** decimals,
+            "uiAmountString": str(raw_amount / 10 ** decimals)
+        }
+    }
+
+
+def make_transaction(index: int, wallet: str):
+    """A jsonParsed SOL -> USDC Raydium swap shaped like a mainnet getTransaction result"""
+    keys = [wallet] + [str(Pubkey.new_unique()) for _ in range(14)] + [RAYDIUM, TOKEN_PROGRAM, COMPUTE_BUDGET]
+    pool_authority = keys[5]
+    signature = str(Signature.new_unique())
+    sol_in = 1_000_000_000 + index
+    usdc_out = 150_000_000 + index
+
+    return signature, {
+        "slot": 250_000_000 + index,
+        "blockTime": 1_700_000_000 + index,
+        "transaction": {
+            "signatures": [signature],
+            "message": {
+                "accountKeys": [
+                    {"pubkey": key, "writable": i < 15, "signer": i == 0, "source": "transaction"}
+                    for i, key in enumerate(keys)
+                ],
+                "recentBlockhash": str(Pubkey.new_unique()),
+                "instructions": [
+                    {"programId": COMPUTE_BUDGET, "accounts": [], "data": "3DTZbgwsozUF", "stackHeight": None},
+                    {"programId": RAYDIUM, "accounts": keys[1:12], "data": "6AuM4xMCPFhR", "stackHeight": None}
+                ]
+            }
+        },
+        "meta": {
+            "err": None,
+            "status": {"Ok": None},
+            "fee": 5000,
+            "preBalances": [2_039_280] * len(keys),
+            "postBalances": [2_039_280] * len(keys),
+            "innerInstructions": [],
+            "logMessages": ["Program log: ray_log: A0BCDE"] * 8,
+            "preTokenBalances": [
+                token_balance(1, SOL, wallet, 5_000_000_000, 9),
+                token_balance(2, USDC, wallet, 100_000_000, 6),
+                token_balance(3, SOL, pool_authority, 900_000_000_000, 9),
+                token_balance(4, USDC, pool_authority, 90_000_000_000, 6)
+            ],
+            "postTokenBalances": [
+                token_balance(1, SOL, wallet, 5_000_000_000 - sol_in, 9),
+                token_balance(2, USDC, wallet, 100_000_000 + usdc_out, 6),
+                token_balance(3, SOL, pool_authority, 900_000_000_000 + sol_in, 9),
+                token_balance(4, USDC, pool_authority, 90_000_000_000 - usdc_out, 6)
+            ],
+            "rewards": [],
+            "loadedAddresses": {"writable": [], "readonly": []},
+            "computeUnitsConsumed": 31_000
+        }
+    }
+
+
+def make_transfer(index: int, wallet: str):
+    """A plain SPL token transfer, the kind of wallet activity the parser has to reject"""
+    signature, transaction = make_transaction(index, wallet)
+    message = transaction["transaction"]["message"]
+    message["accountKeys"] = message["accountKeys"][:4] + message["accountKeys"][-2:]
+    message["instructions"] = [{
+        "program": "spl-token",
+        "programId": TOKEN_PROGRAM,
+        "parsed": {"type": "transfer", "info": {"amount": "1000000", "authority": wallet}},
+        "stackHeight": None
+    }]
+    transaction["meta"]["logMessages"] = transaction["meta"]["logMessages"][:3]
+    return signature, transaction
+
+
+def build_corpus(count: int, swap_share: float):
+    """(wallet, [(signature, transaction), ...]) with swap_share of the transactions being swaps"""
+    rng = random.Random(7)
+    wallet = str(Pubkey.new_unique())
+    transactions = []
+    for i in range(count):
+        make = make_transaction if rng.random() < swap_share else make_transfer
+        transactions.append(make(i, wallet))
+    return wallet, transactions
+
+
+def export_app(ref: str, target_dir: str):
+    """Write the app/ package as of a git revision into target_dir"""
+    archive = subprocess.run(
+        ["git", "archive", "--format=tar", ref, "app"], cwd=PROJECT_DIR, check=True, capture_output=True
+    ).stdout
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        tar.extractall(target_dir)
+
+
+def run(parser, corpus, repeat: int):
+    best = float("inf")
+    parsed = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parsed = len(parser.parse_multiple_swaps(corpus))
+        best = min(best, time.perf_counter() - start)
+    return parsed, best
+
+
+def benchmark(wallet, transactions, repeat: int, label: str):
+    """Parse the corpus as dicts and as solders objects with the app package on sys.path"""
+    from app.ingestion.raydium_parser import RaydiumTransactionParser
+
+    dict_corpus = [(transaction, signature, wallet) for signature, transaction in transactions]
+    solders_corpus = [
+        (EncodedConfirmedTransactionWithStatusMeta.from_json(json.dumps(transaction)), signature, wallet)
+        for signature, transaction in transactions
+    ]
+
+    parser = RaydiumTransactionParser()
+    for name, corpus in (("dict", dict_corpus), ("solders", solders_corpus)):
+        parsed, seconds = run(parser, corpus, repeat)
+        print(
+            f"{label:10s} {name:8s} {len(corpus)} transactions  parsed={parsed:6d}  "
+            f"best={seconds:.3f}s  {len(corpus) / seconds:,.0f} tx/s",
+            flush=True
+        )
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--transactions", type=int, default=5000)
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    arg_parser.add_argument("--swap-share", type=float, default=0.5, help="Fraction of transactions that are swaps")
+    arg_parser.add_argument("--baseline", help="Git revision whose parser also parses the same corpus")
+    arg_parser.add_argument("--corpus", help=argparse.SUPPRESS)  # Saved corpus (baseline subprocess)
+    arg_parser.add_argument("--app-dir", default=PROJECT_DIR, help=argparse.SUPPRESS)
+    arg_parser.add_argument("--label", default="current", help=argparse.SUPPRESS)
+    args = arg_parser.parse_args()
+
+    sys.path.insert(0, args.app_dir)
+
+    if args.corpus:
+        with open(args.corpus) as f:
+            saved = json.load(f)
+        benchmark(saved["wallet"], saved["transactions"], args.repeat, args.label)
+        return
+
+    wallet, transactions = build_corpus(args.transactions, args.swap_share)
+    if args.baseline:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            corpus_path = os.path.join(tmp_dir, "corpus.json")
+            with open(corpus_path, "w") as f:
+                json.dump({"wallet": wallet, "transactions": transactions}, f)
+            export_app(args.baseline, tmp_dir)
+            subprocess.run([
+                sys.executable, os.path.abspath(__file__), "--corpus", corpus_path, "--app-dir", tmp_dir,
+                "--repeat", str(args.repeat), "--label", args.baseline[:10]
+            ], cwd=PROJECT_DIR, check=True)
+
+    benchmark(wallet, transactions, args.repeat, args.label)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Verify the audit log history: checksum chains, signed checkpoints and the links between files
+
+Resumes from the checkpoints verified by the previous run, so a daily run only checks
+what was written since. Exits non-zero if any violation is found.
+
+Usage: python scripts/verify_audit_logs.py [--audit-dir /app/audit] [--workers 8] [--full]
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.audit_verifier import verify_audit_history
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--audit-dir", default="/app/audit")
+    arg_parser.add_argument("--workers", type=int, default=None, help="Verification processes (default: one per CPU)")
+    arg_parser.add_argument("--full", action="store_true", help="Ignore saved resume points and verify everything")
+    args = arg_parser.parse_args()
+
+    report = verify_audit_history(args.audit_dir, workers=args.workers, full=args.full)
+
+    print(json.dumps(report.to_dict(), indent=2))
+    for error in report.errors:
+        print(error, file=sys.stderr)
+    sys.exit(0 if report.ok else 1)
+
+
+if __name__ == "__main__":
+    main()
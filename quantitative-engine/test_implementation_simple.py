@@ -36,20 +36,18 @@ async def test_implementation():
         print(f"   num_samples_per_day: {settings.num_samples_per_day}")
         print("   ✅ Configuration values loaded correctly")
         
-        print(f"\n📊 Pre-flight Check Test:")
+        print(f"\n📊 Backfill Plan Test:")
         end_date = datetime.now(timezone.utc)
         start_date = end_date - timedelta(days=90)
         
-        # Test pre-flight estimation
-        estimated_count = await worker.estimate_transaction_count(
-            high_volume_wallet, start_date, end_date
-        )
+        # Test backfill planning
+        plan = await worker.plan_backfill(high_volume_wallet, start_date, end_date)
         
         print(f"   Wallet: {high_volume_wallet}")
-        print(f"   Estimated count: {estimated_count:,}")
+        print(f"   Signatures scanned: {plan.histogram.total:,}")
         print(f"   Threshold: {settings.transaction_threshold:,}")
         
-        if estimated_count > settings.transaction_threshold:
+        if plan.method == "SAMPLED":
             print("   ✅ High-volume wallet correctly identified")
             print("   ✅ Would trigger sampling strategy")
         else:
@@ -74,12 +72,12 @@ async def test_implementation():
             await conn.close()
         
         print(f"\n🎯 IMPLEMENTATION STATUS:")
-        print(f"   ✅ Step 1: Pre-flight transaction count check - IMPLEMENTED")
+        print(f"   ✅ Step 1: Single-pass backfill planning - IMPLEMENTED")
         print(f"   ✅ Step 2: Conditional logic for TRANSACTION_THRESHOLD - IMPLEMENTED")
         print(f"   ✅ Step 3: Sampling backfill algorithm - IMPLEMENTED") 
         print(f"   ✅ Step 4: Database ingestion_method column - IMPLEMENTED")
         
-        if estimated_count > settings.transaction_threshold:
+        if plan.method == "SAMPLED":
             print(f"   ✅ Validation: Real high-volume wallet triggers sampling")
         
         print(f"\n🚀 READY FOR PRODUCTION VALIDATION!")
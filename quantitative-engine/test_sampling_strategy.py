@@ -40,15 +40,13 @@ async def test_sampling_strategy():
         end_date = datetime.now(timezone.utc)
         start_date = end_date - timedelta(days=90)
         
-        # Test pre-flight check
-        estimated_count = await worker.estimate_transaction_count(
-            high_volume_wallet, start_date, end_date
-        )
+        # Test the backfill plan
+        plan = await worker.plan_backfill(high_volume_wallet, start_date, end_date)
         
-        print(f"Estimated transaction count: {estimated_count}")
+        print(f"Signatures scanned: {plan.histogram.total} in {plan.pages} pages")
         print(f"Transaction threshold: {settings.transaction_threshold}")
         
-        if estimated_count > settings.transaction_threshold:
+        if plan.method == "SAMPLED":
             print("✅ PASS: High-volume wallet correctly identified")
             print(f"   Expected sampling strategy to be triggered")
             
@@ -79,30 +77,28 @@ async def test_sampling_strategy():
         print(f"Wallet: {low_volume_wallet}")
         print(f"Expected: Full strategy (<{settings.transaction_threshold} transactions)")
         
-        # Test pre-flight check for mock wallet (will likely return 0 or error)
-        estimated_count_low = await worker.estimate_transaction_count(
-            low_volume_wallet, start_date, end_date
-        )
+        # Test the backfill plan for the mock wallet (will likely find no signatures)
+        plan_low = await worker.plan_backfill(low_volume_wallet, start_date, end_date)
         
-        print(f"Estimated transaction count: {estimated_count_low}")
+        print(f"Signatures scanned: {plan_low.histogram.total} in {plan_low.pages} pages")
         print(f"Transaction threshold: {settings.transaction_threshold}")
         
-        if estimated_count_low <= settings.transaction_threshold:
+        if plan_low.method == "FULL":
             print("✅ PASS: Low-volume wallet correctly identified")
             print(f"   Expected full backfill strategy to be triggered")
         else:
-            print("⚠️  WARNING: Mock wallet estimated as high-volume (expected for error case)")
+            print("⚠️  WARNING: Mock wallet planned as high-volume")
         
         print("\n" + "="*50)
         print("🎯 VALIDATION SUMMARY:")
         print(f"   ✅ Configuration: transaction_threshold = {settings.transaction_threshold}")
         print(f"   ✅ Configuration: num_samples_per_day = {settings.num_samples_per_day}")
         print(f"   ✅ Database: ingestion_method column added")
-        print(f"   ✅ Pre-flight check: estimate_transaction_count() implemented")
+        print(f"   ✅ Backfill planning: plan_backfill() implemented")
         print(f"   ✅ Sampling logic: execute_sampling_backfill() implemented")
         print(f"   ✅ Conditional logic: High/low volume detection working")
         
-        if estimated_count > settings.transaction_threshold:
+        if plan.method == "SAMPLED":
             print(f"   ✅ Real-world validation: High-volume wallet triggers sampling")
         
         print(f"\n🚀 Implementation is ready for production!")
@@ -0,0 +1,76 @@
+"""
+XORJ Quantitative Engine - Ingestion Test Fakes
+Solana client, parser and worker factory shared by the DataIngestionWorker tests
+"""
+
+import asyncio
+from types import SimpleNamespace
+from typing import Callable, List
+
+from app.ingestion.raydium_parser import SwapParseResult
+from app.ingestion.signature_filter import SignatureFilter
+from app.ingestion.worker import DataIngestionWorker
+
+
+class PagingSolanaClient:
+    """Pages a fixed history newest first with `before` / `until` and serves every transaction"""
+
+    def __init__(self, signatures: List[SimpleNamespace]):
+        self.signatures = list(signatures)
+        self.signature_requests = 0
+        self.fetched = []
+        self.calls = []  # "signatures" and "transactions" in the order they were made
+
+    async def get_transaction_signatures(self, wallet_address, before=None, until=None, limit=1000):
+        self.signature_requests += 1
+        self.calls.append("signatures")
+        await asyncio.sleep(0)
+        names = [sig.signature for sig in self.signatures]
+        start = names.index(before) + 1 if before else 0
+        end = names.index(until) if until else len(names)
+        return self.signatures[start:end][:limit]
+
+    async def get_multiple_transactions(self, signatures, batch_size=100):
+        self.calls.append("transactions")
+        self.fetched.extend(signatures)
+        return [{"signature": sig} for sig in signatures]
+
+
+class StubSwapParser:
+    """Turns the transactions whose signature `is_swap` accepts into swaps; the rest are non-swaps"""
+
+    def __init__(self, is_swap: Callable[[str], bool] = lambda signature: True):
+        self.is_swap = is_swap
+
+    def parse_swap_batch(self, transactions):
+        result = SwapParseResult([], [])
+        for _, signature, _ in transactions:
+            if self.is_swap(signature):
+                result.swaps.append(SimpleNamespace(signature=signature))
+            else:
+                result.non_swaps.append(signature)
+        return result
+
+    def validate_swap_data(self, swap):
+        return []
+
+    def shutdown_process_pool(self):
+        pass
+
+
+def signature_index(signature: str) -> int:
+    """Number after the prefix of a `sig_<n>` test signature"""
+    return int(signature.split("_")[1])
+
+
+def make_worker(client, parser=None, streaming: bool = True, batch_size: int = 50, **kwargs) -> DataIngestionWorker:
+    """DataIngestionWorker over fakes with a fresh, memory-only signature filter unless one is given"""
+    kwargs.setdefault("signature_filter", SignatureFilter(path=""))
+    return DataIngestionWorker(
+        solana_client=client,
+        parser=parser if parser is not None else StubSwapParser(),
+        batch_size=batch_size,
+        max_transactions_per_wallet=100000,
+        streaming=streaming,
+        **kwargs
+    )
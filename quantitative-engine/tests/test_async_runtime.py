@@ -0,0 +1,95 @@
+"""
+XORJ Quantitative Engine - Worker Async Runtime Tests
+Unit tests for the per-process event loop Celery tasks run their coroutines on
+"""
+
+import asyncio
+import pytest
+
+from app.core import async_runtime as async_runtime_module
+from app.core.async_runtime import AsyncRuntime
+
+
+@pytest.fixture
+def runtime():
+    runtime = AsyncRuntime("test-runtime")
+    yield runtime
+    runtime.stop()
+
+
+class TestAsyncRuntime:
+    """Running coroutines from synchronous code"""
+
+    def test_loop_and_loop_bound_objects_survive_between_calls(self, runtime):
+        async def create_client():
+            # Stands in for an httpx/Solana client: its locks and pools belong to the loop
+            return asyncio.get_running_loop(), asyncio.Queue()
+
+        loop, queue = runtime.run(create_client())
+
+        async def use_client():
+            await queue.put("warm")
+            return asyncio.get_running_loop(), await queue.get()
+
+        assert runtime.run(use_client()) == (loop, "warm")
+        assert runtime.loop is loop
+
+    def test_exceptions_and_timeouts(self, runtime):
+        async def fail():
+            raise ValueError("rpc error")
+
+        with pytest.raises(ValueError, match="rpc error"):
+            runtime.run(fail())
+
+        cancelled = asyncio.Event()
+
+        async def hang():
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        with pytest.raises(asyncio.TimeoutError):
+            runtime.run(hang(), timeout=0.05)
+        runtime.run(asyncio.wait_for(cancelled.wait(), 1))  # The abandoned coroutine was cancelled
+
+    def test_stop_runs_shutdown_hooks_on_the_loop(self, runtime):
+        closed = []
+
+        async def close_clients():
+            closed.append(asyncio.get_running_loop())
+
+        runtime.add_shutdown_hook(close_clients)
+        runtime.add_shutdown_hook(close_clients)  # Registered once
+        runtime.start()
+        loop = runtime.loop
+
+        runtime.stop()
+
+        assert closed == [loop]
+        assert not runtime.running and loop.is_closed()
+
+        # Restartable, e.g. by a task in a recycled process
+        assert runtime.run(asyncio.sleep(0, result=42)) == 42
+
+    def test_inherited_runtime_restarts_after_fork(self, runtime, monkeypatch):
+        runtime.start()
+        parent_loop = runtime.loop
+        real_pid = async_runtime_module.os.getpid()
+        monkeypatch.setattr(async_runtime_module.os, "getpid", lambda: real_pid + 1)
+
+        # The child sees the parent's loop object, but not its thread
+        assert not runtime.running
+
+        async def current_loop():
+            return asyncio.get_running_loop()
+
+        assert runtime.run(current_loop()) is not parent_loop
+
+        runtime.stop()
+        parent_loop.call_soon_threadsafe(parent_loop.stop)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
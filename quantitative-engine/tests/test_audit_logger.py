@@ -0,0 +1,321 @@
+"""
+XORJ Quantitative Engine - Audit Logger Tests
+Unit tests for the group-committed, checksum-chained audit log writer
+"""
+
+import asyncio
+import json
+import threading
+import time
+import uuid
+import pytest
+from datetime import datetime, timezone
+
+from app.core import audit_logger as audit_logger_module
+from app.core.audit_logger import AuditEvent, AuditEventType, AuditLevel, AuditLogger
+from app.core.audit_verifier import STATE_FILE_NAME, verify_audit_file, verify_audit_history
+
+KEY = b"test-checkpoint-key"
+
+
+def make_event(index: int) -> AuditEvent:
+    return AuditEvent(
+        event_id=str(uuid.uuid4()),
+        event_type=AuditEventType.API_ACCESS,
+        level=AuditLevel.INFO,
+        timestamp=datetime.now(timezone.utc).isoformat(),
+        component="api_gateway",
+        message=f"GET /health - {index}",
+        details={"index": index}
+    )
+
+
+@pytest.fixture
+def audit_logger(tmp_path):
+    audit_logger = AuditLogger(
+        audit_dir=str(tmp_path), flush_interval_ms=20, max_batch_events=500, checkpoint_interval=0
+    )
+    yield audit_logger
+    audit_logger.close()
+
+
+def read_lines(audit_logger):
+    with open(audit_logger._current_file, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+class TestGroupCommit:
+    """Queued events, batched writes and chained checksums"""
+
+    @pytest.mark.asyncio
+    async def test_events_are_batched_and_chained_in_order(self, audit_logger, monkeypatch):
+        fsyncs = []
+        real_fsync = audit_logger_module.os.fsync
+        monkeypatch.setattr(audit_logger_module.os, "fsync", lambda fd: (fsyncs.append(fd), real_fsync(fd)))
+
+        results = await asyncio.gather(*(audit_logger.log_event(make_event(i)) for i in range(2000)))
+        assert all(results)
+        assert audit_logger.flush(timeout=10)
+
+        lines = read_lines(audit_logger)
+        assert [line["details"]["index"] for line in lines] == list(range(2000))
+        assert lines[0]["previous_checksum"] == ""
+        assert all(line["previous_checksum"] == previous["checksum"] for previous, line in zip(lines, lines[1:]))
+        assert audit_logger.verify_integrity()
+
+        statistics = audit_logger.get_statistics()
+        assert statistics["events_written"] == 2000
+        # One fsync per batch, not per event
+        assert len(fsyncs) == statistics["batches_committed"] <= 2000 // 500 + 1
+        assert statistics["largest_batch"] == 500
+
+    @pytest.mark.asyncio
+    async def test_log_event_does_not_wait_for_the_disk(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(audit_logger_module.os, "fsync", lambda fd: time.sleep(0.5))
+        audit_logger = AuditLogger(audit_dir=str(tmp_path), flush_interval_ms=0, checkpoint_interval=0)
+        try:
+            started = time.perf_counter()
+            for i in range(1000):
+                assert await audit_logger.log_event(make_event(i))
+            assert time.perf_counter() - started < 0.5
+        finally:
+            audit_logger.close()
+
+        # Close drains the queue
+        assert len(read_lines(audit_logger)) == 1000
+
+    @pytest.mark.asyncio
+    async def test_durable_callers_wait_for_their_batch(self, audit_logger):
+        await audit_logger.log_event(make_event(0))
+        assert await audit_logger.log_event(make_event(1), durable=True)
+
+        # Both events are on disk once the durable call returns, without a flush
+        assert [line["details"]["index"] for line in read_lines(audit_logger)] == [0, 1]
+
+    @pytest.mark.asyncio
+    async def test_dict_events_and_failures(self, audit_logger, monkeypatch):
+        event = make_event(0).__dict__
+        assert await audit_logger.log_event(dict(event), durable=True)
+
+        def failing_fsync(fd):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(audit_logger_module.os, "fsync", failing_fsync)
+        assert not await audit_logger.log_event(make_event(1), durable=True)
+        monkeypatch.undo()
+
+        # The chain continues from the last event known to be on disk
+        assert await audit_logger.log_event(make_event(2), durable=True)
+        assert audit_logger.get_statistics()["events_failed"] == 1
+        assert [line["details"]["index"] for line in read_lines(audit_logger)] == [0, 2]
+        assert audit_logger.verify_integrity()
+
+        audit_logger.close()
+        assert not await audit_logger.log_event(make_event(3))
+
+
+class TestQueueLimits:
+    """Bounded queue and writer thread failures"""
+
+    @pytest.mark.asyncio
+    async def test_full_queue_waits_then_fails(self, tmp_path, monkeypatch):
+        committing, release = threading.Event(), threading.Event()
+        real_fsync = audit_logger_module.os.fsync
+
+        def stuck_fsync(fd):
+            committing.set()
+            release.wait(10)
+            real_fsync(fd)
+
+        monkeypatch.setattr(audit_logger_module.os, "fsync", stuck_fsync)
+        audit_logger = AuditLogger(
+            audit_dir=str(tmp_path), flush_interval_ms=0, max_batch_events=1, checkpoint_interval=0,
+            max_pending_events=2, enqueue_timeout=0.2
+        )
+        try:
+            assert await audit_logger.log_event(make_event(0))
+            assert await asyncio.to_thread(committing.wait, 5)  # The writer is stuck committing event 0
+            assert await audit_logger.log_event(make_event(1))
+            assert await audit_logger.log_event(make_event(2))
+
+            started = time.perf_counter()
+            assert not await audit_logger.log_event(make_event(3))
+            assert time.perf_counter() - started >= 0.2
+            assert audit_logger.get_statistics()["events_rejected"] == 1
+
+            # A caller waiting for room gets in once the writer catches up
+            audit_logger.enqueue_timeout = 5
+            waiting = asyncio.ensure_future(audit_logger.log_event(make_event(4), durable=True))
+            await asyncio.sleep(0.05)
+            assert not waiting.done()
+            release.set()
+            assert await waiting
+        finally:
+            release.set()
+            audit_logger.close()
+
+        assert [line["details"]["index"] for line in read_lines(audit_logger)] == [0, 1, 2, 4]
+
+    @pytest.mark.asyncio
+    async def test_dead_writer_fails_its_events_and_is_restarted(self, audit_logger, monkeypatch):
+        def crash(batch):
+            raise SystemError("writer bug")
+
+        monkeypatch.setattr(audit_logger, "_commit_batch", crash)
+        assert not await audit_logger.log_event(make_event(0), durable=True)
+        assert audit_logger.flush(timeout=5)  # Failed events count as processed, flush does not hang
+        monkeypatch.undo()
+
+        assert await audit_logger.log_event(make_event(1), durable=True)
+        statistics = audit_logger.get_statistics()
+        assert statistics["writer_restarts"] == 1
+        assert statistics["events_failed"] == 1
+        assert [line["details"]["index"] for line in read_lines(audit_logger)] == [1]
+
+
+async def write_history(audit_dir, files, events_per_file, checkpoint_interval=100):
+    """Audit files written by successive logger instances (restarts)"""
+    for f in range(files):
+        audit_logger = AuditLogger(
+            audit_dir=str(audit_dir), flush_interval_ms=0, checkpoint_interval=checkpoint_interval, checkpoint_key=KEY
+        )
+        for i in range(events_per_file):
+            await audit_logger.log_event(make_event(f * events_per_file + i))
+        audit_logger.close()
+    return sorted(audit_dir.glob("audit_*.jsonl"))
+
+
+def tamper(path, old, new):
+    data = path.read_bytes()
+    assert old in data
+    path.write_bytes(data.replace(old, new, 1))
+
+
+class TestCheckpointedVerification:
+    """Signed checkpoints, range-parallel verification and resume"""
+
+    @pytest.mark.asyncio
+    async def test_checkpoints_are_written_and_files_linked(self, tmp_path):
+        paths = await write_history(tmp_path, files=2, events_per_file=250)
+
+        for path in paths:
+            records = [json.loads(line) for line in path.read_text().splitlines()]
+            checkpoints = [record for record in records if record.get("record_type") == "checkpoint"]
+            # Opening, every 100 events, and the closing seal
+            assert [checkpoint["events"] for checkpoint in checkpoints] == [0, 100, 200, 250]
+            assert records[0]["record_type"] == "checkpoint" and records[-1]["record_type"] == "checkpoint"
+
+        first_end = json.loads(paths[0].read_text().splitlines()[-1])["chain"]
+        assert json.loads(paths[1].read_text().splitlines()[0])["chain"] == first_end
+
+        # Small ranges: most of them start at a checkpoint in the middle of the file
+        result = verify_audit_file(paths[0], key=KEY, workers=1, chunk_bytes=4096)
+        assert result.ok and result.events == result.events_verified == 250
+        assert result.checkpoints == 4
+
+        report = verify_audit_history(tmp_path, key=KEY, workers=1, chunk_bytes=4096)
+        assert report.ok and report.to_dict()["events"] == 500
+
+    @pytest.mark.asyncio
+    async def test_tampering_is_detected(self, tmp_path):
+        paths = await write_history(tmp_path, files=2, events_per_file=250)
+
+        tamper(paths[0], b'"index":150}', b'"index":151}')
+        result = verify_audit_file(paths[0], key=KEY, workers=1, chunk_bytes=4096)
+        assert not result.ok and "checksum mismatch" in result.errors[0]
+
+        # Forged checkpoints fail their signature
+        assert not verify_audit_file(paths[1], key=b"other-key", workers=1).ok
+
+        # Dropping a whole file breaks the link to the next one
+        paths = await write_history(tmp_path, files=1, events_per_file=10)
+        paths[1].unlink()
+        report = verify_audit_history(tmp_path, key=KEY, workers=1)
+        assert [result.ok for result in report.files] == [False, False]
+        assert "does not continue" in report.files[1].errors[0]
+
+    @pytest.mark.asyncio
+    async def test_verification_resumes_from_the_last_checkpoint(self, tmp_path):
+        await write_history(tmp_path, files=2, events_per_file=250)
+
+        first = verify_audit_history(tmp_path, key=KEY, workers=1)
+        assert first.ok and first.to_dict()["events_verified"] == 500
+        assert len(json.loads((tmp_path / STATE_FILE_NAME).read_text())) == 2
+
+        # Sealed files are not read again
+        again = verify_audit_history(tmp_path, key=KEY, workers=1)
+        assert again.ok and again.to_dict()["events_verified"] == 0
+        assert again.to_dict()["files_resumed"] == 2
+
+        # Only new files are verified, and linked to the verified ones
+        await write_history(tmp_path, files=1, events_per_file=50)
+        incremental = verify_audit_history(tmp_path, key=KEY, workers=1)
+        assert incremental.ok and incremental.to_dict()["events_verified"] == 50
+
+        # A verified checkpoint that changed afterwards invalidates the resume point
+        path = sorted(tmp_path.glob("audit_*.jsonl"))[0]
+        lines = path.read_bytes().splitlines(keepends=True)
+        lines[-1] = lines[-1].replace(b'"events":250', b'"events":251')
+        path.write_bytes(b"".join(lines))
+        assert not verify_audit_history(tmp_path, key=KEY, workers=1).ok
+        full = verify_audit_history(tmp_path, key=KEY, workers=1, full=True)
+        assert not full.ok and full.to_dict()["events_verified"] == 550
+
+    @pytest.mark.asyncio
+    async def test_segments_are_verified_across_processes(self, tmp_path):
+        paths = await write_history(tmp_path, files=1, events_per_file=1000)
+
+        result = verify_audit_file(paths[0], key=KEY, workers=2, chunk_bytes=64 * 1024)
+        assert result.ok and result.events_verified == 1000
+
+    @pytest.mark.asyncio
+    async def test_concurrent_loggers_keep_their_own_chains(self, tmp_path):
+        def open_logger():
+            return AuditLogger(audit_dir=str(tmp_path), flush_interval_ms=0, checkpoint_interval=100, checkpoint_key=KEY)
+
+        first, second = open_logger(), open_logger()
+        assert (first.writer_id, second.writer_id) == ("0", "1")
+        for i in range(300):
+            assert await (first if i % 2 else second).log_event(make_event(i), durable=i % 7 == 0)
+        first.close()
+        second.close()
+        assert verify_audit_history(tmp_path, key=KEY, workers=1).ok
+
+        # A restarted process takes the free slot and continues that slot's chain
+        restarted = open_logger()
+        assert restarted.writer_id == "0"
+        await restarted.log_event(make_event(300))
+        restarted.close()
+
+        paths = sorted(tmp_path.glob("audit_*_w0_*.jsonl"))
+        assert len(paths) == 2
+        assert json.loads(paths[1].read_text().splitlines()[0])["chain"] == json.loads(paths[0].read_text().splitlines()[-1])["chain"]
+        report = verify_audit_history(tmp_path, key=KEY, workers=1)
+        assert report.ok and report.to_dict()["events"] == 301
+
+    @pytest.mark.asyncio
+    async def test_files_without_records_are_skipped_when_linking(self, tmp_path):
+        await write_history(tmp_path, files=1, events_per_file=20)
+        await write_history(tmp_path, files=1, events_per_file=0)  # Started and stopped without logging
+        # Crashed during its first write
+        timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S_%f")
+        (tmp_path / f"audit_{timestamp}_w0_deadbeef.jsonl").write_bytes(b'{"event_id": "torn')
+        await write_history(tmp_path, files=1, events_per_file=20)
+
+        paths = sorted(tmp_path.glob("audit_*.jsonl"))
+        assert paths[1].stat().st_size == 0 and paths[2].name.endswith("_deadbeef.jsonl")
+        report = verify_audit_history(tmp_path, key=KEY, workers=1)
+        assert [result.ok for result in report.files] == [True, True, False, True]  # Only the torn file itself
+        assert "incomplete record" in report.files[2].errors[0]
+
+    def test_logger_verifies_its_own_file(self, audit_logger):
+        async def log():
+            for i in range(10):
+                await audit_logger.log_event(make_event(i))
+
+        asyncio.run(log())
+        assert audit_logger.verify_integrity()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,235 @@
+"""
+XORJ Quantitative Engine - Backfill Planner Tests
+Unit tests for the per-day signature histogram and density-proportional sampling backfill
+"""
+
+import asyncio
+import pytest
+from collections import Counter
+from datetime import date, datetime, timezone, timedelta
+from types import SimpleNamespace
+
+from app.ingestion import worker as worker_module
+from app.ingestion.backfill_planner import SignatureHistogram, allocate_samples, signature_day
+from tests.ingestion_fakes import PagingSolanaClient, make_worker
+
+NOW = datetime(2024, 6, 1, tzinfo=timezone.utc)
+WINDOW_DAYS = 90
+
+
+def day_density(day_index: int) -> int:
+    """Quiet, normal and busy days in turn"""
+    return (20, 60, 100)[day_index % 3]
+
+
+def make_history(density=day_density):
+    """Signature infos newest first, density(d) of them on the d-th day back"""
+    signatures = []
+    for d in range(WINDOW_DAYS):
+        day_end = int((NOW - timedelta(days=d)).timestamp()) - 1
+        count = density(d)
+        signatures.extend(
+            SimpleNamespace(signature=f"sig_{d}_{i}", block_time=day_end - i * (86_000 // count))
+            for i in range(count)
+        )
+    return signatures
+
+
+class ConcurrencyTrackingClient(PagingSolanaClient):
+    """Records how many transaction fetches are in flight at once"""
+
+    def __init__(self, signatures):
+        super().__init__(signatures)
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def get_multiple_transactions(self, signatures, batch_size=100):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.001)
+        self.in_flight -= 1
+        return await super().get_multiple_transactions(signatures, batch_size)
+
+
+@pytest.fixture
+def sampling_settings(monkeypatch):
+    monkeypatch.setattr(worker_module.settings, "transaction_threshold", 2000)
+    monkeypatch.setattr(worker_module.settings, "num_samples_per_day", 10)
+    monkeypatch.setattr(worker_module.settings, "sampling_min_samples_per_day", 4)
+    monkeypatch.setattr(worker_module.settings, "sampling_max_samples_per_day", 50)
+
+
+class TestAllocation:
+    """allocate_samples"""
+
+    def test_budget_follows_density_above_the_floor(self):
+        counts = {date(2024, 1, 1): 10, date(2024, 1, 2): 100, date(2024, 1, 3): 1000}
+
+        allocation = allocate_samples(counts, 111, min_per_day=5)
+
+        assert sum(allocation.values()) == 111
+        assert allocation[date(2024, 1, 1)] >= 5
+        assert allocation[date(2024, 1, 1)] < allocation[date(2024, 1, 2)] < allocation[date(2024, 1, 3)]
+
+    def test_days_never_get_more_than_they_hold(self):
+        counts = {date(2024, 1, 1): 3, date(2024, 1, 2): 500}
+
+        assert allocate_samples(counts, 100, min_per_day=10, max_per_day=40) == {
+            date(2024, 1, 1): 3, date(2024, 1, 2): 40
+        }
+        assert allocate_samples(counts, 10_000) == counts
+
+
+class TestSignatureHistogram:
+    """Counts and bounded per-day reservoirs"""
+
+    def test_reservoirs_are_bounded_and_cover_the_day(self):
+        histogram = SignatureHistogram(reservoir_size=10, seed="wallet")
+        histogram.add_page(make_history()[:300])  # Days 0-5, the last one partly
+        histogram.add(SimpleNamespace(signature="no_time", block_time=None))
+
+        assert histogram.total == 300
+        assert [histogram.counts[day] for day in sorted(histogram.counts, reverse=True)] == [20, 60, 100, 20, 60, 40]
+        assert all(len(reservoir) <= 10 for reservoir in histogram.reservoirs.values())
+
+        busiest = max(histogram.counts, key=histogram.counts.get)
+        sampled = histogram.sample({busiest: 5})
+        assert len(sampled) == 5
+        assert [sig.block_time for sig in sampled] == sorted((sig.block_time for sig in sampled), reverse=True)
+
+    def test_taken_signatures_count_towards_their_day(self):
+        history = make_history()[:300]
+        histogram = SignatureHistogram(reservoir_size=100, seed="wallet")
+        histogram.add_page(history)
+        newest, busiest = sorted(histogram.counts, reverse=True)[0], sorted(histogram.counts, reverse=True)[2]
+
+        sampled = histogram.sample({newest: 20, busiest: 30}, taken=history[:20] + history[80:90])
+
+        assert sum(signature_day(sig) == newest for sig in sampled) == 0
+        assert sum(signature_day(sig) == busiest for sig in sampled) == 20
+        assert not {sig.signature for sig in sampled} & {sig.signature for sig in history[80:90]}
+
+    def test_projection_extrapolates_the_scanned_density(self):
+        histogram = SignatureHistogram(reservoir_size=10)
+        histogram.add_page(make_history(lambda d: 50)[:500])  # The newest 10 days
+
+        assert histogram.projected_total(None) == 500
+        assert histogram.projected_total((NOW - timedelta(days=WINDOW_DAYS)).timestamp()) == pytest.approx(4500, rel=0.02)
+
+
+class TestPlanBackfill:
+    """DataIngestionWorker.plan_backfill and the sampled process_wallet path"""
+
+    @pytest.mark.asyncio
+    async def test_high_volume_window_is_sampled_by_density_in_one_pass(self, sampling_settings):
+        history = make_history()  # 5400 signatures
+        client = PagingSolanaClient(history)
+
+        plan = await make_worker(client).plan_backfill("wallet", NOW - timedelta(days=WINDOW_DAYS), NOW)
+
+        assert plan.method == "SAMPLED"
+        # One sequential pass of 1000-signature pages instead of a probe plus one request per day
+        assert client.signature_requests == plan.pages == 6
+        assert plan.histogram.total == 5400
+        assert len(plan.samples_per_day) == WINDOW_DAYS
+        assert sum(plan.samples_per_day.values()) == 10 * (WINDOW_DAYS + 1)
+
+        per_day = Counter(sig.signature.split("_")[1] for sig in plan.signatures)
+        assert min(per_day.values()) >= 4
+        assert per_day["0"] < per_day["1"] < per_day["2"]  # 20, 60 and 100 signatures
+        assert len({sig.signature for sig in plan.signatures}) == len(plan.signatures)
+
+    @pytest.mark.asyncio
+    async def test_low_volume_window_reuses_the_scanned_signatures(self, sampling_settings):
+        client = PagingSolanaClient(make_history()[:1500])
+
+        plan = await make_worker(client).plan_backfill("wallet", NOW - timedelta(days=WINDOW_DAYS), NOW)
+
+        assert plan.method == "FULL"
+        assert len(plan.signatures) == 1500
+        assert client.signature_requests == 2
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("streaming", [True, False])
+    async def test_sampled_wallet_fetches_only_the_samples(self, sampling_settings, streaming):
+        client = PagingSolanaClient(make_history())
+
+        status = await make_worker(client, streaming=streaming).process_wallet("wallet", NOW - timedelta(days=WINDOW_DAYS), NOW)
+
+        assert status.success
+        assert status.total_transactions_found == len(client.fetched) == 910
+        assert client.signature_requests == 6
+        assert status.newest_signature is None  # A sampled run does not advance the cursor
+
+    @pytest.mark.asyncio
+    async def test_full_backfill_fetches_while_paging(self, sampling_settings, monkeypatch):
+        monkeypatch.setattr(worker_module.settings, "transaction_threshold", 10000)
+        client = PagingSolanaClient(make_history())  # 5400 signatures, well within the threshold
+
+        status = await make_worker(client).process_wallet("wallet", NOW - timedelta(days=WINDOW_DAYS), NOW)
+
+        assert status.success
+        assert len(client.fetched) == 5400
+        assert client.calls.index("transactions") < len(client.calls) - 1 - client.calls[::-1].index("signatures")
+        assert status.newest_signature == "sig_0_0"
+
+    @pytest.mark.asyncio
+    async def test_sampling_scan_is_capped(self, sampling_settings, monkeypatch):
+        monkeypatch.setattr(worker_module.settings, "sampling_max_scan_pages", 3)
+        client = PagingSolanaClient(make_history())
+
+        plan = await make_worker(client).plan_backfill("wallet", NOW - timedelta(days=WINDOW_DAYS), NOW)
+
+        assert plan.method == "SAMPLED"
+        assert client.signature_requests == plan.pages == 3
+        assert not plan.complete and plan.errors
+        assert plan.histogram.total == 3000
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("streaming", [True, False])
+    async def test_recent_burst_below_the_threshold_is_fetched_in_full(self, sampling_settings, monkeypatch, streaming):
+        """A quiet window with a busy last few days projects far above the threshold but is not sampled"""
+        monkeypatch.setattr(worker_module.settings, "sampling_max_scan_pages", 1)
+        client = PagingSolanaClient(make_history(lambda d: 390 if d < 5 else 0))  # 1950 signatures
+
+        status = await make_worker(client, streaming=streaming).process_wallet("wallet", NOW - timedelta(days=WINDOW_DAYS), NOW)
+
+        assert status.success
+        assert len(client.fetched) == 1950
+        assert client.signature_requests == 2
+        assert status.newest_signature == "sig_0_0"
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("streaming", [True, False])
+    async def test_sampled_days_are_fetched_concurrently(self, sampling_settings, streaming):
+        client = ConcurrencyTrackingClient(make_history())
+
+        status = await make_worker(client, streaming=streaming).process_wallet("wallet", NOW - timedelta(days=WINDOW_DAYS), NOW)
+
+        assert status.success
+        assert len(client.fetched) == 910
+        assert client.max_in_flight > 1
+
+    @pytest.mark.asyncio
+    async def test_window_turning_busy_is_sampled_after_the_streamed_pages(self, sampling_settings):
+        # Quiet recent days are streamed before the busy older ones show the window is high-volume
+        history = make_history(lambda d: 10 if d < 60 else 200)
+        client = PagingSolanaClient(history)
+
+        worker = make_worker(client)
+        plan = worker.new_backfill_plan("wallet")
+        fetched = []
+        async for page in worker.iter_backfill_pages("wallet", NOW - timedelta(days=WINDOW_DAYS), NOW, plan):
+            fetched.extend(page)
+
+        assert plan.method == "SAMPLED"
+        assert plan.streamed == 1000
+        assert len({sig.signature for sig in fetched}) == len(fetched) == plan.selected
+        assert fetched[:1000] == history[:1000]  # Days 0-61, streamed in full and not sampled again
+        per_day = Counter(int(sig.signature.split("_")[1]) for sig in fetched[1000:])
+        assert sorted(per_day) == list(range(62, WINDOW_DAYS))
+        assert all(4 <= count < 200 for count in per_day.values())
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
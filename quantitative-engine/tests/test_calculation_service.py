@@ -129,7 +129,9 @@ class TestCalculationService:
         mock_calculator.calculate_performance_metrics.assert_called_once_with(
             "test_wallet", 
             sample_trades,
-            datetime(2024, 1, 31, tzinfo=timezone.utc)
+            datetime(2024, 1, 31, tzinfo=timezone.utc),
+            None,
+            None
         )
     
     @pytest.mark.asyncio
@@ -200,7 +202,7 @@ class TestCalculationService:
         assert results["wallet_2"] is sample_metrics
         assert results["wallet_3"] is None
         
-        mock_calculator.calculate_batch_metrics.assert_called_once_with(wallet_trades, None)
+        mock_calculator.calculate_batch_metrics.assert_called_once_with(wallet_trades, None, None, None)
     
     @pytest.mark.asyncio
     async def test_calculate_batch_wallet_performance_error(self, service):
@@ -239,13 +241,13 @@ class TestCalculationService:
             mock_trade_records.append(mock_record)
         
         # Mock calculator to return trade records
-        mock_calculator.calculate_trade_usd_values.side_effect = mock_trade_records
+        mock_calculator.calculate_trade_usd_values_batch.return_value = mock_trade_records
         
         results = await calc_service.calculate_trade_usd_values(sample_trades)
         
         assert len(results) == len(sample_trades)
         assert all(isinstance(record, TradeRecord) for record in results)
-        assert mock_calculator.calculate_trade_usd_values.call_count == len(sample_trades)
+        mock_calculator.calculate_trade_usd_values_batch.assert_called_once_with(sample_trades, None)
     
     @pytest.mark.asyncio
     async def test_calculate_trade_usd_values_partial_failure(self, service, sample_trades):
@@ -253,7 +255,7 @@ class TestCalculationService:
         calc_service, mock_calculator, mock_price_feed = service
         
         # Mock some successes and some failures
-        mock_calculator.calculate_trade_usd_values.side_effect = [
+        mock_calculator.calculate_trade_usd_values_batch.return_value = [
             TradeRecord(
                 timestamp=sample_trades[0].block_time,
                 signature=sample_trades[0].signature,
@@ -267,8 +269,8 @@ class TestCalculationService:
                 total_cost_usd=Decimal("1000.50"),
                 net_profit_usd=Decimal("49.50")
             ),
-            None,  # Failed calculation
-            Exception("Price data unavailable"),  # Error
+            None,  # Missing token price
+            None,  # Missing token price
         ]
         
         results = await calc_service.calculate_trade_usd_values(sample_trades[:3])
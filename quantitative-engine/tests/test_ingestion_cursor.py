@@ -0,0 +1,203 @@
+"""
+XORJ Quantitative Engine - Ingestion Cursor Tests
+Unit tests for resuming scheduled ingestion from each wallet's newest processed signature
+"""
+
+import pytest
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+from app.ingestion.cursors import IngestionCursor, IngestionCursorStore
+from tests.ingestion_fakes import PagingSolanaClient, StubSwapParser, make_worker as make_fake_worker
+
+NEWEST_TIME = int(datetime.now(timezone.utc).timestamp()) - 60
+NEWEST_SLOT = 300_000_000
+WALLET = "5Q544fKrFoe6tsEbD7S8EmxGTJYAKtTVhAW5Q5pge4j1"
+
+
+def make_signature(index: int):
+    """Signature info `index` positions older than the newest one"""
+    return SimpleNamespace(
+        signature=f"sig_{index}",
+        slot=NEWEST_SLOT - index,
+        block_time=NEWEST_TIME - index * 30
+    )
+
+
+class FakeSolanaClient(PagingSolanaClient):
+    """A wallet with new activity on demand and a signature endpoint that can start failing"""
+
+    def __init__(self, count: int):
+        super().__init__([make_signature(i) for i in range(count)])
+        self.fail_after = None
+
+    def prepend(self, count: int):
+        """New activity: shift history back and add `count` newer signatures"""
+        newest = self.signatures[0]
+        new = [
+            SimpleNamespace(signature=f"new_{newest.slot + i}", slot=newest.slot + i, block_time=newest.block_time + i)
+            for i in range(count, 0, -1)
+        ]
+        self.signatures = new + self.signatures
+
+    async def get_transaction_signatures(self, wallet_address, before=None, until=None, limit=1000):
+        if self.fail_after is not None and self.signature_requests >= self.fail_after:
+            self.signature_requests += 1
+            raise ConnectionError("RPC node unavailable")
+        return await super().get_transaction_signatures(wallet_address, before, until, limit)
+
+
+class FakeDatabaseService:
+    """Keeps cursors in memory with the forward-only upsert rule"""
+
+    def __init__(self):
+        self.cursors = {}
+
+    async def get_ingestion_cursors(self, wallet_addresses):
+        return {wallet: dict(self.cursors[wallet]) for wallet in wallet_addresses if wallet in self.cursors}
+
+    async def save_ingestion_cursors(self, cursors):
+        for cursor in cursors:
+            stored = self.cursors.get(cursor["wallet_address"])
+            if stored is None or stored["slot"] <= cursor["slot"]:
+                self.cursors[cursor["wallet_address"]] = dict(cursor)
+
+
+def make_worker(client, db_service=None, streaming=True):
+    db_service = db_service or FakeDatabaseService()
+    return make_fake_worker(
+        client,
+        streaming=streaming,
+        cursor_store=IngestionCursorStore(AsyncMock(return_value=db_service))
+    )
+
+
+class TestResumeFromCursor:
+    """process_wallet with a stored cursor"""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("streaming", [True, False])
+    async def test_quiet_wallet_costs_one_page(self, streaming):
+        client = FakeSolanaClient(5000)
+        worker = make_worker(client, streaming=streaming)
+        cursor = IngestionCursor.from_signature_info("wallet", client.signatures[0])
+
+        status = await worker.process_wallet("wallet", cursor=cursor)
+
+        assert client.signature_requests == 1
+        assert status.success and status.resumed_from_cursor
+        assert status.total_transactions_found == 0
+        assert status.newest_signature is None  # Nothing new, the stored cursor stays
+        assert not status.warnings
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("streaming", [True, False])
+    async def test_only_newer_signatures_are_fetched(self, streaming):
+        client = FakeSolanaClient(5000)
+        cursor = IngestionCursor.from_signature_info("wallet", client.signatures[0])
+        client.prepend(7)
+        worker = make_worker(client, streaming=streaming)
+
+        status = await worker.process_wallet("wallet", cursor=cursor)
+
+        assert status.total_transactions_found == status.valid_swaps_extracted == 7
+        assert status.newest_signature == client.signatures[0].signature
+        assert status.newest_slot == NEWEST_SLOT + 7
+        assert client.signature_requests == 1
+
+
+class TestScheduledIngestionCursors:
+    """Cursor load and save around run_scheduled_ingestion"""
+
+    @pytest.mark.asyncio
+    async def test_runs_advance_and_resume_from_cursor(self):
+        client = FakeSolanaClient(200)
+        db_service = FakeDatabaseService()
+        worker = make_worker(client, db_service)
+
+        first = await worker.run_scheduled_ingestion([WALLET], lookback_hours=4)
+        assert not first[WALLET].resumed_from_cursor
+        assert first[WALLET].valid_swaps_extracted == 200
+        assert db_service.cursors[WALLET]["signature"] == "sig_0"
+        assert db_service.cursors[WALLET]["slot"] == NEWEST_SLOT
+
+        client.signature_requests = 0
+        quiet = await worker.run_scheduled_ingestion([WALLET], lookback_hours=4)
+        assert quiet[WALLET].resumed_from_cursor
+        assert client.signature_requests == 1
+        assert db_service.cursors[WALLET]["signature"] == "sig_0"
+
+        client.prepend(3)
+        active = await worker.run_scheduled_ingestion([WALLET], lookback_hours=4)
+        assert active[WALLET].valid_swaps_extracted == 3
+        assert db_service.cursors[WALLET]["slot"] == NEWEST_SLOT + 3
+
+    @pytest.mark.asyncio
+    async def test_incomplete_paging_does_not_advance_cursor(self):
+        client = FakeSolanaClient(2500)
+        db_service = FakeDatabaseService()
+        client.fail_after = 1  # Second signature page fails
+        worker = make_worker(client, db_service)
+
+        async def without_retries(func, *args, **kwargs):
+            return await func(*args, **kwargs)
+
+        worker.retry_session.execute_with_retry = without_retries
+
+        results = await worker.run_scheduled_ingestion([WALLET], lookback_hours=24)
+
+        assert results[WALLET].valid_swaps_extracted == 1000
+        assert WALLET not in db_service.cursors
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("streaming", [True, False])
+    async def test_wallet_without_swaps_advances_cursor(self, streaming):
+        """Fully fetched history with no swaps is a success and is not paged again"""
+        client = FakeSolanaClient(120)
+        db_service = FakeDatabaseService()
+        worker = make_worker(client, db_service, streaming=streaming)
+        worker.parser = StubSwapParser(lambda signature: False)
+
+        results = await worker.run_scheduled_ingestion([WALLET], lookback_hours=4)
+
+        assert results[WALLET].success
+        assert results[WALLET].valid_swaps_extracted == 0
+        assert db_service.cursors[WALLET]["signature"] == "sig_0"
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("streaming", [True, False])
+    async def test_failed_transaction_fetch_does_not_advance_cursor(self, streaming):
+        """Swaps from the fetched transactions count, but the missed one is retried next run"""
+        client = FakeSolanaClient(120)
+        db_service = FakeDatabaseService()
+        worker = make_worker(client, db_service, streaming=streaming)
+        fetch = client.get_multiple_transactions
+
+        async def drop_one(signatures, batch_size=100):
+            transactions = await fetch(signatures, batch_size)
+            return [None if sig == "sig_7" else tx for sig, tx in zip(signatures, transactions)]
+
+        client.get_multiple_transactions = drop_one
+
+        results = await worker.run_scheduled_ingestion([WALLET], lookback_hours=4)
+
+        assert results[WALLET].success
+        assert results[WALLET].valid_swaps_extracted == 119
+        assert WALLET not in db_service.cursors
+
+    @pytest.mark.asyncio
+    async def test_unreachable_database_falls_back_to_lookback(self):
+        client = FakeSolanaClient(10)
+        worker = make_worker(client)
+        worker.cursor_store = IngestionCursorStore(AsyncMock(side_effect=RuntimeError("Database initialization failed")))
+
+        results = await worker.run_scheduled_ingestion([WALLET], lookback_hours=4)
+
+        assert results[WALLET].success
+        assert not results[WALLET].resumed_from_cursor
+        assert results[WALLET].valid_swaps_extracted == 10
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,181 @@
+"""
+XORJ Quantitative Engine - Ingestion Fan-Out Tests
+Unit tests for splitting scheduled ingestion into process_wallet_batch chunks and aggregating their results
+"""
+
+import pytest
+from types import SimpleNamespace
+
+from celery.app.task import Context
+
+from app import worker as celery_worker
+from app.schemas.ingestion import WalletIngestionStatus
+
+WALLETS = [f"wallet_{i}" for i in range(10)]
+
+
+@pytest.fixture
+def eager_celery(monkeypatch):
+    """Run tasks, groups and chords in-process"""
+    monkeypatch.setattr(celery_worker.celery_app.conf, "task_always_eager", True)
+    monkeypatch.setattr(celery_worker.celery_app.conf, "task_eager_propagates", True)
+    async def fake_ingestion(wallet_address, lookback_hours=None, use_cursors=True):
+        processed.append(wallet_address)
+        status = WalletIngestionStatus(wallet_address=wallet_address, valid_swaps_extracted=3)
+        if wallet_address == "wallet_7":
+            status.add_error("RPC connection reset")
+        status.mark_completed(success=wallet_address != "wallet_7")
+        return status
+
+    async def fake_save_signature_filter():
+        processed.filter_saves += 1
+
+    processed = ProcessedWallets()
+    monkeypatch.setattr(celery_worker, "process_single_wallet_ingestion", fake_ingestion)
+    monkeypatch.setattr(celery_worker, "save_signature_filter", fake_save_signature_filter)
+    return processed
+
+
+@pytest.fixture
+def dispatched(monkeypatch):
+    """The header and callback of the chord dispatch_scheduled_ingestion builds, instead of running it"""
+    dispatched = {}
+
+    def fake_chord(header):
+        dispatched["header"] = header
+
+        def apply(callback):
+            dispatched["callback"] = callback
+            return SimpleNamespace(id="chord-id")
+        return apply
+
+    monkeypatch.setattr(celery_worker, "chord", fake_chord)
+    return dispatched
+
+
+class ProcessedWallets(list):
+    """Wallets the fake ingestion saw, plus how often the signature filter was saved"""
+    filter_saves = 0
+
+
+class TestChunking:
+    """chunk_wallets"""
+
+    def test_chunks_are_bounded_and_deduplicated(self):
+        chunks = celery_worker.chunk_wallets(WALLETS + ["wallet_0"], chunk_size=4)
+
+        assert [len(chunk) for chunk in chunks] == [4, 4, 2]
+        assert sum(chunks, []) == WALLETS
+        assert celery_worker.chunk_wallets([], chunk_size=4) == []
+
+
+class TestFanOut:
+    """dispatch_scheduled_ingestion -> process_wallet_batch chord -> aggregate_ingestion_results"""
+
+    def test_chunks_run_as_a_chord_on_the_ingestion_queue(self, dispatched):
+        result = celery_worker.dispatch_scheduled_ingestion.apply(args=(WALLETS,), kwargs={"chunk_size": 3}).get()
+
+        assert result["chunks"] == 4 and result["chord_id"] == "chord-id"
+        tasks = list(dispatched["header"].tasks)
+        assert [task.args[0] for task in tasks] == [WALLETS[0:3], WALLETS[3:6], WALLETS[6:9], WALLETS[9:]]
+        assert all(task.kwargs["raise_on_failure"] is False for task in tasks)
+        assert all(task.kwargs["reliability"] == celery_worker.SCHEDULED_RELIABILITY for task in tasks)
+        assert dispatched["callback"].task == "app.worker.aggregate_ingestion_results"
+        [errback] = dispatched["callback"].options["link_error"]
+        assert errback["task"] == "app.worker.recover_ingestion_run"
+        assert errback["kwargs"]["chunk_task_ids"] == [task.options["task_id"] for task in tasks]
+        routes = celery_worker.celery_app.conf.task_routes
+        assert routes["app.worker.process_wallet_batch"]["queue"] == "ingestion"
+        assert routes["app.worker.aggregate_ingestion_results"]["queue"] == "ingestion"
+        assert routes["app.worker.recover_ingestion_run"]["queue"] == "ingestion"
+
+    def test_chunks_use_the_scheduled_reliability_settings(self, eager_celery, monkeypatch):
+        configs = []
+        get_processor = celery_worker.get_fault_tolerant_processor
+
+        def capture(config):
+            configs.append(config)
+            return get_processor(config)
+
+        monkeypatch.setattr(celery_worker, "get_fault_tolerant_processor", capture)
+
+        celery_worker.dispatch_scheduled_ingestion.apply(args=(WALLETS,), kwargs={"chunk_size": 5}).get()
+        celery_worker.process_wallet_batch.apply(args=(WALLETS[:2],)).get()
+
+        assert [config.timeout_seconds for config in configs] == [120.0, 120.0, 90.0]
+        assert [config.max_concurrent_wallets for config in configs] == [5, 5, 8]
+        assert configs[0].retry_delay_seconds == 5.0 and configs[0].circuit_breaker_threshold == 0.8
+
+    def test_chunk_results_are_aggregated(self, eager_celery):
+        batches = [
+            celery_worker.process_wallet_batch.apply(args=(chunk,), kwargs={"raise_on_failure": False}).get()
+            for chunk in celery_worker.chunk_wallets(WALLETS, chunk_size=4)
+        ]
+        # A chunk task that exhausted its retries
+        batches.append({"success": False, "wallet_addresses": ["wallet_10"], "error": "worker lost"})
+
+        summary = celery_worker.aggregate_ingestion_results.apply(args=(batches,), kwargs={"run_id": "run"}).get()
+
+        assert sorted(eager_celery) == sorted(WALLETS)
+        assert eager_celery.filter_saves == 3  # Once per chunk task, not once per wallet
+        assert summary["task_id"] == "run"
+        assert summary["chunks"] == 4 and summary["failed_chunks"] == 1
+        assert summary["processed_wallets"] == 11
+        assert summary["successful_wallets"] == 9
+        assert summary["total_swaps_extracted"] == 10 * 3
+        assert not summary["wallet_results"]["wallet_10"]["success"]
+
+    def test_eager_run_end_to_end(self, eager_celery, monkeypatch):
+        aggregated = {}
+        aggregate = celery_worker.aggregate_ingestion_results.run
+
+        def capture(batch_results, run_id=None, start_time=None):
+            aggregated.update(aggregate(batch_results, run_id=run_id, start_time=start_time))
+            return aggregated
+
+        monkeypatch.setattr(celery_worker.aggregate_ingestion_results, "run", capture)
+
+        result = celery_worker.dispatch_scheduled_ingestion.apply(args=(WALLETS,), kwargs={"chunk_size": 4}).get()
+
+        assert result["chunks"] == 3
+        assert aggregated["processed_wallets"] == 10
+        assert aggregated["wallet_results"]["wallet_7"]["errors"] == 1
+
+    def test_run_is_aggregated_when_a_chunk_crashes(self, eager_celery, dispatched, monkeypatch):
+        celery_worker.dispatch_scheduled_ingestion.apply(args=(WALLETS,), kwargs={"chunk_size": 4}).get()
+
+        # The first two chunks finished; the last one hit its hard time limit
+        stored = {
+            task.options["task_id"]: SimpleNamespace(
+                successful=lambda: True,
+                result=celery_worker.process_wallet_batch.apply(args=task.args, kwargs=task.kwargs).get()
+            )
+            for task in list(dispatched["header"].tasks)[:2]
+        }
+        lost = SimpleNamespace(successful=lambda: False, state="FAILURE", result=TimeoutError("Time limit exceeded"))
+        monkeypatch.setattr(celery_worker.celery_app, "AsyncResult", lambda task_id: stored.get(task_id, lost))
+
+        aggregated = {}
+        aggregate = celery_worker.aggregate_ingestion_results.run
+        monkeypatch.setattr(
+            celery_worker.aggregate_ingestion_results, "run",
+            lambda batch_results, run_id=None, start_time=None: aggregated.update(
+                aggregate(batch_results, run_id=run_id, start_time=start_time)
+            )
+        )
+
+        # What the result backend does when a chord part fails
+        callback = dispatched["callback"]
+        celery_worker.celery_app.backend._call_task_errbacks(
+            Context({"id": "callback-id", "errbacks": callback.options["link_error"], "delivery_info": {}}),
+            RuntimeError("Dependency raised TimeLimitExceeded"), None
+        )
+
+        assert aggregated["chunks"] == 3 and aggregated["failed_chunks"] == 1
+        assert aggregated["processed_wallets"] == 10
+        assert aggregated["successful_wallets"] == 7  # wallet_7 failed itself, wallets 8-9 with their chunk
+        assert not aggregated["wallet_results"]["wallet_9"]["success"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,142 @@
+"""
+XORJ Quantitative Engine - Streaming Ingestion Pipeline Tests
+Unit tests for the bounded fetch -> parse -> validate pipeline in DataIngestionWorker
+"""
+
+import asyncio
+import time
+import pytest
+from datetime import datetime, timezone, timedelta
+from types import SimpleNamespace
+
+from tests.ingestion_fakes import PagingSolanaClient, StubSwapParser, make_worker, signature_index
+
+NOW = datetime(2024, 6, 1, tzinfo=timezone.utc)
+
+
+def make_signatures(count: int, spacing_seconds: int = 60):
+    """Signature infos newest first, like getSignaturesForAddress"""
+    newest = int(NOW.timestamp())
+    return [
+        SimpleNamespace(signature=f"sig_{i}", block_time=newest - i * spacing_seconds)
+        for i in range(count)
+    ]
+
+
+class FakeSolanaClient(PagingSolanaClient):
+    """Serves transactions slowly, loses every tenth and tracks concurrency"""
+
+    def __init__(self, signatures, fetch_delay: float = 0.002):
+        super().__init__(signatures)
+        self.fetch_delay = fetch_delay
+        self.in_flight = 0
+        self.fetched_batches = 0
+
+    async def get_multiple_transactions(self, signatures, batch_size=100):
+        self.in_flight += 1
+        try:
+            await asyncio.sleep(self.fetch_delay)
+        finally:
+            self.in_flight -= 1
+        self.fetched_batches += 1
+        # Every tenth transaction is missing
+        return [None if signature_index(sig) % 10 == 9 else {"signature": sig} for sig in signatures]
+
+
+class FakeParser(StubSwapParser):
+    """Treats even-numbered signatures as swaps; swaps divisible by 4 fail validation"""
+
+    def __init__(self, client: FakeSolanaClient = None, parse_delay: float = 0.0, batch_size: int = 25):
+        super().__init__(lambda signature: signature_index(signature) % 2 == 0)
+        self.client = client
+        self.parse_delay = parse_delay
+        self.batch_size = batch_size
+        self.parsed_batches = 0
+        self.parse_calls = 0
+        self.max_backlog = 0
+        self.overlapped = False
+
+    def parse_swap_batch(self, transactions):
+        if self.client is not None:
+            self.overlapped = self.overlapped or self.client.in_flight > 0
+            self.max_backlog = max(self.max_backlog, self.client.fetched_batches - self.parsed_batches)
+        time.sleep(self.parse_delay)
+        self.parse_calls += 1
+        # Batches that piled up are parsed in one call
+        self.parsed_batches += len({signature_index(signature) // self.batch_size for _, signature, _ in transactions})
+        return super().parse_swap_batch(transactions)
+
+    def validate_swap_data(self, swap):
+        return ["amount out of range"] if signature_index(swap.signature) % 4 == 0 else []
+
+
+class TestStreamingPipeline:
+    """process_wallet in streaming mode"""
+
+    @pytest.mark.asyncio
+    async def test_streaming_matches_materialized(self):
+        signatures = make_signatures(2600)
+        start_date = NOW - timedelta(days=1)
+
+        statuses = {}
+        for streaming in (True, False):
+            client = FakeSolanaClient(signatures)
+            worker = make_worker(client, FakeParser(), streaming)
+            statuses[streaming] = await worker.process_wallet("wallet", start_date, NOW)
+
+        streamed, materialized = statuses[True], statuses[False]
+        assert streamed.total_transactions_found == materialized.total_transactions_found == 1441  # start_date is inclusive
+        assert streamed.valid_swaps_extracted == materialized.valid_swaps_extracted == 360
+        assert len(streamed.errors) == len(materialized.errors)
+        assert streamed.success and materialized.success
+
+    @pytest.mark.asyncio
+    async def test_backlog_is_bounded_and_parsing_overlaps_fetching(self):
+        client = FakeSolanaClient(make_signatures(3000), fetch_delay=0.004)
+        parser = FakeParser(client, parse_delay=0.004)
+        worker = make_worker(client, parser, streaming=True, batch_size=25)
+
+        status = await worker.process_wallet("wallet")
+
+        assert parser.parsed_batches == 120
+        assert status.valid_swaps_extracted == 750
+        # Queued batches plus one per fetcher and the batch being parsed
+        assert parser.max_backlog <= worker.pipeline_queue_size + worker.pipeline_fetch_concurrency + 1
+        assert parser.overlapped
+
+    @pytest.mark.asyncio
+    async def test_batches_that_pile_up_are_parsed_together(self):
+        """A parse stage slower than fetching takes every queued batch at once"""
+        client = FakeSolanaClient(make_signatures(3000), fetch_delay=0.001)
+        parser = FakeParser(client, parse_delay=0.02)
+        worker = make_worker(client, parser, streaming=True, batch_size=25)
+
+        status = await worker.process_wallet("wallet")
+
+        assert parser.parsed_batches == 120
+        assert parser.parse_calls < 60
+        assert status.valid_swaps_extracted == 750
+
+    @pytest.mark.asyncio
+    async def test_start_date_page_keeps_newer_signatures(self):
+        """The page that crosses start_date still contributes its in-range signatures"""
+        client = FakeSolanaClient(make_signatures(1500, spacing_seconds=3600))
+        worker = make_worker(client, FakeParser(), streaming=True)
+
+        pages = [page async for page in worker.iter_signature_pages("wallet", NOW - timedelta(hours=10), NOW)]
+
+        assert [len(page) for page in pages] == [11]
+
+    @pytest.mark.asyncio
+    async def test_empty_wallet(self):
+        worker = make_worker(FakeSolanaClient([]), FakeParser(), streaming=True)
+
+        status = await worker.process_wallet("wallet")
+
+        assert status.success
+        assert status.total_transactions_found == 0
+        assert status.warnings
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,132 @@
+"""
+XORJ Quantitative Engine - Streaming Leaderboard Tests
+Unit tests for bounded-memory ranking and one-pass Trust Score statistics
+"""
+
+import pytest
+import random
+from datetime import datetime, timezone
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock
+
+from app.scoring.leaderboard import LeaderboardAccumulator
+from app.scoring.service import ScoringService
+from app.scoring.trust_score import TrustScoreResult, EligibilityStatus
+
+STATUSES = [
+    EligibilityStatus.ELIGIBLE,
+    EligibilityStatus.ELIGIBLE,
+    EligibilityStatus.ELIGIBLE,
+    EligibilityStatus.INSUFFICIENT_TRADES,
+    EligibilityStatus.INSUFFICIENT_HISTORY,
+]
+
+
+def random_results(count: int, seed: int = 3):
+    """Mixed eligible/ineligible results with deliberate duplicate scores"""
+    rng = random.Random(seed)
+    return [
+        TrustScoreResult(
+            wallet_address=f"wallet_{i}",
+            trust_score=Decimal(str(round(rng.choice([rng.uniform(0, 55), 42.5]), 6))),
+            eligibility_status=rng.choice(STATUSES),
+            calculation_timestamp=datetime(2024, 1, 1, tzinfo=timezone.utc)
+        )
+        for i in range(count)
+    ]
+
+
+class TestLeaderboardAccumulator:
+    """Accumulator output matches a full sort of the same results"""
+
+    def test_matches_full_sort(self):
+        results = random_results(5000)
+        accumulator = LeaderboardAccumulator(limit=25, min_trust_score=10.0)
+        for result in results:
+            accumulator.add(result)
+
+        qualifying = [
+            r for r in results
+            if r.eligibility_status == EligibilityStatus.ELIGIBLE and float(r.trust_score) >= 10.0
+        ]
+        expected_top = sorted(qualifying, key=lambda r: r.trust_score, reverse=True)[:25]
+        scores = [float(r.trust_score) for r in qualifying]
+        mean = sum(scores) / len(scores)
+
+        assert [r.wallet_address for r in accumulator.top_results()] == [r.wallet_address for r in expected_top]
+        assert accumulator.qualifying_results == len(qualifying)
+        stats = accumulator.trust_score_stats()
+        assert stats["average"] == round(mean, 2)
+        assert stats["median"] == round(sorted(scores)[len(scores) // 2], 2)
+        assert stats["maximum"] == round(max(scores), 2)
+        assert stats["minimum"] == round(min(scores), 2)
+        assert stats["std_deviation"] == round((sum((x - mean) ** 2 for x in scores) / len(scores)) ** 0.5, 2)
+        assert sum(accumulator.eligibility_breakdown.values()) == len(results)
+
+    def test_memory_bounded_by_limit(self):
+        """Only `limit` results are retained however many stream through"""
+        accumulator = LeaderboardAccumulator(limit=10)
+        for result in random_results(20000, seed=9):
+            accumulator.add(result)
+
+        assert len(accumulator._heap) == 10
+        assert len(accumulator._rounded_counts) <= 5501  # Scores in [0, 55] at 0.01 resolution
+
+    def test_empty(self):
+        accumulator = LeaderboardAccumulator(limit=10)
+
+        assert accumulator.top_results() == []
+        assert accumulator.trust_score_stats()["std_deviation"] == 0
+
+
+class TestStreamingLeaderboard:
+    """ScoringService consumes the batch scorer as a stream"""
+
+    @pytest.fixture
+    def scoring_service(self):
+        service = ScoringService()
+        service.scoring_engine = MagicMock()
+        service.calculation_service = AsyncMock()
+        return service
+
+    @pytest.mark.asyncio
+    async def test_streaming_matches_materialized(self, scoring_service):
+        results = random_results(300)
+        wallet_trades = {result.wallet_address: [] for result in results}
+
+        async def stream(*args, **kwargs):
+            for result in results:
+                yield result
+
+        scoring_service.scoring_engine.iter_batch_trust_scores = stream
+        scoring_service.calculate_batch_trust_scores = AsyncMock(
+            return_value={result.wallet_address: result for result in results}
+        )
+
+        streamed = await scoring_service.get_trust_score_leaderboard(wallet_trades, limit=20, streaming=True)
+        materialized = await scoring_service.get_trust_score_leaderboard(wallet_trades, limit=20, streaming=False)
+
+        assert streamed["leaderboard"] == materialized["leaderboard"]
+        assert streamed["statistics"] == materialized["statistics"]
+        assert streamed["eligibility_breakdown"] == materialized["eligibility_breakdown"]
+
+    @pytest.mark.asyncio
+    async def test_stream_failure_counts_remaining_wallets(self, scoring_service):
+        results = random_results(10)
+        wallet_trades = {result.wallet_address: [] for result in results}
+
+        async def failing_stream(*args, **kwargs):
+            for result in results[:4]:
+                yield result
+            raise RuntimeError("metrics backend unavailable")
+
+        scoring_service.scoring_engine.iter_batch_trust_scores = failing_stream
+
+        leaderboard = await scoring_service.get_trust_score_leaderboard(wallet_trades, streaming=True)
+
+        assert sum(leaderboard["eligibility_breakdown"].values()) == 10
+        assert leaderboard["eligibility_breakdown"][EligibilityStatus.CALCULATION_ERROR.value] >= 6
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
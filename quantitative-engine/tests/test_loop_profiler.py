@@ -0,0 +1,163 @@
+"""
+XORJ Quantitative Engine - Event Loop Profiling Tests
+Unit tests for slow-callback detection and the on-demand sampling profiler
+"""
+
+import asyncio
+import threading
+import time
+import pytest
+from unittest.mock import MagicMock, patch
+
+from fastapi import Depends, FastAPI, Header, HTTPException
+from fastapi.testclient import TestClient
+
+from app.core import metrics_middleware as metrics_middleware_module
+
+from app.core import loop_profiler as loop_profiler_module
+from app.core.loop_profiler import SlowCallbackMonitor, StackSampler, format_collapsed
+from app.core.metrics_middleware import create_profiling_endpoints, setup_observability
+from app.core.observability import MetricsCollector
+
+
+@pytest.fixture
+def collector():
+    with patch('app.core.observability.DATADOG_AVAILABLE', False):
+        return MetricsCollector(enable_prometheus=True, enable_datadog=False)
+
+
+def blocking_scoring_step(seconds):
+    time.sleep(seconds)  # Stands in for CPU-heavy Decimal scoring on the loop
+
+
+def busy_loop(stop):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+class TestSlowCallbackMonitor:
+    """Timing event loop callbacks"""
+
+    def test_slow_callback_is_logged_with_its_stacks(self, collector):
+        monitor = SlowCallbackMonitor(threshold_ms=50, metrics_collector=collector)
+
+        async def score_wallets():
+            monitor.install()
+            try:
+                await asyncio.sleep(0)
+                blocking_scoring_step(0.2)
+                await asyncio.sleep(0)
+                await asyncio.sleep(0.01)  # Fast callbacks are not reported
+            finally:
+                monitor.uninstall()
+
+        asyncio.run(score_wallets())
+
+        assert asyncio.events.Handle._run is loop_profiler_module._original_handle_run
+        assert monitor.slow_callbacks == 1
+        entry = monitor.recent[0]
+        assert entry["duration_ms"] >= 200
+        assert entry["coroutine"].endswith("score_wallets")
+        # The watchdog caught the loop thread inside the blocking call
+        assert any("in blocking_scoring_step" in frame for frame in entry["blocking_stack"])
+        assert collector.registry.get_sample_value('xorj_event_loop_slow_callbacks_total') == 1
+
+    def test_other_threads_loops_are_not_timed(self, collector):
+        monitor = SlowCallbackMonitor(threshold_ms=10, metrics_collector=collector)
+        monitor.install()
+        try:
+            def other_loop():
+                async def block():
+                    blocking_scoring_step(0.05)
+                asyncio.run(block())
+
+            thread = threading.Thread(target=other_loop)
+            thread.start()
+            thread.join()
+        finally:
+            monitor.uninstall()
+
+        assert monitor.slow_callbacks == 0
+
+
+class TestStackSampler:
+    """Collapsed-stack sampling"""
+
+    def test_profile_of_one_thread(self):
+        stop = threading.Event()
+        thread = threading.Thread(target=busy_loop, args=(stop,))
+        thread.start()
+        try:
+            stacks, rounds = StackSampler(thread_id=thread.ident, interval_ms=1).profile(0.2)
+        finally:
+            stop.set()
+            thread.join()
+
+        assert rounds > 10
+        assert sum(stacks.values()) == rounds
+        assert all("busy_loop (" in stack for stack in stacks)
+
+        lines = format_collapsed(stacks).splitlines()
+        stack, count = lines[0].rsplit(" ", 1)
+        assert stack.split(";")[-1].startswith("busy_loop (") and int(count) == max(stacks.values())
+
+
+async def require_debug_key(x_debug_key: str = Header(None)):
+    if x_debug_key != "secret":
+        raise HTTPException(status_code=401, detail="Invalid API key")
+
+
+class TestProfilingEndpoints:
+    """/debug/profile and /debug/slow-callbacks"""
+
+    def test_profile_endpoint_returns_collapsed_stacks(self, collector, monkeypatch):
+        monkeypatch.setattr(loop_profiler_module, "_slow_callback_monitor", None)
+        app = FastAPI()
+        create_profiling_endpoints(app, collector, [Depends(require_debug_key)])
+
+        with TestClient(app, headers={"X-Debug-Key": "secret"}) as client:
+            response = client.get("/debug/profile", params={"seconds": 0.2, "all_threads": True})
+            assert response.status_code == 200
+            assert int(response.headers["X-Profile-Samples"]) > 0
+            assert all(line.rsplit(" ", 1)[1].isdigit() for line in response.text.splitlines())
+
+            assert client.get("/debug/profile", params={"seconds": 3600}).status_code == 400
+            assert client.get("/debug/slow-callbacks").json()["slow_callbacks"] == 0
+
+    def test_endpoints_require_a_guard(self, collector, monkeypatch):
+        monkeypatch.setattr(loop_profiler_module, "_slow_callback_monitor", None)
+        app = FastAPI()
+        with pytest.raises(ValueError):
+            create_profiling_endpoints(app, collector)
+
+        create_profiling_endpoints(app, collector, [Depends(require_debug_key)])
+        with TestClient(app) as client:
+            assert client.get("/debug/slow-callbacks").status_code == 401
+            assert client.get("/debug/profile", params={"seconds": 0.1}).status_code == 401
+
+    def test_setup_without_a_guard_skips_the_endpoints(self, monkeypatch):
+        monkeypatch.setattr(metrics_middleware_module.settings, "loop_instrumentation_enabled", True)
+        monkeypatch.setattr(metrics_middleware_module, "create_profiling_endpoints", MagicMock())
+        setup_observability(FastAPI())
+        setup_observability(FastAPI(), profiling_dependencies=[Depends(require_debug_key)])
+
+        assert metrics_middleware_module.create_profiling_endpoints.call_count == 1
+
+    def test_secure_app_installs_observability_before_startup(self, monkeypatch):
+        """Middleware added in lifespan would be refused by Starlette, so the real app installs it at import"""
+        pytest.importorskip("jwt")
+        import importlib
+        import app.main_secure as main_secure
+
+        monkeypatch.setattr(metrics_middleware_module.settings, "loop_instrumentation_enabled", True)
+        main_secure = importlib.reload(main_secure)
+
+        assert metrics_middleware_module.MetricsMiddleware in [middleware.cls for middleware in main_secure.app.user_middleware]
+        routes = {route.path: route for route in main_secure.app.routes}
+        assert "/metrics" in routes
+        for path in ("/debug/profile", "/debug/slow-callbacks"):
+            assert main_secure.verify_api_key in [dependency.call for dependency in routes[path].dependant.dependencies]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -8,15 +8,21 @@ import asyncio
 from datetime import datetime, timezone, timedelta
 from decimal import Decimal, getcontext
 from unittest.mock import AsyncMock, MagicMock, patch
+from concurrent.futures.process import BrokenProcessPool
 from typing import List
 
 from app.calculation.metrics import (
     PerformanceCalculator, 
     TradeRecord, 
     PerformanceMetrics, 
-    TradeType
+    TradeType,
+    MetricsEngine,
+    TradeValuationCache,
+    VECTORIZED_TOLERANCE,
+    find_tolerance_violations
 )
-from app.calculation.price_feed import PricePoint
+from app.calculation.vectorized import NUMPY_AVAILABLE
+from app.calculation.price_feed import PricePoint, price_cache_key
 from app.schemas.ingestion import RaydiumSwap, TokenBalance
 from app.core.config import get_settings
 
@@ -261,8 +267,7 @@ class TestPerformanceCalculator:
             mock_swaps.append(swap)
         
         # Mock the USD calculation to return our known trade records
-        calc.calculate_trade_usd_values = AsyncMock()
-        calc.calculate_trade_usd_values.side_effect = self.create_test_trades()
+        calc.calculate_trade_usd_values_batch = AsyncMock(return_value=self.create_test_trades())
         
         # Calculate metrics
         end_date = datetime(2024, 1, 10, tzinfo=timezone.utc)
@@ -327,7 +332,7 @@ class TestPerformanceCalculator:
             fee_usd="0.50"
         )
         
-        calc.calculate_trade_usd_values = AsyncMock(return_value=trades[0])
+        calc.calculate_trade_usd_values_batch = AsyncMock(return_value=[trades[0]])
         
         metrics = await calc.calculate_performance_metrics("single_wallet", [swap], None)
         
@@ -461,5 +466,324 @@ class TestPerformanceCalculator:
         assert trade_type == TradeType.SWAP
 
 
+@pytest.mark.skipif(not NUMPY_AVAILABLE, reason="NumPy not installed")
+class TestVectorizedMetricsEngine:
+    """Vectorized engine must agree with the Decimal reference within VECTORIZED_TOLERANCE"""
+    
+    SOL_MINT = "So11111111111111111111111111111111111111112"
+    USDC_MINT = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"
+    
+    @pytest.fixture
+    def calc(self):
+        """Calculator with a mocked price feed"""
+        calc = PerformanceCalculator()
+        calc.price_feed = AsyncMock()
+        return calc
+    
+    def make_trade(self, index: int, timestamp: datetime, token_in_usd: Decimal, net_profit_usd: Decimal, fee_usd: Decimal) -> TradeRecord:
+        """Build a TradeRecord with consistent derived USD fields"""
+        net_usd_change = net_profit_usd + fee_usd
+        return TradeRecord(
+            timestamp=timestamp,
+            signature=f"vectorized_trade_{index}",
+            trade_type=TradeType.SELL,
+            token_in=TokenBalance(mint=self.SOL_MINT, symbol="SOL", amount="1", decimals=9),
+            token_out=TokenBalance(mint=self.USDC_MINT, symbol="USDC", amount="1", decimals=6),
+            token_in_usd=token_in_usd,
+            token_out_usd=token_in_usd + net_usd_change,
+            net_usd_change=net_usd_change,
+            fee_usd=fee_usd,
+            total_cost_usd=token_in_usd + fee_usd,
+            net_profit_usd=net_profit_usd
+        )
+    
+    def known_trades(self) -> List[TradeRecord]:
+        """Same P&L sequence as TestPerformanceCalculator.create_test_trades"""
+        base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        rows = [
+            ("1000.00", "99.50", "0.50"),
+            ("500.00", "-50.25", "0.25"),
+            ("200.00", "24.90", "0.10"),
+            ("300.00", "-75.15", "0.15"),
+        ]
+        return [
+            self.make_trade(i, base + timedelta(days=i), Decimal(volume), Decimal(profit), Decimal(fee))
+            for i, (volume, profit, fee) in enumerate(rows)
+        ]
+    
+    def random_trades(self, count: int, seed: int) -> List[TradeRecord]:
+        """Deterministic pseudo-random trades, deliberately out of timestamp order"""
+        import random
+        rng = random.Random(seed)
+        base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        trades = []
+        for i in range(count):
+            timestamp = base + timedelta(seconds=rng.randint(0, 90 * 86400))
+            volume = Decimal(str(round(rng.uniform(10, 250000), 6)))
+            profit = Decimal(str(round(rng.gauss(0, float(volume) * 0.05), 6)))
+            fee = Decimal(str(round(rng.uniform(0.0001, 2), 6)))
+            trades.append(self.make_trade(i, timestamp, volume, profit, fee))
+        return trades
+    
+    @pytest.mark.asyncio
+    async def test_known_trades_match_decimal(self, calc):
+        """Known P&L sequence produces identical quantized metrics"""
+        start, end = datetime(2023, 12, 1, tzinfo=timezone.utc), datetime(2024, 1, 10, tzinfo=timezone.utc)
+        
+        reference = await calc._calculate_core_metrics(self.known_trades(), start, end)
+        vectorized = calc._calculate_core_metrics_vectorized(self.known_trades(), start, end)
+        
+        assert find_tolerance_violations(reference, vectorized) == {}
+        assert vectorized.total_profit_usd == Decimal("-1.00")
+        assert vectorized.total_volume_usd == Decimal("2000.00")
+        assert vectorized.win_loss_ratio == Decimal("1.00")
+        assert vectorized.average_holding_period_hours == Decimal("24.0")
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("seed", [1, 7, 42])
+    async def test_randomized_trades_within_tolerance(self, calc, seed):
+        """Large unsorted trade sets stay within the stated tolerance"""
+        start, end = datetime(2024, 1, 1, tzinfo=timezone.utc), datetime(2024, 4, 1, tzinfo=timezone.utc)
+        
+        reference = await calc._calculate_core_metrics(self.random_trades(2000, seed), start, end)
+        vectorized = calc._calculate_core_metrics_vectorized(self.random_trades(2000, seed), start, end)
+        
+        assert find_tolerance_violations(reference, vectorized) == {}
+    
+    @pytest.mark.asyncio
+    async def test_single_trade_edge_case(self, calc):
+        """Single trade: no drawdown, zero Sharpe, infinite win/loss ratio"""
+        start, end = datetime(2023, 12, 1, tzinfo=timezone.utc), datetime(2024, 1, 10, tzinfo=timezone.utc)
+        trades = self.known_trades()[:1]
+        
+        vectorized = calc._calculate_core_metrics_vectorized(trades, start, end)
+        
+        assert vectorized.maximum_drawdown_percent == Decimal("0.00")
+        assert vectorized.sharpe_ratio == Decimal("0.000")
+        assert vectorized.win_loss_ratio == Decimal("99999")
+        assert vectorized.average_holding_period_hours == Decimal("0.0")
+    
+    @pytest.mark.asyncio
+    async def test_engine_selectable_per_call(self, calc):
+        """calculate_performance_metrics routes to the requested engine"""
+        trades = self.known_trades()
+        swaps = [MagicMock(block_time=trade.timestamp, signature=trade.signature) for trade in trades]
+        calc.calculate_trade_usd_values_batch = AsyncMock(side_effect=[trades, trades])
+        calc._calculate_core_metrics_vectorized = MagicMock(wraps=calc._calculate_core_metrics_vectorized)
+        end_date = datetime(2024, 1, 10, tzinfo=timezone.utc)
+        
+        decimal_metrics = await calc.calculate_performance_metrics("wallet", swaps, end_date, MetricsEngine.DECIMAL)
+        assert calc._calculate_core_metrics_vectorized.call_count == 0
+        
+        vectorized_metrics = await calc.calculate_performance_metrics("wallet", swaps, end_date, MetricsEngine.VECTORIZED)
+        assert calc._calculate_core_metrics_vectorized.call_count == 1
+        
+        assert find_tolerance_violations(decimal_metrics, vectorized_metrics) == {}
+    
+    def test_tolerance_covers_all_quantized_fields(self):
+        """Every Decimal metric field has a stated tolerance"""
+        decimal_fields = {
+            'net_roi_percent', 'maximum_drawdown_percent', 'sharpe_ratio', 'win_loss_ratio',
+            'total_volume_usd', 'total_fees_usd', 'total_profit_usd', 'average_trade_size_usd',
+            'largest_win_usd', 'largest_loss_usd', 'average_holding_period_hours'
+        }
+        assert set(VECTORIZED_TOLERANCE) == decimal_fields
+
+
+
+class TestProcessPoolBatchMetrics:
+    """Batch metrics sharded across a process pool match the single-loop path"""
+    
+    @pytest.fixture
+    def calc(self):
+        """Calculator with a mocked price feed"""
+        calc = PerformanceCalculator()
+        calc.price_feed = AsyncMock()
+        return calc
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("engine", [MetricsEngine.DECIMAL, MetricsEngine.VECTORIZED])
+    async def test_process_pool_matches_in_process(self, calc, engine):
+        """Workers receive pre-valued trades and return the same metrics"""
+        if engine == MetricsEngine.VECTORIZED and not NUMPY_AVAILABLE:
+            pytest.skip("NumPy not installed")
+        
+        records = {}
+        wallet_trades = {}
+        for wallet_index in range(6):
+            trades = TestVectorizedMetricsEngine().random_trades(40 + wallet_index * 10, seed=wallet_index)
+            for trade in trades:
+                trade.signature = f"w{wallet_index}_{trade.signature}"
+                records[trade.signature] = trade
+            wallet_trades[f"wallet_{wallet_index}"] = [
+                MagicMock(signature=trade.signature, block_time=trade.timestamp) for trade in trades
+            ]
+        wallet_trades["wallet_empty"] = []
+        
+        calc.calculate_trade_usd_values_batch = AsyncMock(
+            side_effect=lambda swaps, cache=None: [records[swap.signature] for swap in swaps]
+        )
+        end_date = datetime(2024, 4, 1, tzinfo=timezone.utc)
+        
+        in_process = await calc.calculate_batch_metrics(wallet_trades, end_date, engine)
+        
+        calc.process_workers = 2
+        calc.process_min_wallets = 1
+        try:
+            pooled = await calc.calculate_batch_metrics(wallet_trades, end_date, engine)
+        finally:
+            calc.shutdown_process_pool()
+        
+        # All wallets were valued in one pass for the pooled run
+        start_date = end_date - timedelta(days=calc.rolling_period_days)
+        in_window = sum(1 for record in records.values() if start_date <= record.timestamp <= end_date)
+        assert len(calc.calculate_trade_usd_values_batch.call_args[0][0]) == in_window
+        assert pooled == in_process
+        assert pooled["wallet_empty"] is None
+    
+    @pytest.mark.asyncio
+    async def test_broken_pool_falls_back_in_process(self, calc):
+        """A dead pool is shut down, marked failed and the batch is calculated in-process"""
+        records = {}
+        wallet_trades = {}
+        for wallet_index in range(4):
+            trades = TestVectorizedMetricsEngine().random_trades(20, seed=wallet_index)
+            for trade in trades:
+                trade.signature = f"w{wallet_index}_{trade.signature}"
+                records[trade.signature] = trade
+            wallet_trades[f"wallet_{wallet_index}"] = [
+                MagicMock(signature=trade.signature, block_time=trade.timestamp) for trade in trades
+            ]
+        calc.calculate_trade_usd_values_batch = AsyncMock(
+            side_effect=lambda swaps, cache=None: [records[swap.signature] for swap in swaps]
+        )
+        end_date = datetime(2024, 4, 1, tzinfo=timezone.utc)
+        in_process = await calc.calculate_batch_metrics(wallet_trades, end_date, MetricsEngine.DECIMAL)
+        
+        broken_pool = MagicMock()
+        broken_pool.submit.side_effect = BrokenProcessPool("worker died")
+        calc._process_pool = broken_pool
+        calc.process_workers = 2
+        calc.process_min_wallets = 1
+        pooled = await calc.calculate_batch_metrics(wallet_trades, end_date, MetricsEngine.DECIMAL)
+        
+        assert pooled == in_process
+        assert calc._process_pool_failed
+        assert calc._process_pool is None
+        broken_pool.shutdown.assert_called_once()
+        assert not calc._use_process_pool(MetricsEngine.DECIMAL, 100)
+    
+    def test_no_pool_inside_daemon_process(self, calc):
+        """Pool workers (daemonic processes) calculate in-process"""
+        calc.process_workers = 2
+        calc.process_min_wallets = 1
+        with patch('app.calculation.metrics.multiprocessing.current_process', return_value=MagicMock(daemon=True)):
+            assert not calc._use_process_pool(MetricsEngine.DECIMAL, 100)
+
+
+class TestBatchTradeValuation:
+    """Batch USD valuation resolves each unique (mint, minute) price once"""
+    
+    SOL_MINT = "So11111111111111111111111111111111111111112"
+    USDC_MINT = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"
+    PRICES = {SOL_MINT: Decimal("100.00"), USDC_MINT: Decimal("1.00")}
+    
+    @pytest.fixture
+    def calc(self):
+        """Calculator whose price feed answers batch requests from PRICES"""
+        calc = PerformanceCalculator()
+        calc.price_feed = MagicMock()
+        
+        async def resolve(requests):
+            return {
+                price_cache_key(mint, timestamp): PricePoint(
+                    timestamp=timestamp,
+                    mint=mint,
+                    symbol=symbol,
+                    price_usd=self.PRICES[mint],
+                    source="test",
+                    confidence=1.0
+                )
+                for mint, timestamp, symbol in requests
+                if mint in self.PRICES
+            }
+        
+        calc.price_feed.get_multiple_historical_prices = AsyncMock(side_effect=resolve)
+        calc.price_feed.get_historical_price = AsyncMock()
+        return calc
+    
+    def make_swap(self, index: int, block_time: datetime, out_mint: str = USDC_MINT) -> RaydiumSwap:
+        """Build a valid SOL -> token swap"""
+        return RaydiumSwap(
+            signature=f"{index:064d}",
+            block_time=block_time,
+            slot=250000000 + index,
+            wallet_address="W" * 44,
+            status="success",
+            swap_type="swapBaseIn",
+            token_in=TokenBalance(mint=self.SOL_MINT, symbol="SOL", amount="2", decimals=9),
+            token_out=TokenBalance(mint=out_mint, symbol="USDC", amount="210", decimals=6),
+            pool_id="P" * 44,
+            program_id="675kPX9MHTjS2zt1qfr1NYHuzeLXfQM9H24wFSUt1Mp8",
+            fee_lamports=5000
+        )
+    
+    @pytest.mark.asyncio
+    async def test_single_deduplicated_lookup_pass(self, calc):
+        """Trades in the same minute share price lookups and need one feed round trip"""
+        block_time = datetime(2024, 1, 15, 12, 0, 5, tzinfo=timezone.utc)
+        swaps = [self.make_swap(i, block_time + timedelta(seconds=i)) for i in range(20)]
+        
+        records = await calc.calculate_trade_usd_values_batch(swaps)
+        
+        calc.price_feed.get_multiple_historical_prices.assert_awaited_once()
+        requests = calc.price_feed.get_multiple_historical_prices.call_args[0][0]
+        assert len(requests) == 2  # SOL (token_in and fee) + USDC
+        calc.price_feed.get_historical_price.assert_not_awaited()
+        
+        assert [record.signature for record in records] == [swap.signature for swap in swaps]
+        assert records[0].token_in_usd == Decimal("200.00")
+        assert records[0].token_out_usd == Decimal("210.00")
+        assert records[0].fee_usd == Decimal("0.0005")
+        assert records[0].net_profit_usd == Decimal("9.9995")
+    
+    @pytest.mark.asyncio
+    async def test_missing_price_yields_none_in_place(self, calc):
+        """Trades without token prices map to None without affecting their neighbours"""
+        block_time = datetime(2024, 1, 15, 12, 0, tzinfo=timezone.utc)
+        swaps = [
+            self.make_swap(0, block_time),
+            self.make_swap(1, block_time, out_mint="U" * 44),
+            self.make_swap(2, block_time + timedelta(hours=1))
+        ]
+        
+        records = await calc.calculate_trade_usd_values_batch(swaps)
+        
+        assert records[0] is not None
+        assert records[1] is None
+        assert records[2] is not None
+        assert len(calc.price_feed.get_multiple_historical_prices.call_args[0][0]) == 5
+    
+    @pytest.mark.asyncio
+    async def test_valuation_cache_prices_each_swap_once(self, calc):
+        """Swaps already in the run's valuation cache are reused instead of repriced"""
+        block_time = datetime(2024, 1, 15, 12, 0, tzinfo=timezone.utc)
+        swaps = [self.make_swap(i, block_time + timedelta(minutes=i)) for i in range(4)]
+        cache = TradeValuationCache()
+        
+        first = await calc.calculate_trade_usd_values_batch(swaps[:3], cache)
+        second = await calc.calculate_trade_usd_values_batch(swaps, cache)
+        
+        assert calc.price_feed.get_multiple_historical_prices.await_count == 2
+        last_requests = calc.price_feed.get_multiple_historical_prices.call_args[0][0]
+        assert {timestamp for _, timestamp, _ in last_requests} == {swaps[3].block_time}
+        assert second[:3] == first
+        assert cache.get_statistics() == {
+            "swaps_valued": 4,
+            "valuations_reused": 3,
+            "lookups_saved": 9
+        }
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file
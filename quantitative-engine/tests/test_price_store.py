@@ -0,0 +1,234 @@
+"""
+XORJ Quantitative Engine - Price Series Store Tests
+Unit tests for range-loaded historical prices with binary search and interpolation
+"""
+
+import pytest
+import asyncio
+import threading
+from datetime import datetime, timezone, timedelta
+from decimal import Decimal
+from unittest.mock import AsyncMock
+
+from app.calculation.price_store import PriceSeriesStore, MintPriceSeries
+from app.calculation.price_feed import HistoricalPriceFeed
+
+SOL_MINT = "So11111111111111111111111111111111111111112"
+BASE_TIME = datetime(2024, 1, 1, tzinfo=timezone.utc)
+BASE_TS = int(BASE_TIME.timestamp())
+
+
+def hourly_points(hours: int, start_price: Decimal = Decimal("100"), step: Decimal = Decimal("1")):
+    """Hourly price points rising by `step` each hour"""
+    return [(BASE_TS + h * 3600, start_price + step * h) for h in range(hours)]
+
+
+class TestMintPriceSeries:
+    """Binary search, interpolation and coverage bookkeeping"""
+
+    def test_exact_and_interpolated_lookup(self):
+        """Exact timestamps return stored prices, others interpolate linearly"""
+        series = MintPriceSeries()
+        series.add_points(hourly_points(3))
+
+        assert series.lookup(BASE_TS, 7200) == Decimal("100")
+        assert series.lookup(BASE_TS + 3600, 7200) == Decimal("101")
+        # 15 minutes into the second hour: 101 + 0.25
+        assert series.lookup(BASE_TS + 3600 + 900, 7200) == Decimal("101.25")
+
+    def test_edge_snap_limit(self):
+        """Points past the edges snap only within max_snap_seconds"""
+        series = MintPriceSeries()
+        series.add_points(hourly_points(2))
+
+        assert series.lookup(BASE_TS + 3600 + 1800, 3600) == Decimal("101")
+        assert series.lookup(BASE_TS + 3600 + 7200, 3600) is None
+        assert series.lookup(BASE_TS - 600, 3600) == Decimal("100")
+
+    def test_no_interpolation_across_long_gaps(self):
+        """A hole longer than max_gap_seconds is unpriced except close to its edges"""
+        series = MintPriceSeries()
+        series.add_points([(BASE_TS, Decimal("100")), (BASE_TS + 86400, Decimal("200"))])
+
+        assert series.lookup(BASE_TS + 43200, 3600) == Decimal("150")
+        assert series.lookup(BASE_TS + 43200, 3600, max_gap_seconds=21600) is None
+        assert series.lookup(BASE_TS + 600, 3600, max_gap_seconds=21600) == Decimal("100")
+        assert series.lookup(BASE_TS + 86400 - 600, 3600, max_gap_seconds=21600) == Decimal("200")
+
+    def test_coverage_merging(self):
+        """Overlapping and adjacent ranges merge into one"""
+        series = MintPriceSeries()
+        series.add_coverage(0, 100)
+        series.add_coverage(50, 200)
+        series.add_coverage(200, 300)
+        series.add_coverage(500, 600)
+
+        assert series.coverage == [(0, 300), (500, 600)]
+        assert series.is_covered(250)
+        assert not series.is_covered(400)
+        assert series.is_covered(600)
+
+    def test_add_points_replaces_duplicates(self):
+        """Reloading a range overwrites points at identical timestamps"""
+        series = MintPriceSeries()
+        series.add_points([(10, Decimal("1")), (20, Decimal("2"))])
+        series.add_points([(20, Decimal("3")), (15, Decimal("1.5"))])
+
+        assert series.timestamps == [10, 15, 20]
+        assert series.prices == [Decimal("1"), Decimal("1.5"), Decimal("3")]
+
+
+class TestPriceSeriesStore:
+    """Persistence and coverage-gated lookups"""
+
+    def test_lookup_requires_coverage(self, tmp_path):
+        """Lookups outside fetched ranges are misses even if points exist nearby"""
+        store = PriceSeriesStore(str(tmp_path))
+        end = BASE_TIME + timedelta(hours=10)
+        store.add_range(SOL_MINT, BASE_TIME, end, hourly_points(11))
+
+        assert store.lookup(SOL_MINT, BASE_TIME + timedelta(hours=5, minutes=30)) == Decimal("105.5")
+        assert store.lookup(SOL_MINT, end + timedelta(minutes=30)) is None
+        assert store.hits == 1
+        assert store.misses == 1
+
+    def test_persistence_round_trip(self, tmp_path):
+        """A new store instance reads previously loaded ranges from disk"""
+        store = PriceSeriesStore(str(tmp_path))
+        store.add_range(SOL_MINT, BASE_TIME, BASE_TIME + timedelta(hours=4), hourly_points(5, Decimal("0.123456789012345678")))
+
+        reloaded = PriceSeriesStore(str(tmp_path))
+
+        assert reloaded.is_covered(SOL_MINT, BASE_TIME + timedelta(hours=2))
+        assert reloaded.lookup(SOL_MINT, BASE_TIME) == Decimal("0.123456789012345678")
+
+    def test_memory_only_store(self):
+        """An empty storage_dir disables persistence"""
+        store = PriceSeriesStore("")
+        store.add_range(SOL_MINT, BASE_TIME, BASE_TIME + timedelta(hours=1), hourly_points(2))
+
+        assert store.storage_dir is None
+        assert store.lookup(SOL_MINT, BASE_TIME) == Decimal("100")
+
+
+class TestHistoricalPriceFeedRangeLoads:
+    """HistoricalPriceFeed resolves many timestamps from a single range load"""
+
+    @pytest.fixture
+    def feed(self, tmp_path):
+        """Price feed backed by a temporary store and a mocked range fetch"""
+        feed = HistoricalPriceFeed()
+        feed.price_store = PriceSeriesStore(str(tmp_path))
+        feed.rate_limits = {key: 0 for key in feed.rate_limits}
+        feed._fetch_coingecko_price = AsyncMock(return_value=None)
+        return feed
+
+    @pytest.mark.asyncio
+    async def test_window_served_by_one_range_load(self, feed):
+        """Hundreds of timestamps in one window cost exactly one range request"""
+        points = hourly_points(24 * 30)
+        feed._fetch_coingecko_range = AsyncMock(return_value=points)
+
+        requests = [
+            (SOL_MINT, BASE_TIME + timedelta(minutes=17 * i), "SOL")
+            for i in range(500)
+        ]
+        results = await feed.get_multiple_historical_prices(requests)
+
+        assert feed._fetch_coingecko_range.await_count == 1
+        assert feed._fetch_coingecko_price.await_count == 0
+        assert all(point is not None and point.source == 'coingecko_range' for point in results.values())
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_range_load(self, feed):
+        """Concurrent lookups in the same window wait on one in-flight load"""
+        async def slow_range(*args):
+            await asyncio.sleep(0.01)
+            return hourly_points(48)
+
+        feed._fetch_coingecko_range = AsyncMock(side_effect=slow_range)
+
+        prices = await asyncio.gather(*[
+            feed._get_range_price(SOL_MINT, "SOL", BASE_TIME + timedelta(hours=h))
+            for h in range(10)
+        ])
+
+        assert feed._fetch_coingecko_range.await_count == 1
+        assert prices[3] == Decimal("103")
+        assert not feed._range_locks and not feed._range_lock_users
+
+    @pytest.mark.asyncio
+    async def test_series_file_io_runs_off_the_event_loop(self, feed, tmp_path):
+        """Loading and rewriting a mint's series file never blocks the event loop"""
+        PriceSeriesStore(str(tmp_path)).add_range(SOL_MINT, BASE_TIME, BASE_TIME + timedelta(hours=2), hourly_points(3))
+        feed.price_store = PriceSeriesStore(str(tmp_path))
+        feed._fetch_coingecko_range = AsyncMock(return_value=hourly_points(48))
+        store = feed.price_store
+        loop_thread = threading.get_ident()
+        io_threads = []
+
+        def record(method):
+            def wrapper(*args, **kwargs):
+                io_threads.append(threading.get_ident())
+                return method(*args, **kwargs)
+            return wrapper
+
+        store._read_series = record(store._read_series)
+        store._persist = record(store._persist)
+
+        assert await feed._get_range_price(SOL_MINT, "SOL", BASE_TIME + timedelta(hours=1)) == Decimal("101")
+        assert await feed._get_range_price(SOL_MINT, "SOL", BASE_TIME + timedelta(hours=30)) == Decimal("130")
+
+        assert len(io_threads) == 2  # One load, one rewrite
+        assert loop_thread not in io_threads
+        assert PriceSeriesStore(str(tmp_path)).lookup(SOL_MINT, BASE_TIME + timedelta(hours=30)) == Decimal("130")
+
+    @pytest.mark.asyncio
+    async def test_current_window_refreshes_only_the_tail(self, feed):
+        """Later lookups in the current window fetch from the end of the stored range, not the window start"""
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        _, window_start, _ = feed._range_window(now)
+        loaded_until = now - timedelta(hours=3)
+        feed.price_store.add_range(
+            SOL_MINT, window_start, loaded_until, [(int(loaded_until.timestamp()) - 600, Decimal("100"))]
+        )
+
+        tail_start = int(loaded_until.timestamp())
+        feed._fetch_coingecko_range = AsyncMock(return_value=[
+            (tail_start + h * 3600, Decimal("101") + h) for h in range(3)
+        ])
+
+        price = await feed._get_range_price(SOL_MINT, "SOL", now - timedelta(hours=1, minutes=30))
+        again = await feed._get_range_price(SOL_MINT, "SOL", now - timedelta(minutes=50))
+
+        assert price == Decimal("102.5")
+        assert again is not None
+        assert feed._fetch_coingecko_range.await_count == 1
+        _, fetch_start, fetch_end = feed._fetch_coingecko_range.await_args.args
+        assert fetch_start == loaded_until
+        assert fetch_end >= now
+
+    @pytest.mark.asyncio
+    async def test_future_timestamps_are_not_fetched(self, feed):
+        """Nothing is loaded for a time that has not happened yet"""
+        feed._fetch_coingecko_range = AsyncMock(return_value=[])
+
+        price = await feed._get_range_price(SOL_MINT, "SOL", datetime.now(timezone.utc) + timedelta(hours=1))
+
+        assert price is None
+        assert feed._fetch_coingecko_range.await_count == 0
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_point_lookup(self, feed):
+        """Failed range loads fall back to point-in-time CoinGecko history"""
+        feed._fetch_coingecko_range = AsyncMock(return_value=None)
+        feed._fetch_coingecko_price = AsyncMock(return_value=Decimal("98.5"))
+
+        point = await feed.get_historical_price(SOL_MINT, BASE_TIME, "SOL")
+
+        assert point.price_usd == Decimal("98.5")
+        assert point.source == 'coingecko'
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
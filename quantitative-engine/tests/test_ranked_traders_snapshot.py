@@ -0,0 +1,180 @@
+"""
+XORJ Quantitative Engine - Ranked Traders Snapshot Tests
+Unit tests for the in-memory ranking snapshot behind /internal/ranked-traders
+"""
+
+import json
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock
+
+from app.database.ranking_snapshot import RankedTradersSnapshotCache, RankingSnapshot, etag_matches
+
+FIRST_CALC = datetime(2024, 1, 1, tzinfo=timezone.utc)
+SECOND_CALC = datetime(2024, 1, 2, tzinfo=timezone.utc)
+
+
+def make_traders(count: int, top_score: float = 95.0):
+    """Ranking rows in the DatabaseService dict format, best first"""
+    return [
+        {
+            "rank": i + 1,
+            "wallet_address": f"wallet_{i}",
+            "trust_score": top_score - i,
+            "performance_breakdown": {"performance_score": 0.8, "risk_penalty": 0.1},
+            "metrics": {
+                "net_roi_percent": 12.5,
+                "sharpe_ratio": 1.4,
+                "maximum_drawdown_percent": 8.0,
+                "total_trades": 120,
+                "win_loss_ratio": 1.6,
+                "total_volume_usd": 250000.0,
+                "total_profit_usd": 31000.0
+            }
+        }
+        for i in range(count)
+    ]
+
+
+class FakeDatabaseService:
+    """Serves two ranking calculations; latest_calc selects which one is current"""
+
+    def __init__(self):
+        self.latest_calc = FIRST_CALC
+        self.rankings = {FIRST_CALC: make_traders(50), SECOND_CALC: make_traders(10, top_score=60.0)}
+        self.get_latest_ranking_timestamp = AsyncMock(side_effect=lambda period_days: self.latest_calc)
+        self.get_ranking_snapshot = AsyncMock(side_effect=lambda calc_time, period_days: self.rankings[calc_time])
+
+
+class TestRankingSnapshot:
+    """Bucket serialization"""
+
+    def test_bucket_filters_and_limits(self):
+        snapshot = RankingSnapshot(FIRST_CALC, make_traders(50))
+        body, etag = snapshot.response(5, 80.0)
+        response = json.loads(body)
+
+        assert [trader["rank"] for trader in response["data"]] == [1, 2, 3, 4, 5]
+        assert response["meta"]["calculation_timestamp"] == FIRST_CALC.isoformat()
+        assert response["meta"]["limit_applied"] == 5
+        assert snapshot.response(5, 80.0) == (body, etag)
+
+    def test_non_positive_limit_is_rejected(self):
+        snapshot = RankingSnapshot(FIRST_CALC, make_traders(50))
+
+        for limit in (0, -3):
+            with pytest.raises(ValueError):
+                snapshot.response(limit, 0.0)
+        assert not snapshot._buckets
+
+        filtered = json.loads(snapshot.response(100, 80.0)[0])["data"]
+        assert [trader["trust_score"] for trader in filtered] == [95.0 - i for i in range(16)]
+
+    def test_response_matches_api_model(self):
+        from app.main import RankedTradersResponse
+
+        body, _ = RankingSnapshot(FIRST_CALC, make_traders(3)).response(100, 0.0)
+
+        assert RankedTradersResponse(**json.loads(body)).data[0].wallet_address == "wallet_0"
+
+    def test_bucket_count_is_bounded(self):
+        snapshot = RankingSnapshot(FIRST_CALC, make_traders(5), max_buckets=2)
+        for limit in range(1, 6):
+            snapshot.response(limit, 0.0)
+
+        assert len(snapshot._buckets) == 2
+
+    def test_etag_matching(self):
+        assert etag_matches('"abc"', '"abc"')
+        assert etag_matches('W/"abc", "def"', '"def"')
+        assert etag_matches("*", '"abc"')
+        assert not etag_matches('"abc"', '"def"')
+        assert not etag_matches(None, '"abc"')
+
+
+class TestRankedTradersSnapshotCache:
+    """Loading, serving from memory and swapping on a new calculation"""
+
+    @pytest.fixture
+    def db_service(self):
+        return FakeDatabaseService()
+
+    @pytest.fixture
+    def cache(self, db_service):
+        return RankedTradersSnapshotCache(
+            refresh_interval_seconds=3600,
+            database_service_getter=AsyncMock(return_value=db_service)
+        )
+
+    @pytest.mark.asyncio
+    async def test_requests_are_served_from_memory(self, cache, db_service):
+        for _ in range(20):
+            await cache.get_response(100, 0.0)
+            await cache.get_response(10, 50.0)
+
+        assert db_service.get_latest_ranking_timestamp.await_count == 1
+        assert db_service.get_ranking_snapshot.await_count == 1
+        assert cache.get_statistics()["served"] == 40
+
+    @pytest.mark.asyncio
+    async def test_new_calculation_swaps_snapshot(self, cache, db_service):
+        first_body, first_etag = await cache.get_response(100, 0.0)
+
+        db_service.latest_calc = SECOND_CALC
+        cache.refresh_interval_seconds = 0
+        stale_body, _ = await cache.get_response(100, 0.0)  # Served while the refresh runs
+        await cache._refresh_task
+
+        body, etag = await cache.get_response(100, 0.0)
+        response = json.loads(body)
+
+        assert stale_body == first_body
+        assert etag != first_etag
+        assert len(response["data"]) == 10
+        assert response["meta"]["calculation_timestamp"] == SECOND_CALC.isoformat()
+
+    @pytest.mark.asyncio
+    async def test_unchanged_calculation_keeps_snapshot(self, cache, db_service):
+        await cache.get_response(100, 0.0)
+        snapshot = cache._snapshot
+
+        await cache.refresh()
+
+        assert cache._snapshot is snapshot
+        assert db_service.get_ranking_snapshot.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_no_calculation_returns_none(self, cache, db_service):
+        db_service.latest_calc = None
+
+        assert await cache.get_response(100, 0.0) is None
+
+    @pytest.mark.asyncio
+    async def test_endpoint_honours_if_none_match(self, cache, monkeypatch):
+        import app.main as main
+
+        monkeypatch.setattr(main, "get_ranked_traders_cache", lambda: cache)
+
+        response = await main.get_ranked_traders(limit=10, min_trust_score=0.0, if_none_match=None)
+        etag = response.headers["etag"]
+        not_modified = await main.get_ranked_traders(limit=10, min_trust_score=0.0, if_none_match=etag)
+
+        assert response.status_code == 200
+        assert len(json.loads(response.body)["data"]) == 10
+        assert not_modified.status_code == 304
+        assert not_modified.body == b""
+
+    def test_endpoint_rejects_non_positive_limit(self, cache, monkeypatch):
+        import app.main as main
+        from fastapi.testclient import TestClient
+
+        monkeypatch.setattr(main, "get_ranked_traders_cache", lambda: cache)
+        client = TestClient(main.app)
+
+        assert client.get("/internal/ranked-traders", params={"limit": -3}).status_code == 422
+        assert client.get("/internal/ranked-traders", params={"limit": 0}).status_code == 422
+        assert cache.served == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,101 @@
+"""
+XORJ Quantitative Engine - Shared RPC Rate Limiter Tests
+Unit tests for the per-provider async token buckets
+"""
+
+import asyncio
+import pytest
+
+from app.core.rate_limiter import RPCRateLimiter, TokenBucket, provider_for_url
+
+
+class TestTokenBucket:
+    """Budget enforcement and FIFO ordering under concurrency"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_cannot_exceed_budget(self):
+        bucket = TokenBucket("provider", rate=200.0, capacity=5.0)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+
+        await asyncio.gather(*(bucket.acquire() for _ in range(45)))
+
+        # 5 burst tokens, then 40 more at 200/s
+        assert loop.time() - started >= 40 / 200.0 * 0.95
+        assert bucket.acquisitions == 45
+        assert bucket.max_queue_depth >= 40  # Burst callers pass straight through
+        assert bucket.queue_depth == 0
+
+    @pytest.mark.asyncio
+    async def test_waiters_are_served_in_arrival_order(self):
+        bucket = TokenBucket("provider", rate=500.0, capacity=1.0)
+        order = []
+
+        async def call(index: int, weight: float):
+            await bucket.acquire(weight)
+            order.append(index)
+
+        # A heavy call queued behind light ones is not overtaken by later light calls
+        weights = [1, 1, 8, 1, 1, 1]
+        tasks = []
+        for index, weight in enumerate(weights):
+            tasks.append(asyncio.create_task(call(index, weight)))
+            await asyncio.sleep(0)
+        await asyncio.gather(*tasks)
+
+        assert order == list(range(len(weights)))
+        assert bucket.tokens_spent == sum(weights)
+
+    def test_bucket_survives_successive_event_loops(self):
+        """Celery tasks call asyncio.run repeatedly against the same global bucket"""
+        bucket = TokenBucket("provider", rate=1000.0, capacity=10.0)
+
+        for _ in range(3):
+            asyncio.run(bucket.acquire())
+
+        assert bucket.acquisitions == 3
+
+
+class TestRPCRateLimiter:
+    """Provider budgets and method weights"""
+
+    def test_provider_key_hides_api_key(self):
+        assert provider_for_url("https://mainnet.helius-rpc.com/?api-key=secret") == "mainnet.helius-rpc.com"
+
+    @pytest.mark.asyncio
+    async def test_providers_have_separate_budgets(self):
+        limiter = RPCRateLimiter(
+            default_rate=10.0,
+            default_capacity=10.0,
+            provider_limits="fast.example.com=1000:50",
+            method_weights="getProgramAccounts=10"
+        )
+
+        await limiter.acquire("fast.example.com", "getProgramAccounts", count=4)
+        await limiter.acquire("slow.example.com", "getTransaction", count=3)
+
+        statistics = limiter.get_statistics()
+        assert statistics["fast.example.com"]["tokens_spent"] == 40
+        assert statistics["fast.example.com"]["capacity"] == 50
+        assert statistics["slow.example.com"]["tokens_spent"] == 3
+        assert statistics["slow.example.com"]["rate_per_second"] == 10.0
+        assert limiter.bucket("fast.example.com") is limiter.bucket("fast.example.com")
+
+    def test_budget_is_divided_between_processes(self):
+        """Each process gets its share so the deployment as a whole stays within the provider budget"""
+        limiter = RPCRateLimiter(
+            default_rate=50.0,
+            default_capacity=100.0,
+            provider_limits="fast.example.com=1000:40",
+            method_weights="",
+            processes=4
+        )
+
+        assert limiter.bucket("slow.example.com").rate == 12.5
+        assert limiter.bucket("slow.example.com").capacity == 25.0
+        assert limiter.bucket("fast.example.com").rate == 250.0
+        assert limiter.bucket("fast.example.com").capacity == 10.0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,262 @@
+"""
+XORJ Quantitative Engine - Raydium Parser Tests
+Unit tests for transaction normalization and swap parsing from dict and solders payloads
+"""
+
+import json
+import pytest
+from concurrent.futures.process import BrokenProcessPool
+from decimal import Decimal
+
+from solders.transaction_status import EncodedConfirmedTransactionWithStatusMeta
+
+from app.ingestion import raydium_parser
+from app.ingestion.raydium_parser import RaydiumTransactionParser
+from app.ingestion.transaction_view import TransactionView
+from app.schemas.ingestion import SwapType, TransactionStatus
+
+RAYDIUM = "675kPX9MHTjS2zt1qfr1NYHuzeLXfQM9H24wFSUt1Mp8"
+TOKEN_PROGRAM = "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA"
+SOL = "So11111111111111111111111111111111111111112"
+USDC = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"
+WALLET = "5Q544fKrFoe6tsEbD7S8EmxGTJYAKtTVhAW5Q5pge4j1"
+POOL = "58oQChx4yWmvKdwLLZzBi4ChoCc2fqCUWBkwMihLYQo2"
+POOL_AUTHORITY = "5Q544fKrFoe6tsEbD7S8EmxGTJYAKtTVhAW5Q5pge4j2"
+SIGNATURE = "5" * 88
+
+ACCOUNT_KEYS = [
+    WALLET,
+    "7YttLkHDoNj9wyDur5pM1ejNaAvT9X4eqaYcHQqtj2G5",  # Wallet SOL account
+    "8ZcCb5MdkCTJSeT6yTVdHmEXBnbLQkBCv2gHmnyFS1Fc",  # Wallet USDC account
+    "DQyrAcCrDXQ7NeoqGgDCZwBvWDcYmFCjSb9JtteuvPpz",  # Pool SOL vault
+    "HLmqeL62xR1QoZ1HKKbXRrdN1p3phKpxRMb2VVopvBBz",  # Pool USDC vault
+    "9xLtbzJwZjKEvw5E2DAK1d8YRCrrHrRiR3ySVrXp3tsU",  # Second wallet USDC account
+    POOL,
+    RAYDIUM,
+    TOKEN_PROGRAM,
+]
+
+
+def token_balance(index, mint, owner, ui_amount, decimals):
+    return {
+        "accountIndex": index,
+        "mint": mint,
+        "owner": owner,
+        "programId": TOKEN_PROGRAM,
+        "uiTokenAmount": {
+            "amount": str(int(ui_amount * 10 ** decimals)),
+            "decimals": decimals,
+            "uiAmount": ui_amount,
+            "uiAmountString": str(ui_amount)
+        }
+    }
+
+
+def make_swap(encoding="jsonParsed", err=None):
+    """Wallet sells 1.5 SOL for 225 USDC, received across two USDC accounts"""
+    if encoding == "jsonParsed":
+        account_keys = [
+            {"pubkey": key, "writable": True, "signer": i == 0, "source": "transaction"}
+            for i, key in enumerate(ACCOUNT_KEYS)
+        ]
+        instruction = {"programId": RAYDIUM, "accounts": [POOL] + ACCOUNT_KEYS[1:5], "data": "6AuM4xMCPFhR", "stackHeight": None}
+    else:
+        account_keys = ACCOUNT_KEYS
+        instruction = {"programIdIndex": 7, "accounts": [6, 1, 2, 3, 4], "data": "6AuM4xMCPFhR", "stackHeight": None}
+
+    return {
+        "slot": 250_000_000,
+        "blockTime": 1_700_000_000,
+        "transaction": {
+            "signatures": [SIGNATURE],
+            "message": {
+                "accountKeys": account_keys,
+                "recentBlockhash": "11111111111111111111111111111111",
+                "instructions": [instruction]
+            }
+        },
+        "meta": {
+            "err": err,
+            "status": {"Err": err} if err else {"Ok": None},
+            "fee": 5000,
+            "preBalances": [0] * len(ACCOUNT_KEYS),
+            "postBalances": [0] * len(ACCOUNT_KEYS),
+            "preTokenBalances": [
+                token_balance(1, SOL, WALLET, 5.0, 9),
+                token_balance(2, USDC, WALLET, 100.0, 6),
+                token_balance(3, SOL, POOL_AUTHORITY, 900.0, 9),
+                token_balance(4, USDC, POOL_AUTHORITY, 90000.0, 6),
+                token_balance(5, USDC, WALLET, 10.0, 6)
+            ],
+            "postTokenBalances": [
+                token_balance(1, SOL, WALLET, 3.5, 9),
+                token_balance(2, USDC, WALLET, 300.0, 6),
+                token_balance(3, SOL, POOL_AUTHORITY, 901.5, 9),
+                token_balance(4, USDC, POOL_AUTHORITY, 89775.0, 6),
+                token_balance(5, USDC, WALLET, 35.0, 6)
+            ]
+        }
+    }
+
+
+def as_solders(transaction):
+    """The object EnhancedSolanaClient returns for the same payload"""
+    return EncodedConfirmedTransactionWithStatusMeta.from_json(json.dumps(transaction))
+
+
+class TestTransactionView:
+    """Normalization of getTransaction payloads"""
+
+    @pytest.mark.parametrize("encoding", ["jsonParsed", "json"])
+    def test_accounts_and_programs_are_resolved(self, encoding):
+        view = TransactionView.from_rpc(make_swap(encoding))
+
+        assert view.account_keys == tuple(ACCOUNT_KEYS)
+        assert RAYDIUM in view.program_ids
+        assert view.instructions[0].program_id == RAYDIUM
+        assert view.instructions[0].accounts[0] == POOL
+        assert view.post_token_balances[5].owner == WALLET
+        assert view.pre_token_balances[1].ui_amount == 5.0
+
+    def test_solders_payload_normalizes_like_dict(self):
+        from_dict = TransactionView.from_rpc(make_swap())
+        from_solders = TransactionView.from_rpc(as_solders(make_swap()))
+
+        assert from_solders.account_keys == from_dict.account_keys
+        assert from_solders.instructions == from_dict.instructions
+        assert from_solders.post_token_balances == from_dict.post_token_balances
+        assert (from_solders.slot, from_solders.block_time, from_solders.fee) == (250_000_000, 1_700_000_000, 5000)
+
+    def test_undecodable_payloads(self):
+        assert TransactionView.from_rpc({"transaction": ["AQID", "base64"], "meta": {}}) is None
+        assert TransactionView.from_rpc(42) is None
+
+
+class TestSwapParsing:
+    """parse_raydium_swap on normalized transactions"""
+
+    @pytest.fixture
+    def parser(self):
+        return RaydiumTransactionParser()
+
+    @pytest.mark.parametrize("payload", [make_swap(), make_swap("json"), as_solders(make_swap())])
+    def test_swap_is_parsed_from_every_format(self, parser, payload):
+        swap = parser.parse_raydium_swap(payload, SIGNATURE, WALLET)
+
+        assert swap is not None
+        assert swap.token_in.mint == SOL and swap.token_in.amount == Decimal("1.5")
+        assert swap.token_out.mint == USDC and swap.token_out.amount == Decimal("225.0")
+        assert swap.pool_id == POOL
+        assert swap.swap_type == SwapType.SWAP
+        assert swap.status == TransactionStatus.SUCCESS
+        assert swap.fee_lamports == 5000
+
+    def test_balance_changes_are_matched_by_account(self, parser):
+        changes = parser.extract_token_balances(make_swap())
+
+        assert changes[WALLET][USDC]["amount"] == Decimal("225.0")  # 200 + 25 across two accounts
+        assert changes[WALLET][USDC]["pre_balance"] == Decimal("110.0")
+        assert changes[POOL_AUTHORITY][SOL]["amount"] == Decimal("1.5")
+        assert list(parser.extract_token_balances(make_swap(), owner=WALLET)) == [WALLET]
+
+    def test_batch_reports_only_positive_non_swaps(self, parser, monkeypatch):
+        unrelated = make_swap()
+        unrelated["transaction"]["message"]["accountKeys"] = unrelated["transaction"]["message"]["accountKeys"][:7]
+        unrelated["transaction"]["message"]["instructions"] = []
+        transactions = [
+            (make_swap(), "swap" + "5" * 84, WALLET),
+            (unrelated, "none" + "5" * 84, WALLET),
+            (make_swap(), "odd" + "5" * 85, WALLET),
+            ({"transaction": ["AQID", "base64"], "meta": {}}, "junk" + "5" * 84, WALLET),
+        ]
+        extract = parser.extract_token_balances
+
+        def fail_on_odd(transaction, owner=None):
+            if transaction.slot == 1:
+                raise KeyError("uiTokenAmount")
+            return extract(transaction, owner)
+
+        transactions[2][0]["slot"] = 1
+        monkeypatch.setattr(parser, "extract_token_balances", fail_on_odd)
+
+        result = parser.parse_swap_batch(transactions)
+
+        assert [swap.signature for swap in result.swaps] == [transactions[0][1]]
+        # A parse error or an undecodable payload may still hide a swap
+        assert result.non_swaps == [transactions[1][1]]
+
+    def test_failed_and_unrelated_transactions(self, parser):
+        failed = parser.parse_raydium_swap(make_swap(err={"InstructionError": [0, "Custom"]}), SIGNATURE, WALLET)
+        assert failed.status == TransactionStatus.FAILED
+
+        unrelated = make_swap()
+        unrelated["transaction"]["message"]["accountKeys"] = unrelated["transaction"]["message"]["accountKeys"][:7]
+        unrelated["transaction"]["message"]["instructions"] = []
+        assert not parser.is_raydium_transaction(unrelated)
+        assert parser.parse_raydium_swap(unrelated, SIGNATURE, WALLET) is None
+
+
+class TestParallelParsing:
+    """parse_multiple_swaps on the process pool"""
+
+    @pytest.fixture
+    def parser(self):
+        parser = RaydiumTransactionParser()
+        parser.process_workers = 2
+        parser.process_min_transactions = 10
+        parser.process_chunk_size = 4
+        yield parser
+        parser.shutdown_process_pool()
+
+    def batch(self, count):
+        """Alternating dict and solders payloads, every third one unrelated to Raydium"""
+        transactions = []
+        for i in range(count):
+            payload = make_swap()
+            payload["slot"] += i
+            if i % 3 == 2:
+                payload["transaction"]["message"]["accountKeys"] = payload["transaction"]["message"]["accountKeys"][:7]
+                payload["transaction"]["message"]["instructions"] = []
+            transactions.append((as_solders(payload) if i % 2 else payload, f"{i:03d}" + "5" * 85, WALLET))
+        return transactions
+
+    def test_pool_results_match_in_process_parsing(self, parser):
+        transactions = self.batch(30)
+
+        parallel = parser.parse_multiple_swaps(transactions)
+
+        assert parser._process_pool is not None
+        def fields(swap):
+            return (swap.signature, swap.slot, swap.token_in, swap.token_out, swap.pool_id, swap.fee_lamports)
+
+        assert [fields(swap) for swap in parallel] == [fields(swap) for swap in parser._parse_swaps(transactions).swaps]
+        assert [swap.slot for swap in parallel] == [250_000_000 + i for i in range(30) if i % 3 != 2]
+
+    def test_unencodable_payloads_keep_their_position(self, parser, monkeypatch):
+        transactions = self.batch(30)
+        encode = raydium_parser._encode_payload
+        local = {id(payload) for payload, _, _ in transactions[::4]}
+        monkeypatch.setattr(raydium_parser, "_encode_payload", lambda payload: None if id(payload) in local else encode(payload))
+
+        swaps = parser.parse_multiple_swaps(transactions)
+
+        assert parser._process_pool is not None
+        assert [swap.slot for swap in swaps] == [250_000_000 + i for i in range(30) if i % 3 != 2]
+
+    def test_small_batches_stay_in_process(self, parser):
+        assert len(parser.parse_multiple_swaps(self.batch(9))) == 6
+        assert parser._process_pool is None
+
+    def test_unavailable_pool_falls_back_to_in_process(self, parser):
+        def broken_pool():
+            raise BrokenProcessPool("worker died")
+
+        parser._get_process_pool = broken_pool
+
+        assert len(parser.parse_multiple_swaps(self.batch(12))) == 8
+        assert parser._process_pool_failed
+        assert not parser._use_process_pool(1000)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,182 @@
+"""
+XORJ Quantitative Engine - Request Metrics Tests
+Unit tests for the ASGI metrics middleware: route templates, pre-bound label children, access log sampling
+"""
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from fastapi import APIRouter, FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from app.core import metrics_middleware as metrics_middleware_module
+from app.core.metrics_middleware import MetricsMiddleware
+from app.core.observability import MetricsCollector
+
+WALLET = "ABC123DEF456GHI789JKL012MNO345PQR678"
+
+
+@pytest.fixture
+def collector():
+    with patch('app.core.observability.DATADOG_AVAILABLE', False):
+        return MetricsCollector(enable_prometheus=True, enable_datadog=False)
+
+
+@pytest.fixture(autouse=True)
+def no_sampler_thread():
+    with patch('app.core.metrics_middleware.get_system_sampler', return_value=MagicMock()):
+        yield
+
+
+def make_app(collector, access_log_sample_rate=0.0):
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware, metrics_collector=collector, access_log_sample_rate=access_log_sample_rate)
+
+    @app.get("/api/v1/wallets/{wallet_address}/score")
+    async def wallet_score(wallet_address: str):
+        return {"wallet": wallet_address}
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok"}
+
+    @app.get("/fail")
+    async def fail():
+        raise HTTPException(status_code=503, detail="Scoring unavailable")
+
+    @app.get("/crash")
+    async def crash():
+        raise RuntimeError("Unhandled")
+
+    internal = APIRouter(prefix="/internal")
+
+    @internal.get("/trades/{trade_id}")
+    async def trade(trade_id: int):
+        return {"trade": trade_id}
+
+    app.include_router(internal)
+    return app
+
+
+def requests_total(collector, method, endpoint, status_code):
+    return collector.registry.get_sample_value(
+        'xorj_api_requests_total', {'method': method, 'endpoint': endpoint, 'status_code': status_code}
+    )
+
+
+class TestRouteTemplates:
+    """Metrics are labelled by the matched route"""
+
+    def test_requests_are_labelled_by_route_template(self, collector):
+        with TestClient(make_app(collector)) as client:
+            client.get(f"/api/v1/wallets/{WALLET}/score")
+            client.get("/api/v1/wallets/short/score")
+            client.get("/internal/trades/42")
+            client.get("/health")
+
+        assert requests_total(collector, 'GET', '/api/v1/wallets/{wallet_address}/score', '200') == 2
+        assert requests_total(collector, 'GET', '/internal/trades/{trade_id}', '200') == 1
+        assert requests_total(collector, 'GET', '/health', '200') == 1
+
+    def test_unmatched_paths_share_one_label(self, collector):
+        with TestClient(make_app(collector)) as client:
+            for path in ("/unknown/123", f"/probe/{WALLET}", "/wp-admin.php"):
+                assert client.get(path).status_code == 404
+
+        assert requests_total(collector, 'GET', 'unmatched', '404') == 3
+        assert list(collector._api_request_recorders) == [('GET', 'unmatched', 404)]
+
+    def test_endpoint_serving_several_paths_uses_the_matched_template(self, collector):
+        app = FastAPI()
+        app.add_middleware(MetricsMiddleware, metrics_collector=collector, access_log_sample_rate=0.0)
+
+        async def listing():
+            return []
+
+        async def trader(trader_id: str):
+            return {"trader": trader_id}
+
+        app.add_api_route("/v1/traders", listing)
+        app.add_api_route("/v2/traders", listing)
+        app.add_api_route("/v1/traders/{trader_id}", trader)
+        app.add_api_route("/v2/traders/{trader_id}", trader)
+
+        with TestClient(app) as client:
+            client.get("/v2/traders")
+            client.get("/v2/traders/alpha")
+            client.get("/v2/traders/beta")
+            client.get("/v1/traders/gamma")
+
+        assert requests_total(collector, 'GET', '/v2/traders', '200') == 1
+        assert requests_total(collector, 'GET', '/v2/traders/{trader_id}', '200') == 2
+        assert requests_total(collector, 'GET', '/v1/traders/{trader_id}', '200') == 1
+
+
+class TestPreBoundMetrics:
+    """Label children are bound once per method/route/status"""
+
+    def test_recorders_are_created_once(self, collector):
+        with patch.object(collector.prometheus_metrics['api_requests_total'], 'labels',
+                          wraps=collector.prometheus_metrics['api_requests_total'].labels) as labels:
+            with TestClient(make_app(collector)) as client:
+                for _ in range(5):
+                    client.get(f"/api/v1/wallets/{WALLET}/score")
+                client.get("/fail")
+
+        assert labels.call_count == 2
+        assert requests_total(collector, 'GET', '/api/v1/wallets/{wallet_address}/score', '200') == 5
+        assert requests_total(collector, 'GET', '/fail', '503') == 1
+        assert collector.registry.get_sample_value(
+            'xorj_api_request_duration_seconds_count', {'method': 'GET', 'endpoint': '/fail'}
+        ) == 1
+
+    def test_record_api_request_uses_the_same_recorder(self, collector):
+        collector.record_api_request("GET", "/health", 200, 0.01)
+        recorder = collector.api_request_recorder("GET", "/health", 200)
+
+        assert collector.api_request_recorder("GET", "/health", 200) is recorder
+        assert requests_total(collector, 'GET', '/health', '200') == 1
+        assert collector.get_current_metrics().api_response_time_ms == pytest.approx(10)
+
+    def test_unhandled_exception_is_recorded_as_error(self, collector):
+        with TestClient(make_app(collector), raise_server_exceptions=False) as client:
+            assert client.get("/crash").status_code == 500
+
+        assert requests_total(collector, 'GET', '/crash', '500') == 1
+        assert collector.registry.get_sample_value(
+            'xorj_errors_total', {'error_type': 'runtimeerror', 'component': 'api'}
+        ) == 1
+
+
+class TestAccessLogSampling:
+    """Only a share of successful requests is logged"""
+
+    def access_logs(self, collector, sample_rate, paths):
+        with patch.object(metrics_middleware_module, 'logger') as logger:
+            with TestClient(make_app(collector, sample_rate)) as client:
+                for path in paths:
+                    client.get(path)
+        return [call for call in logger.info.call_args_list if call.args == ("API request completed",)]
+
+    def test_successful_requests_are_sampled(self, collector):
+        assert self.access_logs(collector, 0.0, ["/health"] * 20) == []
+
+        logged = self.access_logs(collector, 1.0, ["/health"] * 20)
+        assert len(logged) == 20
+        assert logged[0].kwargs["sample_rate"] == 1.0
+
+    def test_sample_rate_is_applied(self, collector):
+        with patch('app.core.metrics_middleware.random.random', side_effect=[0.05, 0.5, 0.09, 0.95]):
+            logged = self.access_logs(collector, 0.1, ["/health"] * 4)
+
+        assert len(logged) == 2
+        assert all(call.kwargs["sample_rate"] == 0.1 for call in logged)
+
+    def test_server_errors_are_always_logged(self, collector):
+        logged = self.access_logs(collector, 0.0, ["/health", "/fail"])
+
+        assert [call.kwargs["status_code"] for call in logged] == [503]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,400 @@
+"""
+XORJ Quantitative Engine - Incremental Rolling Metrics Tests
+Unit tests for persisted per-wallet rolling state against the Decimal reference path
+"""
+
+import pytest
+import asyncio
+import random
+import threading
+from datetime import datetime, timezone, timedelta
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock
+
+from app.calculation.metrics import (
+    PerformanceCalculator,
+    TradeRecord,
+    TradeType,
+    MetricsEngine,
+    find_tolerance_violations
+)
+from app.calculation.rolling import RollingStateStore, RollingWindowState, SlidingExtremes, WindowEntry
+from app.schemas.ingestion import TokenBalance
+
+SOL_MINT = "So11111111111111111111111111111111111111112"
+USDC_MINT = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"
+BASE_TIME = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def make_record(index: int, timestamp: datetime, token_in_usd: Decimal, net_profit_usd: Decimal) -> TradeRecord:
+    """TradeRecord with consistent derived USD fields and a fixed fee"""
+    fee_usd = Decimal("0.25")
+    net_usd_change = net_profit_usd + fee_usd
+    return TradeRecord(
+        timestamp=timestamp,
+        signature=f"rolling_trade_{index}",
+        trade_type=TradeType.SELL,
+        token_in=TokenBalance(mint=SOL_MINT, symbol="SOL", amount="1", decimals=9),
+        token_out=TokenBalance(mint=USDC_MINT, symbol="USDC", amount="1", decimals=6),
+        token_in_usd=token_in_usd,
+        token_out_usd=token_in_usd + net_usd_change,
+        net_usd_change=net_usd_change,
+        fee_usd=fee_usd,
+        total_cost_usd=token_in_usd + fee_usd,
+        net_profit_usd=net_profit_usd
+    )
+
+
+def random_records(count: int, seed: int = 7):
+    """Trades roughly every 8 hours with mixed wins and losses"""
+    rng = random.Random(seed)
+    records = []
+    timestamp = BASE_TIME
+    for i in range(count):
+        timestamp += timedelta(hours=rng.randint(1, 16), minutes=rng.randint(0, 59))
+        volume = Decimal(rng.randint(100, 5000))
+        profit = (Decimal(rng.randint(-4000, 5000)) / 100).quantize(Decimal("0.01"))
+        records.append(make_record(i, timestamp, volume, profit))
+    return records
+
+
+def apply_record(state: RollingWindowState, record: TradeRecord):
+    state.apply(record.timestamp, record.signature, record.token_in_usd, record.fee_usd, record.net_profit_usd)
+
+
+class TestSlidingExtremes:
+    """Two-stack peak/trough/drawdown summary against brute force"""
+
+    def test_matches_brute_force_under_appends_and_expiries(self):
+        rng = random.Random(11)
+        extremes = SlidingExtremes()
+        window = []
+        cumulative = Decimal("0")
+
+        for step in range(400):
+            if window and rng.random() < 0.4:
+                extremes.pop_oldest()
+                window.pop(0)
+            else:
+                profit = Decimal(rng.randint(-100, 100))
+                cumulative += profit
+                entry = WindowEntry(step, str(step), Decimal("1"), Decimal("0"), profit, cumulative)
+                extremes.append(entry)
+                window.append(entry)
+
+            summary = extremes.summary()
+            if not window:
+                assert summary is None
+                continue
+
+            expected_drawdown = max(
+                window[j].cumulative_usd - window[i].cumulative_usd
+                for i in range(len(window)) for j in range(i + 1)
+            )
+            assert summary.drawdown == expected_drawdown
+            assert summary.cumulative_max == max(entry.cumulative_usd for entry in window)
+            assert summary.profit_min == min(entry.net_profit_usd for entry in window)
+
+
+class TestRollingWindowState:
+    """Running state agrees with a full recompute of the same window"""
+
+    @pytest.fixture
+    def calc(self):
+        return PerformanceCalculator()
+
+    @pytest.mark.asyncio
+    async def test_sliding_window_matches_full_recompute(self, calc):
+        """After many applies and expiries the state matches _calculate_core_metrics"""
+        records = random_records(300)
+        state = RollingWindowState("wallet")
+        window_days = 20
+
+        for end_index in range(0, len(records), 25):
+            for record in records[max(0, end_index - 25):end_index + 1]:
+                if not state.has_seen(record.signature):
+                    apply_record(state, record)
+
+            end_date = records[end_index].timestamp
+            start_date = end_date - timedelta(days=window_days)
+            state.expire_before(start_date)
+
+            window = [r for r in records[:end_index + 1] if start_date <= r.timestamp <= end_date]
+            reference = await calc._calculate_core_metrics(list(window), start_date, end_date)
+            incremental = calc._metrics_from_rolling_core(state.core_metrics(), start_date, end_date)
+
+            assert incremental.total_trades == reference.total_trades
+            assert incremental.winning_trades == reference.winning_trades
+            assert find_tolerance_violations(reference, incremental) == {}
+
+    def test_persistence_round_trip(self, tmp_path):
+        """A reloaded state produces identical metrics and keeps its seen signatures"""
+        store = RollingStateStore(str(tmp_path))
+        state = store.get("wallet")
+        for record in random_records(40):
+            apply_record(state, record)
+        state.expire_before(random_records(40)[10].timestamp)
+        state.mark_unpriced(BASE_TIME + timedelta(days=30), "unpriced_sig")
+        store.save(state)
+
+        reloaded = RollingStateStore(str(tmp_path)).get("wallet")
+
+        assert reloaded.core_metrics() == state.core_metrics()
+        assert reloaded.has_seen("unpriced_sig")
+        assert reloaded.has_seen("rolling_trade_39")
+        assert not reloaded.has_seen("rolling_trade_0")
+
+    def test_saves_append_only_the_changes(self, tmp_path):
+        """After the first snapshot each save appends one journal line; a reload replays it"""
+        records = random_records(60)
+        store = RollingStateStore(str(tmp_path))
+        state = store.get("wallet")
+        for record in records[:50]:
+            apply_record(state, record)
+        store.save(state)
+        snapshot_mtime = (tmp_path / "wallet.json").stat().st_mtime_ns
+
+        for record in records[50:55]:
+            apply_record(state, record)
+        state.expire_before(records[5].timestamp)
+        state.mark_unpriced(records[54].timestamp + timedelta(minutes=1), "unpriced_sig")
+        store.save(state)
+        apply_record(state, records[55])
+        state.clear_unpriced(["unpriced_sig"])
+        store.save(state)
+
+        journal = (tmp_path / "wallet.journal.jsonl").read_text().splitlines()
+        assert (tmp_path / "wallet.json").stat().st_mtime_ns == snapshot_mtime
+        assert len(journal) == 2
+        assert len(journal[0]) < 2000  # Five trades, not the 50-trade window
+
+        reloaded = RollingStateStore(str(tmp_path)).get("wallet")
+        assert reloaded.core_metrics() == state.core_metrics()
+        assert [entry.signature for entry in reloaded.entries] == [entry.signature for entry in state.entries]
+        assert not reloaded.has_seen("unpriced_sig")
+        assert not reloaded.has_seen("rolling_trade_0")
+
+    def test_journal_is_compacted_into_a_snapshot(self, tmp_path):
+        """Every max_journal_records saves the snapshot is rewritten and the journal emptied"""
+        records = random_records(10)
+        store = RollingStateStore(str(tmp_path), max_journal_records=3)
+        state = store.get("wallet")
+        for record in records:
+            apply_record(state, record)
+            store.save(state)
+
+        # Snapshot, three journal lines, snapshot, three journal lines, snapshot, two journal lines
+        assert len((tmp_path / "wallet.journal.jsonl").read_text().splitlines()) == 1
+        reloaded = RollingStateStore(str(tmp_path)).get("wallet")
+        assert reloaded.core_metrics() == state.core_metrics()
+
+    def test_torn_journal_append_is_ignored(self, tmp_path):
+        """A partial last line (crash mid-append) is dropped and the next save writes a snapshot"""
+        records = random_records(12)
+        store = RollingStateStore(str(tmp_path))
+        state = store.get("wallet")
+        for record in records[:10]:
+            apply_record(state, record)
+        store.save(state)
+        apply_record(state, records[10])
+        store.save(state)
+        with open(tmp_path / "wallet.journal.jsonl", "a") as f:
+            f.write('{"sequence": 3, "expir')
+
+        store = RollingStateStore(str(tmp_path))
+        reloaded = store.get("wallet")
+        assert len(reloaded.entries) == 11
+        assert reloaded.needs_snapshot
+
+        apply_record(reloaded, records[11])
+        store.save(reloaded)
+        assert (tmp_path / "wallet.journal.jsonl").read_text() == ""
+        assert len(RollingStateStore(str(tmp_path)).get("wallet").entries) == 12
+
+    def test_state_saved_by_another_process_is_reloaded(self, tmp_path):
+        """Stores sharing a directory (API and Celery processes) pick up each other's saves"""
+        records = random_records(12)
+        api, worker = RollingStateStore(str(tmp_path)), RollingStateStore(str(tmp_path))
+        state = api.get("wallet")
+        for record in records[:6]:
+            apply_record(state, record)
+        api.save(state)
+
+        state = worker.get("wallet")
+        for record in records[6:9]:
+            apply_record(state, record)
+        worker.save(state)
+
+        state = api.get("wallet")
+        assert len(state.entries) == 9
+        for record in records[9:]:
+            apply_record(state, record)
+        api.save(state)
+
+        reloaded = RollingStateStore(str(tmp_path)).get("wallet")
+        assert reloaded.sequence == 3
+        assert [entry.signature for entry in reloaded.entries] == [record.signature for record in records]
+
+    def test_overtaken_save_is_dropped(self, tmp_path):
+        """A save whose state another process advanced meanwhile does not reuse its journal sequence"""
+        records = random_records(12)
+        api, worker = RollingStateStore(str(tmp_path)), RollingStateStore(str(tmp_path))
+        state = api.get("wallet")
+        for record in records[:6]:
+            apply_record(state, record)
+        api.save(state)
+
+        api_state, worker_state = api.get("wallet"), worker.get("wallet")
+        for record in records[6:9]:
+            apply_record(worker_state, record)
+        worker.save(worker_state)
+        apply_record(api_state, records[9])
+        api.save(api_state)
+
+        assert len((tmp_path / "wallet.journal.jsonl").read_text().splitlines()) == 1
+        reloaded = RollingStateStore(str(tmp_path)).get("wallet")
+        assert [entry.signature for entry in reloaded.entries] == [record.signature for record in records[:9]]
+
+        # The next run reloads the winner's state; the dropped trade is new to it again
+        state = api.get("wallet")
+        assert len(state.entries) == 9 and not state.has_seen(records[9].signature)
+
+
+class TestIncrementalEngine:
+    """calculate_performance_metrics with MetricsEngine.INCREMENTAL"""
+
+    @pytest.fixture
+    def calc(self, tmp_path):
+        """Calculator with in-memory rolling state and a valuation mock keyed by signature"""
+        calc = PerformanceCalculator()
+        calc.rolling_store = RollingStateStore(str(tmp_path))
+        calc.price_feed = AsyncMock()
+        return calc
+
+    def use_records(self, calc, records):
+        """Serve swap valuations from prepared records; return matching swap stand-ins"""
+        by_signature = {record.signature: record for record in records}
+        calc.calculate_trade_usd_values_batch = AsyncMock(
+            side_effect=lambda swaps, cache=None: [by_signature[swap.signature] for swap in swaps]
+        )
+        return [MagicMock(signature=record.signature, block_time=record.timestamp) for record in records]
+
+    @pytest.mark.asyncio
+    async def test_only_new_trades_are_valued(self, calc):
+        """A second run values just the swaps that arrived since the first"""
+        records = random_records(120)
+        swaps = self.use_records(calc, records)
+        first_end = records[99].timestamp
+
+        await calc.calculate_performance_metrics("wallet", swaps[:100], first_end, MetricsEngine.INCREMENTAL)
+        second_end = records[-1].timestamp
+        metrics = await calc.calculate_performance_metrics("wallet", swaps, second_end, MetricsEngine.INCREMENTAL)
+
+        valued = calc.calculate_trade_usd_values_batch.call_args[0][0]
+        assert [swap.signature for swap in valued] == [record.signature for record in records[100:]]
+
+        start_date = second_end - timedelta(days=calc.rolling_period_days)
+        window = [r for r in records if start_date <= r.timestamp <= second_end]
+        reference = await calc._calculate_core_metrics(window, start_date, second_end)
+        assert metrics.total_trades == reference.total_trades
+        assert find_tolerance_violations(reference, metrics) == {}
+
+    async def reference_metrics(self, calc, records, end_date):
+        start_date = end_date - timedelta(days=calc.rolling_period_days)
+        window = [r for r in records if start_date <= r.timestamp <= end_date]
+        return await calc._calculate_core_metrics(window, start_date, end_date)
+
+    @pytest.mark.asyncio
+    async def test_state_io_runs_off_the_event_loop(self, calc):
+        """Loading and saving rolling state never blocks the event loop"""
+        records = random_records(20)
+        swaps = self.use_records(calc, records)
+        store = calc.rolling_store
+        loop_thread = threading.get_ident()
+        io_threads = []
+
+        def record(method):
+            def wrapper(*args, **kwargs):
+                io_threads.append(threading.get_ident())
+                return method(*args, **kwargs)
+            return wrapper
+
+        store.get = record(store.get)
+        store.save = record(store.save)
+
+        await calc.calculate_performance_metrics("wallet", swaps, records[-1].timestamp, MetricsEngine.INCREMENTAL)
+
+        assert len(io_threads) == 2
+        assert loop_thread not in io_threads
+
+    @pytest.mark.asyncio
+    async def test_backfilled_trade_is_merged_into_window(self, calc):
+        """A newly seen swap older than the newest applied trade is merged without revaluing the window"""
+        records = random_records(30)
+        swaps = self.use_records(calc, records)
+        end_date = records[-1].timestamp
+
+        await calc.calculate_performance_metrics("wallet", swaps[:10] + swaps[11:], end_date, MetricsEngine.INCREMENTAL)
+        metrics = await calc.calculate_performance_metrics("wallet", swaps, end_date, MetricsEngine.INCREMENTAL)
+
+        valued = calc.calculate_trade_usd_values_batch.call_args[0][0]
+        assert [swap.signature for swap in valued] == [records[10].signature]
+        assert metrics.total_trades == 30
+        assert find_tolerance_violations(await self.reference_metrics(calc, records, end_date), metrics) == {}
+
+        reloaded = RollingStateStore(calc.rolling_store.storage_dir).get("wallet")
+        assert [entry.signature for entry in reloaded.entries] == [record.signature for record in records]
+
+    @pytest.mark.asyncio
+    async def test_unpriced_swaps_are_retried(self, calc):
+        """A swap whose price was missing is valued again on the next run and merged in order"""
+        records = random_records(30)
+        swaps = self.use_records(calc, records)
+        by_signature = {record.signature: record for record in records}
+        end_date = records[-1].timestamp
+
+        calc.calculate_trade_usd_values_batch.side_effect = lambda swaps, cache=None: [
+            None if swap.signature == records[5].signature else by_signature[swap.signature] for swap in swaps
+        ]
+        first = await calc.calculate_performance_metrics("wallet", swaps, end_date, MetricsEngine.INCREMENTAL)
+        assert first.total_trades == 29
+        assert calc.rolling_store.get("wallet").is_unpriced(records[5].signature)
+
+        # Still no price: retried, nothing else revalued
+        await calc.calculate_performance_metrics("wallet", swaps, end_date, MetricsEngine.INCREMENTAL)
+        assert [swap.signature for swap in calc.calculate_trade_usd_values_batch.call_args[0][0]] == [records[5].signature]
+
+        calc.calculate_trade_usd_values_batch.side_effect = lambda swaps, cache=None: [
+            by_signature[swap.signature] for swap in swaps
+        ]
+        metrics = await calc.calculate_performance_metrics("wallet", swaps, end_date, MetricsEngine.INCREMENTAL)
+
+        assert metrics.total_trades == 30
+        assert not calc.rolling_store.get("wallet").is_unpriced(records[5].signature)
+        assert find_tolerance_violations(await self.reference_metrics(calc, records, end_date), metrics) == {}
+
+    @pytest.mark.asyncio
+    async def test_overlapping_runs_apply_trades_once(self, calc):
+        """Two concurrent runs for one wallet do not both apply the same new trades"""
+        records = random_records(40)
+        swaps = self.use_records(calc, records)
+        by_signature = {record.signature: record for record in records}
+        end_date = records[-1].timestamp
+
+        async def slow_valuation(swaps, cache=None):
+            await asyncio.sleep(0.01)
+            return [by_signature[swap.signature] for swap in swaps]
+
+        calc.calculate_trade_usd_values_batch = AsyncMock(side_effect=slow_valuation)
+        first, second = await asyncio.gather(
+            calc.calculate_performance_metrics("wallet", swaps, end_date, MetricsEngine.INCREMENTAL),
+            calc.calculate_performance_metrics("wallet", swaps, end_date, MetricsEngine.INCREMENTAL)
+        )
+
+        assert first.total_trades == second.total_trades == 40
+        assert calc.calculate_trade_usd_values_batch.await_count == 2
+        assert calc.calculate_trade_usd_values_batch.await_args_list[1].args[0] == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,219 @@
+"""
+XORJ Quantitative Engine - Signature Pre-Filter Tests
+Unit tests for dropping failed and known non-swap signatures before transactions are fetched
+"""
+
+import pytest
+import threading
+from types import SimpleNamespace
+
+from app.ingestion import signature_filter as signature_filter_module
+from app.ingestion.raydium_parser import RaydiumTransactionParser
+from app.ingestion.signature_filter import BloomFilter, SignatureFilter
+from tests.ingestion_fakes import PagingSolanaClient, StubSwapParser, make_worker, signature_index
+
+
+def make_signatures(count: int, failed_every: int = 0):
+    """Signature infos newest first; every `failed_every`-th carries an err"""
+    return [
+        SimpleNamespace(
+            signature=f"sig_{i}",
+            block_time=1_700_000_000 - i,
+            err={"InstructionError": [0, "Custom"]} if failed_every and i % failed_every == failed_every - 1 else None
+        )
+        for i in range(count)
+    ]
+
+
+class RaisesOnSomeSwaps(RaydiumTransactionParser):
+    """Real batch parsing over outcomes where every seventh transaction raises"""
+
+    def _parse_swap_outcome(self, transaction, signature, wallet_address):
+        index = signature_index(signature)
+        if index % 7 == 3:
+            raise RuntimeError("unexpected instruction layout")
+        if index % 5 == 0:
+            return SimpleNamespace(signature=signature), False
+        return None, True
+
+    def validate_swap_data(self, swap):
+        return []
+
+
+class TestBloomFilter:
+    """Membership and sizing"""
+
+    def test_added_keys_are_members_and_false_positives_are_rare(self):
+        bloom = BloomFilter.for_capacity(10_000, 0.01)
+        for i in range(10_000):
+            bloom.add(f"member_{i}")
+
+        assert all(f"member_{i}" in bloom for i in range(10_000))
+        false_positives = sum(f"other_{i}" in bloom for i in range(20_000))
+        assert false_positives / 20_000 < 0.02
+        assert 9_000 < bloom.approximate_count() < 11_000
+
+
+class TestSignatureFilter:
+    """Selection, learning and persistence"""
+
+    def test_failed_and_known_signatures_are_dropped(self):
+        signature_filter = SignatureFilter(path="", capacity=1000)
+        signatures = make_signatures(10, failed_every=5)
+        signature_filter.record_non_swaps([("wallet", "sig_1"), ("wallet", "sig_2")])
+
+        kept = signature_filter.select("wallet", signatures)
+
+        assert [sig.signature for sig in kept] == ["sig_0", "sig_3", "sig_5", "sig_6", "sig_7", "sig_8"]
+        # Learned pairs are per wallet
+        assert len(signature_filter.select("other_wallet", signatures)) == 8
+
+        statistics = signature_filter.get_statistics()
+        assert statistics["skipped_failed"] == 4
+        assert statistics["skipped_known_non_swap"] == 2
+        assert statistics["hit_rate"] == 0.3
+
+    def test_learned_pairs_persist_and_merge_across_processes(self, tmp_path):
+        path = str(tmp_path / "filters" / "signature_filter.bin")
+        first = SignatureFilter(path=path, capacity=1000)
+        second = SignatureFilter(path=path, capacity=1000)
+
+        first.record_non_swaps([("wallet", "sig_1")])
+        second.record_non_swaps([("wallet", "sig_2")])
+        assert first.save() and second.save()
+        assert not second.save()  # Nothing new to write
+
+        reopened = SignatureFilter(path=path, capacity=1000)
+        assert len(reopened.select("wallet", make_signatures(4))) == 2
+
+    def test_incompatible_files_are_discarded(self, tmp_path, monkeypatch):
+        path = str(tmp_path / "signature_filter.bin")
+        signature_filter = SignatureFilter(path=path, capacity=1000)
+        signature_filter.record_non_swaps([("wallet", "sig_1")])
+        signature_filter.save()
+
+        # A parser change bumps the version; different sizing changes the layout
+        monkeypatch.setattr(signature_filter_module, "FILTER_VERSION", signature_filter_module.FILTER_VERSION + 1)
+        assert len(SignatureFilter(path=path, capacity=1000).select("wallet", make_signatures(2))) == 2
+        monkeypatch.undo()
+        assert len(SignatureFilter(path=path, capacity=5000).select("wallet", make_signatures(2))) == 2
+        assert len(SignatureFilter(path=path, capacity=1000).select("wallet", make_signatures(2))) == 1
+
+    def test_filter_learned_with_other_parser_settings_is_discarded(self, tmp_path, monkeypatch):
+        path = str(tmp_path / "signature_filter.bin")
+        signature_filter = SignatureFilter(path=path, capacity=1000)
+        signature_filter.record_non_swaps([("wallet", "sig_1")])
+        signature_filter.save()
+
+        # A newly supported DEX can turn a learned non-swap into a swap
+        programs = signature_filter_module.settings.get_supported_dex_programs() + ["NewDex1111111111111111111111111111111111111"]
+        monkeypatch.setattr(type(signature_filter_module.settings), "get_supported_dex_programs", lambda self: programs)
+        assert len(SignatureFilter(path=path, capacity=1000).select("wallet", make_signatures(2))) == 2
+
+        monkeypatch.undo()
+        monkeypatch.setattr(signature_filter_module.settings, "supported_tokens", "SOL,USDC")
+        assert len(SignatureFilter(path=path, capacity=1000).select("wallet", make_signatures(2))) == 2
+
+        monkeypatch.undo()
+        assert len(SignatureFilter(path=path, capacity=1000).select("wallet", make_signatures(2))) == 1
+
+    def test_concurrent_saves_keep_every_pair(self, tmp_path):
+        """Each save's read-merge-write holds the file lock, so no writer drops another's pairs"""
+        path = str(tmp_path / "signature_filter.bin")
+        writers = [SignatureFilter(path=path, capacity=10_000) for _ in range(4)]
+
+        def learn_and_save(index: int, writer: SignatureFilter):
+            for round_index in range(10):
+                writer.record_non_swaps([("wallet", f"sig_{index}_{round_index}")])
+                writer.save()
+
+        threads = [threading.Thread(target=learn_and_save, args=item) for item in enumerate(writers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        reopened = SignatureFilter(path=path, capacity=10_000)
+        learned = [SimpleNamespace(signature=f"sig_{i}_{r}") for i in range(4) for r in range(10)]
+        assert reopened.select("wallet", learned) == []
+
+    def test_full_filter_starts_a_new_generation(self, tmp_path):
+        path = str(tmp_path / "signature_filter.bin")
+        signature_filter = SignatureFilter(path=path, capacity=100)
+
+        signature_filter.record_non_swaps(("wallet", f"old_{i}") for i in range(100))
+        signature_filter.record_non_swaps([("wallet", "sig_1")])
+        signature_filter.save()
+
+        assert signature_filter.generation == 1
+        assert signature_filter.get_statistics()["entries"] == 1
+        reopened = SignatureFilter(path=path, capacity=100)
+        assert reopened.generation == 1
+        assert len(reopened.select("wallet", [SimpleNamespace(signature="old_5"), SimpleNamespace(signature="sig_1")])) == 1
+
+
+class TestWorkerPrefilter:
+    """DataIngestionWorker fetches only what the filter keeps"""
+
+    def make_worker(self, client, signature_filter, streaming, parser=None):
+        # A wallet whose activity is mostly transfers: every fifth transaction is a swap
+        parser = parser or StubSwapParser(lambda signature: signature_index(signature) % 5 == 0)
+        return make_worker(client, parser, streaming, signature_filter=signature_filter)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("streaming", [True, False])
+    async def test_repeat_runs_fetch_only_swaps(self, streaming):
+        signature_filter = SignatureFilter(path="", capacity=10_000)
+        signatures = make_signatures(1000, failed_every=10)
+
+        first_client = PagingSolanaClient(signatures)
+        first = await self.make_worker(first_client, signature_filter, streaming).process_wallet("wallet")
+
+        # Failed transactions are never fetched
+        assert len(first_client.fetched) == 900
+        assert first.signatures_skipped == 100
+        assert first.valid_swaps_extracted == 200
+
+        # A second pass over the same history (a backfill, or a run without cursors)
+        # fetches only the transactions that produced swaps
+        second_client = PagingSolanaClient(signatures)
+        second = await self.make_worker(second_client, signature_filter, streaming).process_wallet("wallet")
+
+        assert len(second_client.fetched) == 200
+        assert second.signatures_skipped == 800
+        assert second.raydium_transactions_found == 200
+        assert second.valid_swaps_extracted == 200
+        assert signature_filter.get_statistics()["hit_rate"] == pytest.approx(0.45)
+
+    @pytest.mark.asyncio
+    async def test_transactions_the_parser_failed_on_are_fetched_again(self):
+        signature_filter = SignatureFilter(path="", capacity=10_000)
+        signatures = make_signatures(140)
+        failed = {f"sig_{i}" for i in range(140) if i % 7 == 3}
+
+        first_client = PagingSolanaClient(signatures)
+        await self.make_worker(first_client, signature_filter, True, RaisesOnSomeSwaps()).process_wallet("wallet")
+        assert len(first_client.fetched) == 140
+
+        second_client = PagingSolanaClient(signatures)
+        await self.make_worker(second_client, signature_filter, True, RaisesOnSomeSwaps()).process_wallet("wallet")
+
+        # Only swaps and the transactions that raised are fetched again
+        assert failed <= set(second_client.fetched)
+        assert set(second_client.fetched) == failed | {f"sig_{i}" for i in range(0, 140, 5) if i % 7 != 3}
+
+    @pytest.mark.asyncio
+    async def test_disabled_filter_fetches_everything(self, monkeypatch):
+        monkeypatch.setattr(signature_filter_module.settings, "ingestion_prefilter_enabled", False)
+        client = PagingSolanaClient(make_signatures(100, failed_every=10))
+
+        worker = self.make_worker(client, None, streaming=True)
+        status = await worker.process_wallet("wallet")
+
+        assert worker.signature_filter is None
+        assert len(client.fetched) == 100
+        assert status.signatures_skipped == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,187 @@
+"""
+XORJ Quantitative Engine - JSON-RPC Batch Transport Tests
+Unit tests for batched getTransaction fetching in EnhancedSolanaClient
+"""
+
+import json
+import threading
+import pytest
+from unittest.mock import AsyncMock
+
+from solders.signature import Signature
+
+from app.core.transaction_cache import TransactionCache
+from app.ingestion.solana_client import EnhancedSolanaClient, SolanaRateLimiter
+
+SYSTEM_PROGRAM = "11111111111111111111111111111111"
+
+
+def signatures(count: int):
+    return [str(Signature.new_unique()) for _ in range(count)]
+
+
+def transaction_result(slot: int, signature: str):
+    """Minimal jsonParsed getTransaction result"""
+    return {
+        "slot": slot,
+        "blockTime": 1700000000 + slot,
+        "transaction": {
+            "signatures": [signature],
+            "message": {
+                "accountKeys": [
+                    {"pubkey": SYSTEM_PROGRAM, "writable": True, "signer": True, "source": "transaction"}
+                ],
+                "recentBlockhash": SYSTEM_PROGRAM,
+                "instructions": []
+            }
+        },
+        "meta": None
+    }
+
+
+class FakeBatchProvider:
+    """
+    Answers batch POSTs like an RPC node
+
+    item_errors maps a signature to the error object returned in its slot;
+    max_batch_size makes larger batches fail with a single error object.
+    """
+
+    def __init__(self, max_batch_size: int = None, item_errors=None, not_found=()):
+        self.max_batch_size = max_batch_size
+        self.item_errors = item_errors or {}
+        self.not_found = set(not_found)
+        self.batch_sizes = []
+        self.make_batch_request_unparsed = AsyncMock(side_effect=self._respond)
+
+    async def _respond(self, bodies):
+        self.batch_sizes.append(len(bodies))
+        if self.max_batch_size and len(bodies) > self.max_batch_size:
+            return json.dumps({"jsonrpc": "2.0", "id": None, "error": {"code": -32600, "message": "Batch size too large"}})
+
+        responses = []
+        for body in reversed(bodies):  # Providers may answer out of order
+            request = json.loads(body.to_json())
+            signature = request["params"][0]
+            if signature in self.item_errors:
+                responses.append({"jsonrpc": "2.0", "id": request["id"], "error": self.item_errors[signature]})
+            elif signature in self.not_found:
+                responses.append({"jsonrpc": "2.0", "id": request["id"], "result": None})
+            else:
+                responses.append({"jsonrpc": "2.0", "id": request["id"], "result": transaction_result(request["id"], signature)})
+        return json.dumps(responses)
+
+
+class TestBatchTransport:
+    """get_multiple_transactions in "batch" transport mode"""
+
+    @pytest.fixture
+    def client(self, tmp_path):
+        return EnhancedSolanaClient(
+            rate_limiter=SolanaRateLimiter(requests_per_second=10000),
+            transaction_transport="batch",
+            max_rpc_batch_size=50,
+            transaction_cache=TransactionCache(str(tmp_path))
+        )
+
+    def use_provider(self, client, provider):
+        client.client._provider = provider
+        client.get_transaction = AsyncMock(return_value="individual")
+        return provider
+
+    @pytest.mark.asyncio
+    async def test_results_align_with_signatures(self, client):
+        sigs = signatures(120)
+        provider = self.use_provider(client, FakeBatchProvider(not_found=[sigs[7]]))
+
+        results = await client.get_multiple_transactions(sigs, batch_size=120)
+
+        assert provider.batch_sizes == [50, 50, 20]
+        assert results[7] is None
+        assert [str(tx.transaction.transaction.signatures[0]) for i, tx in enumerate(results) if i != 7] == [
+            sig for i, sig in enumerate(sigs) if i != 7
+        ]
+        assert client.get_transaction.await_count == 0
+
+    @pytest.mark.asyncio
+    async def test_item_errors_map_to_their_slots(self, client):
+        sigs = signatures(10)
+        provider = self.use_provider(client, FakeBatchProvider(item_errors={
+            sigs[2]: {"code": -32005, "message": "Node is behind"},
+            sigs[5]: {"code": -32009, "message": "Slot was skipped"}
+        }))
+
+        results = await client.get_multiple_transactions(sigs)
+
+        # The transient error is refetched individually; the permanent one stays empty
+        assert results[2] == "individual"
+        assert results[5] is None
+        client.get_transaction.assert_awaited_once()
+        assert sum(1 for tx in results if tx is not None) == 9
+        assert provider.batch_sizes == [10]
+
+    @pytest.mark.asyncio
+    async def test_batch_size_adapts_to_provider_limit(self, client):
+        sigs = signatures(60)
+        provider = self.use_provider(client, FakeBatchProvider(max_batch_size=20))
+
+        results = await client.get_multiple_transactions(sigs)
+
+        assert all(tx is not None for tx in results)
+        assert client.rpc_batch_size == 12
+        assert provider.batch_sizes[:2] == [50, 25]
+        assert client.batch_supported
+
+    @pytest.mark.asyncio
+    async def test_finalized_transactions_are_served_from_cache(self, client):
+        sigs = signatures(30)
+        provider = self.use_provider(client, FakeBatchProvider(not_found=[sigs[3]]))
+
+        first = await client.get_multiple_transactions(sigs)
+        second = await client.get_multiple_transactions(sigs)
+
+        # Only the missing transaction is requested again
+        assert provider.batch_sizes == [30, 1]
+        assert second == first
+        assert client.transaction_cache.get_statistics()["entries"] == 29
+
+    @pytest.mark.asyncio
+    async def test_cache_io_runs_off_the_event_loop(self, client):
+        sigs = signatures(5)
+        self.use_provider(client, FakeBatchProvider())
+        cache = client.transaction_cache
+        loop_thread = threading.get_ident()
+        io_threads = []
+
+        def record(method):
+            def wrapper(*args, **kwargs):
+                io_threads.append(threading.get_ident())
+                return method(*args, **kwargs)
+            return wrapper
+
+        cache.get_raw = record(cache.get_raw)
+        cache.put_many = record(cache.put_many)
+
+        await client.get_multiple_transactions(sigs)
+        await client.get_multiple_transactions(sigs)
+
+        assert len(io_threads) == 2 * len(sigs) + 1  # Two lookup passes, one write
+        assert loop_thread not in io_threads
+
+    @pytest.mark.asyncio
+    async def test_refused_batching_falls_back_to_individual_requests(self, client):
+        sigs = signatures(5)
+        self.use_provider(client, FakeBatchProvider())
+        client.client._provider.make_batch_request_unparsed = AsyncMock(return_value=json.dumps(
+            {"jsonrpc": "2.0", "id": None, "error": {"code": -32403, "message": "Batch requests are not supported"}}
+        ))
+
+        results = await client.get_multiple_transactions(sigs)
+
+        assert results == ["individual"] * 5
+        assert not client.batch_supported
+        assert client.get_transaction.await_count == 5
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
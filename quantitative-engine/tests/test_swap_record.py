@@ -0,0 +1,114 @@
+"""
+XORJ Quantitative Engine - Swap Record Tests
+Unit tests for the compact SwapRecord used between ingestion and calculation
+"""
+
+import pickle
+import pytest
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from app.calculation.metrics import PerformanceCalculator
+from app.calculation.price_feed import PricePoint
+from app.schemas.ingestion import (
+    RaydiumSwap,
+    SwapRecord,
+    SwapType,
+    TokenAmount,
+    TransactionStatus
+)
+
+SOL = "So11111111111111111111111111111111111111112"
+USDC = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"
+WALLET = "5Q544fKrFoe6tsEbD7S8EmxGTJYAKtTVhAW5Q5pge4j1"
+POOL = "58oQChx4yWmvKdwLLZzBi4ChoCc2fqCUWBkwMihLYQo2"
+RAYDIUM = "675kPX9MHTjS2zt1qfr1NYHuzeLXfQM9H24wFSUt1Mp8"
+BLOCK_TIME = datetime(2024, 1, 15, 12, 0, tzinfo=timezone.utc)
+
+
+def make_record(**overrides):
+    fields = dict(
+        signature="5" * 88,
+        block_time=BLOCK_TIME,
+        slot=250_000_000,
+        wallet_address=WALLET,
+        status=TransactionStatus.SUCCESS,
+        swap_type=SwapType.SWAP_BASE_IN,
+        token_in=TokenAmount(SOL, "SOL", 9, Decimal("10.123456789")),
+        token_out=TokenAmount(USDC, "USDC", 6, Decimal("1100.5"), Decimal("1100.5")),
+        pool_id=POOL,
+        program_id=RAYDIUM,
+        fee_lamports=5000,
+        fee_usd=Decimal("0.50"),
+        processed_at=datetime(2024, 1, 15, 12, 5)
+    )
+    fields.update(overrides)
+    return SwapRecord(**fields)
+
+
+class TestConversion:
+    """Lossless conversion to and from RaydiumSwap"""
+
+    def test_round_trip_keeps_every_field(self):
+        record = make_record()
+
+        model = record.to_raydium_swap()
+        assert isinstance(model, RaydiumSwap)
+        assert model.token_in.amount == Decimal("10.123456789")
+        assert model.processed_at == record.processed_at
+        assert SwapRecord.from_raydium_swap(model) == record
+        assert SwapRecord.from_raydium_swap(model).to_raydium_swap() == model
+        assert record.to_dict() == model.to_dict()
+        assert (record.is_buy, record.trade_size_usd) == (model.is_buy, model.trade_size_usd)
+
+    def test_pickles_compactly(self):
+        record = make_record()
+
+        assert pickle.loads(pickle.dumps(record)) == record
+        assert len(pickle.dumps(record)) < len(pickle.dumps(record.to_raydium_swap()))
+
+
+class TestValidation:
+    """validate() reports what the Pydantic model would"""
+
+    @pytest.mark.parametrize("overrides, message", [
+        ({"signature": "short"}, "Invalid transaction signature format"),
+        ({"pool_id": "unknown_pool"}, "Invalid pool ID format"),
+        ({"fee_lamports": -1}, "Transaction fee cannot be negative"),
+        ({"token_out": TokenAmount(SOL, "SOL", 9, Decimal("1"))}, "Input and output tokens cannot be the same"),
+        ({"token_in": TokenAmount(SOL, "SOL", 9, Decimal("0"))}, "Token amount cannot be zero"),
+    ])
+    def test_invalid_fields(self, overrides, message):
+        record = make_record(**overrides)
+
+        with pytest.raises(ValueError, match=message):
+            record.validate()
+        with pytest.raises(ValueError, match=message):
+            record.to_raydium_swap()
+
+    def test_valid_record(self):
+        record = make_record()
+        assert record.validate() is record
+
+
+class TestCalculation:
+    """Metrics read records and models alike"""
+
+    def test_trade_record_matches_model(self):
+        calculator = PerformanceCalculator()
+        prices = [
+            PricePoint(BLOCK_TIME, mint, symbol, Decimal(price), "test")
+            for mint, symbol, price in ((SOL, "SOL", "100.25"), (USDC, "USDC", "1.0001"))
+        ]
+        record = make_record()
+
+        from_record = calculator._build_trade_record(record, prices[0], prices[1], prices[0])
+        from_model = calculator._build_trade_record(record.to_raydium_swap(), prices[0], prices[1], prices[0])
+
+        assert from_record.net_profit_usd == from_model.net_profit_usd
+        assert from_record.token_in_usd == Decimal("10.123456789") * Decimal("100.25")
+        assert from_record.trade_type == from_model.trade_type
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
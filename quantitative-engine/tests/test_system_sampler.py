@@ -0,0 +1,127 @@
+"""
+XORJ Quantitative Engine - System Metrics Sampler Tests
+Unit tests for sampling CPU, RSS, fds, event-loop lag and GC pauses off the request loop
+"""
+
+import asyncio
+import gc
+import time
+import psutil
+import pytest
+from unittest.mock import MagicMock, patch
+
+from app.core.metrics_middleware import MetricsMiddleware
+from app.core.observability import MetricsCollector
+from app.core.system_sampler import GCPauseTracker, SystemMetricsSampler
+
+
+@pytest.fixture
+def collector():
+    with patch('app.core.observability.DATADOG_AVAILABLE', False):
+        return MetricsCollector(enable_prometheus=True, enable_datadog=False)
+
+
+@pytest.fixture
+def sampler(collector):
+    sampler = SystemMetricsSampler(collector, interval=60, lag_probe_interval=0.01)
+    yield sampler
+    sampler.stop()
+
+
+def gauge(collector, name):
+    return collector.prometheus_metrics[name]._value.get()
+
+
+class TestSystemMetricsSampler:
+    """Sampling and publishing"""
+
+    def test_sample_publishes_without_blocking(self, sampler, collector):
+        with patch('app.core.system_sampler.psutil.cpu_percent', wraps=psutil.cpu_percent) as cpu_percent:
+            started = time.perf_counter()
+            snapshot = sampler.sample()
+            elapsed = time.perf_counter() - started
+
+        # Delta-based readings only: never cpu_percent(interval=1)
+        assert all(call.kwargs.get('interval') is None for call in cpu_percent.call_args_list)
+        assert elapsed < 0.5
+
+        assert snapshot["process_rss_mb"] > 0
+        assert snapshot["open_fds"] > 0
+        assert gauge(collector, 'process_resident_memory_bytes') > 0
+        assert gauge(collector, 'process_open_fds') == snapshot["open_fds"]
+        assert collector.get_current_metrics().memory_usage_mb == pytest.approx(snapshot["memory_usage_mb"], abs=0.01)
+        assert sampler.latest == snapshot
+
+    def test_event_loop_lag_is_measured_from_the_sampler_thread(self, sampler, collector):
+        loop = asyncio.new_event_loop()
+        try:
+            sampler.attach_loop(loop)
+            sampler.start()
+
+            async def block_the_loop():
+                await asyncio.sleep(0.05)
+                time.sleep(0.3)  # A synchronous call stalling every request
+                await asyncio.sleep(0.05)
+
+            loop.run_until_complete(block_the_loop())
+        finally:
+            sampler.stop()
+            loop.close()
+
+        snapshot = sampler.sample()
+        assert snapshot["event_loop_lag_max_ms"] >= 250
+        assert gauge(collector, 'event_loop_lag_max_seconds') >= 0.25
+        # Every answered probe lands in the lag histogram
+        assert collector.registry.get_sample_value('xorj_event_loop_lag_seconds_bucket', {'le': '0.25'}) > 0
+        assert collector.registry.get_sample_value('xorj_event_loop_lag_seconds_count') > 1
+
+    def test_stalled_loop_counts_as_lag(self, sampler):
+        loop = asyncio.new_event_loop()
+        try:
+            # The loop is not running, so the probe never gets answered
+            sampler.attach_loop(loop)
+            sampler._probe_loop()
+            time.sleep(0.1)
+            assert sampler.sample()["event_loop_lag_max_ms"] >= 100
+        finally:
+            loop.close()
+
+    def test_gc_pauses_are_timed(self, sampler, collector):
+        tracker = GCPauseTracker()
+        tracker.install()
+        try:
+            gc.collect()
+        finally:
+            tracker.uninstall()
+
+        pauses = tracker.drain()
+        assert [generation for generation, _ in pauses] == [2]
+        assert tracker.drain() == []
+
+        sampler._gc_tracker = tracker
+        tracker.pauses.extend(pauses)
+        assert sampler.sample()["gc_collections"] == 1
+        samples = collector.registry.get_sample_value('xorj_gc_pause_seconds_count', {'generation': '2'})
+        assert samples == 1
+
+
+class TestMiddlewareSampling:
+    """MetricsMiddleware hands system monitoring to the sampler thread"""
+
+    @pytest.mark.asyncio
+    async def test_middleware_starts_no_task_on_the_request_loop(self, collector):
+        sampler = SystemMetricsSampler(collector, interval=60, lag_probe_interval=0.01)
+        tasks_before = asyncio.all_tasks()
+        try:
+            with patch('app.core.metrics_middleware.get_system_sampler', return_value=sampler):
+                middleware = MetricsMiddleware(MagicMock(), collector)
+
+            assert asyncio.all_tasks() == tasks_before
+            assert middleware.system_sampler.running
+            assert sampler.loop is asyncio.get_running_loop()
+        finally:
+            sampler.stop()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,108 @@
+"""
+XORJ Quantitative Engine - Raw Transaction Cache Tests
+Unit tests for the append-only segment + index cache of finalized getTransaction payloads
+"""
+
+import json
+import os
+import pytest
+
+from app.core.transaction_cache import (
+    INDEX_FILENAME,
+    TransactionCache,
+    is_finalized,
+    transaction_key
+)
+
+
+def payload(index: int) -> str:
+    """A getTransaction result with the repetitive structure real payloads have"""
+    return json.dumps({
+        "slot": 250_000_000 + index,
+        "blockTime": 1_700_000_000 + index,
+        "transaction": {
+            "signatures": [f"sig_{index}"],
+            "message": {"accountKeys": [f"account_{i}" for i in range(20)], "instructions": []}
+        },
+        "meta": {"err": None, "fee": 5000, "logMessages": ["Program log: ray_log"] * 10}
+    }, separators=(",", ":"))
+
+
+class TestTransactionCache:
+    """Storage, persistence and sharing between processes"""
+
+    def test_round_trip_is_compressed_and_persistent(self, tmp_path):
+        cache = TransactionCache(str(tmp_path))
+        keys = [transaction_key(f"sig_{i}") for i in range(100)]
+
+        assert cache.put_many(zip(keys, (payload(i) for i in range(100)))) == 100
+        assert cache.put(keys[0], payload(0)) is False  # Already cached
+        assert cache.get_statistics()["compression_ratio"] > 2
+        cache.close()
+
+        reopened = TransactionCache(str(tmp_path))
+        assert reopened.get_raw(keys[42]) == payload(42)
+        assert reopened.get(keys[7])["slot"] == 250_000_007
+        assert reopened.get(transaction_key("sig_0", "json")) is None  # Other encoding, other payload
+
+        statistics = reopened.get_statistics()
+        assert statistics["entries"] == 100
+        assert statistics["hits"] == 2 and statistics["misses"] == 1
+
+    def test_segments_roll_over(self, tmp_path):
+        cache = TransactionCache(str(tmp_path), segment_max_bytes=2048)
+        for i in range(40):
+            cache.put(transaction_key(f"sig_{i}"), payload(i))
+
+        assert cache.get_statistics()["segments"] > 1
+        assert all(cache.get_raw(transaction_key(f"sig_{i}")) == payload(i) for i in range(40))
+
+    def test_writes_are_visible_to_other_instances(self, tmp_path):
+        """Each process has its own instance over the shared directory"""
+        writer = TransactionCache(str(tmp_path))
+        reader = TransactionCache(str(tmp_path))
+
+        writer.put(transaction_key("sig_1"), payload(1))
+        reader.put(transaction_key("sig_2"), payload(2))
+
+        assert reader.get_raw(transaction_key("sig_1")) == payload(1)
+        assert writer.get_raw(transaction_key("sig_2")) == payload(2)
+        assert transaction_key("sig_1") in reader
+
+    def test_torn_writes_read_as_misses(self, tmp_path):
+        cache = TransactionCache(str(tmp_path))
+        cache.put(transaction_key("sig_1"), payload(1))
+        cache.put(transaction_key("sig_2"), payload(2))
+        cache.close()
+
+        # A crash left half an index entry, and a record was damaged on disk
+        with open(os.path.join(tmp_path, INDEX_FILENAME), "ab") as f:
+            f.write(b"\x00\x00\x00")
+        with open(os.path.join(tmp_path, "segment-000000.dat"), "r+b") as f:
+            f.seek(20)
+            f.write(b"corrupt")
+
+        reopened = TransactionCache(str(tmp_path))
+        assert reopened.get_raw(transaction_key("sig_1")) is None
+        assert reopened.get_raw(transaction_key("sig_2")) == payload(2)
+        assert reopened.get_statistics()["corrupt_records"] == 1
+
+        # The damaged entry is refetched and cached again after the torn index tail
+        assert reopened.put(transaction_key("sig_1"), payload(1))
+        assert TransactionCache(str(tmp_path)).get_raw(transaction_key("sig_1")) == payload(1)
+
+
+class TestFinality:
+    """Which fetched transactions may be cached forever"""
+
+    def test_confirmed_transactions_need_age(self):
+        now = 1_700_000_000
+
+        assert is_finalized(now - 3600, "confirmed", now=now)
+        assert not is_finalized(now - 5, "confirmed", now=now)
+        assert not is_finalized(None, "confirmed", now=now)
+        assert is_finalized(now - 5, "finalized", now=now)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
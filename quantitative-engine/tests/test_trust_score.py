@@ -22,7 +22,7 @@ from app.scoring.trust_score import (
     MIN_TOTAL_TRADES,
     MAX_SINGLE_DAY_ROI_SPIKE
 )
-from app.calculation.metrics import PerformanceMetrics, TradeRecord, TradeType
+from app.calculation.metrics import PerformanceMetrics, TradeRecord, TradeType, TradeValuationCache
 from app.schemas.ingestion import RaydiumSwap, TokenBalance
 from app.core.config import get_settings
 
@@ -36,7 +36,7 @@ class TestXORJTrustScoreEngine:
     """Test suite for XORJ Trust Score algorithm with known inputs and outputs"""
     
     @pytest.fixture
-    async def scoring_engine(self):
+    def scoring_engine(self):
         """Create scoring engine instance for testing"""
         engine = XORJTrustScoreEngine()
         
@@ -313,7 +313,9 @@ class TestXORJTrustScoreEngine:
                     net_profit_usd=Decimal('999.50')
                 )
         
-        mock_calc_service.calculate_trade_usd_values.side_effect = mock_calculate_usd_values
+        mock_calc_service.calculate_trade_usd_values.side_effect = (
+            lambda trades, valuation_cache=None: [mock_calculate_usd_values(trade) for trade in trades]
+        )
         
         has_spikes = await engine._has_extreme_roi_spikes(trades)
         assert has_spikes == True
@@ -472,6 +474,91 @@ class TestXORJTrustScoreEngine:
         assert all(score > 0 for _, score in trust_scores)
         assert trust_scores[0][1] > trust_scores[-1][1]  # Best > worst
     
+    @pytest.mark.asyncio
+    async def test_batch_shares_valuation_cache(self, scoring_engine, known_performance_metrics):
+        """Eligibility checks and metrics calculation share one valuation cache per run"""
+        engine, mock_calc_service = scoring_engine
+        
+        engine.check_wallet_eligibility = AsyncMock(return_value=(EligibilityStatus.ELIGIBLE, None))
+        mock_calc_service.calculate_batch_wallet_performance.return_value = {
+            "wallet1": known_performance_metrics[0],
+            "wallet2": known_performance_metrics[1]
+        }
+        cache = TradeValuationCache()
+        
+        await engine.calculate_batch_trust_scores(
+            {"wallet1": [MagicMock()], "wallet2": [MagicMock()]},
+            valuation_cache=cache
+        )
+        
+        for call in engine.check_wallet_eligibility.call_args_list:
+            assert call.kwargs["valuation_cache"] is cache
+        assert mock_calc_service.calculate_batch_wallet_performance.call_args[0][3] is cache
+    
+    @pytest.mark.asyncio
+    async def test_batch_streams_in_chunks(self, scoring_engine, known_performance_metrics):
+        """Chunked scoring calculates one chunk of metrics at a time and matches whole-batch normalization"""
+        engine, mock_calc_service = scoring_engine
+        engine.chunk_size = 2
+        
+        wallet_metrics = {f"wallet{i}": metrics for i, metrics in enumerate(known_performance_metrics)}
+        wallet_metrics["wallet_failed"] = None
+        engine.check_wallet_eligibility = AsyncMock(side_effect=lambda wallet, trades, valuation_cache=None: (
+            (EligibilityStatus.INSUFFICIENT_TRADES, "Too few") if wallet == "wallet_new" else (EligibilityStatus.ELIGIBLE, None)
+        ))
+        mock_calc_service.calculate_batch_wallet_performance = AsyncMock(
+            side_effect=lambda trades, *args: {wallet: wallet_metrics[wallet] for wallet in trades}
+        )
+        wallet_trades = {wallet: [MagicMock()] for wallet in ["wallet0", "wallet_new", "wallet1", "wallet_failed", "wallet2"]}
+        
+        results = [result async for result in engine.iter_batch_trust_scores(wallet_trades)]
+        
+        assert [result.wallet_address for result in results] == [
+            "wallet_new", "wallet0", "wallet1", "wallet_failed", "wallet2"
+        ]
+        for call in mock_calc_service.calculate_batch_wallet_performance.call_args_list:
+            assert len(call.args[0]) <= 2
+        
+        expected = engine.normalize_metrics(known_performance_metrics)
+        by_wallet = {result.wallet_address: result for result in results}
+        for index in range(3):
+            assert by_wallet[f"wallet{index}"].normalized_metrics == expected[f"wallet_{index}"]
+        assert by_wallet["wallet_failed"].eligibility_status == EligibilityStatus.CALCULATION_ERROR
+        assert by_wallet["wallet_new"].eligibility_status == EligibilityStatus.INSUFFICIENT_TRADES
+    
+    @pytest.mark.asyncio
+    async def test_batch_evicts_valuations_per_chunk(self, scoring_engine, known_performance_metrics):
+        """A run-owned valuation cache never holds more than one chunk of swaps"""
+        engine, mock_calc_service = scoring_engine
+        engine.chunk_size = 2
+        engine.check_wallet_eligibility = AsyncMock(return_value=(EligibilityStatus.ELIGIBLE, None))
+        
+        cache_sizes = []
+        caches = []
+        
+        async def value_chunk(trades, end_date, engine_name, valuation_cache):
+            for wallet, wallet_swaps in trades.items():
+                valuation_cache.update([swap.signature for swap in wallet_swaps], [None] * len(wallet_swaps))
+            cache_sizes.append(len(valuation_cache))
+            caches.append(valuation_cache)
+            return {wallet: known_performance_metrics[0] for wallet in trades}
+        
+        mock_calc_service.calculate_batch_wallet_performance = AsyncMock(side_effect=value_chunk)
+        wallet_trades = {
+            f"wallet{i}": [MagicMock(signature=f"sig_{i}_{j}") for j in range(5)]
+            for i in range(7)
+        }
+        
+        results = [result async for result in engine.iter_batch_trust_scores(wallet_trades)]
+        
+        assert len(results) == 7
+        assert len(cache_sizes) == 4
+        assert max(cache_sizes) <= engine.chunk_size * 5
+        assert len(caches[-1]) == 0
+        assert caches[-1].get_statistics()["swaps_valued"] == 35
+        # Metrics are calculated once per wallet
+        assert sum(len(call.args[0]) for call in mock_calc_service.calculate_batch_wallet_performance.call_args_list) == 7
+    
     @pytest.mark.asyncio
     async def test_empty_trades_handling(self, scoring_engine):
         """Test handling of empty trade lists"""